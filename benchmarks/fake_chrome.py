@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Заглушка Chrome для бенчмарков запуска профилей без настоящего браузера.
+
+Процесс принимает флаги Chrome, поднимает DevTools-совместимый HTTP-эндпоинт
+(/json/version, /json/list) и WebSocket браузера, отвечающий на команды CDP,
+и пишет файл DevToolsActivePort в --user-data-dir, как настоящий Chrome.
+
+Запуск напрямую:
+    python benchmarks/fake_chrome.py --remote-debugging-port=9222 --user-data-dir=/tmp/profiles
+
+Для подстановки вместо CHROME_PATH используется create_fake_chrome_executable().
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import stat
+import base64
+import socket
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+FAKE_BROWSER_VERSION = 'HeadlessChrome/120.0.0.0 (fake)'
+
+
+def _websocket_accept(key: str) -> str:
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError('соединение закрыто')
+        data += chunk
+    return data
+
+
+def read_frame(sock: socket.socket) -> tuple[int, bytes]:
+    """
+    Читает один кадр WebSocket
+
+    Returns:
+        tuple[int, bytes]: (opcode, данные)
+    """
+    first, second = _recv_exact(sock, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(_recv_exact(sock, 2), 'big')
+    elif length == 127:
+        length = int.from_bytes(_recv_exact(sock, 8), 'big')
+
+    mask = _recv_exact(sock, 4) if second & 0x80 else None
+    payload = _recv_exact(sock, length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+    return opcode, payload
+
+
+def send_frame(sock: socket.socket, payload: bytes, opcode: int = 0x1, masked: bool = False) -> None:
+    """
+    Отправляет один кадр WebSocket (клиент обязан маскировать кадры, сервер - нет)
+    """
+    header = bytes([0x80 | opcode])
+    mask_bit = 0x80 if masked else 0
+    length = len(payload)
+    if length < 126:
+        header += bytes([mask_bit | length])
+    elif length < 2 ** 16:
+        header += bytes([mask_bit | 126]) + length.to_bytes(2, 'big')
+    else:
+        header += bytes([mask_bit | 127]) + length.to_bytes(8, 'big')
+
+    if masked:
+        mask = os.urandom(4)
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        header += mask
+
+    sock.sendall(header + payload)
+
+
+def _cdp_result(method: str) -> dict:
+    if method == 'Browser.getVersion':
+        return {
+            'protocolVersion': '1.3',
+            'product': FAKE_BROWSER_VERSION,
+            'revision': '0',
+            'userAgent': f'Mozilla/5.0 {FAKE_BROWSER_VERSION}',
+            'jsVersion': '0',
+        }
+    if method == 'Target.getTargets':
+        return {'targetInfos': []}
+
+    return {}
+
+
+class DevToolsHandler(BaseHTTPRequestHandler):
+    server_version = 'FakeChrome/1.0'
+
+    def log_message(self, format, *args):
+        pass  # без вывода в консоль, как Chrome с stdout в devnull
+
+    def _send_json(self, data) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        port = self.server.server_address[1]
+        browser_ws_url = f'ws://127.0.0.1:{port}{self.server.browser_path}'
+
+        if self.headers.get('Upgrade', '').lower() == 'websocket':
+            return self._serve_websocket()
+
+        if self.path.startswith('/json/version'):
+            return self._send_json({
+                'Browser': FAKE_BROWSER_VERSION,
+                'Protocol-Version': '1.3',
+                'User-Agent': f'Mozilla/5.0 {FAKE_BROWSER_VERSION}',
+                'webSocketDebuggerUrl': browser_ws_url,
+            })
+        if self.path.startswith('/json'):  # /json и /json/list
+            return self._send_json([])
+
+        self.send_error(404)
+
+    def _serve_websocket(self):
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', _websocket_accept(self.headers['Sec-WebSocket-Key']))
+        self.end_headers()
+        self.wfile.flush()
+
+        sock = self.connection
+        try:
+            while True:
+                opcode, payload = read_frame(sock)
+                if opcode == 0x8:  # close
+                    send_frame(sock, b'', 0x8)
+                    return
+                if opcode == 0x9:  # ping
+                    send_frame(sock, payload, 0xA)
+                    continue
+
+                message = json.loads(payload)
+                send_frame(sock, json.dumps({
+                    'id': message.get('id'),
+                    'result': _cdp_result(message.get('method', '')),
+                }).encode())
+        except (ConnectionError, OSError, ValueError):
+            return
+
+
+def cdp_call(ws_url: str, method: str, timeout: float = 5) -> dict:
+    """
+    Подключается к WebSocket DevTools и выполняет одну команду CDP
+
+    Args:
+        ws_url: Адрес вида ws://127.0.0.1:9222/devtools/browser/<id>
+        method: Метод CDP, например Browser.getVersion
+
+    Returns:
+        dict: Ответ CDP
+    """
+    host_port, _, path = ws_url[len('ws://'):].partition('/')
+    host, _, port = host_port.partition(':')
+    key = base64.b64encode(os.urandom(16)).decode()
+
+    with socket.create_connection((host, int(port)), timeout=timeout) as sock:
+        sock.sendall((
+            f'GET /{path} HTTP/1.1\r\n'
+            f'Host: {host_port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n\r\n'
+        ).encode())
+
+        response = b''
+        while b'\r\n\r\n' not in response:
+            chunk = sock.recv(1024)
+            if not chunk:
+                raise ConnectionError('соединение закрыто при рукопожатии')
+            response += chunk
+        if b' 101 ' not in response.split(b'\r\n', 1)[0]:
+            raise ConnectionError(f'неожиданный ответ на рукопожатие: {response[:80]!r}')
+
+        send_frame(sock, json.dumps({'id': 1, 'method': method}).encode(), masked=True)
+        _, payload = read_frame(sock)
+        send_frame(sock, b'', 0x8, masked=True)
+
+        return json.loads(payload)
+
+
+def create_fake_chrome_executable(directory: str) -> str:
+    """
+    Создает исполняемый файл, который запускает заглушку текущим интерпретатором Python.
+    Путь подставляется вместо CHROME_PATH. На Windows это .cmd-обертка, на остальных системах - sh-скрипт
+
+    Args:
+        directory: Папка для исполняемого файла
+
+    Returns:
+        str: Путь к исполняемому файлу
+    """
+    if sys.platform == 'win32':
+        executable_path = os.path.join(directory, 'fake-chrome.cmd')
+        with open(executable_path, 'w') as f:
+            f.write(f'@"{sys.executable}" "{os.path.abspath(__file__)}" %*\n')
+        return executable_path
+
+    executable_path = os.path.join(directory, 'fake-chrome')
+    with open(executable_path, 'w') as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.abspath(__file__)}" "$@"\n')
+    os.chmod(executable_path, os.stat(executable_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    return executable_path
+
+
+def _exit_with_parent(parent_pid: int) -> None:
+    """
+    Завершает заглушку вместе с родителем (Windows). Под .cmd-оберткой terminate() получает cmd.exe,
+    а не сам процесс Python, и без этого заглушка осталась бы висеть с занятым портом
+    """
+    import ctypes
+
+    synchronize, infinite = 0x00100000, 0xFFFFFFFF
+    handle = ctypes.windll.kernel32.OpenProcess(synchronize, False, parent_pid)
+    if handle:
+        ctypes.windll.kernel32.WaitForSingleObject(handle, infinite)
+    os._exit(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Заглушка Chrome с DevTools-эндпоинтом')
+    parser.add_argument('--remote-debugging-port', type=int, default=0)
+    parser.add_argument('--user-data-dir', default=None)
+    parser.add_argument('--startup-delay-ms', type=float, default=float(os.environ.get('FAKE_CHROME_STARTUP_DELAY_MS', 0)),
+                        help='искусственная задержка старта, имитирует время запуска браузера')
+    args, _ = parser.parse_known_args()  # остальные флаги Chrome игнорируются
+
+    if sys.platform == 'win32':
+        threading.Thread(target=_exit_with_parent, args=(os.getppid(),), daemon=True).start()
+
+    if args.startup_delay_ms:
+        time.sleep(args.startup_delay_ms / 1000)
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.remote_debugging_port), DevToolsHandler)
+    server.daemon_threads = True
+    server.browser_path = f'/devtools/browser/{uuid.uuid4()}'
+
+    if args.user_data_dir:
+        os.makedirs(args.user_data_dir, exist_ok=True)
+        with open(os.path.join(args.user_data_dir, 'DevToolsActivePort'), 'w') as f:
+            f.write(f'{server.server_address[1]}\n{server.browser_path}')
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
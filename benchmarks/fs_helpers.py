@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Бенчмарк файловых функций src/utils/helpers.py на синтетическом парке профилей.
+
+Во временной папке создается парк из N профилей с M расширениями в каждом
+(папки версий с manifest.json и файлами скриптов) и файлами Preferences
+реалистичного размера, а также папка default_extensions. CHROME_DATA_PATH и
+DEFAULT_EXTENSIONS_PATH в src.utils.helpers подменяются на время замеров,
+настоящие профили не затрагиваются.
+
+Замеряется на каждом размере парка:
+    get_profiles_list                - список профилей
+    get_profiles_extensions_info     - сбор расширений всех профилей
+    fix_profile_extensions_settings  - по одному вызову на профиль
+    copy_extension                   - замена одного расширения (replace=True) в каждом профиле
+    restore_default_extensions       - восстановление всех расширений из default_extensions
+
+Для каждой функции считается рост времени на один профиль между самым маленьким и
+самым большим парком (growth): около 1 - линейная зависимость, заметно больше 1 -
+квадратичные или копирующие пути, которые станут узким местом при росте парка.
+
+Запуск из корня проекта:
+    python -m benchmarks.fs_helpers
+    python -m benchmarks.fs_helpers --profiles 10,100,500 --extensions 5,30 --output bench_results/fs_helpers.json
+"""
+
+import os
+import json
+import time
+import random
+import string
+import argparse
+import tempfile
+
+from loguru import logger
+
+from benchmarks.stats import summarize, write_results
+
+
+EXTENSION_ID_ALPHABET = 'abcdefghijklmnop'  # ID расширений Chrome состоят из букв a-p
+
+
+def make_extension_id(rng: random.Random) -> str:
+    return ''.join(rng.choice(EXTENSION_ID_ALPHABET) for _ in range(32))
+
+
+def write_extension(extension_path: str, name: str, version: str, files_count: int, file_kb: int) -> None:
+    """
+    Создает папку расширения в формате Chrome: <ext_id>/<версия>/manifest.json и файлы скриптов
+    """
+    version_path = os.path.join(extension_path, version)
+    os.makedirs(version_path, exist_ok=True)
+
+    manifest = {
+        'manifest_version': 3,
+        'name': name,
+        'version': version,
+        'background': {'service_worker': 'background.js'},
+    }
+    with open(os.path.join(version_path, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+
+    chunk = ('// ' + string.ascii_letters + '\n') * (file_kb * 1024 // 56 + 1)
+    for i in range(files_count):
+        with open(os.path.join(version_path, f'script_{i}.js'), 'w', encoding='utf-8') as f:
+            f.write(chunk[:file_kb * 1024])
+
+
+def build_preferences(extension_ids: list[str], size_kb: int, rng: random.Random) -> dict:
+    """
+    Собирает Preferences: настройки половины расширений (вторую половину исправляет
+    fix_profile_extensions_settings) и записи site_engagement до нужного размера
+    """
+    preferences = {
+        'extensions': {
+            'pinned_extensions': extension_ids[::2],
+            'settings': {ext_id: {'location': 1, 'state': 1, 'manifest': {'name': ext_id}} for ext_id in extension_ids[::2]},
+        },
+        'profile': {'name': 'bench', 'content_settings': {'exceptions': {'site_engagement': {}}}},
+    }
+
+    site_engagement = preferences['profile']['content_settings']['exceptions']['site_engagement']
+    size = len(json.dumps(preferences))
+    while size < size_kb * 1024:
+        host = ''.join(rng.choice(string.ascii_lowercase) for _ in range(12))
+        entry = {'last_modified': str(rng.randrange(10 ** 17)), 'setting': {'rawScore': rng.random() * 100}}
+        site_engagement[f'https://{host}.com:443,*'] = entry
+        size += len(host) + 110
+
+    return preferences
+
+
+class SyntheticFleet:
+    """
+    Временный парк профилей, подставленный в src.utils.helpers
+    """
+
+    def __init__(self,
+                 profiles_count: int,
+                 extensions_count: int,
+                 preferences_kb: int = 100,
+                 extension_files: int = 4,
+                 extension_file_kb: int = 16,
+                 seed: int = 0):
+        """
+        Args:
+            profiles_count: Количество профилей
+            extensions_count: Количество расширений в каждом профиле и в default_extensions
+            preferences_kb: Размер файла Preferences
+            extension_files: Файлов скриптов в каждом расширении
+            extension_file_kb: Размер одного файла скрипта
+            seed: Зерно генератора, чтобы парк был одинаковым между запусками
+        """
+        rng = random.Random(seed)
+
+        self.temp_dir = tempfile.TemporaryDirectory(prefix='fs-bench-')
+        self.data_path = os.path.join(self.temp_dir.name, 'profiles')
+        self.default_extensions_path = os.path.join(self.temp_dir.name, 'default_extensions')
+        self.profile_names = [f'Profile bench-{i}' for i in range(profiles_count)]
+        self.extension_ids = [make_extension_id(rng) for _ in range(extensions_count)]
+
+        # в папке профилей лежат и служебные папки Chrome, get_profiles_list должен их пропускать
+        for service_dir in ('Default', 'System Profile', 'Crashpad'):
+            os.makedirs(os.path.join(self.data_path, service_dir))
+
+        for i, ext_id in enumerate(self.extension_ids):
+            write_extension(os.path.join(self.default_extensions_path, ext_id),
+                            f'Bench Extension {i}', '2.0.0', extension_files, extension_file_kb)
+
+        for profile_name in self.profile_names:
+            profile_path = os.path.join(self.data_path, profile_name)
+            for i, ext_id in enumerate(self.extension_ids):
+                write_extension(os.path.join(profile_path, 'Extensions', ext_id),
+                                f'Bench Extension {i}', '1.0.0', extension_files, extension_file_kb)
+                os.makedirs(os.path.join(profile_path, 'Local Extension Settings', ext_id))
+
+            with open(os.path.join(profile_path, 'Preferences'), 'w', encoding='utf-8') as f:
+                json.dump(build_preferences(self.extension_ids, preferences_kb, rng), f)
+
+        self._patched = []
+
+    def __enter__(self) -> 'SyntheticFleet':
+        import src.utils.helpers as helpers_module
+
+        self._patch(helpers_module, 'CHROME_DATA_PATH', self.data_path)
+        self._patch(helpers_module, 'DEFAULT_EXTENSIONS_PATH', self.default_extensions_path)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        for module, name, value in reversed(self._patched):
+            setattr(module, name, value)
+        self.temp_dir.cleanup()
+
+    def _patch(self, module, name: str, value) -> None:
+        self._patched.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+
+def time_calls(func, args_list: list[tuple]) -> list[float]:
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started)
+
+    return samples
+
+
+def bench_fleet(fleet: SyntheticFleet, repeat: int) -> dict:
+    """
+    Замеряет функции на одном парке. Порядок важен: функции, меняющие профили, идут последними
+
+    Returns:
+        dict: {функция: сводка замеров и total_ms - суммарное время на весь парк}
+    """
+    from src.utils import helpers
+
+    profiles = fleet.profile_names
+    replaced_ext_id = fleet.extension_ids[0]
+    samples = {
+        'get_profiles_list': time_calls(helpers.get_profiles_list, [()] * repeat),
+        'get_profiles_extensions_info': time_calls(helpers.get_profiles_extensions_info, [(profiles,)] * repeat),
+        'fix_profile_extensions_settings': time_calls(helpers.fix_profile_extensions_settings,
+                                                      [(profile,) for profile in profiles]),
+        'copy_extension': time_calls(helpers.copy_extension, [(
+            os.path.join(fleet.default_extensions_path, replaced_ext_id),
+            os.path.join(fleet.data_path, profile, 'Extensions', replaced_ext_id),
+            profile,
+            replaced_ext_id,
+            True,
+        ) for profile in profiles]),
+        'restore_default_extensions': time_calls(helpers.restore_default_extensions, [(profile,) for profile in profiles]),
+    }
+
+    results = {}
+    for name, function_samples in samples.items():
+        per_call_fleet = name in ('get_profiles_list', 'get_profiles_extensions_info')
+        results[name] = {
+            **summarize(function_samples),
+            # для функций по всему парку - время одного вызова, для пропрофильных - сумма по парку
+            'total_ms': round((function_samples[0] if per_call_fleet and function_samples else sum(function_samples)) * 1000, 3),
+        }
+
+    return results
+
+
+def compute_growth(runs: list[dict]) -> dict:
+    """
+    Рост времени на один профиль между самым маленьким и самым большим парком
+    с одинаковым числом расширений
+
+    Returns:
+        dict: {расширений: {функция: growth}}
+    """
+    growth = {}
+    for extensions_count in sorted({run['extensions'] for run in runs}):
+        same_extensions = sorted((run for run in runs if run['extensions'] == extensions_count),
+                                 key=lambda run: run['profiles'])
+        smallest, largest = same_extensions[0], same_extensions[-1]
+        if smallest['profiles'] == largest['profiles']:
+            continue
+
+        growth[str(extensions_count)] = {}
+        for name, largest_result in largest['results'].items():
+            smallest_per_profile = smallest['results'][name]['total_ms'] / smallest['profiles']
+            largest_per_profile = largest_result['total_ms'] / largest['profiles']
+            if smallest_per_profile > 0:
+                growth[str(extensions_count)][name] = round(largest_per_profile / smallest_per_profile, 2)
+
+    return growth
+
+
+def log_results(runs: list[dict], growth: dict) -> None:
+    for run in runs:
+        logger.info(f'📂 профилей {run["profiles"]}, расширений {run["extensions"]} '
+                    f'(подготовка парка {run["setup_sec"]} с)')
+        for name, value in run['results'].items():
+            logger.info(f'   ⏱️ {name}: всего {value["total_ms"]:.1f} мс, '
+                        f'p50 {value["p50_ms"]:.2f} мс, p95 {value["p95_ms"]:.2f} мс, n={value["count"]}')
+
+    for extensions_count, functions in growth.items():
+        for name, value in functions.items():
+            mark = '⚠️' if value >= 2 else '📈'
+            logger.info(f'{mark} {name} (расширений {extensions_count}): рост времени на профиль x{value}')
+
+
+def parse_sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(',') if size.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк файловых функций helpers на синтетическом парке профилей')
+    parser.add_argument('--profiles', default='10,40,160', help='размеры парка (число профилей) через запятую')
+    parser.add_argument('--extensions', default='5,20', help='число расширений в профиле через запятую')
+    parser.add_argument('--preferences-kb', type=int, default=100, help='размер файла Preferences')
+    parser.add_argument('--extension-files', type=int, default=4, help='файлов скриптов в расширении')
+    parser.add_argument('--extension-file-kb', type=int, default=16, help='размер файла скрипта расширения')
+    parser.add_argument('--repeat', type=int, default=5, help='повторов для функций, работающих со всем парком')
+    parser.add_argument('--output', default=None, help='путь к JSON с результатами')
+    args = parser.parse_args()
+
+    runs = []
+    logger.disable('src')  # функции пишут в лог по несколько строк на каждый профиль
+    try:
+        for extensions_count in parse_sizes(args.extensions):
+            for profiles_count in parse_sizes(args.profiles):
+                started = time.perf_counter()
+                fleet = SyntheticFleet(profiles_count, extensions_count, args.preferences_kb,
+                                       args.extension_files, args.extension_file_kb)
+                setup_sec = round(time.perf_counter() - started, 2)
+
+                with fleet:
+                    runs.append({
+                        'profiles': profiles_count,
+                        'extensions': extensions_count,
+                        'setup_sec': setup_sec,
+                        'results': bench_fleet(fleet, args.repeat),
+                    })
+    finally:
+        logger.enable('src')
+
+    growth = compute_growth(runs)
+    log_results(runs, growth)
+
+    if args.output:
+        write_results(args.output, 'fs_helpers', {'runs': runs, 'growth': growth}, vars(args))
+        logger.info(f'💾 Результаты записаны в {args.output}')
+
+
+if __name__ == '__main__':
+    main()
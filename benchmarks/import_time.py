@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Проверка времени холодного старта CLI (main.py) и GUI (main_gui.py).
+
+Каждая точка входа импортируется в отдельном процессе с `-X importtime`.
+Проверка падает, если суммарное время импорта превышает бюджет или если на
+старте загрузился один из тяжелых модулей, которые должны импортироваться
+только по требованию.
+
+Запуск из корня проекта:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --cli-budget-ms 300 --gui-budget-ms 800
+"""
+
+import argparse
+import subprocess
+import sys
+
+from loguru import logger
+
+from src.utils.constants import PROJECT_PATH
+
+
+# Бюджет холодного старта в миллисекундах
+IMPORT_TIME_BUDGET_MS = {
+    'main': 500,
+    'main_gui': 1000,
+}
+
+# Модули, которые не должны загружаться при старте приложения
+DEFERRED_MODULES = ['selenium', 'playwright', 'requests', 'rich']
+
+
+def measure_import_time(module_name: str) -> tuple[float, set[str]]:
+    """
+    Импортирует модуль в отдельном интерпретаторе с `-X importtime`
+
+    Args:
+        module_name: Имя модуля точки входа
+
+    Returns:
+        tuple[float, set[str]]: Суммарное время импорта в миллисекундах и множество загруженных модулей
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        cwd=PROJECT_PATH,
+        capture_output=True,
+        text=True
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f'не удалось импортировать {module_name}: {result.stderr.strip().splitlines()[-1]}')
+
+    total_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        self_us, _, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # строка заголовка
+
+        total_us += int(self_us)
+        imported.add(name.strip())
+
+    return total_us / 1000, imported
+
+
+def check_import_time(budgets: dict[str, float]) -> bool:
+    """
+    Сравнивает время старта точек входа с бюджетом
+
+    Args:
+        budgets: Бюджет в миллисекундах для каждого модуля точки входа
+
+    Returns:
+        bool: True если все точки входа уложились в бюджет и не загрузили отложенные модули
+    """
+    passed = True
+
+    for module_name, budget_ms in budgets.items():
+        elapsed_ms, imported = measure_import_time(module_name)
+
+        leaked_roots = sorted({
+            name.split('.')[0] for name in imported
+            if name.split('.')[0] in DEFERRED_MODULES
+        })
+
+        if leaked_roots:
+            logger.error(f'⛔  {module_name} - при старте загружены отложенные модули: {", ".join(leaked_roots)}')
+            passed = False
+
+        if elapsed_ms > budget_ms:
+            logger.error(f'⛔  {module_name} - импорт {elapsed_ms:.0f} мс, бюджет {budget_ms:.0f} мс')
+            passed = False
+        else:
+            logger.info(f'✅  {module_name} - импорт {elapsed_ms:.0f} мс, бюджет {budget_ms:.0f} мс')
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Проверка времени холодного старта CLI и GUI')
+    parser.add_argument('--cli-budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS['main'])
+    parser.add_argument('--gui-budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS['main_gui'])
+    args = parser.parse_args()
+
+    budgets = {
+        'main': args.cli_budget_ms,
+        'main_gui': args.gui_budget_ms,
+    }
+
+    sys.exit(0 if check_import_time(budgets) else 1)
+
+
+if __name__ == '__main__':
+    main()
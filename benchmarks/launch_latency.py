@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Бенчмарк запуска, подключения и закрытия профилей на заглушке Chrome.
+
+Вместо CHROME_PATH подставляется benchmarks/fake_chrome.py, данные профилей
+создаются во временной папке, поэтому бенчмарк работает без браузера и сети
+и не трогает настоящие профили и процессы Chrome.
+
+Замеряется:
+    chrome_launch       - Chrome.launch_profile до ответа /json/version (launch-to-ready)
+    cdp_attach          - подключение к WebSocket браузера и Browser.getVersion
+    chrome_teardown     - terminate + wait процесса
+    playwright_launch   - PlaywrightChrome.launch_profile до готовности порта отладки
+                          (вместе с kill_chrome_processes и ожиданием порта, на Windows - без него)
+    kill_chrome_processes - на Windows не замеряется: там он завершает все процессы chrome.exe
+    throughput          - полных циклов запуск/подключение/закрытие в секунду при разном числе потоков
+    memory              - RSS заглушек и пиковая память процесса бенчмарка
+
+Подключение Selenium (__establish_debug_port_connection) не замеряется:
+для него нужны chromedriver и настоящий Chrome.
+
+Запуск из корня проекта:
+    python -m benchmarks.launch_latency
+    python -m benchmarks.launch_latency --iterations 50 --workers 1,4,16 --output bench_results/launch.json
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+from benchmarks.fake_chrome import create_fake_chrome_executable, cdp_call
+from benchmarks.stats import summarize, write_results
+
+
+def wait_devtools_ready(port: int, timeout: float = 10) -> str:
+    """
+    Ждет ответа /json/version
+
+    Returns:
+        str: webSocketDebuggerUrl браузера
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/json/version', timeout=0.5) as response:
+                return json.load(response)['webSocketDebuggerUrl']
+        except OSError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f'порт отладки {port} не ответил за {timeout} с')
+            time.sleep(0.01)
+
+
+def find_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class FakeChromeEnvironment:
+    """
+    Временная папка с профилями и заглушкой Chrome, подставленной в модули проекта
+    """
+
+    def __init__(self, profiles_count: int, startup_delay_ms: float = 0):
+        self.temp_dir = tempfile.TemporaryDirectory(prefix='chrome-bench-')
+        self.root = self.temp_dir.name
+        self.data_path = os.path.join(self.root, 'profiles')
+        self.welcome_pages_path = os.path.join(self.root, 'welcome_pages')
+        self.fake_chrome_path = create_fake_chrome_executable(self.root)
+        self.profile_names = [f'bench-{i}' for i in range(profiles_count)]
+
+        for name in self.profile_names:
+            os.makedirs(os.path.join(self.data_path, f'Profile {name}', 'Extensions'))
+
+        os.environ['FAKE_CHROME_STARTUP_DELAY_MS'] = str(startup_delay_ms)
+        self._patched = []
+
+    def __enter__(self) -> 'FakeChromeEnvironment':
+        import src.chrome.chrome as chrome_module
+        import src.chrome.playwright_chrome as playwright_chrome_module
+        import src.utils.helpers as helpers_module
+
+        self._patch(chrome_module, 'CHROME_PATH', self.fake_chrome_path)
+        self._patch(chrome_module, 'CHROME_DATA_PATH', self.data_path)
+        self._patch(chrome_module, 'PROFILE_WELCOME_PAGES_OUTPUT_PATH', self.welcome_pages_path)
+        self._patch(playwright_chrome_module, 'CHROME_PATH', self.fake_chrome_path)
+        self._patch(playwright_chrome_module, 'CHROME_DATA_PATH', self.data_path)
+        # kill_chrome_processes ищет процессы по пути данных, подменяем, чтобы не задеть настоящий Chrome
+        self._patch(helpers_module, 'CHROME_DATA_PATH', self.data_path)
+        if sys.platform == 'win32':
+            # на Windows kill_chrome_processes не фильтрует по пути данных (taskkill /IM chrome.exe)
+            self._patch(playwright_chrome_module, 'kill_chrome_processes', lambda: None)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        for module, name, value in reversed(self._patched):
+            setattr(module, name, value)
+        self.temp_dir.cleanup()
+
+    def _patch(self, module, name: str, value) -> None:
+        self._patched.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+
+def run_chrome_cycle(chrome, profile_name: str, launch_lock: threading.Lock, lean: bool) -> dict:
+    """
+    Полный цикл профиля через Chrome: запуск, ожидание DevTools, подключение, закрытие
+
+    Returns:
+        dict: Длительности фаз launch, attach, teardown в секундах
+    """
+    started = time.perf_counter()
+    with launch_lock:  # __find_free_port не потокобезопасен
+        process = chrome.launch_profile(profile_name, debug=True, headless=True, lean=lean)
+        port = chrome.debug_ports[profile_name]
+    if not process:
+        raise RuntimeError(f'{profile_name} - заглушка не запустилась')
+
+    try:
+        ws_url = wait_devtools_ready(port)
+        ready = time.perf_counter()
+
+        cdp_call(ws_url, 'Browser.getVersion')
+        attached = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+        with launch_lock:
+            chrome.chosen_debug_ports.remove(port)
+
+    return {
+        'launch': ready - started,
+        'attach': attached - ready,
+        'teardown': time.perf_counter() - attached,
+    }
+
+
+def bench_chrome(environment: FakeChromeEnvironment, iterations: int, workers_list: list[int], lean: bool) -> dict:
+    from src.chrome.chrome import Chrome
+
+    results = {}
+    launch_lock = threading.Lock()
+
+    # задержки по фазам при последовательном запуске
+    chrome = Chrome()
+    phases = {'launch': [], 'attach': [], 'teardown': []}
+    for i in range(iterations):
+        cycle = run_chrome_cycle(chrome, environment.profile_names[i % len(environment.profile_names)], launch_lock, lean)
+        for phase, duration in cycle.items():
+            phases[phase].append(duration)
+
+    results['chrome_launch'] = summarize(phases['launch'])
+    results['cdp_attach'] = summarize(phases['attach'])
+    results['chrome_teardown'] = summarize(phases['teardown'])
+
+    # пропускная способность при разном числе потоков
+    results['throughput'] = {}
+    for workers in workers_list:
+        chrome = Chrome()
+        cycles_total = max(iterations, workers * 2)
+        launches = []
+
+        def run(i):
+            # в пределах пачки индексы разные, поэтому один профиль не запускается в двух потоках сразу
+            cycle = run_chrome_cycle(chrome, environment.profile_names[i % workers], launch_lock, lean)
+            launches.append(cycle['launch'])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for batch_start in range(0, cycles_total, workers):
+                list(executor.map(run, range(batch_start, min(batch_start + workers, cycles_total))))
+        elapsed = time.perf_counter() - started
+
+        results['throughput'][str(workers)] = {
+            'cycles': cycles_total,
+            'cycles_per_sec': round(cycles_total / elapsed, 2),
+            'launch': summarize(launches),
+        }
+
+    return results
+
+
+def bench_memory(environment: FakeChromeEnvironment, processes_count: int) -> dict:
+    from src.chrome.chrome import Chrome
+    from src.utils.resource_scheduler import get_chrome_rss_bytes, is_proc_available
+
+    if not is_proc_available():
+        return {'skipped': '/proc недоступен'}
+
+    chrome = Chrome()
+    processes = []
+    try:
+        for name in environment.profile_names[:processes_count]:
+            process = chrome.launch_profile(name, debug=True, headless=True)
+            wait_devtools_ready(chrome.debug_ports[name])
+            processes.append(process)
+
+        total_rss, count = get_chrome_rss_bytes(data_path=environment.data_path)
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    return {
+        'processes': count,
+        'stub_rss_total_mb': round(total_rss / 2 ** 20, 1),
+        'stub_rss_per_process_mb': round(total_rss / 2 ** 20 / count, 1) if count else 0.0,
+    }
+
+
+def bench_playwright_launch(environment: FakeChromeEnvironment, iterations: int, lean: bool) -> dict:
+    from src.chrome.playwright_chrome import PlaywrightChrome
+    from src.utils.retry_policy import RetryPolicy
+
+    launches = []
+    attaches = []
+    for i in range(iterations):
+        pw = PlaywrightChrome()
+        # заглушка не реализует CDP в объеме Playwright, подключение заменяем прямым вызовом CDP
+        pw._PlaywrightChrome__attach_over_cdp = lambda profile_name, debug_url, close_tabs, lean=False: bool(
+            cdp_call(wait_devtools_ready(int(debug_url.rsplit(':', 1)[1])), 'Browser.getVersion')
+        )
+
+        try:
+            launched = pw.launch_profile(
+                environment.profile_names[i % len(environment.profile_names)],
+                headless=True,
+                debug_port=find_free_port(),
+                retry_policy=RetryPolicy(limits={'launch': 0, 'attach': 0}),
+                lean=lean
+            )
+            if not launched:
+                raise RuntimeError('PlaywrightChrome.launch_profile вернул False')
+
+            launches.append(pw.launch_timings['launch'])
+            attaches.append(pw.launch_timings['attach'])
+        finally:
+            pw.close()
+
+    return {
+        'playwright_launch': summarize(launches),
+        'playwright_attach': summarize(attaches),
+    }
+
+
+def bench_kill_chrome_processes(iterations: int) -> dict:
+    from src.utils.helpers import kill_chrome_processes
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        kill_chrome_processes()
+        samples.append(time.perf_counter() - started)
+
+    return {'kill_chrome_processes': summarize(samples)}
+
+
+def get_peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10, 1)  # macOS - байты, Linux - КБ
+
+
+def log_results(results: dict) -> None:
+    for name, value in results.items():
+        if isinstance(value, dict) and 'p50_ms' in value:
+            logger.info(f'⏱️ {name}: p50 {value["p50_ms"]:.1f} мс, p95 {value["p95_ms"]:.1f} мс, n={value["count"]}')
+        elif name == 'throughput':
+            for workers, data in value.items():
+                logger.info(f'🚀 потоков {workers}: {data["cycles_per_sec"]} циклов/с, '
+                            f'запуск p50 {data["launch"]["p50_ms"]:.1f} мс, p95 {data["launch"]["p95_ms"]:.1f} мс')
+        else:
+            logger.info(f'📦 {name}: {value}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк запуска, подключения и закрытия профилей на заглушке Chrome')
+    parser.add_argument('--iterations', type=int, default=20, help='циклов на каждый замер')
+    parser.add_argument('--workers', default='1,2,4,8', help='число потоков для замера пропускной способности')
+    parser.add_argument('--playwright-iterations', type=int, default=5)
+    parser.add_argument('--kill-iterations', type=int, default=3)
+    parser.add_argument('--startup-delay-ms', type=float, default=0, help='искусственная задержка старта заглушки')
+    parser.add_argument('--lean', action='store_true', help='запускать профили в облегченном режиме (lean run)')
+    parser.add_argument('--output', default=None, help='путь к JSON с результатами')
+    args = parser.parse_args()
+
+    workers_list = [int(workers) for workers in args.workers.split(',') if workers.strip()]
+    profiles_count = max(workers_list + [args.iterations, 1])
+
+    logger.disable('src')  # логи запуска профилей на каждом цикле не нужны
+    results = {}
+    with FakeChromeEnvironment(profiles_count, args.startup_delay_ms) as environment:
+        results.update(bench_chrome(environment, args.iterations, workers_list, args.lean))
+        results['memory'] = bench_memory(environment, max(workers_list))
+        results.update(bench_playwright_launch(environment, args.playwright_iterations, args.lean))
+        if sys.platform == 'win32':
+            results['kill_chrome_processes'] = 'не замеряется на Windows: завершает все процессы chrome.exe'
+        else:
+            results.update(bench_kill_chrome_processes(args.kill_iterations))
+    logger.enable('src')
+
+    results['memory']['harness_peak_rss_mb'] = get_peak_rss_mb()
+    results['selenium_attach'] = 'не замеряется: нужны chromedriver и настоящий Chrome'
+
+    log_results(results)
+
+    if args.output:
+        write_results(args.output, 'launch_latency', results, vars(args))
+        logger.info(f'💾 Результаты записаны в {args.output}')
+
+
+if __name__ == '__main__':
+    main()
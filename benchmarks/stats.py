@@ -0,0 +1,85 @@
+"""
+Общие функции бенчмарков: сводная статистика замеров и запись результатов в JSON
+для сравнения между коммитами.
+"""
+
+import json
+import time
+import platform
+import subprocess
+from pathlib import Path
+
+from src.utils.constants import PROJECT_PATH
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    """
+    Перцентиль с линейной интерполяцией
+
+    Args:
+        samples: Замеры
+        percent: Перцентиль от 0 до 100
+    """
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples_sec: list[float]) -> dict:
+    """
+    Сводка замеров в миллисекундах
+
+    Args:
+        samples_sec: Замеры в секундах
+
+    Returns:
+        dict: count, p50_ms, p95_ms, mean_ms, max_ms
+    """
+    samples_ms = [sample * 1000 for sample in samples_sec]
+    return {
+        'count': len(samples_ms),
+        'p50_ms': round(percentile(samples_ms, 50), 3),
+        'p95_ms': round(percentile(samples_ms, 95), 3),
+        'mean_ms': round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+        'max_ms': round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def get_git_commit() -> str | None:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_PATH,
+                                capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def write_results(path: str | Path, benchmark: str, results: dict, parameters: dict | None = None) -> None:
+    """
+    Записывает результаты бенчмарка в JSON с метаданными (коммит, время, платформа)
+
+    Args:
+        path: Путь к файлу результатов
+        benchmark: Название бенчмарка
+        results: Результаты замеров
+        parameters: Параметры запуска бенчмарка
+    """
+    payload = {
+        'benchmark': benchmark,
+        'commit': get_git_commit(),
+        'timestamp': time.time(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'parameters': parameters or {},
+        'results': results,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding='utf-8')
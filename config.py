@@ -2,7 +2,47 @@ import os
 
 general_config = {
     'show_debug_logs': False,                   # Показывать DEBUG логи в консоли (True / False)
-    'max_workers': 10,                          # Максимальное количество потоков для многопоточных процессов (1+)
+    'max_workers': 10,                          # Максимальное количество потоков для многопоточных процессов (1+), для прогонов профилей - верхняя граница параллельности
     'chrome_data_path': os.path.expanduser('~/Library/Application Support/Google/Chrome/Profile *'),  # Путь к профилям Chrome
-    'install_default_extensions_on_launch': True  # Устанавливать расширения из папки по умолчанию при запуске профилей (True / False)
+    'install_default_extensions_on_launch': True,  # Устанавливать расширения из папки по умолчанию при запуске профилей (True / False)
+    'human_delay_sec': (0, 0),                  # Случайная пауза перед действиями в скриптах (мин, макс) в секундах, (0, 0) - без пауз
+    'record_run_results': True,                 # Записывать результаты и тайминги прогонов в data/run_results.sqlite3 (True / False)
+    'retry_limits': {                           # Максимум повторов упавшей фазы по классам ошибок (0 - без повторов)
+        'launch': 2,                            # браузер не запустился
+        'attach': 2,                            # не удалось подключиться к DevTools
+        'timeout': 0,                           # таймаут внутри скрипта (повторяются только скрипты с 'idempotent': True)
+        'crash': 0,                             # браузер упал во время скрипта
+        'script': 0,                            # прочие ошибки скрипта
+    },
+    'retry_backoff_sec': (1, 30),               # Задержка перед повтором (начальная, максимальная) в секундах, удваивается с каждым повтором
+    'retry_batch_budget': 50,                   # Максимум повторов на весь прогон (None - без ограничения)
+    'admission_min_free_memory_mb': 1024,       # Запуск нескольких профилей: свободная память, которая должна остаться после запуска еще одного профиля (МБ)
+    'admission_max_cpu_percent': 85,            # Запуск нескольких профилей: загрузка CPU, выше которой новые профили не запускаются (%)
+    'admission_profile_memory_mb': 600,         # Запуск нескольких профилей: начальная оценка памяти на профиль, уточняется по RSS Chrome (МБ)
+    'admission_poll_sec': (0.5, 10),            # Запуск нескольких профилей: интервал проверки ресурсов под нагрузкой (начальный, максимальный) в секундах
+    'admission_startup_grace_sec': 15,          # Запуск нескольких профилей: сколько секунд резервировать память под только что запущенный профиль
+    'lean_run': False,                          # Облегченный запуск при прогоне скриптов: без восстановления сессии, фоновых запросов и стартовой страницы, без картинок/шрифтов/медиа сайтов (True / False)
+    'progress_stream': False,                   # Транслировать события хода прогонов в локальный сокет data/progress.sock для внешних инструментов (True / False)
+    'progress_stream_port': None,               # Порт TCP на 127.0.0.1 для событий прогонов вместо Unix-сокета (None - Unix-сокет, на Windows - свободный порт)
+    'progress_stall_sec': 300,                  # Через сколько секунд без событий профиль считается зависшим в сводке прогона
+    'instrumentation': True,                    # Замерять горячие пути (запуск, подключение, скрипты, расширения) в гистограммы в памяти (True / False)
+    'profiling_mode': None,                     # Профилирование прогона каждого профиля в data/profiling: None - выключено, 'cprofile' - файл .prof, 'sampling' - выборка стека, файл .folded
+    'profiling_sample_interval_ms': 5,          # Интервал выборки стека в режиме 'sampling' в миллисекундах
+    'log_file_level': 'DEBUG',                  # Уровень логов в файле data/debug_log.log (DEBUG / INFO / WARNING), INFO снимает затраты на debug-логи
+    'log_levels': {},                           # Уровни логов отдельных модулей, например {'src.utils.helpers': 'INFO', 'src.chrome': 'DEBUG'}
+    'log_enqueue': True,                        # Писать файл логов в фоновом потоке, чтобы параллельные прогоны не ждали запись (True / False)
+    'log_rotation': '10 MB',                    # Ротация файла логов: по размеру ('10 MB') или времени ('1 day')
+    'log_retention': 5,                         # Сколько старых файлов логов хранить
+    'log_compression': 'zip',                   # Сжатие старых файлов логов (zip / gz / None)
+    'distributed_token': None,                  # Распределенный прогон: общий токен координатора и воркеров (None - случайный токен на каждый запуск координатора)
+    'distributed_port': 8765,                   # Распределенный прогон: порт координатора
+    'distributed_lease_sec': 600,               # Распределенный прогон: на сколько секунд воркер берет задание, аренда продлевается, пока воркер жив
+    'distributed_max_attempts': 3,              # Распределенный прогон: сколько раз задание выдается воркерам, прежде чем считается проваленным
+    'snapshot_before_runs': True,               # Снимок профиля перед каждым прогоном скриптов для отката (True / False), хранятся только измененные файлы
+    'snapshot_retention': 10,                   # Сколько последних снимков хранить на профиль, старые удаляются
+    'health_check_before_runs': True,           # Проверять профили перед прогоном скриптов [chrome] / [playwright] и исключать профили с ошибками (True / False)
+    'health_check_repair': False,               # Исправлять перед прогоном найденные проблемы: лишние pinned_extensions, блокировки, Preferences (True / False), папки расширений удаляются только из меню проверки
+    'launch_ramp_per_sec': 4,                   # Сколько профилей запускать в секунду при ручном запуске нескольких профилей, скорость снижается, если машина не успевает
+    'launch_max_in_flight': 8,                  # Сколько профилей может одновременно находиться в процессе запуска
+    'launch_ready_timeout_sec': 30,             # Сколько секунд ждать готовности запущенного профиля
 }
@@ -1,30 +1,29 @@
-from sys import stderr
-
 import questionary
 
 from loguru import logger
 
 import src.client.menu as menu
 from src.utils.helpers import kill_chrome_processes
+from src.utils.logging_setup import setup_logger
 from config import general_config
 
-def setup_logger():
-    logger.remove()
-    logger_level = "DEBUG" if general_config['show_debug_logs'] else "INFO"
-    log_format = "<white>{time:HH:mm:ss}</white> | <level>{level: <8}</level> | <white>{message}</white>"
-    logger.add(stderr, level=logger_level, format=log_format)
-    logger.add("data/debug_log.log", level="DEBUG", format=log_format)
-
 def main():
+    # Значения - имена пунктов меню: модуль пункта импортируется только при его выборе
     main_activities_list = {
-        '🚀 запуск профилей': menu.launch_multiple_profiles,
-        '📖 просмотр профилей': menu.show_all_profiles,
-        '📝 задать комментарии': menu.update_comments,
-        '🤖 прогон скриптов [chrome]': menu.run_chrome_scripts_on_multiple_profiles,
-        '🤖 прогон скриптов [manager]': menu.run_manager_scripts_on_multiple_profiles,
-        '🤖 прогон скриптов [playwright]': menu.run_playwright_scripts_on_multiple_profiles,
-        '🧩 работа с расширениями': menu.manage_extensions,
-        '➕ создание профилей': menu.create_multiple_profiles,
+        '🚀 запуск профилей': 'launch_multiple_profiles',
+        '📖 просмотр профилей': 'show_all_profiles',
+        '📝 задать комментарии': 'update_comments',
+        '📇 выгрузка профилей в CSV / JSONL': 'export_profiles_inventory',
+        '🤖 прогон скриптов [chrome]': 'run_chrome_scripts_on_multiple_profiles',
+        '🤖 прогон скриптов [manager]': 'run_manager_scripts_on_multiple_profiles',
+        '🤖 прогон скриптов [playwright]': 'run_playwright_scripts_on_multiple_profiles',
+        '🧩 работа с расширениями': 'manage_extensions',
+        '⚙️ изменить настройки Preferences': 'patch_preferences',
+        '🩺 проверка профилей': 'check_profiles_health',
+        '🧹 размер и очистка профилей': 'profiles_disk_usage',
+        '📦 экспорт и импорт профилей': 'profiles_archive',
+        '⏪ снимки и откат профилей': 'profile_snapshots',
+        '➕ создание профилей': 'create_multiple_profiles',
         '💀 убить процессы Chrome': kill_chrome_processes,
         '🚪 выход': None
     }
@@ -41,9 +40,16 @@ def main():
             exit(0)
 
         else:
-            main_activities_list[main_activity]()
+            activity = main_activities_list[main_activity]
+            if isinstance(activity, str):
+                activity = getattr(menu, activity)
+
+            activity()
             continue
 
 if __name__ == "__main__":
     setup_logger()
+    if general_config.get('progress_stream', False):
+        from src.utils.progress_events import start_progress_stream
+        start_progress_stream()
     main()
@@ -13,17 +13,14 @@ from src.utils.helpers import (
     safe_remove_extensions, safe_install_extension
 )
 from src.utils.constants import PROJECT_PATH, CHROME_DATA_PATH, DEFAULT_EXTENSIONS_PATH, CHROME_DRIVER_PATH
-from src.client.menu import manage_extensions, run_chrome_scripts_on_multiple_profiles, run_manager_scripts_on_multiple_profiles, update_comments, create_multiple_profiles
+import src.client.menu as menu
+from src.utils.logging_setup import setup_logger
 from loguru import logger
 from config import general_config
 import os
 from concurrent.futures import ThreadPoolExecutor
 import time
 import shutil
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
 from PySide6.QtCore import QUrl
 import json
 import threading
@@ -32,12 +29,10 @@ import importlib.util
 import random
 import subprocess
 import re
-import csv
 from datetime import datetime
 import uuid
 from PySide6.QtCore import Q_ARG
 from PySide6.QtCore import QMetaObject
-from playwright.sync_api import Page
 
 class ProfileManager(QObject):
     profilesListChanged = Signal()
@@ -51,6 +46,8 @@ class ProfileManager(QObject):
     # Сигналы для работы с менеджер-скриптами
     managerScriptsListChanged = Signal()
     managerScriptOperationStatusChanged = Signal(bool, str)
+    managerScriptProgressChanged = Signal(int, int, int)  # Сигнал хода прогона менеджер-скриптов (выполнено, всего, с ошибками)
+    profileLaunchProgressChanged = Signal(int, int, int)  # Сигнал хода запуска профилей (запущено, всего, не запустилось)
     # Сигналы для работы с playwright-скриптами
     playwrightScriptsListChanged = Signal()
     playwrightScriptOperationStatusChanged = Signal(bool, str)
@@ -73,6 +70,8 @@ class ProfileManager(QObject):
         self._profile_lists = []  # Список доступных списков профилей
         self._current_list_id = ""  # Текущий выбранный список профилей
         self._scripts_running = False  # Флаг, указывающий выполняются ли скрипты в данный момент
+        self._profiles_launching = False  # Флаг, указывающий идет ли запуск профилей (потоки запуска делят self.chrome)
+        self._launch_lock = threading.Lock()
         self.update_profiles_list()
         self.updateProfileLists()  # Загружаем списки профилей
         self.engine = None  # Будет установлено позже
@@ -109,8 +108,8 @@ class ProfileManager(QObject):
             # Сортируем профили
             self._profiles_list = sorted(profiles, key=self._sort_profile_name)
             
-            logger.debug(f"Загружено профилей: {len(self._profiles_list)}")
-            logger.debug(f"Список профилей: {self._profiles_list}")
+            logger.debug("Загружено профилей: {}", len(self._profiles_list))
+            logger.debug("Список профилей: {}", self._profiles_list)
             self.profilesListChanged.emit()
             
             # Очищаем выбранные профили при обновлении списка
@@ -173,19 +172,19 @@ class ProfileManager(QObject):
             is_selected: True, если профиль выбран, иначе False
         """
         try:
-            logger.debug(f"toggleProfileSelection вызван для {profile_name}, is_selected={is_selected}")
-            logger.debug(f"Текущие выбранные профили: {self._selected_profiles}")
+            logger.debug("toggleProfileSelection вызван для {}, is_selected={}", profile_name, is_selected)
+            logger.debug("Текущие выбранные профили: {}", self._selected_profiles)
             
             if is_selected and profile_name not in self._selected_profiles:
                 self._selected_profiles.add(profile_name)
                 self.selectedProfilesChanged.emit()
-                logger.debug(f"Profile {profile_name} selected")
-                logger.debug(f"Обновленные выбранные профили: {self._selected_profiles}")
+                logger.debug("Profile {} selected", profile_name)
+                logger.debug("Обновленные выбранные профили: {}", self._selected_profiles)
             elif not is_selected and profile_name in self._selected_profiles:
                 self._selected_profiles.remove(profile_name)
                 self.selectedProfilesChanged.emit()
-                logger.debug(f"Profile {profile_name} deselected")
-                logger.debug(f"Обновленные выбранные профили: {self._selected_profiles}")
+                logger.debug("Profile {} deselected", profile_name)
+                logger.debug("Обновленные выбранные профили: {}", self._selected_profiles)
         except Exception as e:
             logger.error(f"Error toggling profile selection: {e}")
 
@@ -207,7 +206,7 @@ class ProfileManager(QObject):
             
             self._filtered_profiles = filtered_profiles
             self.filteredProfilesListChanged.emit()
-            logger.debug(f"Found {len(filtered_profiles)} profiles matching '{search_text}'")
+            logger.debug("Found {} profiles matching '{}'", len(filtered_profiles), search_text)
         except Exception as e:
             logger.error(f"Error searching profiles by comment: {e}")
             
@@ -217,7 +216,7 @@ class ProfileManager(QObject):
             # Просто выбираем все профили, но не запускаем их
             self._selected_profiles = set(self._profiles_list)
             self.selectedProfilesChanged.emit()
-            logger.debug(f"Selected all profiles: {self._selected_profiles}")
+            logger.debug("Selected all profiles: {}", self._selected_profiles)
         except Exception as e:
             logger.error(f"Error selecting all profiles: {e}")
         
@@ -238,12 +237,12 @@ class ProfileManager(QObject):
         Args:
             profiles: Список профилей для выбора
         """
-        logger.debug(f"setSelectedProfiles вызван с параметрами: profiles={profiles}")
+        logger.debug("setSelectedProfiles вызван с параметрами: profiles={}", profiles)
         self._selected_profiles.clear()
         for profile in profiles:
             self._selected_profiles.add(profile)
         self.selectedProfilesChanged.emit()
-        logger.debug(f"Установлены выбранные профили: {self._selected_profiles}")
+        logger.debug("Установлены выбранные профили: {}", self._selected_profiles)
         
     @Slot()
     def launchSelectedProfiles(self):
@@ -256,20 +255,9 @@ class ProfileManager(QObject):
         # Создаем копию выбранных профилей, чтобы избежать изменения во время итерации
         profiles_to_launch = list(self._selected_profiles)
         
-        # Запускаем профили по одному
-        for profile in profiles_to_launch:
-            try:
-                # Если профиль содержит префикс "Profile ", удаляем его перед запуском
-                if isinstance(profile, str) and profile.startswith("Profile "):
-                    profile_name = profile.replace("Profile ", "")
-                else:
-                    profile_name = profile
-                
-                # Запускаем профиль
-                self.chrome.launch_profile(profile_name)
-                logger.info(f"✅  {profile} - профиль запущен")
-            except Exception as e:
-                logger.error(f"❌  {profile} - ошибка запуска: {e}")
+        # Запускаем профили с плавным разгоном в отдельном потоке, чтобы не блокировать интерфейс
+        if not self._launch_profiles_in_background(profiles_to_launch):
+            return
         
         # Очищаем выбранные профили после запуска
         self._selected_profiles.clear()
@@ -284,27 +272,61 @@ class ProfileManager(QObject):
         logger.info(f"Launching profiles by names: {profile_names}")
         all_profiles = set(self._profiles_list)
         
+        profiles_to_launch = []
         for name in profile_names:
-            try:
-                if name in all_profiles:
-                    # Если профиль содержит префикс "Profile ", удаляем его перед запуском
-                    if isinstance(name, str) and name.startswith("Profile "):
-                        profile_name = name.replace("Profile ", "")
-                    else:
-                        profile_name = name
-                    
-                    # Используем те же параметры, что и в терминальном интерфейсе
-                    self.chrome.launch_profile(
-                        str(profile_name),
-                        debug=False,
-                        headless=False,
-                        maximized=False
-                    )
-                    logger.info(f"✅  {name} - профиль запущен")
-                else:
-                    logger.warning(f"⚠️  {name} - профиль не найден")
-            except Exception as e:
-                logger.error(f"❌  {name} - ошибка запуска: {e}")
+            if name in all_profiles:
+                profiles_to_launch.append(name)
+            else:
+                logger.warning(f"⚠️  {name} - профиль не найден")
+        
+        if profiles_to_launch:
+            self._launch_profiles_in_background(profiles_to_launch)
+    
+    def _launch_profiles_in_background(self, profiles):
+        """Запускает профили для ручной работы с плавным разгоном в отдельном потоке.
+        Пока идет предыдущий запуск, новый не начинается
+        
+        Args:
+            profiles (list): Список профилей для запуска
+            
+        Returns:
+            bool: True, если запуск начат
+        """
+        with self._launch_lock:
+            if self._profiles_launching:
+                logger.warning("⚠️ Профили еще запускаются, дождитесь окончания запуска")
+                return False
+            self._profiles_launching = True
+
+        thread = threading.Thread(target=self._launch_profiles_thread, args=(profiles,))
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def _launch_profiles_thread(self, profiles):
+        """Запускает профили и сообщает ход запуска после каждого профиля
+        
+        Args:
+            profiles (list): Список профилей для запуска
+        """
+        from src.chrome.profile_launcher import launch_profiles
+
+        failed = 0
+
+        def on_profile_ready(report, done, total):
+            nonlocal failed
+            if report['status'] in ('failed', 'timeout'):
+                failed += 1
+            self.profileLaunchProgressChanged.emit(done, total, failed)
+
+        try:
+            self.profileLaunchProgressChanged.emit(0, len(profiles), 0)
+            launch_profiles(profiles, chrome=self.chrome, on_profile_ready=on_profile_ready)
+        except Exception as e:
+            logger.error(f"⛔  Ошибка при запуске профилей: {e}")
+        finally:
+            with self._launch_lock:
+                self._profiles_launching = False
     
     @Slot(str)
     def updateProfileComments(self, comment):
@@ -416,7 +438,7 @@ class ProfileManager(QObject):
         
     @Slot()
     def update_comments(self):
-        update_comments()
+        menu.update_comments()
         
     @Slot()
     def run_chrome_scripts(self):
@@ -478,7 +500,7 @@ class ProfileManager(QObject):
     
     @Slot()
     def manage_extensions(self):
-        manage_extensions()
+        menu.manage_extensions()
         
     @Slot(str)
     def createProfilesManually(self, profile_names_text):
@@ -601,7 +623,7 @@ class ProfileManager(QObject):
             
     @Slot()
     def create_profiles(self):
-        create_multiple_profiles()
+        menu.create_multiple_profiles()
         
     @Slot()
     def kill_chrome(self):
@@ -618,7 +640,7 @@ class ProfileManager(QObject):
         Если выполняются скрипты, запрашивает подтверждение у пользователя
         """
         # Добавляем отладочные логи
-        logger.debug(f"quit_application вызван. _scripts_running = {hasattr(self, '_scripts_running') and self._scripts_running}")
+        logger.debug("quit_application вызван. _scripts_running = {}", hasattr(self, '_scripts_running') and self._scripts_running)
         
         # Проверяем, выполняются ли скрипты
         if hasattr(self, '_scripts_running') and self._scripts_running:
@@ -1443,6 +1465,11 @@ class ProfileManager(QObject):
         """
         # Запускаем операцию в отдельном потоке, чтобы не блокировать интерфейс
         def install_task():
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
+            from selenium.webdriver.common.by import By
+
             try:
                 if not self._selected_profiles:
                     self.extensionOperationStatusChanged.emit(False, "Не выбрано ни одного профиля")
@@ -1617,21 +1644,21 @@ class ProfileManager(QObject):
             headless: Запускать ли браузер в фоновом режиме
         """
         try:
-            logger.debug(f"_run_chrome_scripts_thread начал выполнение. _scripts_running = {self._scripts_running}")
-            logger.debug(f"Выбранные профили в run_task: {self._selected_profiles}")
+            logger.debug("_run_chrome_scripts_thread начал выполнение. _scripts_running = {}", self._scripts_running)
+            logger.debug("Выбранные профили в run_task: {}", self._selected_profiles)
             
             if not self._selected_profiles:
                 logger.error(f"Не выбрано ни одного профиля")
                 self.scriptOperationStatusChanged.emit(False, "Не выбрано ни одного профиля")
                 self._scripts_running = False
-                logger.debug(f"_scripts_running установлен в False (нет выбранных профилей)")
+                logger.debug("_scripts_running установлен в False (нет выбранных профилей)")
                 return
             
             if not script_names:
                 logger.error(f"Не выбрано ни одного скрипта")
                 self.scriptOperationStatusChanged.emit(False, "Не выбрано ни одного скрипта")
                 self._scripts_running = False
-                logger.debug(f"_scripts_running установлен в False (нет скриптов для запуска)")
+                logger.debug("_scripts_running установлен в False (нет скриптов для запуска)")
                 return
             
             # Создаем копию выбранных профилей, чтобы избежать ошибки "Set changed size during iteration"
@@ -1692,12 +1719,20 @@ class ProfileManager(QObject):
             if not selected_chrome_script_dirs and not selected_playwright_script_dirs:
                 self.scriptOperationStatusChanged.emit(False, "Не удалось найти выбранные скрипты")
                 self._scripts_running = False
-                logger.debug(f"_scripts_running установлен в False (нет выбранных скриптов)")
+                logger.debug("_scripts_running установлен в False (нет выбранных скриптов)")
                 return
             
             # Запускаем скрипты для каждого профиля
             success_count = 0
             total_operations = len(selected_profiles)
+            from src.utils.run_results import new_batch_id
+            from src.utils.retry_policy import RetryPolicy
+            from src.utils.progress_events import publish_batch_started, publish_batch_finished
+            batch_id = new_batch_id()
+            retry_policy = RetryPolicy.from_config()
+            failed_profiles = []
+            publish_batch_started(batch_id, 'chrome', selected_profiles,
+                                  bool(selected_chrome_script_dirs) + bool(selected_playwright_script_dirs))
             
             for profile in selected_profiles:
                 try:
@@ -1707,21 +1742,29 @@ class ProfileManager(QObject):
                     else:
                         profile_name = profile
                     
+                    profile_success = True
+
                     # Запускаем Chrome скрипты
                     if selected_chrome_script_dirs:
                         logger.info(f"Запускаем Chrome скрипты для профиля {profile_name}")
-                        self.chrome.run_scripts(profile_name, selected_chrome_script_dirs, headless)
+                        profile_success &= self.chrome.run_scripts(profile_name, selected_chrome_script_dirs, headless, batch_id, retry_policy=retry_policy)
                     
                     # Запускаем Playwright скрипты
                     if selected_playwright_script_dirs:
                         logger.info(f"Запускаем Playwright скрипты для профиля {profile_name}")
                         from src.chrome.playwright_chrome import PlaywrightChrome
                         pw = PlaywrightChrome()
-                        pw.run_scripts(profile_name, selected_playwright_script_dirs, headless)
+                        profile_success &= pw.run_scripts(profile_name, selected_playwright_script_dirs, headless, batch_id, retry_policy=retry_policy)
                     
-                    success_count += 1
+                    if profile_success:
+                        success_count += 1
+                    else:
+                        failed_profiles.append(profile)
                 except Exception as e:
                     logger.error(f"Ошибка при запуске скриптов для профиля {profile}: {e}")
+                    failed_profiles.append(profile)
+
+            publish_batch_finished(batch_id, 'chrome', failed_profiles)
             
             # Отправляем сигнал о завершении операции
             if success_count == total_operations:
@@ -1733,19 +1776,23 @@ class ProfileManager(QObject):
             
             # Устанавливаем флаг, что скрипты больше не выполняются
             self._scripts_running = False
-            logger.debug(f"_scripts_running установлен в False (успешное завершение)")
+            logger.debug("_scripts_running установлен в False (успешное завершение)")
             
         except Exception as e:
             logger.error(f"Ошибка при выполнении скриптов: {e}")
             self.scriptOperationStatusChanged.emit(False, f"Ошибка при выполнении скриптов: {e}")
             # Устанавливаем флаг, что скрипты больше не выполняются
             self._scripts_running = False
-            logger.debug(f"_scripts_running установлен в False (ошибка выполнения)")
+            logger.debug("_scripts_running установлен в False (ошибка выполнения)")
             
         finally:
+            # Останавливаем драйвер Playwright, если в этом потоке запускались Playwright скрипты
+            from src.chrome.playwright_chrome import stop_shared_playwright
+            stop_shared_playwright()
+
             # Устанавливаем флаг, что скрипты больше не выполняются (на всякий случай)
             self._scripts_running = False
-            logger.debug(f"_scripts_running установлен в False (finally)")
+            logger.debug("_scripts_running установлен в False (finally)")
             
             # Сбрасываем флаг isProcessing
             QMetaObject.invokeMethod(self, "_set_is_processing", Qt.QueuedConnection, Q_ARG(bool, False))
@@ -1813,13 +1860,20 @@ class ProfileManager(QObject):
                 else:
                     processed_profiles.append(profile)
             
+            # Сообщаем ход прогона после каждого профиля
+            def on_profile_done(profile, profile_success, done, total, failed):
+                self.managerScriptProgressChanged.emit(done, total, failed)
+
+            self.managerScriptProgressChanged.emit(0, len(processed_profiles), 0)
+
             # Запускаем скрипты
             logger.info("Вызываем функцию run_manager_scripts_on_multiple_profiles")
             success = run_manager_scripts_on_multiple_profiles(
                 profiles=processed_profiles,
                 scripts=scripts,
                 shuffle_scripts=shuffle_scripts,
-                gui_mode=True
+                gui_mode=True,
+                on_profile_done=on_profile_done
             )
             logger.info(f"Функция run_manager_scripts_on_multiple_profiles выполнена с результатом: {success}")
             
@@ -1904,22 +1958,35 @@ class ProfileManager(QObject):
             processed_profiles = profiles
             
             # Запускаем скрипты для каждого профиля
-            success = True
+            from src.utils.run_results import new_batch_id
+            from src.utils.retry_policy import RetryPolicy
+            from src.utils.progress_events import publish_batch_started, publish_batch_finished
+            batch_id = new_batch_id()
+            retry_policy = RetryPolicy.from_config()
+            failed_profiles = []
+            publish_batch_started(batch_id, 'playwright', processed_profiles)
             for profile in processed_profiles:
                 try:
                     logger.info(f"Запускаем скрипты для профиля {profile}")
-                    pw.run_scripts(
+                    if pw.run_scripts(
                         str(profile),
                         script_keys_to_run,
-                        headless
-                    )
-                    logger.info(f"Скрипты для профиля {profile} выполнены")
+                        headless,
+                        batch_id,
+                        retry_policy=retry_policy
+                    ):
+                        logger.info(f"Скрипты для профиля {profile} выполнены")
+                    else:
+                        logger.warning(f"Скрипты для профиля {profile} выполнены с ошибками")
+                        failed_profiles.append(profile)
                 except Exception as e:
                     logger.error(f"Ошибка при выполнении скриптов для профиля {profile}: {e}")
-                    success = False
+                    failed_profiles.append(profile)
+
+            publish_batch_finished(batch_id, 'playwright', failed_profiles)
             
             # Отправляем сигнал о завершении операции
-            if success:
+            if not failed_profiles:
                 logger.info(f"Отправляем сигнал об успешном выполнении скриптов для {len(processed_profiles)} профилей")
                 self.playwrightScriptOperationStatusChanged.emit(True, f"Скрипты успешно выполнены для всех профилей ({len(processed_profiles)})")
             else:
@@ -1932,6 +1999,10 @@ class ProfileManager(QObject):
             self.playwrightScriptOperationStatusChanged.emit(False, f"Ошибка при выполнении скриптов: {e}")
         
         finally:
+            # Останавливаем драйвер Playwright, общий для всех профилей этого потока
+            from src.chrome.playwright_chrome import stop_shared_playwright
+            stop_shared_playwright()
+
             # Сбрасываем флаг выполнения скриптов
             self._scripts_running = False
     
@@ -2057,30 +2128,30 @@ class ProfileManager(QObject):
         Returns:
             bool: True, если экспорт успешен, иначе False
         """
+        return self.exportInventory(file_path, ['profile', 'comment'])
+
+    @Slot(str, list, result=bool)
+    def exportInventory(self, file_path, columns):
+        """
+        Выгружает опись профилей (комментарии, списки, расширения, размер, последний прогон) в CSV или JSONL
+        
+        Args:
+            file_path: Путь к файлу, формат по расширению .csv / .jsonl (если пустой, создается CSV в директории data)
+            columns: Колонки из INVENTORY_COLUMNS (если пустой, все колонки)
+            
+        Returns:
+            bool: True, если экспорт успешен, иначе False
+        """
+        from src.utils.profile_inventory import export_inventory, INVENTORY_COLUMNS
+
         try:
             # Если путь не указан, создаем файл в директории data с текущей датой и временем
             if not file_path:
-                # Создаем директорию data, если она не существует
-                os.makedirs("data", exist_ok=True)
-                # Генерируем имя файла с текущей датой и временем
                 current_time = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
                 file_path = f"data/profiles_export_{current_time}.csv"
-            
-            # Получаем список профилей и их комментарии
-            profiles_data = []
-            for profile in self._profiles_list:
-                comment = self.getProfileComment(profile)
-                profiles_data.append({"profile": profile, "comment": comment})
-            
-            # Записываем данные в CSV-файл
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['profile', 'comment']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for data in profiles_data:
-                    writer.writerow(data)
-            
-            logger.info(f"Профили успешно экспортированы в {file_path}")
+
+            report = export_inventory(file_path, self._profiles_list, tuple(columns) or INVENTORY_COLUMNS)
+            logger.info(f"Профили успешно экспортированы в {file_path} (строк: {report['rows']}, {report['seconds']} сек)")
             return True
         except Exception as e:
             logger.error(f"Ошибка при экспорте профилей: {e}")
@@ -2121,7 +2192,7 @@ class ProfileManager(QObject):
             
             # Уведомляем об изменении списка
             self.profileListsChanged.emit()
-            logger.debug(f"Загружено {len(self._profile_lists)} списков профилей")
+            logger.debug("Загружено {} списков профилей", len(self._profile_lists))
         except Exception as e:
             logger.error(f"Ошибка при обновлении списков профилей: {e}")
     
@@ -2293,8 +2364,8 @@ class ProfileManager(QObject):
             
             self._filtered_profiles = filtered_profiles
             self.filteredProfilesListChanged.emit()
-            logger.debug(f"Отфильтровано {len(filtered_profiles)} профилей по запросу '{search_text}'")
-            logger.debug(f"Первый профиль в списке: {filtered_profiles[0] if filtered_profiles else 'нет профилей'}")
+            logger.debug("Отфильтровано {} профилей по запросу '{}'", len(filtered_profiles), search_text)
+            logger.debug("Первый профиль в списке: {}", filtered_profiles[0] if filtered_profiles else 'нет профилей')
         except Exception as e:
             logger.error(f"Ошибка при фильтрации профилей: {e}")
     
@@ -2322,7 +2393,7 @@ class ProfileManager(QObject):
                 
                 # Устанавливаем выбранные профили (преобразуем список в множество)
                 self._selected_profiles = set(profiles_in_list)
-                logger.debug(f"Загружен список профилей '{list_name}' с {len(self._selected_profiles)} профилями")
+                logger.debug("Загружен список профилей '{}' с {} профилями", list_name, len(self._selected_profiles))
                 
                 # Получаем комментарии для профилей
                 from src.utils.helpers import get_profile_comments
@@ -2347,9 +2418,9 @@ class ProfileManager(QObject):
                 # Уведомляем об изменении выбранных профилей
                 self.selectedProfilesChanged.emit()
                 
-                logger.debug(f"Всего профилей для отображения: {len(self._filtered_profiles)}")
+                logger.debug("Всего профилей для отображения: {}", len(self._filtered_profiles))
                 if self._filtered_profiles:
-                    logger.debug(f"Первый профиль: {self._filtered_profiles[0]}")
+                    logger.debug("Первый профиль: {}", self._filtered_profiles[0])
                 
                 return True
             else:
@@ -2401,7 +2472,7 @@ class ProfileManager(QObject):
             
             # Отправляем уведомление об успешном добавлении
             self.profileListOperationStatusChanged.emit(True, f"Профили успешно добавлены в список '{list_name}'")
-            logger.debug(f"Профили {profiles_to_add} добавлены в список {list_id}")
+            logger.debug("Профили {} добавлены в список {}", profiles_to_add, list_id)
         except Exception as e:
             self.profileListOperationStatusChanged.emit(False, f"Ошибка при добавлении профилей: {e}")
             logger.error(f"Ошибка при добавлении профилей в список: {e}")
@@ -2448,7 +2519,7 @@ class ProfileManager(QObject):
             
             # Отправляем уведомление об успешном удалении
             self.profileListOperationStatusChanged.emit(True, f"Профили успешно удалены из списка '{list_name}'")
-            logger.debug(f"Профили {profiles_to_remove} удалены из списка {list_id}")
+            logger.debug("Профили {} удалены из списка {}", profiles_to_remove, list_id)
         except Exception as e:
             self.profileListOperationStatusChanged.emit(False, f"Ошибка при удалении профилей: {e}")
             logger.error(f"Ошибка при удалении профилей из списка: {e}")
@@ -2462,7 +2533,7 @@ class ProfileManager(QObject):
         try:
             # Получаем актуальный список профилей (без префикса "Profile ")
             actual_profiles = set(profile.replace('Profile ', '') for profile in get_profiles_list())
-            logger.debug(f"Актуальные профили: {actual_profiles}")
+            logger.debug("Актуальные профили: {}", actual_profiles)
             
             # Загружаем списки профилей из файла
             profile_lists_file = "data/profile_lists.json"
@@ -2489,7 +2560,7 @@ class ProfileManager(QObject):
                     data["lists"][list_id]["profiles"] = [p for p in profiles if p in actual_profiles]
                     changes_made = True
                     removed_count += len(invalid_profiles)
-                    logger.debug(f"Из списка '{list_name}' удалены несуществующие профили: {invalid_profiles}")
+                    logger.debug("Из списка '{}' удалены несуществующие профили: {}", list_name, invalid_profiles)
             
             # Сохраняем изменения, если были удалены профили
             if changes_made:
@@ -2590,6 +2661,9 @@ class ProfileManager(QObject):
                 
                 # Запускаем все профили из списка
                 logger.info(f"Запуск всех профилей из списка '{list_name}'")
+                if self._profiles_launching:
+                    self.profileListOperationStatusChanged.emit(False, "Профили еще запускаются, дождитесь окончания запуска")
+                    return
                 self.launchProfilesByNames(profiles_in_list)
                 
                 self.profileListOperationStatusChanged.emit(True, f"Запущены все профили из списка '{list_name}'")
@@ -2646,7 +2720,7 @@ class ProfileManager(QObject):
             
             # Уведомляем об изменении списка
             self.profileListsChanged.emit()
-            logger.debug(f"Найдено {len(filtered_lists)} списков профилей по запросу '{search_text}'")
+            logger.debug("Найдено {} списков профилей по запросу '{}'", len(filtered_lists), search_text)
         except Exception as e:
             logger.error(f"Ошибка при поиске списков профилей: {e}")
 
@@ -2657,7 +2731,7 @@ class ProfileManager(QObject):
         даже если выполняются скрипты
         """
         logger.warning("Подтвержденное завершение работы приложения во время выполнения скриптов")
-        logger.debug(f"confirmed_quit_application вызван. _scripts_running = {hasattr(self, '_scripts_running') and self._scripts_running}")
+        logger.debug("confirmed_quit_application вызван. _scripts_running = {}", hasattr(self, '_scripts_running') and self._scripts_running)
         
         # Закрываем все процессы Chrome, связанные с проектом
         logger.info("Закрытие процессов Chrome, связанных с проектом...")
@@ -2670,13 +2744,6 @@ class ProfileManager(QObject):
         
         QGuiApplication.quit()
 
-def setup_logger():
-    logger.remove()
-    logger_level = "DEBUG" if general_config['show_debug_logs'] else "INFO"
-    log_format = "<white>{time:HH:mm:ss}</white> | <level>{level: <8}</level> | <white>{message}</white>"
-    logger.add(sys.stderr, level=logger_level, format=log_format)
-    logger.add("data/debug_log.log", level="DEBUG", format=log_format)
-
 def main():
     app = QGuiApplication(sys.argv)
     # Настраиваем логгер
@@ -2693,6 +2760,13 @@ def main():
     
     # Регистрируем ProfileManager в QML
     engine.rootContext().setContextProperty("profileManager", profile_manager)
+
+    # Ход прогонов в реальном времени: адаптер для QML и, если включен, локальный сокет
+    from src.client.gui.progress_feed import ProgressFeed
+    from src.utils.progress_events import start_progress_stream
+    progress_feed = ProgressFeed()
+    engine.rootContext().setContextProperty("progressFeed", progress_feed)
+    start_progress_stream()
     
     # Добавляем обработку сигналов завершения
     def signal_handler(sig, frame):
@@ -22,9 +22,16 @@ from src.utils.constants import (
 class AsyncPlaywrightAutomation:
     """Класс для асинхронной автоматизации действий в Chrome через Playwright"""
     
-    def __init__(self):
-        """Инициализация"""
-        self.playwright = None
+    def __init__(self, playwright=None):
+        """
+        Инициализация
+
+        Args:
+            playwright: Уже запущенный драйвер Playwright, общий для нескольких профилей.
+                Если не передан, драйвер запускается при подключении и останавливается в close()
+        """
+        self.playwright = playwright
+        self.owns_playwright = playwright is None
         self.browser = None
         self.context = None
         self.chrome_process = None
@@ -173,10 +180,13 @@ class AsyncPlaywrightAutomation:
             max_attempts = 10
             attempt = 0
             
+            # Драйвер запускаем один раз, в цикле повторяем только подключение к DevTools
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+
             while attempt < max_attempts:
                 try:
                     # Пробуем подключиться к Chrome DevTools
-                    self.playwright = await async_playwright().start()
                     self.browser = await self.playwright.chromium.connect_over_cdp(
                         f"http://localhost:{debug_port}"
                     )
@@ -190,7 +200,9 @@ class AsyncPlaywrightAutomation:
                     
                     # Если контекст не получен, закрываем соединение и пробуем снова
                     await self.browser.close()
-                    await self.playwright.stop()
+                    self.browser = None
+                    attempt += 1
+                    await asyncio.sleep(1)
                     
                 except Exception:
                     attempt += 1
@@ -237,8 +249,10 @@ class AsyncPlaywrightAutomation:
                     self.chrome_process.kill()
             if self.browser:
                 await self.browser.close()
-            if self.playwright:
+                self.browser = None
+            if self.playwright and self.owns_playwright:
                 await self.playwright.stop()
+                self.playwright = None
         except Exception as e:
             logger.error(f"❌ Ошибка при закрытии браузера: {str(e)}")
 
@@ -253,10 +267,14 @@ async def run_multiple_profiles(profile_names: list[str], script_function) -> li
     Returns:
         list[bool]: Список результатов выполнения для каждого профиля
     """
+    playwright = None
     try:
+        # Один драйвер Playwright на весь прогон, профили подключаются к нему по CDP
+        playwright = await async_playwright().start()
+
         results = []
         for profile_name in profile_names:
-            automation = AsyncPlaywrightAutomation()
+            automation = AsyncPlaywrightAutomation(playwright)
             try:
                 if await automation.launch_profile(profile_name):
                     logger.info(f"🚀 Запускаю скрипт для профиля {profile_name}")
@@ -270,9 +288,16 @@ async def run_multiple_profiles(profile_names: list[str], script_function) -> li
             except Exception as e:
                 logger.error(f"❌ Ошибка при выполнении скрипта для профиля {profile_name}: {str(e)}")
                 results.append(False)
+
+            finally:
+                await automation.close()
                 
         return results
         
     except Exception as e:
         logger.error(f"❌ Ошибка при запуске профилей: {str(e)}")
-        return [False] * len(profile_names) 
\ No newline at end of file
+        return [False] * len(profile_names)
+
+    finally:
+        if playwright:
+            await playwright.stop() 
\ No newline at end of file
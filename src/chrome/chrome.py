@@ -1,39 +1,70 @@
+import importlib
 import subprocess
 import time
 import socket
 import os
+from typing import TYPE_CHECKING
 
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium import webdriver
 from loguru import logger
 
 from src.utils.helpers import set_comments_for_profiles, get_profiles_list
 from src.utils.constants import *
-from .scripts import *
+from src.utils.run_results import ProfileRun
+from src.utils.profile_snapshots import snapshot_before_run
+from src.utils.retry_policy import RetryPolicy
+from src.utils.instrumentation import instrumented, profiled_run
+from .lean_run import is_lean_run_enabled, apply_lean_launch_flags, block_heavy_resources_cdp
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from src.utils.batch_journal import BatchJournal
+
+
+def _lazy_script(script_name: str):
+    """
+    Возвращает обертку над скриптом из src.chrome.scripts, которая импортирует
+    модуль скрипта (и selenium вместе с ним) только при первом вызове
+
+    Args:
+        script_name: Имя скрипта, совпадает с именем модуля и функции
+
+    Returns:
+        Callable: Функция с сигнатурой скрипта
+    """
+    def method(*args, **kwargs):
+        module = importlib.import_module(f'.scripts.{script_name}', __package__)
+        return getattr(module, script_name)(*args, **kwargs)
+
+    method.__name__ = script_name
+    return method
 
 
 class Chrome:
     def __init__(self):
         self.debug_ports = {}
         self.chosen_debug_ports = []
+        self.last_run = None  # ProfileRun последнего run_scripts
 
+        # 'idempotent': True - скрипт можно безопасно перезапустить после таймаута (см. retry_limits)
         self.scripts = {
             'chrome_initial_setup': {
                 'human_name': 'Первичная настройка Chrome',
-                'method': chrome_initial_setup,
+                'method': _lazy_script('chrome_initial_setup'),
+                'idempotent': True
             },
             'omega_proxy_setup': {
                 'human_name': 'Настройка Omega Proxy',
-                'method': omega_proxy_setup
+                'method': _lazy_script('omega_proxy_setup'),
+                'idempotent': True
             },
             'agent_switcher': {
                 'human_name': 'Настройка Agent Switcher',
-                'method': agent_switcher
+                'method': _lazy_script('agent_switcher'),
+                'idempotent': True
             },
             'rabby_import': {
                 'human_name': 'Импорт Rabby Wallet',
-                'method': rabby_import
+                'method': _lazy_script('rabby_import')
             }
         }
 
@@ -61,7 +92,7 @@ class Chrome:
             logger.warning(f'⚠️ {profile_name} - профиль уже существует')
         except Exception as e:
             logger.error(f'⛔  {profile_name} - не удалось создать профиль')
-            logger.debug(f'{profile_name} - не удалось создать профиль, причина: {e}')
+            logger.debug('{} - не удалось создать профиль, причина: {}', profile_name, e)
 
     def init_profile_preferences(self, profile_name: str) -> bool:
         initialized = False
@@ -75,7 +106,7 @@ class Chrome:
             logger.info(f'✅  {profile_name} - профиль запущен')
         except Exception as e:
             logger.error(f'⛔  {profile_name} - не удалось запустить профиль для инициализации настроек')
-            logger.debug(f'{profile_name} - не удалось запустить профиль для инициализации настроек, причина: {e}')
+            logger.debug('{} - не удалось запустить профиль для инициализации настроек, причина: {}', profile_name, e)
             return initialized
 
         time.sleep(2)
@@ -83,22 +114,24 @@ class Chrome:
         try:
             chrome_process.terminate()
             chrome_process.wait()
-            logger.debug(f'{profile_name} - профиль закрыт')
+            logger.debug('{} - профиль закрыт', profile_name)
         except Exception as e:
             logger.error(f'⛔  {profile_name} - не удалось закрыть профиль')
-            logger.debug(f'{profile_name} - не удалось закрыть профиль, причина: {e}')
+            logger.debug('{} - не удалось закрыть профиль, причина: {}', profile_name, e)
 
         return initialized
 
+    @instrumented('chrome.launch_profile')
     def launch_profile(self,
                        profile_name: str,
                        debug=False,
                        headless: bool = False,
-                       maximized: bool = False) -> subprocess.Popen | None:
+                       maximized: bool = False,
+                       lean: bool = False) -> subprocess.Popen | None:
         try:
-            logger.debug(f"launch_profile: profile_name={profile_name}, type={type(profile_name)}, debug={debug}, headless={headless}, maximized={maximized}")
-            launch_args = self.__create_launch_flags(profile_name, debug, headless, maximized)
-            logger.debug(f"launch_args: {launch_args}")
+            logger.debug("launch_profile: profile_name={}, type={}, debug={}, headless={}, maximized={}, lean={}", profile_name, type(profile_name), debug, headless, maximized, lean)
+            launch_args = self.__create_launch_flags(profile_name, debug, headless, maximized, lean)
+            logger.debug("launch_args: {}", launch_args)
 
             with open(os.devnull, 'w') as devnull:  # to avoid Chrome log spam
                 chrome_process = subprocess.Popen([CHROME_PATH, *launch_args], stdout=devnull, stderr=devnull)
@@ -108,54 +141,128 @@ class Chrome:
             return chrome_process
         except Exception as e:
             logger.error(f'⛔  {profile_name} - не удалось запустить профиль')
-            logger.debug(f'{profile_name} - не удалось запустить профиль, причина: {e}')
+            logger.debug('{} - не удалось запустить профиль, причина: {}', profile_name, e)
+
+    @profiled_run('chrome')
+    def run_scripts(self,
+                    profile_name: str,
+                    scripts_list: list[str],
+                    headless: bool = False,
+                    batch_id: str | None = None,
+                    journal: 'BatchJournal | None' = None,
+                    retry_policy: RetryPolicy | None = None,
+                    lean: bool | None = None) -> bool:
+        run = ProfileRun('chrome', profile_name, batch_id, journal=journal, scripts_total=len(scripts_list))
+        self.last_run = run
+        with run.phase('snapshot'):
+            snapshot_before_run(profile_name, run.batch_id)
+        retry_policy = retry_policy or RetryPolicy.from_config()
+        lean = is_lean_run_enabled() if lean is None else lean
+        chrome_process = None
 
-    def run_scripts(self, profile_name: str, scripts_list: list[str], headless: bool = False) -> None:
         try:
-            chrome_process = self.launch_profile(profile_name, True, headless, True)
-            if not chrome_process:
-                raise Exception('не удалось запустить браузер')
-
-            time.sleep(1)
-
-            logger.debug(f'{profile_name} - подключаюсь к порту {self.debug_ports[profile_name]}')
-            driver = self.__establish_debug_port_connection(profile_name)
-            logger.debug(f'{profile_name} - соединение установлено')
-
-            logger.debug(f'{profile_name} - скрипты для прогона: {scripts_list}')
+            with run.phase('launch'):
+                chrome_process = retry_policy.call(
+                    'launch',
+                    self.__launch_for_scripts,
+                    profile_name,
+                    headless,
+                    lean,
+                    description=f'{profile_name} - запуск профиля',
+                    is_failed=lambda process: not process,
+                    on_retry=run.add_retry
+                )
+                if not chrome_process:
+                    raise Exception('не удалось запустить браузер')
+
+            logger.debug('{} - подключаюсь к порту {}', profile_name, self.debug_ports[profile_name])
+            with run.phase('attach'):
+                driver = retry_policy.call(
+                    'attach',
+                    self.__establish_debug_port_connection,
+                    profile_name,
+                    description=f'{profile_name} - подключение к порту отладки',
+                    on_retry=run.add_retry
+                )
+            logger.debug('{} - соединение установлено', profile_name)
+
+            if lean:
+                block_heavy_resources_cdp(driver, profile_name)
+
+            logger.debug('{} - скрипты для прогона: {}', profile_name, scripts_list)
             for script in scripts_list:
                 try:
                     human_name = self.scripts[script]['human_name']
                     logger.info(f'ℹ️ {profile_name} - запускаю скрипт "{human_name}"')
                     script_data_path = os.path.join(DATA_PATH, 'scripts', "chrome", script)
-                    self.scripts[script]['method'](
-                        profile_name,
-                        script_data_path,
-                        driver
-                    )
-                    logger.info(f'✅  {profile_name} - скрипт "{human_name}" выполнен')
+                    with run.script(script) as outcome:
+                        result = retry_policy.call(
+                            'script',
+                            self.scripts[script]['method'],
+                            profile_name,
+                            script_data_path,
+                            driver,
+                            description=f'{profile_name} - скрипт "{human_name}"',
+                            is_failed=lambda script_result: script_result is False,
+                            on_retry=run.add_retry,
+                            retryable=self.scripts[script].get('idempotent', False)
+                        )
+                        outcome['failed'] = result is False
+
+                    if outcome['failed']:
+                        logger.error(f'⛔  {profile_name} - скрипт "{human_name}" завершен с ошибкой')
+                    else:
+                        logger.info(f'✅  {profile_name} - скрипт "{human_name}" выполнен')
                 except Exception as e:
                     human_name = self.scripts[script]['human_name']
                     logger.error(f'⛔  {profile_name} - скрипт "{human_name}" завершен с ошибкой')
-                    logger.debug(f'{profile_name} - скрипт "{human_name}" завершен с ошибкой, причина: {e}')
+                    logger.debug('{} - скрипт "{}" завершен с ошибкой, причина: {}', profile_name, human_name, e)
 
         except Exception as e:
             logger.error(f'⛔  {profile_name} - не удалось запустить профиль, выполнение скриптов прервано')
-            logger.debug(f'{profile_name} - не удалось запустить профиль, причина: {e}')
-            return
+            logger.debug('{} - не удалось запустить профиль, причина: {}', profile_name, e)
+            if chrome_process and chrome_process.poll() is None:
+                chrome_process.terminate()
+            self.__release_debug_port(profile_name)
+            return run.finish(e).success
+
+        with run.phase('teardown'):
+            time.sleep(1)
+
+            try:
+                driver.quit()
+                chrome_process.terminate()
+                chrome_process.wait()
+                logger.debug('{} - профиль закрыт', profile_name)
+            except Exception as e:
+                logger.error(f'⛔  {profile_name} - не удалось закрыть профиль')
+                logger.debug('{} - не удалось закрыть профиль, причина: {}', profile_name, e)
+
+            self.__release_debug_port(profile_name)
+
+        return run.finish().success
+
+    def __launch_for_scripts(self, profile_name: str, headless: bool, lean: bool) -> subprocess.Popen | None:
+        chrome_process = self.launch_profile(profile_name, True, headless, True, lean)
+        if not chrome_process:
+            self.__release_debug_port(profile_name)
+            return None
 
         time.sleep(1)
 
-        try:
-            driver.quit()
-            chrome_process.terminate()
-            chrome_process.wait()
-            logger.debug(f'{profile_name} - профиль закрыт')
-        except Exception as e:
-            logger.error(f'⛔  {profile_name} - не удалось закрыть профиль')
-            logger.debug(f'{profile_name} - не удалось закрыть профиль, причина: {e}')
+        if chrome_process.poll() is not None:  # например, профиль занят другим процессом Chrome
+            logger.debug('{} - процесс Chrome завершился сразу после запуска, код {}', profile_name, chrome_process.returncode)
+            self.__release_debug_port(profile_name)
+            return None
+
+        return chrome_process
+
+    @instrumented('chrome.establish_debug_port_connection')
+    def __establish_debug_port_connection(self, profile_name) -> 'webdriver.Chrome':
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from selenium import webdriver
 
-    def __establish_debug_port_connection(self, profile_name) -> webdriver.Chrome:
         debug_port = self.debug_ports[profile_name]
 
         chrome_options = Options()
@@ -169,41 +276,42 @@ class Chrome:
                               profile_name: str,
                               debug: bool = False,
                               headless: bool = False,
-                              maximized: bool = False) -> list[str]:
-        logger.debug(f"__create_launch_flags: profile_name={profile_name}, type={type(profile_name)}")
+                              maximized: bool = False,
+                              lean: bool = False) -> list[str]:
+        logger.debug("__create_launch_flags: profile_name={}, type={}", profile_name, type(profile_name))
         profile_path = self.__get_profile_path(profile_name)
-        logger.debug(f"profile_path={profile_path}, type={type(profile_path)}")
+        logger.debug("profile_path={}, type={}", profile_path, type(profile_path))
         profile_extensions_path = os.path.join(profile_path, "Extensions")
-        logger.debug(f"profile_extensions_path={profile_extensions_path}, type={type(profile_extensions_path)}")
-        profile_html_path = self.__get_profile_welcome_page(profile_name)
-        logger.debug(f"profile_html_path={profile_html_path}, type={type(profile_html_path)}")
+        logger.debug("profile_extensions_path={}, type={}", profile_extensions_path, type(profile_extensions_path))
+        profile_html_path = None if lean else self.__get_profile_welcome_page(profile_name)
+        logger.debug("profile_html_path={}, type={}", profile_html_path, type(profile_html_path))
 
         all_extensions = []
         if os.path.exists(profile_extensions_path):
-            logger.debug(f"Директория расширений существует: {profile_extensions_path}")
+            logger.debug("Директория расширений существует: {}", profile_extensions_path)
             for ext_id in os.listdir(profile_extensions_path):
                 versions_dir = os.path.join(profile_extensions_path, ext_id)
                 if os.path.isdir(versions_dir):
-                    logger.debug(f"Найдена директория расширения: {versions_dir}")
+                    logger.debug("Найдена директория расширения: {}", versions_dir)
                     for version in os.listdir(versions_dir):
                         version_path = os.path.join(versions_dir, version)
                         manifest_path = os.path.join(version_path, "manifest.json")
                         if os.path.isdir(version_path) and os.path.isfile(manifest_path):
                             all_extensions.append(version_path)
-                            logger.debug(f"Добавлено расширение для загрузки: {ext_id} (версия {version})")
+                            logger.debug("Добавлено расширение для загрузки: {} (версия {})", ext_id, version)
         else:
-            logger.debug(f"Директория расширений не существует: {profile_extensions_path}")
+            logger.debug("Директория расширений не существует: {}", profile_extensions_path)
 
         # Формируем аргумент для загрузки расширений
         load_arg = ",".join(all_extensions)
-        logger.debug(f"Аргумент для загрузки расширений: {load_arg}")
+        logger.debug("Аргумент для загрузки расширений: {}", load_arg)
 
         flags = [
             f"--user-data-dir={CHROME_DATA_PATH}",
             f"--profile-directory={f'Profile {profile_name}'}",
             "--no-first-run",
             f"--load-extension={load_arg}",
-            f"file:///{profile_html_path}",
+            f"file:///{profile_html_path}" if profile_html_path else None,
             "--no-sync",
             "--disable-features=IdentityConsistency",
             "--disable-accounts-receiver",
@@ -212,7 +320,9 @@ class Chrome:
         ]
 
         flags = [i for i in flags if i is not None]
-        logger.debug(f"Флаги запуска Chrome: {flags}")
+        if lean:
+            flags = apply_lean_launch_flags(flags)
+        logger.debug("Флаги запуска Chrome: {}", flags)
 
         if debug:
             free_port = self.__find_free_port()
@@ -233,15 +343,17 @@ class Chrome:
         os.makedirs(PROFILE_WELCOME_PAGES_OUTPUT_PATH, exist_ok=True)
         profile_welcome_page_path = os.path.join(PROFILE_WELCOME_PAGES_OUTPUT_PATH, f"{profile_name}.html")
 
-        # USE CACHE
-        # if os.path.exists(profile_welcome_page_path):
-        #     return profile_welcome_page_path
-
         with open(PROFILE_WELCOME_PAGE_TEMPLATE_PATH, 'r') as template_file:
             template_content = template_file.read()
 
         profile_page_content = template_content.replace("{{ profile_name }}", profile_name)
 
+        # перезаписываем страницу только если шаблон изменился
+        if os.path.exists(profile_welcome_page_path):
+            with open(profile_welcome_page_path, 'r') as profile_page_file:
+                if profile_page_file.read() == profile_page_content:
+                    return profile_welcome_page_path
+
         with open(profile_welcome_page_path, 'w') as profile_page_file:
             profile_page_file.write(profile_page_content)
 
@@ -256,3 +368,9 @@ class Chrome:
                     return port
 
         return None
+
+    def __release_debug_port(self, profile_name: str) -> None:
+        # порт неудачного или завершенного запуска снова можно выбрать, иначе список занятых портов только растет
+        port = self.debug_ports.pop(profile_name, None)
+        if port in self.chosen_debug_ports:
+            self.chosen_debug_ports.remove(port)
@@ -0,0 +1,155 @@
+"""
+Облегченный запуск профилей для прогона скриптов (lean run).
+
+Скрипты вроде rabby_import и metamask_import работают только со страницами
+chrome-extension://, поэтому при прогоне скриптов профиль можно запускать без
+восстановления сессии, фоновых сетевых запросов и стартовой страницы, а картинки,
+шрифты и медиа с обычных сайтов не загружать.
+
+Настройки - в секции "lean_run" файла chrome_launch_config.json,
+включение - general_config['lean_run'].
+"""
+
+import os
+import json
+
+from loguru import logger
+
+from config import general_config
+
+
+_LAUNCH_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config", "chrome_launch_config.json")
+
+DEFAULT_LEAN_RUN_CONFIG = {
+    "remove_flags": ["--restore-last-session"],
+    "extra_flags": [],
+    "blocked_resource_types": ["image", "font", "media"],
+    "blocked_url_patterns": [],
+}
+
+# Network.setBlockedURLs не различает типы ресурсов, поэтому типы блокируются по расширениям файлов
+_RESOURCE_TYPE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico", "svg"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "ogg", "mp3", "wav", "m4a", "mov"],
+}
+
+_lean_run_config = None
+
+
+def is_lean_run_enabled() -> bool:
+    return bool(general_config.get('lean_run', False))
+
+
+def get_lean_run_config() -> dict:
+    """
+    Возвращает настройки облегченного запуска из chrome_launch_config.json
+
+    Returns:
+        dict: remove_flags, extra_flags, blocked_resource_types, blocked_url_patterns
+    """
+    global _lean_run_config
+
+    if _lean_run_config is None:
+        try:
+            with open(_LAUNCH_CONFIG_PATH, 'r', encoding='utf-8') as f:
+                launch_config = json.load(f)
+            _lean_run_config = {**DEFAULT_LEAN_RUN_CONFIG, **launch_config.get('lean_run', {})}
+        except Exception as e:
+            logger.debug(f'не удалось прочитать настройки lean run, используются настройки по умолчанию, причина: {e}')
+            _lean_run_config = dict(DEFAULT_LEAN_RUN_CONFIG)
+
+    return _lean_run_config
+
+
+def apply_lean_launch_flags(flags: list[str]) -> list[str]:
+    """
+    Убирает из флагов запуска восстановление сессии и добавляет флаги облегченного запуска
+
+    Args:
+        flags: Флаги запуска Chrome
+
+    Returns:
+        list[str]: Новый список флагов
+    """
+    lean_config = get_lean_run_config()
+    removed = set(lean_config['remove_flags'])
+
+    lean_flags = [flag for flag in flags if flag not in removed]
+    lean_flags += [flag for flag in lean_config['extra_flags'] if flag not in lean_flags]
+
+    return lean_flags
+
+
+def get_blocked_url_patterns() -> list[str]:
+    """
+    Собирает шаблоны адресов для Network.setBlockedURLs: типы ресурсов из blocked_resource_types
+    переводятся в шаблоны по расширениям файлов (только http/https, страницы расширений не затрагиваются),
+    к ним добавляются blocked_url_patterns
+
+    Returns:
+        list[str]: Шаблоны адресов
+    """
+    lean_config = get_lean_run_config()
+
+    patterns = []
+    for resource_type in lean_config['blocked_resource_types']:
+        for extension in _RESOURCE_TYPE_EXTENSIONS.get(resource_type, []):
+            patterns += [f'http*://*.{extension}', f'http*://*.{extension}?*']
+    patterns += [pattern for pattern in lean_config['blocked_url_patterns'] if pattern not in patterns]
+
+    return patterns
+
+
+def block_heavy_resources(context, profile_name: str = '') -> None:
+    """
+    Блокирует в контексте Playwright загрузку картинок, шрифтов и медиа с сайтов через CDP
+    (Network.setBlockedURLs) на всех открытых и новых страницах. Запросы не проходят через
+    обработчик Python, и кэш браузера остается включенным, в отличие от context.route
+
+    Args:
+        context: BrowserContext Playwright
+        profile_name: Имя профиля для логов
+    """
+    patterns = get_blocked_url_patterns()
+    if not patterns:
+        return
+
+    def block_on_page(page) -> None:
+        try:
+            session = context.new_cdp_session(page)
+            session.send('Network.enable')
+            session.send('Network.setBlockedURLs', {'urls': patterns})
+        except Exception as e:
+            logger.debug(f'{profile_name} - не удалось включить блокировку ресурсов на странице, причина: {e}')
+
+    try:
+        for page in context.pages:
+            block_on_page(page)
+        context.on('page', block_on_page)
+        logger.debug(f'{profile_name} - блокировка ресурсов включена, шаблонов: {len(patterns)}')
+    except Exception as e:
+        logger.warning(f'⚠️ {profile_name} - не удалось включить блокировку ресурсов')
+        logger.debug(f'{profile_name} - не удалось включить блокировку ресурсов, причина: {e}')
+
+
+def block_heavy_resources_cdp(driver, profile_name: str = '') -> None:
+    """
+    Блокирует загрузку тяжелых ресурсов во вкладке Selenium через CDP (Network.setBlockedURLs)
+    по шаблонам из get_blocked_url_patterns. Блокировка действует на текущую вкладку
+
+    Args:
+        driver: webdriver.Chrome, подключенный к профилю
+        profile_name: Имя профиля для логов
+    """
+    patterns = get_blocked_url_patterns()
+    if not patterns:
+        return
+
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        logger.debug(f'{profile_name} - блокировка ресурсов включена, шаблонов: {len(patterns)}')
+    except Exception as e:
+        logger.warning(f'⚠️ {profile_name} - не удалось включить блокировку ресурсов')
+        logger.debug(f'{profile_name} - не удалось включить блокировку ресурсов, причина: {e}')
@@ -9,14 +9,62 @@ import os
 import time
 import subprocess
 import json
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext, TimeoutError as PlaywrightTimeoutError
 from loguru import logger
-import requests
 
 from src.utils.helpers import set_comments_for_profiles, get_profiles_list, kill_chrome_processes
 from src.utils.constants import *
+from src.utils.run_results import ProfileRun
+from src.utils.profile_snapshots import snapshot_before_run
+from src.utils.retry_policy import RetryPolicy
+from src.utils.instrumentation import instrumented, profiled_run
+from .lean_run import is_lean_run_enabled, apply_lean_launch_flags, block_heavy_resources
+
+if TYPE_CHECKING:
+    from src.utils.batch_journal import BatchJournal
+
+
+# Драйвер Playwright (Node-процесс) живет весь прогон и переиспользуется всеми профилями потока.
+# Sync API привязан к потоку, в котором драйвер запущен, поэтому драйвер у каждого потока свой.
+_shared_driver = threading.local()
+
+
+def get_shared_playwright():
+    """
+    Возвращает драйвер Playwright текущего потока, запуская его при первом обращении
+
+    Returns:
+        Playwright: Запущенный экземпляр sync Playwright
+    """
+    playwright = getattr(_shared_driver, 'playwright', None)
+    if playwright is None:
+        from playwright.sync_api import sync_playwright
+
+        playwright = sync_playwright().start()
+        _shared_driver.playwright = playwright
+        logger.debug('драйвер Playwright запущен в потоке {}', threading.current_thread().name)
+
+    return playwright
+
+
+def stop_shared_playwright() -> None:
+    """
+    Останавливает драйвер Playwright текущего потока, если он был запущен.
+    Вызывается один раз в конце прогона, а не после каждого профиля
+    """
+    playwright = getattr(_shared_driver, 'playwright', None)
+    if playwright is None:
+        return
+
+    _shared_driver.playwright = None
+    try:
+        playwright.stop()
+        logger.debug('драйвер Playwright остановлен в потоке {}', threading.current_thread().name)
+    except Exception as e:
+        logger.debug('не удалось остановить драйвер Playwright, причина: {}', e)
 
 
 class PlaywrightChrome:
@@ -38,6 +86,8 @@ class PlaywrightChrome:
         self.context = None
         self.page = None
         self.chrome_process = None
+        self.launch_timings = {}  # длительность фаз последнего launch_profile: launch, attach
+        self.last_run = None  # ProfileRun последнего run_scripts
         
         # Словарь доступных скриптов
         self.scripts = {}
@@ -77,9 +127,18 @@ class PlaywrightChrome:
             logger.warning(f'⚠️ {profile_name} - профиль уже существует')
         except Exception as e:
             logger.error(f'⛔  {profile_name} - не удалось создать профиль')
-            logger.debug(f'{profile_name} - не удалось создать профиль, причина: {e}')
+            logger.debug('{} - не удалось создать профиль, причина: {}', profile_name, e)
     
-    def launch_profile(self, profile_name, headless=False, debug_port=None, timeout=None, close_tabs=False):
+    @instrumented('playwright.launch_profile')
+    def launch_profile(self,
+                       profile_name,
+                       headless=False,
+                       debug_port=None,
+                       timeout=None,
+                       close_tabs=False,
+                       retry_policy: RetryPolicy | None = None,
+                       on_retry=None,
+                       lean: bool = False):
         """
         Запускает профиль Chrome с использованием Playwright
         
@@ -89,10 +148,17 @@ class PlaywrightChrome:
             debug_port: Порт для отладки (если None, будет использован порт из конфигурации)
             timeout: Таймаут для запуска Chrome (если None, будет использован таймаут из конфигурации)
             close_tabs: Закрывать ли все вкладки при запуске профиля (по умолчанию False)
+            retry_policy: Политика повторов запуска и подключения (если None, берется из конфигурации)
+            on_retry: Вызывается с классом ошибки перед каждым повтором
+            lean: Облегченный запуск для скриптов: без восстановления сессии и фоновых запросов,
+                  с блокировкой картинок, шрифтов и медиа
             
         Returns:
             bool: True если профиль успешно запущен, иначе False
         """
+        self.launch_timings = {}
+        launch_started = time.perf_counter()
+
         try:
             # Убиваем все процессы Chrome перед запуском
             logger.info(f"🔫 {profile_name} - убиваем все процессы Chrome...")
@@ -191,147 +257,240 @@ class PlaywrightChrome:
                 flag_value = flag_value.replace("{debug_port}", str(debug_port))
                 launch_args.append(flag_value)
             
+            if lean:
+                launch_args = apply_lean_launch_flags(launch_args)
+
             # Выводим команду запуска для отладки
-            logger.debug(f"Команда запуска Chrome: {' '.join(launch_args)}")
-            
-            # Запускаем Chrome
-            self.chrome_process = subprocess.Popen(
-                launch_args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            logger.info(f"✅ {profile_name} - процесс Chrome запущен с PID: {self.chrome_process.pid}")
-            
-            # Ждем минимальное время для запуска Chrome
-            time.sleep(0.1)
-            
-            # Проверяем доступность порта отладки
-            logger.info(f"🔍 {profile_name} - проверяем доступность порта отладки {debug_port}...")
+            logger.debug("Команда запуска Chrome: {}", ' '.join(launch_args))
             
             # Получаем URL для подключения к Chrome DevTools
             debug_url = self.config.get("debug_endpoint", f"http://localhost:{debug_port}")
-            
-            # Проверяем доступность порта отладки с повторными попытками
-            max_attempts = 15
-            for attempt in range(1, max_attempts + 1):
-                try:
-                    logger.debug(f"Попытка {attempt}/{max_attempts} подключения к {debug_url}/json/version")
-                    response = requests.get(f"{debug_url}/json/version", timeout=0.5)
-                    if response.status_code == 200:
-                        logger.debug(f"Ответ от Chrome DevTools: {response.json()}")
-                        logger.info(f"✅ {profile_name} - порт отладки доступен")
-                        break
-                except requests.exceptions.RequestException:
-                    if attempt == max_attempts:
-                        logger.error(f"❌ {profile_name} - не удалось подключиться к порту отладки после {max_attempts} попыток")
-                        return False
-                    time.sleep(0.2)
-            
-            # Подключаемся к Chrome через CDP
+
+            # Запускаем Chrome, при ошибке повторяется только запуск
+            retry_policy = retry_policy or RetryPolicy.from_config()
+            started = retry_policy.call(
+                'launch',
+                self.__start_chrome_process,
+                profile_name,
+                launch_args,
+                debug_url,
+                description=f'{profile_name} - запуск Chrome',
+                is_failed=lambda result: not result,
+                on_retry=on_retry
+            )
+            if not started:
+                return False
+            self.launch_timings['launch'] = time.perf_counter() - launch_started
+
+            # Подключаемся к Chrome через CDP, при ошибке повторяется только подключение
+            attach_started = time.perf_counter()
+            attached = retry_policy.call(
+                'attach',
+                self.__attach_over_cdp,
+                profile_name,
+                debug_url,
+                close_tabs,
+                lean,
+                description=f'{profile_name} - подключение через CDP',
+                is_failed=lambda result: not result,
+                on_retry=on_retry
+            )
+            if attached:
+                self.launch_timings['attach'] = time.perf_counter() - attach_started
+
+            return attached
+
+        except Exception as e:
+            logger.error(f"❌ {profile_name} - ошибка при запуске профиля: {str(e)}")
+            return False
+    
+    @instrumented('playwright.start_chrome_process')
+    def __start_chrome_process(self, profile_name: str, launch_args: list[str], debug_url: str) -> bool:
+        """
+        Запускает процесс Chrome и ждет, пока поднимется порт отладки (фаза launch)
+
+        Returns:
+            bool: True, если порт отладки доступен
+        """
+        import requests
+
+        # Запускаем Chrome
+        self.chrome_process = subprocess.Popen(
+            launch_args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+        logger.info(f"✅ {profile_name} - процесс Chrome запущен с PID: {self.chrome_process.pid}")
+
+        # Ждем минимальное время для запуска Chrome
+        time.sleep(0.1)
+
+        # Проверяем доступность порта отладки
+        logger.info(f"🔍 {profile_name} - проверяем доступность порта отладки {debug_url}...")
+
+        # Проверяем доступность порта отладки с повторными попытками
+        max_attempts = 15
+        for attempt in range(1, max_attempts + 1):
             try:
-                logger.info(f"🔌 {profile_name} - подключаемся к Chrome через CDP...")
-                
-                # Запускаем Playwright
-                self.playwright = sync_playwright().start()
-                
-                # Подключаемся к запущенному Chrome через CDP
-                self.browser = self.playwright.chromium.connect_over_cdp(debug_url)
-                
-                # Получаем список доступных браузеров
-                logger.debug(f"Получаем список браузеров: {debug_url}/json/list")
-                response = requests.get(f"{debug_url}/json/list")
-                logger.debug(f"Доступные браузеры: {response.json()}")
-                
-                # Получаем контекст браузера
-                contexts = self.browser.contexts
-                if not contexts:
-                    logger.error(f"❌ {profile_name} - не найден контекст браузера")
-                    return False
-                    
-                self.context = contexts[0]
-                logger.info(f"✅ {profile_name} - получен контекст браузера")
-                
-                # Всегда создаем новую страницу для отображения информации о профиле
-                self.page = self.context.new_page()
-                logger.info(f"✅ {profile_name} - создана новая страница для информации о профиле")
-                
-                # Открываем простую страницу с именем профиля в заголовке
-                try:
-                    # Создаем упрощенный HTML-контент для быстрой загрузки
-                    html_content = f"""
-                    <!DOCTYPE html>
-                    <html>
-                    <head>
-                        <title>{profile_name}</title>
-                        <style>
-                            body {{
-                                font-family: Arial, sans-serif;
-                                background: #1e2a38;
-                                color: #f0f0f0;
-                                margin: 0;
-                                padding: 20px;
-                                text-align: center;
-                            }}
-                            h1 {{
-                                font-size: 24px;
-                                color: #ffcc00;
-                            }}
-                        </style>
-                    </head>
-                    <body>
-                        <h1>Профиль: {profile_name}</h1>
-                    </body>
-                    </html>
-                    """
-                    
-                    # Устанавливаем содержимое новой страницы напрямую, без ожидания загрузки ресурсов
-                    self.page.set_content(html_content, wait_until="domcontentloaded")
-                    logger.info(f"✅ {profile_name} - открыта страница с информацией о профиле в новой вкладке")
-                    
-                    # Закрываем все лишние вкладки только если параметр close_tabs=True
-                    if close_tabs:
-                        try:
-                            # Получаем все вкладки
-                            all_pages = self.context.pages
-                            
-                            # Закрываем все вкладки, кроме нашей с информацией о профиле
-                            for page in all_pages:
-                                if page != self.page:
-                                    try:
-                                        # Получаем URL вкладки для логирования
-                                        page_url = page.url
-                                        
-                                        # Закрываем вкладку
-                                        page.close()
-                                        logger.debug(f"🔒 {profile_name} - закрыта вкладка: {page_url}")
-                                    except Exception as e:
-                                        logger.warning(f"⚠️ {profile_name} - не удалось закрыть вкладку: {str(e)}")
-                            
-                            logger.info(f"✅ {profile_name} - закрыты все лишние вкладки")
-                        except Exception as e:
-                            logger.error(f"❌ {profile_name} - ошибка при закрытии лишних вкладок: {str(e)}")
-                    else:
-                        logger.info(f"ℹ️ {profile_name} - автоматическое закрытие вкладок отключено")
-                    
-                    logger.success(f"✅ {profile_name} - профиль успешно запущен")
+                logger.debug("Попытка {}/{} подключения к {}/json/version", attempt, max_attempts, debug_url)
+                response = requests.get(f"{debug_url}/json/version", timeout=0.5)
+                if response.status_code == 200:
+                    logger.debug("Ответ от Chrome DevTools: {}", response.json())
+                    logger.info(f"✅ {profile_name} - порт отладки доступен")
                     return True
-                    
-                except Exception as e:
-                    logger.error(f"❌ {profile_name} - ошибка при открытии страницы с информацией о профиле: {str(e)}")
-                
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.2)
+
+        logger.error(f"❌ {profile_name} - не удалось подключиться к порту отладки после {max_attempts} попыток")
+        self.__stop_chrome_process()
+        return False
+
+    def __stop_chrome_process(self) -> None:
+        if self.chrome_process and self.chrome_process.poll() is None:
+            try:
+                self.chrome_process.terminate()
+                self.chrome_process.wait(timeout=5)
+            except Exception:
+                self.chrome_process.kill()
+        self.chrome_process = None
+
+    @instrumented('playwright.attach_over_cdp')
+    def __attach_over_cdp(self, profile_name: str, debug_url: str, close_tabs: bool, lean: bool = False) -> bool:
+        """
+        Подключается к запущенному Chrome через CDP и открывает страницу профиля (фаза attach)
+
+        Returns:
+            bool: True, если подключение установлено
+        """
+        import requests
+
+        try:
+            logger.info(f"🔌 {profile_name} - подключаемся к Chrome через CDP...")
+
+            # Берем общий драйвер Playwright потока вместо запуска нового на каждый профиль
+            self.playwright = get_shared_playwright()
+
+            # Подключаемся к запущенному Chrome через CDP
+            self.browser = self.playwright.chromium.connect_over_cdp(debug_url)
+
+            # Получаем список доступных браузеров
+            logger.debug("Получаем список браузеров: {}/json/list", debug_url)
+            response = requests.get(f"{debug_url}/json/list")
+            logger.debug("Доступные браузеры: {}", response.json())
+
+            # Получаем контекст браузера
+            contexts = self.browser.contexts
+            if not contexts:
+                logger.error(f"❌ {profile_name} - не найден контекст браузера")
+                self.__close_cdp_browser()
+                return False
+
+            self.context = contexts[0]
+            logger.info(f"✅ {profile_name} - получен контекст браузера")
+
+            if lean:
+                block_heavy_resources(self.context, profile_name)
+
+            # Всегда создаем новую страницу для отображения информации о профиле
+            self.page = self.context.new_page()
+            logger.info(f"✅ {profile_name} - создана новая страница для информации о профиле")
+
+            # Открываем простую страницу с именем профиля в заголовке
+            try:
+                # Создаем упрощенный HTML-контент для быстрой загрузки
+                html_content = f"""
+                <!DOCTYPE html>
+                <html>
+                <head>
+                    <title>{profile_name}</title>
+                    <style>
+                        body {{
+                            font-family: Arial, sans-serif;
+                            background: #1e2a38;
+                            color: #f0f0f0;
+                            margin: 0;
+                            padding: 20px;
+                            text-align: center;
+                        }}
+                        h1 {{
+                            font-size: 24px;
+                            color: #ffcc00;
+                        }}
+                    </style>
+                </head>
+                <body>
+                    <h1>Профиль: {profile_name}</h1>
+                </body>
+                </html>
+                """
+
+                # Устанавливаем содержимое новой страницы напрямую, без ожидания загрузки ресурсов
+                self.page.set_content(html_content, wait_until="domcontentloaded")
+                logger.info(f"✅ {profile_name} - открыта страница с информацией о профиле в новой вкладке")
+
+                # Закрываем все лишние вкладки только если параметр close_tabs=True
+                if close_tabs:
+                    try:
+                        # Получаем все вкладки
+                        all_pages = self.context.pages
+
+                        # Закрываем все вкладки, кроме нашей с информацией о профиле
+                        for page in all_pages:
+                            if page != self.page:
+                                try:
+                                    # Получаем URL вкладки для логирования
+                                    page_url = page.url
+
+                                    # Закрываем вкладку
+                                    page.close()
+                                    logger.debug("🔒 {} - закрыта вкладка: {}", profile_name, page_url)
+                                except Exception as e:
+                                    logger.warning(f"⚠️ {profile_name} - не удалось закрыть вкладку: {str(e)}")
+
+                        logger.info(f"✅ {profile_name} - закрыты все лишние вкладки")
+                    except Exception as e:
+                        logger.error(f"❌ {profile_name} - ошибка при закрытии лишних вкладок: {str(e)}")
+                else:
+                    logger.info(f"ℹ️ {profile_name} - автоматическое закрытие вкладок отключено")
+
                 logger.success(f"✅ {profile_name} - профиль успешно запущен")
                 return True
-                
+
             except Exception as e:
-                logger.error(f"❌ {profile_name} - ошибка при подключении к Chrome через CDP: {str(e)}")
-                return False
-                
+                logger.error(f"❌ {profile_name} - ошибка при открытии страницы с информацией о профиле: {str(e)}")
+
+            logger.success(f"✅ {profile_name} - профиль успешно запущен")
+            return True
+
         except Exception as e:
-            logger.error(f"❌ {profile_name} - ошибка при запуске профиля: {str(e)}")
+            logger.error(f"❌ {profile_name} - ошибка при подключении к Chrome через CDP: {str(e)}")
+            self.__close_cdp_browser()
             return False
-    
-    def run_scripts(self, profile_name: str, scripts_list: list[str], headless: bool = False) -> None:
+
+    def __close_cdp_browser(self) -> None:
+        """
+        Закрывает CDP-подключение неудачной попытки attach, иначе повтор перезапишет self.browser и оставит его открытым
+        """
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception as e:
+                logger.debug('не удалось закрыть CDP-подключение, причина: {}', e)
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    @profiled_run('playwright')
+    def run_scripts(self,
+                    profile_name: str,
+                    scripts_list: list[str],
+                    headless: bool = False,
+                    batch_id: str | None = None,
+                    journal: 'BatchJournal | None' = None,
+                    retry_policy: RetryPolicy | None = None,
+                    lean: bool | None = None) -> bool:
         """
         Запускает скрипты для профиля Chrome
         
@@ -339,10 +498,28 @@ class PlaywrightChrome:
             profile_name: Имя профиля
             scripts_list: Список скриптов для запуска
             headless: Запускать ли браузер в фоновом режиме
+            batch_id: Идентификатор пакетного прогона для записи результатов
+            journal: Журнал прогона, в котором отмечаются выполненные скрипты
+            retry_policy: Политика повторов прогона (если None, берется из конфигурации)
+            lean: Облегченный запуск (если None, берется general_config['lean_run'])
+
+        Returns:
+            bool: True, если профиль запущен и все скрипты выполнены успешно
         """
+        run = ProfileRun('playwright', profile_name, batch_id, journal=journal, scripts_total=len(scripts_list))
+        self.last_run = run
+        with run.phase('snapshot'):
+            snapshot_before_run(profile_name, run.batch_id)
+        retry_policy = retry_policy or RetryPolicy.from_config()
+        lean = is_lean_run_enabled() if lean is None else lean
+        error = None
+
         try:
-            # Запускаем профиль
-            success = self.launch_profile(profile_name, headless)
+            # Запускаем профиль, фазы launch и attach замеряются внутри launch_profile
+            run.publish('launching')
+            success = self.launch_profile(profile_name, headless, retry_policy=retry_policy, on_retry=run.add_retry, lean=lean)
+            for phase, duration in self.launch_timings.items():
+                run.add_phase_duration(phase, duration)
             if not success:
                 raise Exception('не удалось запустить браузер')
             
@@ -350,50 +527,67 @@ class PlaywrightChrome:
             context = self.context  # Используем существующий контекст
             page = self.page  # Используем существующую страницу
             
-            logger.debug(f'{profile_name} - подключение установлено')
+            logger.debug('{} - подключение установлено', profile_name)
             
-            logger.debug(f'{profile_name} - скрипты для прогона: {scripts_list}')
+            logger.debug('{} - скрипты для прогона: {}', profile_name, scripts_list)
             for script in scripts_list:
                 try:
                     human_name = self.scripts[script]['human_name']
                     logger.info(f'ℹ️ {profile_name} - запускаю скрипт "{human_name}"')
                     script_data_path = os.path.join(DATA_PATH, 'scripts', "playwright", script)
-                    self.scripts[script]['method'](
-                        profile_name,
-                        script_data_path,
-                        page
-                    )
-                    logger.info(f'✅  {profile_name} - скрипт "{human_name}" выполнен')
+                    with run.script(script) as outcome:
+                        result = retry_policy.call(
+                            'script',
+                            self.scripts[script]['method'],
+                            profile_name,
+                            script_data_path,
+                            page,
+                            description=f'{profile_name} - скрипт "{human_name}"',
+                            is_failed=lambda script_result: script_result is False,
+                            on_retry=run.add_retry,
+                            retryable=self.scripts[script].get('idempotent', False)
+                        )
+                        outcome['failed'] = result is False
+
+                    if outcome['failed']:
+                        logger.error(f'⛔  {profile_name} - скрипт "{human_name}" завершен с ошибкой')
+                    else:
+                        logger.info(f'✅  {profile_name} - скрипт "{human_name}" выполнен')
                 except Exception as e:
                     human_name = self.scripts[script]['human_name']
                     logger.error(f'⛔  {profile_name} - скрипт "{human_name}" завершен с ошибкой')
-                    logger.debug(f'{profile_name} - скрипт "{human_name}" завершен с ошибкой, причина: {e}')
+                    logger.debug('{} - скрипт "{}" завершен с ошибкой, причина: {}', profile_name, human_name, e)
             
         except Exception as e:
+            error = e
             logger.error(f'⛔  {profile_name} - не удалось запустить профиль, выполнение скриптов прервано')
-            logger.debug(f'{profile_name} - не удалось запустить профиль, причина: {e}')
-            return
+            logger.debug('{} - не удалось запустить профиль, причина: {}', profile_name, e)
         
         finally:
-            # Закрываем браузер и playwright
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
-            logger.debug(f'{profile_name} - профиль закрыт')
+            # Отключаемся от браузера, общий драйвер Playwright остается жить до конца прогона
+            with run.phase('teardown'):
+                if self.browser:
+                    try:
+                        self.browser.close()
+                    except Exception as e:
+                        logger.debug('{} - не удалось отключиться от браузера, причина: {}', profile_name, e)
+                    self.browser = None
+                self.playwright = None
+            logger.debug('{} - профиль закрыт', profile_name)
+
+        return run.finish(error).success
     
     def close(self) -> None:
         """
-        Закрывает браузер и освобождает ресурсы
+        Закрывает браузер и освобождает ресурсы.
+        Общий драйвер Playwright не останавливается, для этого есть stop_shared_playwright
         """
         try:
             if self.browser:
                 self.browser.close()
                 self.browser = None
                 
-            if self.playwright:
-                self.playwright.stop()
-                self.playwright = None
+            self.playwright = None
                 
             if self.chrome_process:
                 try:
@@ -0,0 +1,178 @@
+"""
+Одновременный запуск многих профилей для ручной работы с плавным разгоном.
+
+Все профили живут в одной папке данных (--user-data-dir), поэтому первый запущенный процесс
+становится браузером, а каждый следующий передает ему команду открыть профиль и завершается.
+Готовность запуска определяется без портов отладки:
+    handed_off  процесс передал профиль уже запущенному браузеру и завершился с кодом 0
+    ready       процесс сам стал браузером: SingletonLock папки профилей указывает на его pid
+                (на Windows - lockfile папки профилей занят, а других запусков в процессе нет)
+    failed      процесс не запустился или завершился с ошибкой
+    timeout     за launch_ready_timeout_sec процесс так и не стал готов (сам процесс не убивается)
+
+Новые процессы стартуют не чаще launch_ramp_per_sec в секунду, одновременно неготовых - не больше
+launch_max_in_flight. Скорость подстраивается под машину: по закону Литтла устойчивая пропускная
+способность - launch_max_in_flight / среднее время до готовности, и пауза между запусками
+растягивается, если машина не успевает.
+
+На Windows владельца lockfile по pid не определить, поэтому, пока браузер не запущен, профиль
+запускается один: он и станет браузером. Остальные запуски идут после и готовы, когда передадут
+профиль браузеру и завершатся.
+
+Каждый запуск проходит через AdmissionController (src.utils.resource_scheduler): новый профиль
+стартует, только если после него останется запас памяти и CPU (admission_* в general_config),
+иначе запуск откладывается с нарастающей паузой. Слот допуска освобождается, когда запуск завершен.
+"""
+
+import os
+import sys
+import time
+import subprocess
+from collections import deque
+
+from loguru import logger
+
+from config import general_config
+from src.utils.helpers import get_singleton_lock_owner, is_windows_lock_held
+from src.utils.resource_scheduler import AdmissionController
+
+
+_POLL_INTERVAL = 0.05       # как часто проверять готовность запущенных процессов, сек
+_LATENCY_SMOOTHING = 0.3    # вес нового замера во взвешенном среднем времени до готовности
+_MIN_RAMP_PER_SEC = 0.2     # нижняя граница скорости разгона
+
+
+def _readiness(process: subprocess.Popen, may_become_browser: bool) -> str | None:
+    """
+    Args:
+        process: Запущенный процесс Chrome
+        may_become_browser: Браузер не был запущен, и процесс может стать им сам
+
+    Returns:
+        str | None: handed_off / ready / failed или None, если процесс еще запускается
+    """
+    returncode = process.poll()
+    if returncode is not None:
+        return 'handed_off' if returncode == 0 else 'failed'
+
+    if not may_become_browser:
+        return None  # браузер уже был запущен - процесс готов, когда передаст ему профиль и завершится
+
+    if sys.platform == 'win32':
+        # запуск, который может стать браузером, на Windows идет один, поэтому lockfile занят именно им
+        return 'ready' if is_windows_lock_held() else None
+
+    owner = get_singleton_lock_owner()
+    return 'ready' if owner is not None and owner[1] == process.pid else None
+
+
+def launch_profiles(profiles: list[str | int],
+                    chrome=None,
+                    ramp_per_sec: float | None = None,
+                    max_in_flight: int | None = None,
+                    ready_timeout: float | None = None,
+                    on_profile_ready=None,
+                    admission: AdmissionController | None = None) -> dict:
+    """
+    Запускает профили для ручной работы (без порта отладки, не headless) с плавным разгоном
+
+    Args:
+        profiles: Профили (с префиксом "Profile " или без)
+        chrome: Экземпляр Chrome, по умолчанию новый
+        ramp_per_sec: Сколько процессов запускать в секунду, по умолчанию general_config['launch_ramp_per_sec']
+        max_in_flight: Сколько неготовых запусков допускается одновременно, по умолчанию general_config['launch_max_in_flight']
+        ready_timeout: Сколько ждать готовности одного запуска, по умолчанию general_config['launch_ready_timeout_sec']
+        on_profile_ready: Вызывается для каждого профиля по завершении запуска: on_profile_ready(report, done, total)
+        admission: Контроллер ресурсов хоста, по умолчанию из настроек на max_in_flight слотов
+
+    Returns:
+        dict: profiles (profile, status, ready_sec), seconds, final_ramp_per_sec
+    """
+    if chrome is None:
+        from src.chrome.chrome import Chrome
+        chrome = Chrome()
+
+    ramp_per_sec = max(_MIN_RAMP_PER_SEC, float(ramp_per_sec or general_config.get('launch_ramp_per_sec', 4)))
+    max_in_flight = max(1, int(max_in_flight or general_config.get('launch_max_in_flight', 8)))
+    ready_timeout = float(ready_timeout or general_config.get('launch_ready_timeout_sec', 30))
+
+    admission = admission or AdmissionController.from_config(max_in_flight)
+    admission_interval, admission_max_interval = admission.poll_interval_sec
+    waiting_for_resources = False
+
+    pending = deque(str(profile).removeprefix('Profile ') for profile in profiles)
+    total = len(pending)
+    reports = []
+    in_flight = {}  # профиль -> (процесс, время запуска, может стать браузером)
+    average_ready = None
+    current_rate = ramp_per_sec
+    next_launch_at = started = time.monotonic()
+
+    def finish(name: str, status: str, ready_sec: float | None) -> None:
+        report = {'profile': name, 'status': status, 'ready_sec': round(ready_sec, 3) if ready_sec is not None else None}
+        reports.append(report)
+        if status == 'failed':
+            logger.error(f'⛔  {name} - профиль не запустился')
+        elif status == 'timeout':
+            logger.warning(f'⚠️ {name} - профиль не ответил за {ready_timeout:g} сек')
+        else:
+            logger.debug('{} - профиль готов за {} сек ({})', name, report['ready_sec'], status)
+        if on_profile_ready:
+            try:
+                on_profile_ready(report, len(reports), total)
+            except Exception as e:
+                logger.debug('{} - ошибка в обработчике готовности запуска, причина: {}', name, e)
+
+    while pending or in_flight:
+        now = time.monotonic()
+
+        for name, (process, launched_at, may_become_browser) in list(in_flight.items()):
+            status = _readiness(process, may_become_browser)
+            if status is None and now - launched_at < ready_timeout:
+                continue
+
+            del in_flight[name]
+            admission.release()
+            ready_sec = now - launched_at
+            finish(name, status or 'timeout', ready_sec)
+            if status in ('ready', 'handed_off'):
+                average_ready = ready_sec if average_ready is None else (
+                    _LATENCY_SMOOTHING * ready_sec + (1 - _LATENCY_SMOOTHING) * average_ready
+                )
+                current_rate = max(_MIN_RAMP_PER_SEC, min(ramp_per_sec, max_in_flight / max(average_ready, 1e-3)))
+            elif status is None:
+                # запуск завис - машина перегружена, сбрасываем скорость вдвое
+                current_rate = max(_MIN_RAMP_PER_SEC, current_rate / 2)
+
+        # на Windows, пока браузер не запущен, следующий профиль ждет, чтобы браузером стал один известный процесс
+        sole_launch_pending = sys.platform == 'win32' and any(entry[2] for entry in in_flight.values())
+        if pending and len(in_flight) < max_in_flight and now >= next_launch_at and not sole_launch_pending:
+            admitted, reason = admission.try_acquire(pending[0])
+            if not admitted:
+                if not waiting_for_resources:
+                    logger.info(f'⏳ {pending[0]} - ожидаю ресурсы: {reason}')
+                    waiting_for_resources = True
+                next_launch_at = now + admission_interval
+                admission_interval = min(admission_interval * 2, admission_max_interval)
+                continue
+
+            waiting_for_resources = False
+            admission_interval = admission.poll_interval_sec[0]
+            name = pending.popleft()
+            may_become_browser = sys.platform != 'win32' or not is_windows_lock_held()
+            process = chrome.launch_profile(name, debug=False, headless=False, maximized=False)
+            if process is None:
+                admission.release()
+                finish(name, 'failed', None)
+            else:
+                in_flight[name] = (process, time.monotonic(), may_become_browser)
+            next_launch_at = max(now, next_launch_at) + 1 / current_rate
+            continue
+
+        time.sleep(_POLL_INTERVAL)
+
+    seconds = round(time.monotonic() - started, 3)
+    ready = sum(report['status'] in ('ready', 'handed_off') for report in reports)
+    logger.info(f'📊 Запущено профилей: {ready} из {total} за {seconds:g} сек')
+
+    return {'profiles': reports, 'seconds': seconds, 'final_ramp_per_sec': round(current_rate, 3)}
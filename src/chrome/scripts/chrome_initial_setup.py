@@ -4,11 +4,15 @@ import json
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from loguru import logger
 
 from .utils import js_click, close_all_other_tabs
 
 
+_STEP_TIMEOUT_SEC = 10  # сколько ждать отрисовки следующего шага мастера приватности
+
+
 def chrome_initial_setup(profile_name: str | int, script_data_path: str, driver: webdriver.Chrome) -> None:
     with open(os.path.join(script_data_path, 'config.json'), 'r', encoding="utf-8") as f:
         config = json.load(f)
@@ -174,7 +178,9 @@ def adjust_privacy_choices(name: str | int, driver: webdriver.Chrome, working_ta
             'settings-toggle-button'
         ]
 
-        searches_and_browser_better_sr = dive_into_shadowroots(unique_sr, host_tags)
+        searches_and_browser_better_sr = WebDriverWait(driver, _STEP_TIMEOUT_SEC).until(
+            lambda _: dive_into_shadowroots(unique_sr, host_tags)
+        )
         searches_and_browser_better_toggle = searches_and_browser_better_sr.find_element(By.ID, 'control')
         if searches_and_browser_better_toggle.get_attribute('aria-pressed') == 'true':
             close_all_other_tabs(driver, working_tab)
@@ -188,7 +194,9 @@ def adjust_privacy_choices(name: str | int, driver: webdriver.Chrome, working_ta
             'settings-collapse-radio-button#safeBrowsingRadioStandard'
         ]
 
-        safe_browsing_sr = dive_into_shadowroots(unique_sr, host_tags)
+        safe_browsing_sr = WebDriverWait(driver, _STEP_TIMEOUT_SEC).until(
+            lambda _: dive_into_shadowroots(unique_sr, host_tags)
+        )
         standard_mode_radio_btn = safe_browsing_sr.find_element(By.ID, 'button')
         if standard_mode_radio_btn.get_attribute('aria-checked') == 'false': 
             safe_browsing_btn = safe_browsing_sr.find_element(By.ID, 'radioCollapse')
@@ -204,7 +212,9 @@ def adjust_privacy_choices(name: str | int, driver: webdriver.Chrome, working_ta
             'settings-collapse-radio-button#block3PIncognito'
         ]
 
-        block_cookies_in_incognito_sr = dive_into_shadowroots(unique_sr, host_tags)
+        block_cookies_in_incognito_sr = WebDriverWait(driver, _STEP_TIMEOUT_SEC).until(
+            lambda _: dive_into_shadowroots(unique_sr, host_tags)
+        )
         block_cookies_in_incognito_radio_btn = block_cookies_in_incognito_sr.find_element(By.ID, 'button')
         if block_cookies_in_incognito_radio_btn.get_attribute('aria-checked') == 'false': 
             block_cookies_in_incognito_btn = block_cookies_in_incognito_sr.find_element(By.ID, 'radioCollapse')
@@ -215,7 +225,9 @@ def adjust_privacy_choices(name: str | int, driver: webdriver.Chrome, working_ta
         close_all_other_tabs(driver, working_tab)
         js_click(driver, next_button)
 
-        finish_fragment_element = unique_sr.find_element(By.CSS_SELECTOR, 'privacy-guide-completion-fragment')
+        finish_fragment_element = WebDriverWait(driver, _STEP_TIMEOUT_SEC).until(
+            lambda _: unique_sr.find_element(By.CSS_SELECTOR, 'privacy-guide-completion-fragment')
+        )
         finish_fragment_sr = finish_fragment_element.shadow_root
         done_button = finish_fragment_sr.find_element(By.ID, 'leaveButton')
         close_all_other_tabs(driver, working_tab)
@@ -13,6 +13,9 @@ from loguru import logger
 from .utils import parse_proxy, js_click, close_all_other_tabs, get_txt_line_by_profile_name
 
 
+_APPLY_SAVE_SEC = 0.5  # Apply сохраняет настройки асинхронно, а следом идет переход на другую страницу
+
+
 def omega_proxy_setup(profile_name: str | int, script_data_path: str | Path, driver: webdriver.Chrome) -> None:
     with open(os.path.join(script_data_path, 'config.json'), 'r') as f:
         config = json.load(f)
@@ -80,7 +83,7 @@ def omega_proxy_setup(profile_name: str | int, script_data_path: str | Path, dri
     time.sleep(0.1)
     apply_changes_btn = wait.until(EC.element_to_be_clickable((By.XPATH, '//a[@ng-click="applyOptions()"]')))
     close_all_other_tabs(driver, working_tab)
-    js_click(driver, apply_changes_btn)
+    js_click(driver, apply_changes_btn, sleep_after=_APPLY_SAVE_SEC)
 
     # Turn it on
     driver.get(f'chrome-extension://{config["extension_id"]}/options.html#!/ui')
@@ -96,7 +99,7 @@ def omega_proxy_setup(profile_name: str | int, script_data_path: str | Path, dri
     time.sleep(0.1)
     apply_changes_btn = wait.until(EC.element_to_be_clickable((By.XPATH, '//a[@ng-click="applyOptions()"]')))
     close_all_other_tabs(driver, working_tab)
-    js_click(driver, apply_changes_btn)
+    js_click(driver, apply_changes_btn, sleep_after=_APPLY_SAVE_SEC)
 
     # Turn off notifications
     driver.get(f'chrome-extension://{config["extension_id"]}/options.html#!/general')
@@ -109,18 +112,12 @@ def omega_proxy_setup(profile_name: str | int, script_data_path: str | Path, dri
 
         apply_changes_btn = wait.until(EC.element_to_be_clickable((By.XPATH, '//a[@ng-click="applyOptions()"]')))
         close_all_other_tabs(driver, working_tab)
-        js_click(driver, apply_changes_btn)
+        js_click(driver, apply_changes_btn, sleep_after=_APPLY_SAVE_SEC)
 
 
 def get_proxy_by_profile_name(profile_name: str | int, script_data_path: str) -> str | None:
-    with open(os.path.join(script_data_path, 'proxies.txt'), 'r') as f:
-        proxies_data = [i.strip() for i in f.readlines()]
-
-    selected_proxy = None
-    for line in proxies_data:
-        name, _proxy = line.split('|')
-        if name == str(profile_name):
-            selected_proxy = _proxy
-            break
+    profile_data = get_txt_line_by_profile_name(profile_name, os.path.join(script_data_path, 'proxies.txt'))
+    if not profile_data:
+        return None
 
-    return selected_proxy
+    return profile_data.split('|')[1]
@@ -4,6 +4,9 @@ from pathlib import Path
 from selenium.webdriver.remote.webelement import WebElement
 from selenium import webdriver
 
+from src.utils.helpers import human_delay
+from src.utils.data_sources import get_txt_line_by_profile_name
+
 
 def parse_proxy(proxy: str) -> tuple[str, str, str, str, str]:
     proto = proxy.split('://')[0]
@@ -18,10 +21,14 @@ def parse_proxy(proxy: str) -> tuple[str, str, str, str, str]:
 def js_click(
         _driver: webdriver.Chrome,
         element: WebElement,
-        sleep_before: int | float = 0.2,
-        sleep_after: int | float = 0.2
+        sleep_before: int | float | None = None,
+        sleep_after: int | float = 0
 ) -> None:
-    time.sleep(sleep_before)
+    # Готовность элемента проверяет WebDriverWait до вызова, пауза нужна только как явная политика
+    if sleep_before is None:
+        human_delay()
+    else:
+        time.sleep(sleep_before)
     _driver.execute_script("arguments[0].click();", element)
     time.sleep(sleep_after)
 
@@ -35,20 +42,6 @@ def close_all_other_tabs(_driver: webdriver.Chrome, current_tab: str) -> None:
     _driver.switch_to.window(current_tab)
 
 
-def get_txt_line_by_profile_name(profile_name: str | int, file_path: str | Path) -> str | None:
-    with open(file_path, 'r') as f:
-        data = [i.strip() for i in f.readlines()]
-
-    selected_line = None
-    for line in data:
-        name, profile_data = line.split('|', 1)
-        if name == str(profile_name):
-            selected_line = line
-            break
-
-    return selected_line
-
-
 def is_twelve_words_string(text: str) -> bool:
     words = text.split()
     return len(words) == 12
@@ -0,0 +1,72 @@
+from PySide6.QtCore import QObject, Signal, Property, QTimer
+
+from src.utils.progress_events import event_bus, BatchProgress
+
+
+class ProgressFeed(QObject):
+    """
+    Адаптер шины событий прогона для QML.
+
+    События публикуются в потоках раннеров, сигналы Qt доходят до QML в главном потоке
+    через очередь событий. Раз в несколько секунд сводка пересчитывается и без новых событий,
+    чтобы ETA и зависшие профили обновлялись во время долгих скриптов.
+    Регистрируется в QML как progressFeed
+    """
+    eventReceived = Signal('QVariantMap')  # каждое событие прогона как есть
+    progressChanged = Signal()  # сводка прогона изменилась
+
+    def __init__(self, refresh_interval_ms: int = 5000):
+        super().__init__()
+        self.tracker = BatchProgress()
+        self._unsubscribe = event_bus.subscribe(self._on_event)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(refresh_interval_ms)
+        self._refresh_timer.timeout.connect(self.progressChanged.emit)
+
+        self.progressChanged.connect(self._update_refresh_timer)
+
+    def _on_event(self, event: dict) -> None:
+        self.tracker.handle(event)
+        self.eventReceived.emit(event)
+        self.progressChanged.emit()
+
+    def _update_refresh_timer(self) -> None:
+        snapshot = self.tracker.snapshot()
+        running = bool(snapshot) and not snapshot['finished']
+        if running and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+        elif not running and self._refresh_timer.isActive():
+            self._refresh_timer.stop()
+
+    def close(self) -> None:
+        self._refresh_timer.stop()
+        self._unsubscribe()
+
+    def get_progress(self) -> dict:
+        return self.tracker.snapshot()
+
+    def get_status_text(self) -> str:
+        snapshot = self.tracker.snapshot()
+        if not snapshot:
+            return ''
+
+        parts = [f"Выполнено {snapshot['done']} из {snapshot['total']}"]
+        if snapshot['failed']:
+            parts.append(f"с ошибками {snapshot['failed']}")
+        if snapshot['profiles_per_min']:
+            parts.append(f"{snapshot['profiles_per_min']} проф./мин")
+        if snapshot['eta_sec'] is not None and not snapshot['finished']:
+            parts.append(f"осталось ~{max(1, round(snapshot['eta_sec'] / 60))} мин")
+
+        for state in snapshot['running']:
+            stage = f"{state['stage']} {state['script']}" if state['script'] else state['stage']
+            parts.append(f"{state['profile']} ({state['runner']}): {stage}")
+        if snapshot['stalled']:
+            stalled = ', '.join(f"{state['profile']} ({state['runner']})" for state in snapshot['stalled'])
+            parts.append(f"⚠️ нет событий дольше {self.tracker.stall_sec} с: {stalled}")
+
+        return ' · '.join(parts)
+
+    progress = Property('QVariantMap', get_progress, notify=progressChanged)
+    statusText = Property(str, get_status_text, notify=progressChanged)
@@ -64,6 +64,9 @@ Window {
     property bool isProcessing: false
     property string operationStatus: ""
     property bool operationSuccess: false
+    property int profilesDone: 0
+    property int profilesTotal: 0
+    property int profilesFailed: 0
     
     // Модели для списков
     property var selectedProfiles: []
@@ -88,6 +91,12 @@ Window {
     Connections {
         target: profileManager
         
+        function onManagerScriptProgressChanged(done, total, failed) {
+            profilesDone = done
+            profilesTotal = total
+            profilesFailed = failed
+        }
+        
         function onManagerScriptOperationStatusChanged(success, message) {
             isProcessing = false
             operationStatus = message
@@ -634,6 +643,9 @@ Window {
                             
                             if (selectedProfiles.length > 0 && selectedScripts.length > 0 && !isProcessing) {
                                 isProcessing = true
+                                profilesDone = 0
+                                profilesTotal = 0
+                                profilesFailed = 0
                                 
                                 // Обновляем цвет кнопки
                                 parent.color = "#e0e0e0"
@@ -680,6 +692,25 @@ Window {
             }
         }
         
+        // Ход прогона: выполненные профили и события текущих профилей
+        ProgressBar {
+            Layout.fillWidth: true
+            visible: isProcessing && profilesTotal > 0
+            from: 0
+            to: Math.max(profilesTotal, 1)
+            value: profilesDone
+        }
+        
+        Text {
+            Layout.fillWidth: true
+            visible: isProcessing && profilesTotal > 0
+            text: progressFeed.statusText !== "" ? progressFeed.statusText
+                  : "Выполнено " + profilesDone + " из " + profilesTotal + (profilesFailed > 0 ? ", с ошибками " + profilesFailed : "")
+            color: "#555555"
+            font.pixelSize: 13
+            wrapMode: Text.WordWrap
+        }
+        
         // Сообщение о статусе
         Rectangle {
             id: statusMessage
@@ -538,6 +538,16 @@ Window {
                         }
                     }
                     
+                    // Ход прогона в реальном времени
+                    Text {
+                        Layout.fillWidth: true
+                        visible: isProcessing && progressFeed.statusText !== ""
+                        text: progressFeed.statusText
+                        color: "#555555"
+                        font.pixelSize: 13
+                        wrapMode: Text.WordWrap
+                    }
+                    
                     // Сообщение о статусе
                     Rectangle {
                         id: statusMessage
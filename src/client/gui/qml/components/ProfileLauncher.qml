@@ -59,6 +59,12 @@ Window {
     property string currentListId: ""
     property string currentListName: ""
     
+    // Ход запуска профилей
+    property int launchDone: 0
+    property int launchTotal: 0
+    property int launchFailed: 0
+    property bool isLaunching: launchDone < launchTotal
+    
     // Обработка сигналов от ProfileManager
     Connections {
         target: profileManager
@@ -70,6 +76,12 @@ Window {
             statusMessage.visible = true
             statusTimer.restart()
         }
+        
+        function onProfileLaunchProgressChanged(done, total, failed) {
+            launchDone = done
+            launchTotal = total
+            launchFailed = failed
+        }
     }
     
     // Основной макет
@@ -339,7 +351,7 @@ Window {
                         Button {
                             text: "Запустить выбранные профили"
                             Layout.fillWidth: true
-                            enabled: profileManager.hasSelectedProfiles && !isProcessing
+                            enabled: profileManager.hasSelectedProfiles && !isProcessing && !isLaunching
                             
                             background: Rectangle {
                                 color: parent.enabled ? (parent.hovered ? "#e0f2f1" : "#ffffff") : "#f5f5f5"
@@ -363,7 +375,7 @@ Window {
                         Button {
                             text: "Запустить все профили из списка"
                             Layout.fillWidth: true
-                            enabled: currentListId !== "" && !isProcessing
+                            enabled: currentListId !== "" && !isProcessing && !isLaunching
                             
                             background: Rectangle {
                                 color: parent.enabled ? (parent.hovered ? "#e0f2f1" : "#ffffff") : "#f5f5f5"
@@ -388,6 +400,16 @@ Window {
             }
         }
         
+        // Ход запуска профилей
+        Text {
+            Layout.fillWidth: true
+            visible: launchTotal > 0
+            text: "Запущено профилей: " + launchDone + " из " + launchTotal + (launchFailed > 0 ? ", не запустилось: " + launchFailed : "")
+            color: launchFailed > 0 ? "#c62828" : "#00796b"
+            font.pixelSize: 14
+            horizontalAlignment: Text.AlignHCenter
+        }
+        
         // Кнопка закрытия
         Button {
             text: "🏠 Закрыть окно"
@@ -1,10 +1,44 @@
-from .create_multiple_profiles import create_multiple_profiles
-from .launch_multiple_profiles import launch_multiple_profiles
-from .manage_extensions import manage_extensions
-from .run_chrome_scripts_on_multiple_profiles import run_chrome_scripts_on_multiple_profiles
-from .run_manager_scripts_on_multiple_profiles import run_manager_scripts_on_multiple_profiles
-from .run_playwright_scripts_on_multiple_profiles import run_playwright_scripts_on_multiple_profiles
-from .show_all_profiles import show_all_profiles
-from .update_comments import update_comments
+"""
+Пункты консольного меню.
+
+Модули пунктов меню импортируются лениво, при первом обращении к атрибуту пакета:
+многие из них тянут selenium, playwright или rich, и загружать их на старте
+приложения не нужно.
+"""
+
+import importlib
 
 from .utils import *
+
+
+_MENU_ACTIONS = {
+    'check_profiles_health': '.check_profiles_health',
+    'create_multiple_profiles': '.create_multiple_profiles',
+    'export_profiles_inventory': '.export_profiles_inventory',
+    'launch_multiple_profiles': '.launch_multiple_profiles',
+    'manage_extensions': '.manage_extensions',
+    'patch_preferences': '.patch_preferences',
+    'profile_snapshots': '.profile_snapshots',
+    'profiles_archive': '.profiles_archive',
+    'profiles_disk_usage': '.profiles_disk_usage',
+    'run_chrome_scripts_on_multiple_profiles': '.run_chrome_scripts_on_multiple_profiles',
+    'run_manager_scripts_on_multiple_profiles': '.run_manager_scripts_on_multiple_profiles',
+    'run_playwright_scripts_on_multiple_profiles': '.run_playwright_scripts_on_multiple_profiles',
+    'show_all_profiles': '.show_all_profiles',
+    'update_comments': '.update_comments',
+}
+
+
+def __getattr__(name: str):
+    if name not in _MENU_ACTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_MENU_ACTIONS[name], __name__)
+    action = getattr(module, name)
+    globals()[name] = action
+
+    return action
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_MENU_ACTIONS))
@@ -0,0 +1,67 @@
+import questionary
+from loguru import logger
+
+from src.utils.profile_health import check_profiles, format_issue, HEALTH_REPORT_PATH
+from .utils import select_profiles, custom_style
+
+
+def check_profiles_health():
+    """
+    Проверяет выбранные профили, показывает найденные проблемы и предлагает их исправить
+    """
+    selected_profiles = select_profiles()
+    if not selected_profiles:
+        return
+
+    report = check_profiles(selected_profiles)
+    if not _log_report(report):
+        logger.info('✅  Проблем не найдено')
+        return
+
+    repair_choice = questionary.select(
+        "Исправить найденные проблемы? Битые версии расширений будут удалены, открытые в Chrome профили пропущены",
+        choices=[
+            '✅  да',
+            '❌  нет'
+        ],
+        style=custom_style
+    ).ask()
+    if not repair_choice or 'нет' in repair_choice:
+        logger.info(f'ℹ️ Отчет сохранен в {HEALTH_REPORT_PATH}')
+        return
+
+    report = check_profiles(selected_profiles, repair=True, remove_extensions=True)
+    for profile_report in report['profiles']:
+        if profile_report['repaired']:
+            logger.info(f"🔧 {profile_report['profile']} - исправлено: {', '.join(profile_report['repaired'])}")
+
+    if not _log_report(report):
+        logger.info('✅  Все проблемы исправлены')
+    logger.info(f'ℹ️ Отчет сохранен в {HEALTH_REPORT_PATH}')
+
+
+def _log_report(report: dict) -> bool:
+    """
+    Returns:
+        bool: Есть ли в отчете проблемы
+    """
+    found = False
+    for issue in report['shared_issues']:
+        found = True
+        logger.warning(f'⚠️ Папка профилей: {format_issue(issue)}')
+
+    for profile_report in report['profiles']:
+        if profile_report['status'] == 'running':
+            logger.info(f"ℹ️ {profile_report['profile']} - профиль открыт в Chrome, не проверялся")
+        elif profile_report['status'] == 'missing':
+            logger.warning(f"⚠️ {profile_report['profile']} - профиль не найден")
+
+        for issue in profile_report['issues']:
+            found = True
+            icon = '⛔ ' if issue['severity'] == 'error' else '⚠️'
+            logger.warning(f"{icon} {profile_report['profile']} - {format_issue(issue)}")
+
+    unhealthy = sum(profile_report['status'] == 'unhealthy' for profile_report in report['profiles'])
+    logger.info(f"📊 Проверено профилей: {len(report['profiles'])}, с ошибками: {unhealthy}")
+
+    return found
@@ -2,6 +2,7 @@ import questionary
 from loguru import logger
 
 from src.utils.helpers import get_profiles_list
+from src.utils.profile_clone import get_golden_profile, set_golden_profile, clone_profiles
 from src.chrome.chrome import Chrome
 from .utils import custom_style
 
@@ -10,6 +11,7 @@ def create_multiple_profiles() -> None:
     create_methods = [
         '📝 задать вручную',
         '🤖 задать автоматически',
+        '🧬 назначить шаблонный профиль',
         '🏠 назад в меню'
     ]
 
@@ -26,6 +28,10 @@ def create_multiple_profiles() -> None:
     if 'назад в меню' in create_method:
         return
 
+    if 'шаблонный профиль' in create_method:
+        select_golden_profile()
+        return
+
     existing_profile_names = get_profiles_list()
 
     profiles_to_create = []
@@ -68,6 +74,39 @@ def create_multiple_profiles() -> None:
         start = highest_existing_numeric_name + 1
         profiles_to_create = list(range(start, start + amount))
 
+    golden_profile = get_golden_profile()
+    if golden_profile and profiles_to_create:
+        source = questionary.select(
+            "Как создать профили?",
+            choices=[
+                f'🧬 копией шаблона {golden_profile}',
+                '📄 пустыми'
+            ],
+            style=custom_style
+        ).ask()
+        if not source:
+            return
+
+        if 'копией шаблона' in source:
+            clone_profiles([str(name) for name in profiles_to_create], golden_profile)
+            return
+
     chrome = Chrome()
     for name in profiles_to_create:
         chrome.create_new_profile(str(name))
+
+
+def select_golden_profile() -> None:
+    profiles = sorted(name.removeprefix('Profile ') for name in get_profiles_list())
+    if not profiles:
+        logger.warning('⚠️ Профилей нет')
+        return
+
+    golden_profile = get_golden_profile()
+    profile = questionary.select(
+        f"Выбери подготовленный профиль, копиями которого будут создаваться новые (сейчас: {golden_profile or 'не задан'})",
+        choices=profiles,
+        style=custom_style
+    ).ask()
+    if profile:
+        set_golden_profile(profile)
@@ -0,0 +1,39 @@
+import questionary
+from loguru import logger
+
+from src.utils.profile_inventory import export_inventory, INVENTORY_COLUMNS
+from .utils import select_profiles, custom_style
+
+
+def export_profiles_inventory():
+    """
+    Выгружает выбранные профили с выбранными колонками в CSV или JSONL
+    """
+    selected_profiles = select_profiles()
+    if not selected_profiles:
+        return
+
+    columns = questionary.checkbox(
+        "Выбери колонки",
+        choices=[questionary.Choice(column, checked=True) for column in INVENTORY_COLUMNS],
+        style=custom_style
+    ).ask()
+    if not columns:
+        logger.warning('⚠️ Колонки не выбраны')
+        return
+
+    output_path = questionary.path(
+        "Путь к файлу (.csv или .jsonl)\n",
+        style=custom_style
+    ).ask()
+    if not output_path:
+        return
+
+    try:
+        report = export_inventory(output_path.strip(), selected_profiles, tuple(columns))
+    except Exception as e:
+        logger.error('⛔  Не удалось выгрузить профили')
+        logger.debug('не удалось выгрузить профили, причина: {}', e)
+        return
+
+    logger.info(f"✅  Выгружено профилей: {report['rows']} ({report['format']}) в {report['path']} за {report['seconds']} сек")
@@ -1,7 +1,4 @@
-from time import sleep
-import concurrent.futures
-
-from src.chrome.chrome import Chrome
+from src.chrome.profile_launcher import launch_profiles
 from .utils import select_profiles
 
 
@@ -10,15 +7,4 @@ def launch_multiple_profiles():
     if not selected_profiles:
         return
 
-    chrome = Chrome()
-
-    for name in selected_profiles:
-        chrome.launch_profile(
-            str(name),
-            debug=False,
-            headless=False,
-            maximized=False
-        )
-
-        sleep(0.5)
-
+    launch_profiles(selected_profiles)
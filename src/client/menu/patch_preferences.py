@@ -0,0 +1,67 @@
+import json
+
+import questionary
+from loguru import logger
+
+from src.utils.preferences_patch import patch_profiles, normalize_edits, format_change, summarize_reports
+from .utils import select_profiles, custom_style
+
+
+def patch_preferences():
+    """
+    Применяет патч настроек Preferences (JSON-файл со списком правок) к выбранным профилям:
+    сначала показывает изменения без записи, затем применяет после подтверждения
+    """
+    selected_profiles = select_profiles()
+    if not selected_profiles:
+        return
+
+    patch_path = questionary.path(
+        "Путь к JSON-файлу с правками\n",
+        style=custom_style
+    ).ask()
+    if not patch_path:
+        return
+
+    try:
+        with open(patch_path.strip(), 'r', encoding='utf-8') as f:
+            edits = normalize_edits(json.load(f))
+    except Exception as e:
+        logger.error(f'⛔  Не удалось прочитать патч, причина: {e}')
+        return
+
+    reports = patch_profiles(selected_profiles, edits, dry_run=True)
+    for report in reports:
+        if report['status'] == 'changed':
+            logger.info(f"ℹ️ {report['profile']} - изменений: {len(report['changes'])}")
+            for change in report['changes']:
+                logger.info(f"    {format_change(change)}")
+        elif report['status'] == 'missing':
+            logger.warning(f"⚠️ {report['profile']} - файл Preferences не найден")
+
+    summary = summarize_reports(reports)
+    logger.info(f"📊 Будет изменено профилей: {summary['changed']}, уже соответствуют: {summary['compliant']}, "
+                f"без Preferences: {summary['missing']}, с ошибками: {summary['error']}")
+    if not summary['changed']:
+        return
+
+    apply_choice = questionary.select(
+        "Применить изменения?",
+        choices=[
+            '✅  да',
+            '❌  нет'
+        ],
+        style=custom_style
+    ).ask()
+    if not apply_choice or 'нет' in apply_choice:
+        return
+
+    changed_profiles = [report['profile'] for report in reports if report['status'] == 'changed']
+    reports = patch_profiles(changed_profiles, edits)
+    for report in reports:
+        if report['status'] == 'running':
+            logger.warning(f"⚠️ {report['profile']} - профиль открыт в Chrome, пропускаю")
+
+    summary = summarize_reports(reports)
+    logger.info(f"📊 Изменено профилей: {summary['changed']}, пропущено открытых: {summary['running']}, "
+                f"с ошибками: {summary['error']}")
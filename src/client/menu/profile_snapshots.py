@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import questionary
+from loguru import logger
+
+from src.utils.profile_snapshots import (
+    take_snapshots, restore_profiles, rollback_batch, list_snapshot_batches, prune_snapshots, collect_garbage
+)
+from src.utils.profile_disk_usage import format_size
+from .utils import select_profiles, custom_style
+
+
+def profile_snapshots():
+    """
+    Снимки профилей: ручной снимок, откат профилей к последнему снимку, откат всего прогона, очистка
+    """
+    action = questionary.select(
+        "Выбери действие",
+        choices=[
+            '📸 сделать снимок',
+            '⏪ откатить профили к последнему снимку',
+            '⏪ откатить прогон',
+            '🧹 удалить старые снимки',
+            '🏠 назад в меню'
+        ],
+        style=custom_style
+    ).ask()
+    if not action or 'назад' in action:
+        return
+
+    if 'сделать снимок' in action:
+        selected_profiles = select_profiles()
+        if not selected_profiles:
+            return
+        reports = take_snapshots(selected_profiles, 'manual')
+        new_bytes = sum(report['new_bytes'] for report in reports)
+        logger.info(f'✅  Снимков сделано: {len(reports)}, новых данных: {format_size(new_bytes)}')
+
+    elif 'к последнему снимку' in action:
+        selected_profiles = select_profiles()
+        if not selected_profiles:
+            return
+        _log_restore_reports(restore_profiles(selected_profiles))
+
+    elif 'откатить прогон' in action:
+        batches = list_snapshot_batches()[:20]
+        if not batches:
+            logger.warning('⚠️ Снимков перед прогонами нет')
+            return
+
+        choices = {
+            f"{_format_snapshot_time(batch['first_snapshot_id'])}  профилей: {len(batch['profiles'])}  ({batch['batch_id'][:8]})": batch['batch_id']
+            for batch in batches
+        }
+        batch_choice = questionary.select(
+            "Выбери прогон, профили вернутся к состоянию перед ним",
+            choices=list(choices),
+            style=custom_style
+        ).ask()
+        if not batch_choice:
+            return
+        _log_restore_reports(rollback_batch(choices[batch_choice]))
+
+    else:
+        removed = prune_snapshots(collect=False)
+        objects, freed = collect_garbage()
+        logger.info(f'✅  Удалено снимков: {removed}, объектов: {objects}, освобождено {format_size(freed)}')
+
+
+def _format_snapshot_time(snapshot_id: str) -> str:
+    try:
+        return datetime.strptime(snapshot_id, '%Y%m%d-%H%M%S-%f').strftime('%d.%m.%Y %H:%M:%S')
+    except ValueError:
+        return snapshot_id
+
+
+def _log_restore_reports(reports: list[dict]) -> None:
+    for report in reports:
+        if report['status'] == 'restored':
+            logger.info(f"✅  {report['profile']} - откат к снимку {_format_snapshot_time(report['snapshot_id'])}: "
+                        f"файлов восстановлено {report['written']}, удалено {report['removed']}")
+        elif report['status'] == 'running':
+            logger.warning(f"⚠️ {report['profile']} - профиль открыт в Chrome, пропускаю")
+        elif report['status'] == 'missing':
+            logger.warning(f"⚠️ {report['profile']} - снимков нет")
+
+    if any(report['status'] == 'restored' for report in reports):
+        logger.info('ℹ️ Состояние перед откатом сохранено снимком, откат можно отменить')
@@ -0,0 +1,84 @@
+import questionary
+from loguru import logger
+
+from src.utils.profile_archive import export_profiles, import_profiles
+from src.utils.profile_disk_usage import format_size
+from .utils import select_profiles, custom_style
+
+
+def profiles_archive():
+    """
+    Экспорт выбранных профилей в сжатый архив и импорт профилей из архива
+    """
+    action = questionary.select(
+        "Выбери действие",
+        choices=[
+            '📦 экспорт профилей в архив',
+            '📥 импорт профилей из архива',
+            '🏠 назад в меню'
+        ],
+        style=custom_style
+    ).ask()
+    if not action or 'назад' in action:
+        return
+
+    if 'экспорт' in action:
+        _export()
+    else:
+        _import()
+
+
+def _export():
+    selected_profiles = select_profiles()
+    if not selected_profiles:
+        return
+
+    archive_path = questionary.path(
+        "Путь к файлу архива\n",
+        style=custom_style
+    ).ask()
+    if not archive_path:
+        return
+
+    try:
+        report = export_profiles(selected_profiles, archive_path.strip())
+    except Exception as e:
+        logger.error('⛔  Не удалось экспортировать профили')
+        logger.debug('не удалось экспортировать профили, причина: {}', e)
+        return
+
+    logger.info(f"✅  Экспортировано профилей: {len(report['profiles'])}, файлов: {report['files']}, "
+                f"{format_size(report['bytes_in'])} -> {format_size(report['bytes_out'])} "
+                f"({report['compression']}) за {report['seconds']} сек")
+
+
+def _import():
+    archive_path = questionary.path(
+        "Путь к файлу архива\n",
+        style=custom_style
+    ).ask()
+    if not archive_path:
+        return
+
+    overwrite_choice = questionary.select(
+        "Заменять уже существующие профили?",
+        choices=[
+            '❌  нет',
+            '✅  да'
+        ],
+        style=custom_style
+    ).ask()
+    if not overwrite_choice:
+        return
+
+    try:
+        report = import_profiles(archive_path.strip(), overwrite='да' in overwrite_choice)
+    except Exception as e:
+        logger.error('⛔  Не удалось импортировать профили')
+        logger.debug('не удалось импортировать профили, причина: {}', e)
+        return
+
+    logger.info(f"✅  Импортировано профилей: {len(report['imported'])}, пропущено: {len(report['skipped'])} "
+                f"за {report['seconds']} сек")
+    if report['incomplete']:
+        logger.warning(f"⚠️ Не распакованы до конца: {', '.join(report['incomplete'])}, повтори импорт после докачки архива")
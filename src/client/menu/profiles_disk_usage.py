@@ -0,0 +1,66 @@
+import questionary
+from loguru import logger
+
+from src.utils.profile_disk_usage import scan_profiles, compact_profiles, format_size
+from .utils import select_profiles, custom_style
+
+
+def profiles_disk_usage():
+    """
+    Показывает размер выбранных профилей по категориям и предлагает очистить пересоздаваемые кэши
+    """
+    from rich.table import Table
+    from rich.console import Console
+
+    selected_profiles = select_profiles()
+    if not selected_profiles:
+        return
+
+    usage = scan_profiles(selected_profiles)
+
+    console = Console()
+    table = Table(style="cyan")
+    table.add_column("Название", style="magenta")
+    table.add_column("Всего", justify="right", style="green")
+    table.add_column("Кэши", justify="right")
+    table.add_column("IndexedDB", justify="right")
+    table.add_column("Расширения", justify="right")
+    table.add_column("Прочее", justify="right")
+
+    profiles_by_size = sorted(usage.items(), key=lambda item: item[1]['total'], reverse=True)
+    for profile, profile_usage in profiles_by_size:
+        categories = profile_usage['categories']
+        table.add_row(
+            profile,
+            format_size(profile_usage['total']),
+            format_size(profile_usage['regenerable']),
+            format_size(categories.get('indexeddb', 0)),
+            format_size(categories.get('extensions', 0)),
+            format_size(categories.get('other', 0)),
+        )
+
+    console.print(table)
+
+    regenerable = sum(profile_usage['regenerable'] for profile_usage in usage.values())
+    if not regenerable:
+        logger.info('ℹ️ Кэшей для очистки нет')
+        return
+
+    compact_choice = questionary.select(
+        f"Очистить кэши ({format_size(regenerable)})? Chrome пересоздаст их при запуске, открытые профили будут пропущены",
+        choices=[
+            '✅  да',
+            '❌  нет'
+        ],
+        style=custom_style
+    ).ask()
+    if not compact_choice or 'нет' in compact_choice:
+        return
+
+    reports = compact_profiles([profile for profile, profile_usage in usage.items() if profile_usage['regenerable']])
+    for report in reports:
+        if report['status'] == 'running':
+            logger.warning(f"⚠️ {report['profile']} - профиль открыт в Chrome, пропускаю")
+
+    freed = sum(report['freed'] for report in reports if report['status'] == 'compacted')
+    logger.info(f'✅  Кэши очищены, освобождено {format_size(freed)}')
@@ -4,59 +4,96 @@ import questionary
 from loguru import logger
 
 from src.chrome.chrome import Chrome
-from .utils import select_profiles, custom_style
+from src.chrome.lean_run import is_lean_run_enabled
+from src.utils.batch_journal import BatchJournal
+from src.utils.progress_events import publish_batch_started, publish_batch_finished
+from src.utils.profile_snapshots import collect_garbage
+from src.utils.retry_policy import RetryPolicy
+from .utils import select_profiles, custom_style, ask_resume_batch, exclude_unhealthy_profiles
 
 
 def run_chrome_scripts_on_multiple_profiles():
-    selected_profiles = select_profiles()
-    if not selected_profiles:
-        return
-
     chrome = Chrome()
-    scripts = {
-        value['human_name']: key
-        for key, value in chrome.scripts.items()
-    }
-
-    chosen_scripts_human_names = questionary.checkbox(
-        "Выбери скрипты",
-        choices=list(scripts.keys()),
-        style=custom_style
-    ).ask()
-
-    chosen_scripts = [scripts[name] for name in chosen_scripts_human_names]
-
-    if not chosen_scripts:
-        logger.warning('⚠️ Скрипты не выбраны')
-        return
-
-    if len(chosen_scripts) > 1:
-        shuffle_choice = questionary.select(
-            "Рандомить порядок выполнения скриптов?",
+
+    journal = ask_resume_batch('chrome')
+    if journal:
+        headless = journal.options.get('headless', False)
+    else:
+        selected_profiles = select_profiles()
+        if not selected_profiles:
+            return
+
+        selected_profiles = exclude_unhealthy_profiles(selected_profiles)
+        if not selected_profiles:
+            logger.warning('⚠️ Нет профилей, готовых к запуску')
+            return
+
+        scripts = {
+            value['human_name']: key
+            for key, value in chrome.scripts.items()
+        }
+
+        chosen_scripts_human_names = questionary.checkbox(
+            "Выбери скрипты",
+            choices=list(scripts.keys()),
+            style=custom_style
+        ).ask()
+
+        chosen_scripts = [scripts[name] for name in chosen_scripts_human_names]
+
+        if not chosen_scripts:
+            logger.warning('⚠️ Скрипты не выбраны')
+            return
+
+        if len(chosen_scripts) > 1:
+            shuffle_choice = questionary.select(
+                "Рандомить порядок выполнения скриптов?",
+                choices=[
+                    '✅  да',
+                    '❌  нет'
+                ],
+                style=custom_style
+            ).ask()
+
+            if 'да' in shuffle_choice:
+                shuffle(chosen_scripts)
+
+        headless_choice = questionary.select(
+            "Использовать Headless Mode?",
             choices=[
                 '✅  да',
                 '❌  нет'
             ],
+            default='✅  да' if is_lean_run_enabled() else None,  # в облегченном режиме по умолчанию headless
             style=custom_style
         ).ask()
 
-        if 'да' in shuffle_choice:
-            shuffle(chosen_scripts)
-
-    headless_choice = questionary.select(
-        "Использовать Headless Mode?",
-        choices=[
-            '✅  да',
-            '❌  нет'
-        ],
-        style=custom_style
-    ).ask()
-
-    headless = True if 'да' in headless_choice else False
-
-    for name in selected_profiles:
-        chrome.run_scripts(
-            str(name),
-            chosen_scripts,
-            headless
-        )
+        headless = True if 'да' in headless_choice else False
+
+        journal = BatchJournal.create('chrome', selected_profiles, chosen_scripts, {'headless': headless})
+
+    retry_policy = RetryPolicy.from_config()  # бюджет повторов общий на весь прогон
+    failed_profiles = []
+    publish_batch_started(journal.batch_id, 'chrome', [name for name in journal.profiles if journal.pending_scripts(name)])
+    for name in journal.profiles:
+        pending_scripts = journal.pending_scripts(name)
+        if not pending_scripts:
+            logger.info(f'⏭️ {name} - скрипты уже выполнены, пропускаю')
+            continue
+
+        if not chrome.run_scripts(
+            name,
+            pending_scripts,
+            headless,
+            journal=journal,
+            retry_policy=retry_policy
+        ):
+            failed_profiles.append(name)
+
+    publish_batch_finished(journal.batch_id, 'chrome', failed_profiles)
+    collect_garbage(pending_only=True)  # объекты снимков, удаленных по сроку хранения
+    logger.info(f'📊 Прогон завершен: успешно {len(journal.profiles) - len(failed_profiles)}, с ошибками {len(failed_profiles)}')
+    if failed_profiles:
+        logger.warning(f'⚠️ Профили с ошибками: {", ".join(failed_profiles)}, их можно перезапустить продолжением прогона')
+    else:
+        journal.finish()
@@ -1,21 +1,31 @@
 from random import shuffle
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import questionary
 from loguru import logger
 
+from config import general_config
 from src.manager.manager import Manager
+from src.utils.run_results import new_batch_id
+from src.utils.retry_policy import RetryPolicy
+from src.utils.progress_events import publish_batch_started, publish_batch_finished
+from src.utils.profile_snapshots import collect_garbage
 from .utils import select_profiles, custom_style
 
 
-def run_manager_scripts_on_multiple_profiles(profiles=None, scripts=None, shuffle_scripts=False, gui_mode=False):
+def run_manager_scripts_on_multiple_profiles(profiles=None, scripts=None, shuffle_scripts=False, gui_mode=False,
+                                             on_profile_done=None):
     """
-    Запускает выбранные скрипты менеджера для выбранных профилей
+    Запускает выбранные скрипты менеджера для выбранных профилей.
+    Скрипты менеджера работают только с файлами профиля, поэтому профили выполняются
+    параллельно, до general_config['max_workers'] одновременно
     
     Args:
         profiles (list, optional): Список профилей для запуска. Если None, будет запрошен выбор через консоль.
         scripts (list, optional): Список скриптов для запуска. Если None, будет запрошен выбор через консоль.
         shuffle_scripts (bool, optional): Перемешать порядок скриптов. По умолчанию False.
         gui_mode (bool, optional): Режим работы через GUI. По умолчанию False.
+        on_profile_done (Callable, optional): Вызывается после каждого профиля с (профиль, успех, выполнено, всего, с ошибками).
         
     Returns:
         bool: True, если все скрипты выполнены успешно, иначе False
@@ -68,19 +78,43 @@ def run_manager_scripts_on_multiple_profiles(profiles=None, scripts=None, shuffl
     if shuffle_scripts and len(chosen_scripts) > 1:
         shuffle(chosen_scripts)
     
-    success = True
-    
-    # Запускаем скрипты для каждого профиля
-    for name in selected_profiles:
+    failed_profiles = []
+    batch_id = new_batch_id()
+    retry_policy = RetryPolicy.from_config()  # бюджет повторов общий на весь прогон
+    publish_batch_started(batch_id, 'manager', selected_profiles)
+
+    def run_profile(name) -> bool:
+        # свой экземпляр Manager на профиль: last_run и состояние скриптов не делятся между потоками
         try:
-            result = manager.run_scripts(
+            return Manager().run_scripts(
                 str(name),
-                chosen_scripts
+                chosen_scripts,
+                batch_id,
+                retry_policy=retry_policy
             )
-            if not result:
-                success = False
         except Exception as e:
             logger.error(f"Ошибка при выполнении скриптов для профиля {name}: {e}")
-            success = False
+            return False
+
+    # Запускаем скрипты для профилей параллельно
+    max_workers = max(1, min(general_config['max_workers'], len(selected_profiles)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_profile, name): name for name in selected_profiles}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            name = futures[future]
+            success = future.result()
+            if not success:
+                failed_profiles.append(name)
+
+            if on_profile_done:
+                try:
+                    on_profile_done(name, success, done, len(selected_profiles), len(failed_profiles))
+                except Exception as e:
+                    logger.debug(f'обработчик хода прогона завершился с ошибкой, причина: {e}')
+
+    publish_batch_finished(batch_id, 'manager', failed_profiles)
+    collect_garbage(pending_only=True)  # объекты снимков, удаленных по сроку хранения
+    logger.info(f'📊 Прогон завершен: успешно {len(selected_profiles) - len(failed_profiles)}, с ошибками {len(failed_profiles)}')
     
-    return success
+    return not failed_profiles
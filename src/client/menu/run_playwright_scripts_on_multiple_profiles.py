@@ -3,76 +3,118 @@ from random import shuffle
 import questionary
 from loguru import logger
 
-from src.chrome.playwright_chrome import PlaywrightChrome
-from src.scripts import register_all_scripts
-from .utils import select_profiles, custom_style
+from src.chrome.playwright_chrome import PlaywrightChrome, stop_shared_playwright
+from src.chrome.lean_run import is_lean_run_enabled
+from src.utils.batch_journal import BatchJournal
+from src.utils.progress_events import publish_batch_started, publish_batch_finished
+from src.utils.profile_snapshots import collect_garbage
+from src.utils.retry_policy import RetryPolicy
+from .utils import select_profiles, custom_style, ask_resume_batch, exclude_unhealthy_profiles
 
 
 def run_playwright_scripts_on_multiple_profiles():
     """
     Запускает выбранные скрипты Playwright для выбранных профилей
     """
-    selected_profiles = select_profiles()
-    if not selected_profiles:
-        return
+    from src.scripts import register_all_scripts  # скрипты тянут playwright, импортируем по требованию
 
     # Создаем экземпляр PlaywrightChrome
     pw = PlaywrightChrome()
     
     # Регистрируем все доступные скрипты
     register_all_scripts(pw)
-    
-    # Получаем список скриптов для выбора
-    scripts = {
-        value['human_name']: key
-        for key, value in pw.scripts.items()
-    }
-
-    chosen_scripts_human_names = questionary.checkbox(
-        "Выбери скрипты",
-        choices=list(scripts.keys()),
-        style=custom_style
-    ).ask()
-
-    chosen_scripts = [scripts[name] for name in chosen_scripts_human_names]
-
-    if not chosen_scripts:
-        logger.warning('⚠️ Скрипты не выбраны')
-        return
-
-    if len(chosen_scripts) > 1:
-        shuffle_choice = questionary.select(
-            "Рандомить порядок выполнения скриптов?",
+
+    journal = ask_resume_batch('playwright')
+    if journal:
+        headless = journal.options.get('headless', False)
+    else:
+        selected_profiles = select_profiles()
+        if not selected_profiles:
+            return
+
+        selected_profiles = exclude_unhealthy_profiles(selected_profiles)
+        if not selected_profiles:
+            logger.warning('⚠️ Нет профилей, готовых к запуску')
+            return
+
+        # Получаем список скриптов для выбора
+        scripts = {
+            value['human_name']: key
+            for key, value in pw.scripts.items()
+        }
+
+        chosen_scripts_human_names = questionary.checkbox(
+            "Выбери скрипты",
+            choices=list(scripts.keys()),
+            style=custom_style
+        ).ask()
+
+        chosen_scripts = [scripts[name] for name in chosen_scripts_human_names]
+
+        if not chosen_scripts:
+            logger.warning('⚠️ Скрипты не выбраны')
+            return
+
+        if len(chosen_scripts) > 1:
+            shuffle_choice = questionary.select(
+                "Рандомить порядок выполнения скриптов?",
+                choices=[
+                    '✅  да',
+                    '❌  нет'
+                ],
+                style=custom_style
+            ).ask()
+
+            if 'да' in shuffle_choice:
+                shuffle(chosen_scripts)
+
+        headless_choice = questionary.select(
+            "Использовать Headless Mode?",
             choices=[
                 '✅  да',
                 '❌  нет'
             ],
+            default='✅  да' if is_lean_run_enabled() else None,  # в облегченном режиме по умолчанию headless
             style=custom_style
         ).ask()
 
-        if 'да' in shuffle_choice:
-            shuffle(chosen_scripts)
-
-    headless_choice = questionary.select(
-        "Использовать Headless Mode?",
-        choices=[
-            '✅  да',
-            '❌  нет'
-        ],
-        style=custom_style
-    ).ask()
-
-    headless = True if 'да' in headless_choice else False
-
-    # Запускаем скрипты для каждого профиля
-    for name in selected_profiles:
-        try:
-            logger.info(f"🚀 Запускаем скрипты для профиля {name}")
-            pw.run_scripts(
-                str(name),
-                chosen_scripts,
-                headless
-            )
-            logger.success(f"✅ Скрипты для профиля {name} выполнены")
-        except Exception as e:
-            logger.error(f"❌ Ошибка при выполнении скриптов для профиля {name}: {e}") 
\ No newline at end of file
+        headless = True if 'да' in headless_choice else False
+
+        journal = BatchJournal.create('playwright', selected_profiles, chosen_scripts, {'headless': headless})
+
+    # Запускаем скрипты для каждого профиля, все профили используют один драйвер Playwright
+    retry_policy = RetryPolicy.from_config()  # бюджет повторов общий на весь прогон
+    failed_profiles = []
+    publish_batch_started(journal.batch_id, 'playwright', [name for name in journal.profiles if journal.pending_scripts(name)])
+    try:
+        for name in journal.profiles:
+            pending_scripts = journal.pending_scripts(name)
+            if not pending_scripts:
+                logger.info(f"⏭️ {name} - скрипты уже выполнены, пропускаю")
+                continue
+
+            try:
+                logger.info(f"🚀 Запускаем скрипты для профиля {name}")
+                if pw.run_scripts(
+                    name,
+                    pending_scripts,
+                    headless,
+                    journal=journal,
+                    retry_policy=retry_policy
+                ):
+                    logger.success(f"✅ Скрипты для профиля {name} выполнены")
+                else:
+                    logger.warning(f"⚠️ Скрипты для профиля {name} выполнены с ошибками")
+                    failed_profiles.append(name)
+            except Exception as e:
+                logger.error(f"❌ Ошибка при выполнении скриптов для профиля {name}: {e}")
+                failed_profiles.append(name)
+    finally:
+        stop_shared_playwright()
+        publish_batch_finished(journal.batch_id, 'playwright', failed_profiles)
+        collect_garbage(pending_only=True)  # объекты снимков, удаленных по сроку хранения
+
+    if failed_profiles:
+        logger.warning(f"⚠️ Профили с ошибками: {', '.join(failed_profiles)}, их можно перезапустить продолжением прогона")
+    else:
+        journal.finish()
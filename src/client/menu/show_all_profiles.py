@@ -1,12 +1,13 @@
 from loguru import logger
-from rich.table import Table
-from rich.console import Console
 
 from src.utils.helpers import get_comments_for_profiles
 from .utils import get_all_sorted_profiles
 
 
 def show_all_profiles():
+    from rich.table import Table
+    from rich.console import Console
+
     profiles_list_sorted = get_all_sorted_profiles()
     if not profiles_list_sorted:
         logger.error("⛔  Профили отсутствуют")
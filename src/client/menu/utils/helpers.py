@@ -12,3 +12,81 @@ custom_style = questionary.Style([
     ('disabled', 'fg:#858585 italic')
 ])
 
+
+
+def ask_resume_batch(runner: str):
+    """
+    Предлагает продолжить последний незавершенный прогон раннера.
+    Если пользователь отказался, прогон отмечается завершенным и больше не предлагается
+
+    Args:
+        runner: Раннер (chrome, playwright, manager)
+
+    Returns:
+        BatchJournal | None: Журнал прогона для продолжения или None
+    """
+    from src.utils.batch_journal import BatchJournal
+
+    journal = BatchJournal.find_unfinished(runner)
+    if not journal:
+        return None
+
+    resume_choice = questionary.select(
+        f"Найден незавершенный прогон: профилей {len(journal.profiles)}, "
+        f"осталось пар профиль/скрипт {journal.pending_count()}. Продолжить?",
+        choices=[
+            '✅  продолжить',
+            '❌  начать новый'
+        ],
+        style=custom_style
+    ).ask()
+
+    if 'продолжить' in resume_choice:
+        logger.info(f'ℹ️ Продолжаю прогон {journal.batch_id}')
+        return journal
+
+    journal.finish()
+    return None
+
+
+def exclude_unhealthy_profiles(profiles: list[str]) -> list[str]:
+    """
+    Проверяет профили перед прогоном (general_config['health_check_before_runs']) и убирает из списка
+    профили с ошибками и уже открытые в Chrome, чтобы не тратить на них запуски
+
+    Args:
+        profiles: Выбранные профили
+
+    Returns:
+        list[str]: Профили, которые можно запускать, в исходном виде и порядке
+    """
+    from config import general_config
+    from src.utils.profile_health import check_profiles, healthy_profiles, format_issue
+
+    if not general_config.get('health_check_before_runs', True):
+        return profiles
+
+    from src.utils.helpers import is_profiles_dir_locked
+
+    if is_profiles_dir_locked():
+        logger.warning('⚠️ С папкой профилей работает Chrome, открытые в нем профили не определить - закрой Chrome перед прогоном')
+
+    report = check_profiles(profiles, repair=general_config.get('health_check_repair', False))
+    for issue in report['shared_issues']:
+        if issue['severity'] == 'error':
+            logger.error(f'⛔  Папка профилей заблокирована: {format_issue(issue)}, профили не запустятся')
+
+    for profile_report in report['profiles']:
+        name = profile_report['profile']
+        if profile_report['repaired']:
+            logger.info(f"🔧 {name} - исправлено: {', '.join(profile_report['repaired'])}")
+        if profile_report['status'] == 'unhealthy':
+            errors = [format_issue(issue) for issue in profile_report['issues'] if issue['severity'] == 'error']
+            logger.warning(f"⚠️ {name} - исключен из прогона: {', '.join(errors)}")
+        elif profile_report['status'] == 'running':
+            logger.warning(f'⚠️ {name} - профиль уже открыт в Chrome, исключен из прогона')
+        elif profile_report['status'] == 'missing':
+            logger.warning(f'⚠️ {name} - профиль не найден, исключен из прогона')
+
+    healthy = set(healthy_profiles(report))
+    return [profile for profile in profiles if str(profile).removeprefix('Profile ') in healthy]
@@ -0,0 +1,8 @@
+"""
+Распределенный прогон профилей: координатор раздает задания воркерам на других хостах.
+"""
+
+from .job_queue import JobQueue
+from .transport import Transport, LocalTransport, HttpTransport, TransportError
+from .coordinator import CoordinatorServer
+from .worker import Worker
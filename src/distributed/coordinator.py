@@ -0,0 +1,353 @@
+"""
+Координатор распределенного прогона.
+
+Делит выбранные профили и скрипты на задания в очереди (JobQueue) и раздает их воркерам
+по HTTP + JSON. Каждый запрос должен нести заголовок X-Token с общим токеном.
+По умолчанию сервер слушает только 127.0.0.1: к другим хостам его стоит открывать через
+SSH-туннель или VPN - в профилях лежат куки и данные кошельков.
+
+    POST /jobs/lease                 - выдать задание воркеру
+    POST /jobs/<job_id>/heartbeat    - продлить аренду
+    POST /jobs/<job_id>/complete     - записать итог задания
+    GET  /profiles/<name>            - архив профиля для воркера с арендой этого профиля
+    PUT  /profiles/<name>            - профиль после прогона от воркера с арендой
+    GET  /batches/<batch_id>         - состояние прогона
+
+Запуск:
+    python -m src.distributed.coordinator --runner manager --scripts test_script --profiles 1,2,3
+"""
+
+import hmac
+import json
+import time
+import secrets
+import argparse
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+from config import general_config
+from src.utils.progress_events import publish_event, publish_batch_started, publish_batch_finished
+from .job_queue import JobQueue
+from .profile_sync import is_valid_profile_name, pack_profile, unpack_profile
+
+
+RUNNERS = ('chrome', 'playwright', 'manager')
+
+
+class CoordinatorServer:
+    def __init__(self,
+                 job_queue: JobQueue | None = None,
+                 token: str | None = None,
+                 host: str = '127.0.0.1',
+                 port: int | None = None,
+                 lease_sec: float | None = None):
+        """
+        Args:
+            job_queue: Очередь заданий, по умолчанию data/distributed/jobs.sqlite3
+            token: Токен доступа воркеров, по умолчанию general_config['distributed_token']
+            host: Адрес, на котором слушает сервер
+            port: Порт, по умолчанию general_config['distributed_port'] (0 - свободный)
+            lease_sec: Длительность аренды задания, по умолчанию general_config['distributed_lease_sec']
+        """
+        self.job_queue = job_queue or JobQueue()
+        self.token = token or general_config.get('distributed_token')
+        if not self.token:
+            raise ValueError('не задан токен координатора (distributed_token)')
+
+        self.host = host
+        self.port = port if port is not None else general_config.get('distributed_port', 8765)
+        self.lease_sec = lease_sec or general_config.get('distributed_lease_sec', 600)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def submit_batch(self,
+                     runner: str,
+                     profiles: list[str | int],
+                     scripts: list[str],
+                     options: dict | None = None) -> str:
+        """
+        Ставит прогон в очередь
+
+        Args:
+            runner: Раннер (chrome, playwright, manager)
+            profiles: Профили прогона
+            scripts: Скрипты для каждого профиля
+            options: Параметры прогона (headless)
+
+        Returns:
+            str: Идентификатор прогона
+        """
+        if runner not in RUNNERS:
+            raise ValueError(f'неизвестный раннер: {runner}')
+        invalid = [profile for profile in profiles if not is_valid_profile_name(profile)]
+        if invalid:
+            raise ValueError(f'недопустимые имена профилей: {invalid}')
+
+        batch_id = self.job_queue.submit_batch(
+            runner,
+            profiles,
+            scripts,
+            options,
+            max_attempts=general_config.get('distributed_max_attempts', 3)
+        )
+        publish_batch_started(batch_id, runner, profiles)
+
+        return batch_id
+
+    def start(self) -> None:
+        coordinator = self
+
+        class Handler(_CoordinatorHandler):
+            server_coordinator = coordinator
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='coordinator', daemon=True)
+        self._thread.start()
+        logger.info(f'🌐 Координатор слушает {self.url}')
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def wait_batch(self, batch_id: str, poll_sec: float = 2) -> dict:
+        """
+        Ждет завершения всех заданий прогона
+
+        Returns:
+            dict: Итоговое состояние прогона (JobQueue.get_batch_status)
+        """
+        last_done = None
+        while True:
+            status = self.job_queue.get_batch_status(batch_id)
+            done = status['done'] + status['failed']
+            if done != last_done:
+                logger.info(f'ℹ️ Прогон {batch_id[:8]}: выполнено {done} из {status["total"]}, '
+                            f'в работе {status["leased"]}, с ошибками {status["failed"]}')
+                last_done = done
+            if status['finished']:
+                return status
+            time.sleep(poll_sec)
+
+
+class _CoordinatorHandler(BaseHTTPRequestHandler):
+    server_coordinator: CoordinatorServer = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug('координатор: {} - {}', self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def _authorized(self) -> bool:
+        token = self.headers.get('X-Token', '')
+        if hmac.compare_digest(token.encode('utf-8'), self.server_coordinator.token.encode('utf-8')):
+            return True
+
+        self._send_json(401, {'error': 'unauthorized'})
+        return False
+
+    def _route(self) -> tuple[list[str], dict]:
+        parsed = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(part) for part in parsed.path.strip('/').split('/')]
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        return parts, query
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+
+        coordinator = self.server_coordinator
+        parts, query = self._route()
+
+        if len(parts) == 2 and parts[0] == 'batches':
+            self._send_json(200, coordinator.job_queue.get_batch_status(parts[1]))
+        elif len(parts) == 2 and parts[0] == 'profiles':
+            profile_name = parts[1]
+            if not self._check_profile_lease(profile_name, query.get('worker_id', '')):
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/gzip')
+            self.send_header('Connection', 'close')  # размер архива заранее неизвестен
+            self.end_headers()
+            self.close_connection = True
+            try:
+                pack_profile(profile_name, self.wfile)
+            except Exception as e:
+                logger.error(f'⛔  {profile_name} - не удалось отправить профиль воркеру')
+                logger.debug(f'{profile_name} - не удалось отправить профиль воркеру, причина: {e}')
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_PUT(self):
+        if not self._authorized():
+            return
+
+        parts, query = self._route()
+        if not (len(parts) == 2 and parts[0] == 'profiles'):
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        profile_name = parts[1]
+        if not self._check_profile_lease(profile_name, query.get('worker_id', '')):
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            unpack_profile(profile_name, _LimitedReader(self.rfile, length))
+        except Exception as e:
+            logger.error(f'⛔  {profile_name} - не удалось принять профиль от воркера')
+            logger.debug(f'{profile_name} - не удалось принять профиль от воркера, причина: {e}')
+            self._send_json(400, {'error': str(e)})
+            return
+
+        self._send_json(200, {'ok': True})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+
+        coordinator = self.server_coordinator
+        job_queue = coordinator.job_queue
+        parts, _ = self._route()
+        try:
+            payload = self._read_json()
+        except ValueError:
+            self._send_json(400, {'error': 'invalid json'})
+            return
+
+        worker_id = str(payload.get('worker_id') or '')
+        if not worker_id:
+            self._send_json(400, {'error': 'worker_id required'})
+            return
+
+        if parts == ['jobs', 'lease']:
+            job = job_queue.lease(worker_id, payload.get('runners'), coordinator.lease_sec)
+            if job:
+                logger.info(f'ℹ️ {job["profile"]} - задание выдано воркеру {worker_id}')
+            self._send_json(200, {'job': job})
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'heartbeat':
+            self._send_json(200, {'ok': job_queue.heartbeat(parts[1], worker_id, coordinator.lease_sec)})
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'complete':
+            success = bool(payload.get('success'))
+            result = payload.get('result') or {}
+            accepted = job_queue.complete(parts[1], worker_id, success, result)
+            if accepted:
+                publish_event('finished', batch_id=result.get('batch_id'), runner=result.get('runner'),
+                              profile=result.get('profile'), outcome=result.get('outcome'), worker=worker_id)
+            self._send_json(200, {'ok': accepted})
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'release':
+            result = payload.get('result') or {}
+            accepted = job_queue.release(parts[1], worker_id, result)
+            if accepted:
+                logger.warning(f'⚠️ {result.get("profile")} - воркер {worker_id} вернул задание: {result.get("error")}')
+            self._send_json(200, {'ok': accepted})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def _check_profile_lease(self, profile_name: str, worker_id: str) -> bool:
+        if not is_valid_profile_name(profile_name):
+            self._send_json(400, {'error': 'invalid profile name'})
+            return False
+        if not self.server_coordinator.job_queue.holds_lease(worker_id, profile_name):
+            self._send_json(403, {'error': 'no lease for profile'})
+            return False
+
+        return True
+
+
+class _LimitedReader:
+    """
+    Читает из потока запроса не больше Content-Length байт
+    """
+
+    def __init__(self, stream, length: int):
+        self.stream = stream
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size)
+        self.remaining -= len(data)
+        return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Координатор распределенного прогона профилей')
+    parser.add_argument('--runner', choices=RUNNERS, required=True, help='раннер скриптов')
+    parser.add_argument('--scripts', required=True, help='скрипты через запятую')
+    parser.add_argument('--profiles', default='all', help='профили через запятую или all')
+    parser.add_argument('--headless', action='store_true', help='запускать Chrome в headless режиме')
+    parser.add_argument('--host', default='127.0.0.1', help='адрес сервера')
+    parser.add_argument('--port', type=int, default=None, help='порт сервера')
+    parser.add_argument('--db', default=None, help='путь к базе очереди заданий')
+    args = parser.parse_args()
+
+    from src.utils.logging_setup import setup_logger
+    setup_logger()
+
+    if args.profiles == 'all':
+        from src.utils.helpers import get_profiles_list
+        profiles = [profile.removeprefix('Profile ') for profile in get_profiles_list()]  # имена папок с префиксом
+    else:
+        profiles = [profile.strip() for profile in args.profiles.split(',') if profile.strip()]
+    scripts = [script.strip() for script in args.scripts.split(',') if script.strip()]
+
+    token = general_config.get('distributed_token')
+    if not token:
+        token = secrets.token_urlsafe(24)
+        logger.warning(f'⚠️ distributed_token не задан, токен этого запуска: {token}')
+
+    coordinator = CoordinatorServer(JobQueue(args.db) if args.db else None, token, args.host, args.port)
+    batch_id = coordinator.submit_batch(args.runner, profiles, scripts, {'headless': args.headless})
+    coordinator.start()
+    logger.info(f'ℹ️ Прогон {batch_id}: {len(profiles)} профилей, воркеры подключаются командой')
+    logger.info(f'   python -m src.distributed.worker --coordinator {coordinator.url} --token <токен>')
+
+    try:
+        status = coordinator.wait_batch(batch_id)
+    except KeyboardInterrupt:
+        logger.warning('⚠️ Координатор остановлен, незавершенные задания остались в очереди')
+        return
+    finally:
+        coordinator.stop()
+
+    failed_jobs = [job for job in coordinator.job_queue.get_batch_jobs(batch_id) if job['status'] == 'failed']
+    publish_batch_finished(batch_id, args.runner, [job['profile'] for job in failed_jobs])
+
+    if failed_jobs:
+        logger.error(f'⛔  Прогон завершен: успешно {status["done"]}, с ошибками {status["failed"]}')
+        for job in failed_jobs:
+            result = job['result'] or {}
+            reason = result.get('error') or ', '.join(result.get('failed_scripts') or [])
+            logger.error(f'⛔  {job["profile"]} ({job["worker_id"]}): {reason}')
+    else:
+        logger.success(f'✅  Прогон завершен: все {status["total"]} профилей выполнены успешно')
+
+
+if __name__ == '__main__':
+    main()
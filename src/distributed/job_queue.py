@@ -0,0 +1,276 @@
+"""
+Очередь заданий распределенного прогона на SQLite.
+
+Координатор делит прогон на задания - по одному на профиль со всеми скриптами прогона.
+Воркер берет задание в аренду (lease) на lease_sec секунд и продлевает ее heartbeat'ами,
+пока выполняет скрипты. Если воркер пропал, аренда истекает и задание возвращается
+в очередь, после max_attempts попыток оно считается проваленным. Так же возвращается
+задание, которое воркер не смог выполнить из-за сбоя сети или переноса профиля (release).
+
+Статусы задания: queued -> leased -> done / failed
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from pathlib import Path
+
+from src.utils.constants import DATA_PATH
+
+
+JOB_QUEUE_DB_PATH = DATA_PATH / "distributed" / "jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    runner TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    scripts TEXT NOT NULL,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    worker_id TEXT,
+    lease_expires_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, runner);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id);
+"""
+
+
+class JobQueue:
+    def __init__(self, db_path: str | Path = None):
+        """
+        Args:
+            db_path: Путь к базе очереди, по умолчанию data/distributed/jobs.sqlite3
+        """
+        self.db_path = Path(db_path or JOB_QUEUE_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: транзакции открываются явно через BEGIN IMMEDIATE
+        connection = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _transaction(self, func):
+        """
+        Выполняет func(connection) в транзакции с блокировкой записи, чтобы два воркера
+        (или два процесса координатора) не взяли одно задание
+        """
+        with self._lock:
+            connection = self._connect()
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    result = func(connection)
+                except Exception:
+                    connection.execute("ROLLBACK")
+                    raise
+                connection.execute("COMMIT")
+                return result
+            finally:
+                connection.close()
+
+    def submit_batch(self,
+                     runner: str,
+                     profiles: list[str | int],
+                     scripts: list[str],
+                     options: dict | None = None,
+                     max_attempts: int = 3,
+                     batch_id: str | None = None) -> str:
+        """
+        Ставит прогон в очередь: одно задание на профиль
+
+        Args:
+            runner: Раннер (chrome, playwright, manager)
+            profiles: Профили прогона
+            scripts: Скрипты, выполняемые на каждом профиле
+            options: Параметры прогона (headless и т.п.)
+            max_attempts: Сколько раз задание выдается воркерам, прежде чем считается проваленным
+            batch_id: Идентификатор прогона, по умолчанию новый
+
+        Returns:
+            str: Идентификатор прогона
+        """
+        batch_id = batch_id or uuid.uuid4().hex
+        now = time.time()
+        rows = [
+            (uuid.uuid4().hex, batch_id, runner, str(profile), json.dumps(scripts), json.dumps(options or {}),
+             max_attempts, now, now)
+            for profile in profiles
+        ]
+
+        def insert(connection):
+            connection.executemany("""
+                INSERT INTO jobs (job_id, batch_id, runner, profile, scripts, options, max_attempts, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+        self._transaction(insert)
+        return batch_id
+
+    def lease(self, worker_id: str, runners: list[str] | None = None, lease_sec: float = 600) -> dict | None:
+        """
+        Выдает воркеру следующее задание: из очереди или с истекшей арендой
+
+        Args:
+            worker_id: Идентификатор воркера
+            runners: Раннеры, доступные воркеру (None - любые)
+            lease_sec: Длительность аренды в секундах
+
+        Returns:
+            dict | None: Задание (job_id, batch_id, runner, profile, scripts, options, attempts) или None
+        """
+        def take(connection):
+            now = time.time()
+            self._expire_leases(connection, now)
+
+            runner_filter = f"AND runner IN ({','.join('?' * len(runners))})" if runners else ''
+            row = connection.execute(f"""
+                SELECT * FROM jobs WHERE status = 'queued' {runner_filter}
+                ORDER BY created_at, rowid LIMIT 1
+            """, tuple(runners or ())).fetchone()
+            if row is None:
+                return None
+
+            connection.execute("""
+                UPDATE jobs SET status = 'leased', worker_id = ?, lease_expires_at = ?, attempts = attempts + 1,
+                                updated_at = ?
+                WHERE job_id = ?
+            """, (worker_id, now + lease_sec, now, row['job_id']))
+
+            job = _row_to_job(row)
+            job['attempts'] += 1
+            job['lease_sec'] = lease_sec
+            return job
+
+        return self._transaction(take)
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_sec: float = 600) -> bool:
+        """
+        Продлевает аренду задания
+
+        Returns:
+            bool: False, если аренда уже потеряна (истекла и задание отдано другому воркеру)
+        """
+        def extend(connection):
+            now = time.time()
+            cursor = connection.execute("""
+                UPDATE jobs SET lease_expires_at = ?, updated_at = ?
+                WHERE job_id = ? AND worker_id = ? AND status = 'leased'
+            """, (now + lease_sec, now, job_id, worker_id))
+            return cursor.rowcount == 1
+
+        return self._transaction(extend)
+
+    def complete(self, job_id: str, worker_id: str, success: bool, result: dict | None = None) -> bool:
+        """
+        Записывает итог задания
+
+        Args:
+            job_id: Идентификатор задания
+            worker_id: Идентификатор воркера, державшего аренду
+            success: Все скрипты профиля выполнены успешно
+            result: Подробности итога (outcome, failed_scripts, длительности фаз и т.п.)
+
+        Returns:
+            bool: False, если аренда уже потеряна и итог не принят
+        """
+        def finish(connection):
+            cursor = connection.execute("""
+                UPDATE jobs SET status = ?, result = ?, lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND worker_id = ? AND status = 'leased'
+            """, ('done' if success else 'failed', json.dumps(result or {}, default=str), time.time(), job_id, worker_id))
+            return cursor.rowcount == 1
+
+        return self._transaction(finish)
+
+    def release(self, job_id: str, worker_id: str, result: dict | None = None) -> bool:
+        """
+        Возвращает задание в очередь после сбоя, не связанного со скриптами (сеть, перенос профиля).
+        Если попытки исчерпаны, задание считается проваленным
+
+        Args:
+            job_id: Идентификатор задания
+            worker_id: Идентификатор воркера, державшего аренду
+            result: Подробности сбоя
+
+        Returns:
+            bool: False, если аренда уже потеряна
+        """
+        def put_back(connection):
+            cursor = connection.execute("""
+                UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                                worker_id = CASE WHEN attempts >= max_attempts THEN worker_id ELSE NULL END,
+                                result = ?, lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ? AND worker_id = ? AND status = 'leased'
+            """, (json.dumps(result or {}, default=str), time.time(), job_id, worker_id))
+            return cursor.rowcount == 1
+
+        return self._transaction(put_back)
+
+    def holds_lease(self, worker_id: str, profile: str) -> bool:
+        """
+        Проверяет, держит ли воркер аренду задания этого профиля (для приема синхронизации профиля)
+        """
+        def check(connection):
+            row = connection.execute("""
+                SELECT 1 FROM jobs WHERE worker_id = ? AND profile = ? AND status = 'leased' AND lease_expires_at > ?
+            """, (worker_id, str(profile), time.time())).fetchone()
+            return row is not None
+
+        return self._transaction(check)
+
+    def get_batch_jobs(self, batch_id: str) -> list[dict]:
+        def select(connection):
+            self._expire_leases(connection, time.time())
+            rows = connection.execute("SELECT * FROM jobs WHERE batch_id = ? ORDER BY created_at, rowid",
+                                      (batch_id,)).fetchall()
+            return [_row_to_job(row) for row in rows]
+
+        return self._transaction(select)
+
+    def get_batch_status(self, batch_id: str) -> dict:
+        """
+        Returns:
+            dict: total, queued, leased, done, failed, finished (все задания завершены)
+        """
+        jobs = self.get_batch_jobs(batch_id)
+        status = {'total': len(jobs), 'queued': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for job in jobs:
+            status[job['status']] += 1
+        status['finished'] = status['queued'] == 0 and status['leased'] == 0
+
+        return status
+
+    @staticmethod
+    def _expire_leases(connection: sqlite3.Connection, now: float) -> None:
+        # задания пропавших воркеров возвращаются в очередь, исчерпавшие попытки - проваливаются
+        connection.execute("""
+            UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+                            result = CASE WHEN attempts >= max_attempts
+                                          THEN '{"error": "аренда истекла, попытки исчерпаны"}' ELSE result END,
+                            worker_id = CASE WHEN attempts >= max_attempts THEN worker_id ELSE NULL END,
+                            lease_expires_at = NULL, updated_at = ?
+            WHERE status = 'leased' AND lease_expires_at < ?
+        """, (now, now))
+
+
+def _row_to_job(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job['scripts'] = json.loads(job['scripts'])
+    job['options'] = json.loads(job['options'])
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
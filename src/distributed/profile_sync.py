@@ -0,0 +1,120 @@
+"""
+Перенос папки профиля Chrome между хостами архивом tar.gz.
+
+Кэши браузера (Cache, Code Cache, GPUCache и т.п.) в архив не попадают: Chrome
+пересоздает их сам, а по объему они обычно больше остального профиля. Распаковка
+идет во временную папку рядом с профилем, после чего папки подменяются, поэтому
+прерванная синхронизация не оставляет полупустой профиль.
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import BinaryIO
+
+from loguru import logger
+
+from src.utils.constants import CHROME_DATA_PATH, PROFILE_CACHE_DIRS, PROFILE_LOCK_FILES
+
+
+EXCLUDED_DIRS = set(PROFILE_CACHE_DIRS)
+EXCLUDED_FILES = set(PROFILE_LOCK_FILES)
+
+
+def is_valid_profile_name(profile_name: str) -> bool:
+    """
+    Имя профиля приходит по сети и становится частью пути, поэтому допускаются
+    только буквы, цифры, пробел, '-', '_' и '.', без '..'
+    """
+    profile_name = str(profile_name)
+    return (
+        bool(profile_name)
+        and len(profile_name) <= 100
+        and '..' not in profile_name
+        and all(char.isalnum() or char in ' -_.' for char in profile_name)
+    )
+
+
+def get_profile_path(profile_name: str | int) -> Path:
+    if not is_valid_profile_name(profile_name):
+        raise ValueError(f'недопустимое имя профиля: {profile_name!r}')
+
+    return CHROME_DATA_PATH / f"Profile {profile_name}"
+
+
+def _exclude_filter(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo | None:
+    parts = Path(tarinfo.name).parts
+    if any(part in EXCLUDED_DIRS for part in parts) or (parts and parts[-1] in EXCLUDED_FILES):
+        return None
+    if not (tarinfo.isfile() or tarinfo.isdir()):
+        return None  # ссылки и спецфайлы не переносим
+
+    return tarinfo
+
+
+def pack_profile(profile_name: str | int, stream: BinaryIO) -> None:
+    """
+    Пишет папку профиля в поток архивом tar.gz без кэшей
+
+    Args:
+        profile_name: Имя профиля
+        stream: Поток для записи (файл, ответ HTTP)
+    """
+    profile_path = get_profile_path(profile_name)
+    if not profile_path.is_dir():
+        raise FileNotFoundError(f'профиль {profile_name} не найден')
+
+    with tarfile.open(fileobj=stream, mode='w|gz') as archive:
+        archive.add(profile_path, arcname='.', filter=_exclude_filter)
+
+
+def _check_member(member: tarfile.TarInfo, target: Path) -> bool:
+    if not (member.isfile() or member.isdir()):
+        return False
+
+    member_path = (target / member.name).resolve()
+    return member_path == target or target in member_path.parents
+
+
+def unpack_profile(profile_name: str | int, stream: BinaryIO) -> None:
+    """
+    Заменяет папку профиля содержимым архива tar.gz из потока
+
+    Args:
+        profile_name: Имя профиля
+        stream: Поток с архивом
+    """
+    profile_path = get_profile_path(profile_name)
+    profile_path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_path = Path(tempfile.mkdtemp(prefix=f'.sync_{profile_path.name}_', dir=profile_path.parent))
+    try:
+        target = temp_path.resolve()
+        with tarfile.open(fileobj=stream, mode='r|gz') as archive:
+            for member in archive:
+                if not _check_member(member, target):
+                    logger.debug('синхронизация профиля {} - пропущен элемент архива {}', profile_name, member.name)
+                    continue
+                member.mode = member.mode | 0o600 if member.isfile() else 0o700
+                archive.extract(member, target)
+
+        # кэши на этом хосте остаются от прошлого прогона, переносим их в новую папку
+        if profile_path.exists():
+            for excluded in EXCLUDED_DIRS:
+                cache_path = profile_path / excluded
+                if cache_path.is_dir() and not (temp_path / excluded).exists():
+                    shutil.move(str(cache_path), str(temp_path / excluded))
+
+        old_path = None
+        if profile_path.exists():
+            old_path = profile_path.with_name(f'.old_{profile_path.name}_{os.getpid()}')
+            os.replace(profile_path, old_path)
+        os.replace(temp_path, profile_path)
+
+        if old_path:
+            shutil.rmtree(old_path, ignore_errors=True)
+    finally:
+        if temp_path.exists():
+            shutil.rmtree(temp_path, ignore_errors=True)
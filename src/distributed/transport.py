@@ -0,0 +1,162 @@
+"""
+Транспорт между воркером и очередью заданий.
+
+LocalTransport работает с очередью напрямую - для воркеров на том же хосте или с общей
+папкой data/. HttpTransport ходит к координатору по HTTP (src/distributed/coordinator.py).
+Другой транспорт (брокер сообщений и т.п.) подключается наследованием от Transport.
+"""
+
+import json
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from .job_queue import JobQueue
+from .profile_sync import pack_profile, unpack_profile
+
+
+class TransportError(Exception):
+    pass
+
+
+class Transport:
+    """
+    Операции воркера с очередью заданий
+    """
+
+    def lease(self, worker_id: str, runners: list[str] | None = None) -> dict | None:
+        raise NotImplementedError
+
+    def heartbeat(self, job: dict, worker_id: str) -> bool:
+        raise NotImplementedError
+
+    def complete(self, job: dict, worker_id: str, success: bool, result: dict) -> bool:
+        raise NotImplementedError
+
+    def release(self, job: dict, worker_id: str, result: dict) -> bool:
+        """
+        Возвращает задание в очередь после сбоя сети или переноса профиля
+        """
+        raise NotImplementedError
+
+    def download_profile(self, profile_name: str, worker_id: str) -> None:
+        """
+        Получает профиль с координатора и заменяет им локальную папку профиля
+        """
+        raise NotImplementedError
+
+    def upload_profile(self, profile_name: str, worker_id: str) -> None:
+        """
+        Отправляет локальную папку профиля на координатор после прогона
+        """
+        raise NotImplementedError
+
+
+class LocalTransport(Transport):
+    def __init__(self, job_queue: JobQueue | None = None, lease_sec: float = 600):
+        """
+        Args:
+            job_queue: Очередь заданий, по умолчанию data/distributed/jobs.sqlite3
+            lease_sec: Длительность аренды задания в секундах
+        """
+        self.job_queue = job_queue or JobQueue()
+        self.lease_sec = lease_sec
+
+    def lease(self, worker_id: str, runners: list[str] | None = None) -> dict | None:
+        return self.job_queue.lease(worker_id, runners, self.lease_sec)
+
+    def heartbeat(self, job: dict, worker_id: str) -> bool:
+        return self.job_queue.heartbeat(job['job_id'], worker_id, self.lease_sec)
+
+    def complete(self, job: dict, worker_id: str, success: bool, result: dict) -> bool:
+        return self.job_queue.complete(job['job_id'], worker_id, success, result)
+
+    def release(self, job: dict, worker_id: str, result: dict) -> bool:
+        return self.job_queue.release(job['job_id'], worker_id, result)
+
+    def download_profile(self, profile_name: str, worker_id: str) -> None:
+        pass  # папка профилей общая
+
+    def upload_profile(self, profile_name: str, worker_id: str) -> None:
+        pass
+
+
+class HttpTransport(Transport):
+    def __init__(self, base_url: str, token: str, timeout_sec: float = 60):
+        """
+        Args:
+            base_url: Адрес координатора, например http://127.0.0.1:8765
+            token: Токен доступа (general_config['distributed_token'] координатора)
+            timeout_sec: Таймаут запросов в секундах
+        """
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.timeout_sec = timeout_sec
+
+    def _request(self, method: str, path: str, payload: dict | None = None) -> dict:
+        data = json.dumps(payload or {}).encode('utf-8')
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data if method != 'GET' else None,
+            method=method,
+            headers={'Content-Type': 'application/json', 'X-Token': self.token},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_sec) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            raise TransportError(f'{method} {path}: HTTP {e.code} {e.read().decode("utf-8", "replace")}') from e
+        except OSError as e:
+            raise TransportError(f'{method} {path}: {e}') from e
+
+        return json.loads(body) if body else {}
+
+    def lease(self, worker_id: str, runners: list[str] | None = None) -> dict | None:
+        return self._request('POST', '/jobs/lease', {'worker_id': worker_id, 'runners': runners}).get('job')
+
+    def heartbeat(self, job: dict, worker_id: str) -> bool:
+        return self._request('POST', f'/jobs/{job["job_id"]}/heartbeat', {'worker_id': worker_id})['ok']
+
+    def complete(self, job: dict, worker_id: str, success: bool, result: dict) -> bool:
+        payload = {'worker_id': worker_id, 'success': success, 'result': result}
+        return self._request('POST', f'/jobs/{job["job_id"]}/complete', payload)['ok']
+
+    def release(self, job: dict, worker_id: str, result: dict) -> bool:
+        payload = {'worker_id': worker_id, 'result': result}
+        return self._request('POST', f'/jobs/{job["job_id"]}/release', payload)['ok']
+
+    def _profile_url(self, profile_name: str, worker_id: str) -> str:
+        query = urllib.parse.urlencode({'worker_id': worker_id})
+        return f'{self.base_url}/profiles/{urllib.parse.quote(str(profile_name))}?{query}'
+
+    def download_profile(self, profile_name: str, worker_id: str) -> None:
+        request = urllib.request.Request(self._profile_url(profile_name, worker_id), headers={'X-Token': self.token})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout_sec) as response:
+                unpack_profile(profile_name, response)
+        except urllib.error.HTTPError as e:
+            raise TransportError(f'загрузка профиля {profile_name}: HTTP {e.code}') from e
+        except OSError as e:
+            raise TransportError(f'загрузка профиля {profile_name}: {e}') from e
+
+    def upload_profile(self, profile_name: str, worker_id: str) -> None:
+        # архив собирается во временный файл на диске, чтобы не держать профиль в памяти
+        with tempfile.TemporaryFile() as archive:
+            pack_profile(profile_name, archive)
+            size = archive.tell()
+            archive.seek(0)
+
+            request = urllib.request.Request(
+                self._profile_url(profile_name, worker_id),
+                data=archive,
+                method='PUT',
+                headers={'X-Token': self.token, 'Content-Type': 'application/gzip', 'Content-Length': str(size)},
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout_sec) as response:
+                    response.read()
+            except urllib.error.HTTPError as e:
+                raise TransportError(f'отправка профиля {profile_name}: HTTP {e.code}') from e
+            except OSError as e:
+                raise TransportError(f'отправка профиля {profile_name}: {e}') from e
@@ -0,0 +1,267 @@
+"""
+Воркер распределенного прогона.
+
+Берет задания у координатора, при необходимости получает папку профиля, выполняет скрипты
+обычным раннером (Chrome, PlaywrightChrome или Manager), отправляет профиль обратно
+и сообщает итог. Пока идет прогон, аренда задания продлевается в фоновом потоке.
+Если не удалось получить или отправить профиль, задание возвращается в очередь
+и проваливается только после distributed_max_attempts попыток.
+
+Запуск:
+    python -m src.distributed.worker --coordinator http://127.0.0.1:8765 --token <токен>
+"""
+
+import time
+import uuid
+import socket
+import argparse
+import threading
+
+from loguru import logger
+
+from config import general_config
+from .transport import Transport, HttpTransport, TransportError
+
+
+class Worker:
+    def __init__(self,
+                 transport: Transport,
+                 worker_id: str | None = None,
+                 runners: list[str] | None = None,
+                 sync_profiles: bool = True,
+                 poll_sec: float = 5,
+                 heartbeat_sec: float | None = None):
+        """
+        Args:
+            transport: Транспорт к очереди заданий
+            worker_id: Идентификатор воркера, по умолчанию <хост>-<случайный суффикс>
+            runners: Раннеры, задания которых берет воркер (None - любые)
+            sync_profiles: Получать профиль перед прогоном и отправлять после
+            poll_sec: Пауза между запросами заданий, когда очередь пуста
+            heartbeat_sec: Интервал продления аренды, по умолчанию треть distributed_lease_sec
+        """
+        self.transport = transport
+        self.worker_id = worker_id or f'{socket.gethostname()}-{uuid.uuid4().hex[:6]}'
+        self.runners = runners
+        self.sync_profiles = sync_profiles
+        self.poll_sec = poll_sec
+        self.heartbeat_sec = heartbeat_sec or general_config.get('distributed_lease_sec', 600) / 3
+        self.jobs_done = 0
+        self._stop = threading.Event()
+        self._runner_instances = {}
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self, exit_when_idle: bool = False, max_jobs: int | None = None) -> int:
+        """
+        Выполняет задания, пока воркер не остановлен
+
+        Args:
+            exit_when_idle: Завершиться, когда очередь пуста
+            max_jobs: Завершиться после этого числа заданий
+
+        Returns:
+            int: Число выполненных заданий
+        """
+        logger.info(f'ℹ️ Воркер {self.worker_id} запущен')
+        try:
+            while not self._stop.is_set():
+                if max_jobs is not None and self.jobs_done >= max_jobs:
+                    break
+
+                try:
+                    job = self.transport.lease(self.worker_id, self.runners)
+                except TransportError as e:
+                    logger.warning('⚠️ Координатор недоступен, повторю запрос позже')
+                    logger.debug(f'не удалось получить задание, причина: {e}')
+                    self._stop.wait(self.poll_sec)
+                    continue
+
+                if job is None:
+                    if exit_when_idle:
+                        break
+                    self._stop.wait(self.poll_sec)
+                    continue
+
+                self.process_job(job)
+                self.jobs_done += 1
+        finally:
+            if 'playwright' in self._runner_instances:
+                from src.chrome.playwright_chrome import stop_shared_playwright
+                stop_shared_playwright()
+
+        logger.info(f'ℹ️ Воркер {self.worker_id} завершен, выполнено заданий: {self.jobs_done}')
+        return self.jobs_done
+
+    def process_job(self, job: dict) -> bool:
+        """
+        Выполняет одно задание и сообщает итог
+
+        Args:
+            job: Задание из очереди
+
+        Returns:
+            bool: True, если все скрипты выполнены успешно
+        """
+        profile_name = job['profile']
+        logger.info(f'ℹ️ {profile_name} - задание {job["job_id"][:8]} ({job["runner"]}, попытка {job["attempts"]})')
+
+        lease_lost = threading.Event()
+        heartbeat_stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat_loop,
+            args=(job, heartbeat_stop, lease_lost),
+            name=f'heartbeat-{profile_name}',
+            daemon=True
+        )
+        heartbeat.start()
+
+        success = False
+        sync_failed = False
+        result = {'batch_id': job['batch_id'], 'runner': job['runner'], 'profile': profile_name,
+                  'worker_id': self.worker_id, 'host': socket.gethostname()}
+        try:
+            if self.sync_profiles:
+                sync_failed = True
+                self.transport.download_profile(profile_name, self.worker_id)
+                sync_failed = False
+
+            runner = self._get_runner(job['runner'])
+            success = self._run_job(runner, job)
+            result.update(self._describe_run(runner.last_run))
+
+            if self.sync_profiles and not lease_lost.is_set():
+                sync_failed = True
+                self.transport.upload_profile(profile_name, self.worker_id)
+                sync_failed = False
+        except Exception as e:
+            success = False
+            result['outcome'] = 'failed'
+            result['error'] = str(e)
+            if sync_failed:
+                logger.warning(f'⚠️ {profile_name} - не удалось перенести профиль, задание вернется в очередь')
+            else:
+                logger.error(f'⛔  {profile_name} - задание завершено с ошибкой')
+            logger.debug(f'{profile_name} - задание {job["job_id"]} завершено с ошибкой, причина: {e}')
+        finally:
+            heartbeat_stop.set()
+            heartbeat.join()
+
+        if lease_lost.is_set():
+            logger.warning(f'⚠️ {profile_name} - аренда задания потеряна, итог не будет принят')
+
+        try:
+            if sync_failed:
+                # сбой сети или переноса профиля - не ошибка скриптов, задание повторяется до max_attempts
+                accepted = self.transport.release(job, self.worker_id, result)
+            else:
+                accepted = self.transport.complete(job, self.worker_id, success, result)
+            if not accepted:
+                logger.warning(f'⚠️ {profile_name} - координатор не принял итог задания (аренда истекла)')
+        except TransportError as e:
+            # итог не дошел: аренда истечет, и задание вернется в очередь
+            logger.error(f'⛔  {profile_name} - не удалось отправить итог задания')
+            logger.debug(f'{profile_name} - не удалось отправить итог задания, причина: {e}')
+
+        if sync_failed:
+            self._stop.wait(self.poll_sec)  # пауза, чтобы сбой сети не сжег все попытки задания подряд
+
+        return success
+
+    def _heartbeat_loop(self, job: dict, stop: threading.Event, lease_lost: threading.Event) -> None:
+        while not stop.wait(self.heartbeat_sec):
+            try:
+                if not self.transport.heartbeat(job, self.worker_id):
+                    lease_lost.set()
+                    return
+            except TransportError as e:
+                logger.debug(f'{job["profile"]} - не удалось продлить аренду, причина: {e}')
+
+    def _get_runner(self, runner_name: str):
+        # раннеры создаются по требованию: playwright и selenium тяжелые и нужны не каждому воркеру
+        runner = self._runner_instances.get(runner_name)
+        if runner is not None:
+            return runner
+
+        if runner_name == 'chrome':
+            from src.chrome.chrome import Chrome
+            runner = Chrome()
+        elif runner_name == 'playwright':
+            from src.chrome.playwright_chrome import PlaywrightChrome
+            from src.scripts import register_all_scripts
+            runner = PlaywrightChrome()
+            register_all_scripts(runner)
+        elif runner_name == 'manager':
+            from src.manager.manager import Manager
+            runner = Manager()
+        else:
+            raise ValueError(f'неизвестный раннер: {runner_name}')
+
+        self._runner_instances[runner_name] = runner
+        return runner
+
+    @staticmethod
+    def _run_job(runner, job: dict) -> bool:
+        unknown_scripts = [script for script in job['scripts'] if script not in runner.scripts]
+        if unknown_scripts:
+            raise ValueError(f'скрипты не найдены на воркере: {", ".join(unknown_scripts)}')
+
+        if job['runner'] == 'manager':
+            return runner.run_scripts(job['profile'], job['scripts'], batch_id=job['batch_id'])
+
+        return runner.run_scripts(
+            job['profile'],
+            job['scripts'],
+            job['options'].get('headless', False),
+            batch_id=job['batch_id']
+        )
+
+    @staticmethod
+    def _describe_run(run) -> dict:
+        if run is None:
+            return {}
+
+        return {
+            'outcome': run.outcome,
+            'failed_scripts': run.failed_scripts,
+            'error': run.error,
+            'duration_sec': round((run.finished_at or time.time()) - run.started_at, 3),
+            'phases': run.phases,
+            'retries': run.retries,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Воркер распределенного прогона профилей')
+    parser.add_argument('--coordinator', required=True, help='адрес координатора, например http://127.0.0.1:8765')
+    parser.add_argument('--token', default=None, help='токен координатора (по умолчанию distributed_token)')
+    parser.add_argument('--worker-id', default=None, help='идентификатор воркера')
+    parser.add_argument('--runners', default=None, help='раннеры через запятую (по умолчанию любые)')
+    parser.add_argument('--no-sync', action='store_true', help='не переносить профили (общая папка профилей)')
+    parser.add_argument('--exit-when-idle', action='store_true', help='завершиться, когда заданий нет')
+    parser.add_argument('--poll-sec', type=float, default=5, help='пауза между запросами при пустой очереди')
+    args = parser.parse_args()
+
+    from src.utils.logging_setup import setup_logger
+    setup_logger()
+
+    token = args.token or general_config.get('distributed_token')
+    if not token:
+        parser.error('нужен --token или distributed_token в config.py')
+
+    worker = Worker(
+        HttpTransport(args.coordinator, token),
+        worker_id=args.worker_id,
+        runners=args.runners.split(',') if args.runners else None,
+        sync_profiles=not args.no_sync,
+        poll_sec=args.poll_sec
+    )
+    try:
+        worker.run(exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        logger.warning('⚠️ Воркер остановлен, текущее задание вернется в очередь по истечении аренды')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,88 @@
 import os
+from typing import TYPE_CHECKING
 
 from loguru import logger
 
 from src.utils.constants import *
+from src.utils.run_results import ProfileRun
+from src.utils.profile_snapshots import snapshot_before_run
+from src.utils.retry_policy import RetryPolicy
+from src.utils.instrumentation import profiled_run
 from .scripts import *
 
+if TYPE_CHECKING:
+    from src.utils.batch_journal import BatchJournal
+
 
 class Manager:
     def __init__(self):
+        self.last_run = None  # ProfileRun последнего run_scripts
 
+        # 'idempotent': True - скрипт можно безопасно перезапустить после таймаута (см. retry_limits)
         self.scripts = {
             'test_script': {
                 'human_name': 'Тестовый скрипт',
                 'method': test_script,
+                'idempotent': True
+            },
+            'chrome_initial_setup': {
+                'human_name': 'Первичная настройка Chrome через Preferences (без запуска браузера)',
+                'method': chrome_initial_setup,
+                'idempotent': True
             }
         }
 
-    def run_scripts(self, profile_name: str, scripts_list: list[str]) -> bool:
+    @profiled_run('manager')
+    def run_scripts(self,
+                    profile_name: str,
+                    scripts_list: list[str],
+                    batch_id: str | None = None,
+                    journal: 'BatchJournal | None' = None,
+                    retry_policy: RetryPolicy | None = None) -> bool:
         """
         Запускает скрипты для указанного профиля
         
         Args:
             profile_name (str): Имя профиля
             scripts_list (list[str]): Список скриптов для запуска
+            batch_id (str | None): Идентификатор пакетного прогона для записи результатов
+            journal (BatchJournal | None): Журнал прогона, в котором отмечаются выполненные скрипты
+            retry_policy (RetryPolicy | None): Политика повторов прогона (если None, берется из конфигурации)
             
         Returns:
             bool: True, если все скрипты выполнены успешно, иначе False
         """
-        success = True
+        run = ProfileRun('manager', profile_name, batch_id, journal=journal, scripts_total=len(scripts_list))
+        self.last_run = run
+        with run.phase('snapshot'):
+            snapshot_before_run(profile_name, run.batch_id)
+        retry_policy = retry_policy or RetryPolicy.from_config()
+
         for script in scripts_list:
             try:
                 human_name = self.scripts[script]['human_name']
                 logger.info(f'ℹ️ {profile_name} - запускаю скрипт "{human_name}"')
                 script_data_path = os.path.join(DATA_PATH, 'scripts', "manager", script)
-                self.scripts[script]['method'](
-                    profile_name,
-                    script_data_path
-                )
-                logger.info(f'✅  {profile_name} - скрипт "{human_name}" выполнен')
+                with run.script(script) as outcome:
+                    result = retry_policy.call(
+                        'script',
+                        self.scripts[script]['method'],
+                        profile_name,
+                        script_data_path,
+                        description=f'{profile_name} - скрипт "{human_name}"',
+                        is_failed=lambda script_result: script_result is False,
+                        on_retry=run.add_retry,
+                        retryable=self.scripts[script].get('idempotent', False)
+                    )
+                    outcome['failed'] = result is False
+
+                if outcome['failed']:
+                    logger.error(f'⛔  {profile_name} - скрипт "{human_name}" завершен с ошибкой')
+                else:
+                    logger.info(f'✅  {profile_name} - скрипт "{human_name}" выполнен')
             except Exception as e:
                 human_name = self.scripts[script]['human_name']
                 logger.error(f'⛔  {profile_name} - скрипт "{human_name}" завершен с ошибкой')
                 logger.debug(f'{profile_name} - скрипт "{human_name}" завершен с ошибкой, причина: {e}')
-                success = False
         
-        return success
+        return run.finish().success
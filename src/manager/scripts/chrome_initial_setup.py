@@ -1,9 +1,8 @@
-import json
-import time
+from loguru import logger
 
-from pathlib import Path
-from src.chrome.chrome import Chrome
 from src.utils.constants import *
+from src.utils.preferences_patch import patch_profile, normalize_edits, edits_from_preferences_spec
+from .preferences_template import PREFERENCES_TEMPLATE_VERSION, build_preferences, write_preferences
 
 
 GENERAL_PREFERENCES = {
@@ -154,28 +153,34 @@ PROFILE_SPECIFIC_PREFERENCES = {
 }
 
 
-def chrome_initial_setup(profile_name: str, _) -> None:
-    profile_preferences_path = CHROME_DATA_PATH / f"Profile {profile_name}" / "Preferences"
-
-    if not profile_preferences_path.exists():
-        chrome = Chrome()
-        chrome.init_profile_preferences(profile_name)
-        time.sleep(5)
-
-    with open(profile_preferences_path, "r", encoding="utf-8") as f:
-        preferences_file = json.load(f)
+def chrome_initial_setup(profile_name: str, _, profile_values: dict | None = None) -> bool | None:
+    """
+    Применяет безопасные настройки GENERAL_PREFERENCES к профилю.
+    Если Preferences еще нет (новый профиль), файл собирается из шаблона без запуска Chrome
 
-    for setting, data in GENERAL_PREFERENCES.items():
-        value_to_set = data["default_safe_value"]
+    Args:
+        profile_name: Имя профиля
+        profile_values: Значения PROFILE_SPECIFIC_PREFERENCES для нового профиля, например {"theme_color": -1714692}
 
-        final_update_path = preferences_file
-        for key in data["access"][:-1]:
-            final_update_path = final_update_path.setdefault(key, {})
-
-        final_update_path[data["access"][-1]] = value_to_set
+    Returns:
+        bool | None: False, если не удалось изменить Preferences
+    """
+    profile_preferences_path = CHROME_DATA_PATH / f"Profile {profile_name}" / "Preferences"
 
-    with open(profile_preferences_path, "w", encoding="utf-8") as f:
-        json.dump(preferences_file, f, indent=4, ensure_ascii=False)
+    if not profile_preferences_path.exists():
+        preferences_file = build_preferences(
+            GENERAL_PREFERENCES,
+            PROFILE_SPECIFIC_PREFERENCES,
+            {"name": str(profile_name), **(profile_values or {})}
+        )
+        write_preferences(profile_preferences_path, preferences_file)
+        logger.debug('{} - Preferences создан из шаблона v{}', profile_name, PREFERENCES_TEMPLATE_VERSION)
+        return
+
+    # существующий файл переписывается, только если какие-то настройки отличаются
+    report = patch_profile(profile_name, normalize_edits(edits_from_preferences_spec(GENERAL_PREFERENCES)))
+    if report['status'] == 'error':
+        return False
 
 
 # ЦВЕТ ПРОФИЛЯ
@@ -0,0 +1,83 @@
+"""
+Шаблон файла Preferences для новых профилей.
+
+Chrome дополняет неполный Preferences значениями по умолчанию при первом запуске,
+поэтому для новой папки профиля достаточно минимального файла с нужными настройками -
+запускать браузер ради его создания не нужно.
+
+При изменении шаблона увеличивается PREFERENCES_TEMPLATE_VERSION: версия записывается
+в сам файл, по ней видно, каким шаблоном создан профиль.
+"""
+
+import copy
+from pathlib import Path
+
+from src.utils.preferences_patch import write_json_atomic
+
+
+PREFERENCES_TEMPLATE_VERSION = 1
+
+PREFERENCES_TEMPLATE = {
+    "browser": {
+        "check_default_browser": False,
+        "has_seen_welcome_page": True,
+    },
+    "extensions": {
+        "pinned_extensions": [],
+    },
+    "profile": {
+        "exit_type": "Normal",
+        "exited_cleanly": True,
+        "name": "",
+    },
+    "profiles_manager": {
+        "preferences_template_version": PREFERENCES_TEMPLATE_VERSION,
+    },
+}
+
+
+def set_preference(preferences: dict, access: list[str], value) -> None:
+    """
+    Записывает значение по пути ключей, создавая недостающие словари
+
+    Args:
+        preferences: Содержимое Preferences
+        access: Путь ключей, например ["profile", "cookie_controls_mode"]
+        value: Значение
+    """
+    node = preferences
+    for key in access[:-1]:
+        node = node.setdefault(key, {})
+
+    node[access[-1]] = copy.deepcopy(value)
+
+
+def build_preferences(general_preferences: dict, profile_preferences: dict, profile_values: dict) -> dict:
+    """
+    Собирает Preferences из шаблона
+
+    Args:
+        general_preferences: Общие настройки (GENERAL_PREFERENCES), применяется default_safe_value
+        profile_preferences: Настройки профиля (PROFILE_SPECIFIC_PREFERENCES)
+        profile_values: Значения настроек профиля, например {"name": "1"}; настройки без значения не пишутся
+
+    Returns:
+        dict: Содержимое Preferences
+    """
+    preferences = copy.deepcopy(PREFERENCES_TEMPLATE)
+
+    for data in general_preferences.values():
+        set_preference(preferences, data["access"], data["default_safe_value"])
+
+    for setting, data in profile_preferences.items():
+        if profile_values.get(setting) is not None:
+            set_preference(preferences, data["access"], profile_values[setting])
+
+    return preferences
+
+
+def write_preferences(preferences_path: str | Path, preferences: dict) -> None:
+    """
+    Атомарно записывает Preferences, чтобы прерванная запись не оставила профиль с битым файлом
+    """
+    write_json_atomic(preferences_path, preferences)
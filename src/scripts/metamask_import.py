@@ -15,26 +15,8 @@ from typing import Optional, Dict, Any
 
 # Импортируем модуль с общими функциями
 from src.utils.common_actions import click_element
-
-def get_txt_line_by_profile_name(profile_name: str, file_path: str) -> Optional[str]:
-    """
-    Получает строку из файла secrets.txt по имени профиля
-    
-    Args:
-        profile_name: Имя профиля
-        file_path: Путь к файлу secrets.txt
-        
-    Returns:
-        Optional[str]: Строка с данными профиля или None, если не найдена
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip().startswith(f"{profile_name}|"):
-                    return line.strip()
-    except Exception as e:
-        logger.error(f"❌ Ошибка при чтении файла {file_path}: {str(e)}")
-    return None
+from src.utils.helpers import human_delay
+from src.utils.data_sources import get_txt_line_by_profile_name
 
 def is_twelve_words_string(text: str) -> bool:
     """
@@ -99,8 +81,8 @@ def run_metamask_import(profile_name: str, script_data_path: str, page: Page = N
         # Получаем контекст из страницы
         context = page.context
         
-        # Пауза перед открытием новой вкладки
-        time.sleep(0.5)
+        # Пауза перед открытием новой вкладки (только если включена политика human_delay)
+        human_delay()
         
         # Создаем страницу и сразу переходим на URL
         metamask_url = f"chrome-extension://nkbihfbeogaeaoehlefnkodbefgpgknn/home.html#onboarding/welcome"
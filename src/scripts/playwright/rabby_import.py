@@ -13,25 +13,7 @@ from loguru import logger
 from playwright.sync_api import Page
 from typing import Optional, Dict, Any
 
-def get_txt_line_by_profile_name(profile_name: str, file_path: str) -> Optional[str]:
-    """
-    Получает строку из файла secrets.txt по имени профиля
-    
-    Args:
-        profile_name: Имя профиля
-        file_path: Путь к файлу secrets.txt
-        
-    Returns:
-        Optional[str]: Строка с данными профиля или None, если не найдена
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip().startswith(f"{profile_name}|"):
-                    return line.strip()
-    except Exception as e:
-        logger.error(f"❌ Ошибка при чтении файла {file_path}: {str(e)}")
-    return None
+from src.utils.data_sources import get_txt_line_by_profile_name
 
 def is_twelve_words_string(text: str) -> bool:
     """
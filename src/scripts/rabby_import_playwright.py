@@ -15,26 +15,8 @@ from typing import Optional, Dict, Any
 
 # Импортируем модуль с общими функциями
 from src.utils.common_actions import click_element, fill_input, wait_for_element, check_element_exists
-
-def get_txt_line_by_profile_name(profile_name: str, file_path: str) -> Optional[str]:
-    """
-    Получает строку из файла secrets.txt по имени профиля
-    
-    Args:
-        profile_name: Имя профиля
-        file_path: Путь к файлу secrets.txt
-        
-    Returns:
-        Optional[str]: Строка с данными профиля или None, если не найдена
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip().startswith(f"{profile_name}|"):
-                    return line.strip()
-    except Exception as e:
-        logger.error(f"❌ Ошибка при чтении файла {file_path}: {str(e)}")
-    return None
+from src.utils.helpers import human_delay
+from src.utils.data_sources import get_txt_line_by_profile_name
 
 def is_twelve_words_string(text: str) -> bool:
     """
@@ -99,15 +81,14 @@ def run_rabby_import(profile_name: str, script_data_path: str, page: Page = None
         # Получаем контекст из страницы
         context = page.context
         
-        # Пауза перед открытием новой вкладки
-        time.sleep(1.5)
+        # Пауза перед открытием новой вкладки (только если включена политика human_delay)
+        human_delay()
         
         # Создаем страницу и сразу переходим на URL
         rabby_url = f"chrome-extension://acmacodkjbdgmoleebolmdjonilkdbch/index.html#/new-user/guide"
         logger.info(f"🔗 Открываем Rabby по URL: {rabby_url}")
         rabby_page = context.new_page()
         rabby_page.goto(rabby_url, wait_until="networkidle")  # wait_until опционально
-        time.sleep(1)
 
         click_element(
             page=rabby_page,
@@ -116,24 +97,16 @@ def run_rabby_import(profile_name: str, script_data_path: str, page: Page = None
             timeout=10000,
             highlight=True
          )
-        
-        # Добавляем задержку для загрузки следующей страницы
-        time.sleep(0.5)
 
         if is_seed_phrase:
             # Импорт через seed-фразу
             logger.info("🔑 Импортируем через seed-фразу...")
-                    # Добавляем задержку для загрузки следующей страницы
-            time.sleep(0.5)
             
-            # Пробуем прямой клик по тексту
+            # Пробуем прямой клик по тексту, click сам дождется появления элемента
             logger.info("🔄 Пробуем прямой клик по тексту 'Seed Phrase'...")
             try:
                 rabby_page.click("text=Seed Phrase")
                 logger.info("✅ Клик по тексту 'Seed Phrase' выполнен")
-                
-                # Добавляем задержку
-                time.sleep(0.5)
             except Exception as direct_click_error:
                 logger.error(f"❌ Ошибка при прямом клике: {str(direct_click_error)}")         
             
@@ -143,9 +116,6 @@ def run_rabby_import(profile_name: str, script_data_path: str, page: Page = None
                 word_input = rabby_page.locator(f"input[placeholder*='•'], .is-mnemonics-input input, input.ant-input >> nth={i-1}")
                 word_input.fill(word)
                 logger.info(f"✍️ Введено слово {i} из 12")
-            
-            # Добавляем задержку после ввода seed-фразы
-            time.sleep(0.5)
 
              #  кликаем на кнопку Confirm  - Используем функцию из общего модуля
             click_element(
@@ -155,14 +125,17 @@ def run_rabby_import(profile_name: str, script_data_path: str, page: Page = None
                     timeout=10000,
                     highlight=True
                 )
-           
-            time.sleep(0.5)
             
             # Проверяем, появилось ли поле для ввода пароля
             logger.info("🔍 Проверяем наличие поля для ввода пароля...")
             try:
-                # Проверяем видимость поля для ввода пароля
-                password_visible = rabby_page.is_visible("#password, input[placeholder*='Password']")
+                # Ждем появления поля для ввода пароля вместо фиксированной паузы
+                password_visible = check_element_exists(
+                    page=rabby_page,
+                    selector="#password, input[placeholder*='Password']",
+                    log_message="Проверяем поле для ввода пароля",
+                    timeout=10000
+                )
                 logger.info(f"👁️ Поле для ввода пароля видимо: {password_visible}")
                 
                 if password_visible:
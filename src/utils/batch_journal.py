@@ -0,0 +1,218 @@
+"""
+Журнал пакетного прогона скриптов для продолжения после сбоя.
+
+Журнал - JSONL-файл data/batches/<batch_id>.jsonl:
+    {"type": "batch", ...}     - первая строка: раннер, профили, скрипты и параметры прогона
+    {"type": "done", ...}      - пара (профиль, скрипт) выполнена успешно
+    {"type": "finished", ...}  - прогон завершен (или отменен) и продолжать его не нужно
+
+Каждая отметка дописывается и сбрасывается на диск сразу после выполнения скрипта,
+поэтому после падения или принудительного закрытия приложения повторный прогон
+выполняет только оставшиеся пары. Оборванная последняя строка при чтении пропускается.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+from loguru import logger
+
+from src.utils.constants import DATA_PATH
+from src.utils.run_results import new_batch_id
+
+
+BATCH_JOURNALS_PATH = DATA_PATH / "batches"
+
+
+class BatchJournal:
+    def __init__(self,
+                 path: str | Path,
+                 batch_id: str,
+                 runner: str,
+                 profiles: list[str],
+                 scripts: list[str],
+                 options: dict | None = None,
+                 created_at: float | None = None):
+        self.path = Path(path)
+        self.batch_id = batch_id
+        self.runner = runner
+        self.profiles = profiles
+        self.scripts = scripts
+        self.options = options or {}
+        self.created_at = created_at or time.time()
+        self.completed: set[tuple[str, str]] = set()
+        self.finished = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls,
+               runner: str,
+               profiles: list[str],
+               scripts: list[str],
+               options: dict | None = None,
+               journals_path: str | Path = None) -> 'BatchJournal':
+        """
+        Создает журнал нового прогона
+
+        Args:
+            runner: Раннер (chrome, playwright, manager)
+            profiles: Профили прогона в порядке выполнения
+            scripts: Скрипты прогона в порядке выполнения
+            options: Параметры прогона, нужные для продолжения (например, headless)
+
+        Returns:
+            BatchJournal: Журнал прогона
+        """
+        journals_path = Path(journals_path or BATCH_JOURNALS_PATH)
+        journals_path.mkdir(parents=True, exist_ok=True)
+
+        batch_id = new_batch_id()
+        journal = cls(
+            journals_path / f"{batch_id}.jsonl",
+            batch_id,
+            runner,
+            [str(profile) for profile in profiles],
+            list(scripts),
+            options
+        )
+        journal._append({
+            'type': 'batch',
+            'batch_id': journal.batch_id,
+            'runner': runner,
+            'profiles': journal.profiles,
+            'scripts': journal.scripts,
+            'options': journal.options,
+            'created_at': journal.created_at
+        })
+
+        return journal
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'BatchJournal':
+        """
+        Читает журнал прогона с диска
+
+        Args:
+            path: Путь к файлу журнала
+
+        Returns:
+            BatchJournal: Журнал с отметками выполненных пар
+        """
+        journal = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # строка оборвана при падении
+
+                if record.get('type') == 'batch':
+                    journal = cls(
+                        path,
+                        record['batch_id'],
+                        record['runner'],
+                        record['profiles'],
+                        record['scripts'],
+                        record.get('options'),
+                        record.get('created_at')
+                    )
+                elif journal is None:
+                    continue
+                elif record.get('type') == 'done':
+                    journal.completed.add((record['profile'], record['script']))
+                elif record.get('type') == 'finished':
+                    journal.finished = True
+
+        if journal is None:
+            raise ValueError(f'{path} - нет заголовка прогона')
+
+        return journal
+
+    @classmethod
+    def find_unfinished(cls, runner: str, journals_path: str | Path = None) -> 'BatchJournal | None':
+        """
+        Находит последний незавершенный прогон раннера
+
+        Args:
+            runner: Раннер (chrome, playwright, manager)
+
+        Returns:
+            BatchJournal | None: Журнал прогона или None, если незавершенных прогонов нет
+        """
+        journals_path = Path(journals_path or BATCH_JOURNALS_PATH)
+        if not journals_path.exists():
+            return None
+
+        journal_files = sorted(journals_path.glob('*.jsonl'), key=lambda p: p.stat().st_mtime, reverse=True)
+        for journal_file in journal_files:
+            try:
+                journal = cls.load(journal_file)
+            except Exception as e:
+                logger.debug(f'{journal_file} - не удалось прочитать журнал прогона, причина: {e}')
+                continue
+
+            if journal.runner == runner and not journal.finished and journal.pending_count():
+                return journal
+
+        return None
+
+    def is_done(self, profile_name: str, script: str) -> bool:
+        return (str(profile_name), script) in self.completed
+
+    def pending_scripts(self, profile_name: str) -> list[str]:
+        """
+        Возвращает скрипты профиля, которые еще не выполнены
+
+        Args:
+            profile_name: Имя профиля
+
+        Returns:
+            list[str]: Скрипты в исходном порядке
+        """
+        return [script for script in self.scripts if not self.is_done(profile_name, script)]
+
+    def pending_count(self) -> int:
+        return len(self.profiles) * len(self.scripts) - len(self.completed)
+
+    def mark_done(self, profile_name: str, script: str) -> None:
+        """
+        Отмечает пару (профиль, скрипт) выполненной и сразу сбрасывает отметку на диск
+
+        Args:
+            profile_name: Имя профиля
+            script: Ключ скрипта
+        """
+        key = (str(profile_name), script)
+        if key in self.completed:
+            return
+
+        self.completed.add(key)
+        self._append({'type': 'done', 'profile': key[0], 'script': script, 'at': time.time()})
+
+    def finish(self) -> None:
+        """
+        Отмечает прогон завершенным, продолжать его больше не будет предложено
+        """
+        if self.finished:
+            return
+
+        self.finished = True
+        self._append({'type': 'finished', 'at': time.time()})
+
+    def _append(self, record: dict) -> None:
+        try:
+            line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+            with self._lock, open(self.path, 'a+b') as f:
+                # если последняя строка оборвана при падении, начинаем запись с новой строки
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.warning(f'⚠️ {self.batch_id} - не удалось записать журнал прогона')
+            logger.debug(f'{self.batch_id} - не удалось записать журнал прогона, причина: {e}')
@@ -9,15 +9,52 @@
 import os
 import time
 from loguru import logger
-from playwright.sync_api import Page, Locator
+from playwright.sync_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
 from typing import Optional, Dict, Any, Union
 
+from src.utils.helpers import human_delay
+from src.utils.instrumentation import instrumented
+
+def _pause_before_action(sleep_before: Optional[float]) -> None:
+    """
+    Пауза перед действием: явно заданная задержка или политика human_delay
+    """
+    if sleep_before is None:
+        human_delay()
+    elif sleep_before > 0:
+        time.sleep(sleep_before)
+
+@instrumented('common_actions.wait_for_page_ready')
+def wait_for_page_ready(
+    page: Page,
+    state: str = "domcontentloaded",
+    timeout: int = 30000
+) -> bool:
+    """
+    Ожидает готовности страницы вместо фиксированной паузы после перехода
+
+    Args:
+        page: Страница Playwright
+        state: Состояние загрузки (load, domcontentloaded, networkidle)
+        timeout: Таймаут ожидания в миллисекундах
+
+    Returns:
+        bool: True если страница достигла состояния, False в противном случае
+    """
+    try:
+        page.wait_for_load_state(state, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        logger.warning(f"⚠️ Страница не достигла состояния {state} за {timeout} мс")
+        return False
+
+@instrumented('common_actions.click_element')
 def click_element(
     page: Page, 
     selector: str, 
     log_message: str = "Нажимаем на элемент", 
     timeout: int = 30000,
-    sleep_before: float = 0.5,
+    sleep_before: Optional[float] = None,
     take_screenshot: bool = False,
     screenshot_dir: str = None,
     screenshot_name: str = None,
@@ -31,7 +68,7 @@ def click_element(
         selector: Селектор элемента (может быть комбинированным с запятой)
         log_message: Сообщение для логирования
         timeout: Таймаут ожидания элемента в миллисекундах
-        sleep_before: Задержка перед кликом в секундах
+        sleep_before: Задержка перед кликом в секундах (None - политика human_delay)
         take_screenshot: Делать ли скриншот перед кликом
         screenshot_dir: Директория для сохранения скриншота
         screenshot_name: Имя файла скриншота
@@ -42,47 +79,47 @@ def click_element(
     """
     logger.info(f"🖱️ {log_message}...")
     
-    # Добавляем задержку перед действием
-    if sleep_before > 0:
-        time.sleep(sleep_before)
+    _pause_before_action(sleep_before)
     
     try:
-        # Создаем локатор
-        element = page.locator(selector)
+        # Создаем локатор (для комбинированного селектора берем первый найденный элемент)
+        element = page.locator(selector).first
         
-        # Проверяем видимость элемента
-        if element.is_visible(timeout=timeout):
-            # Делаем скриншот перед кликом, если нужно
-            if take_screenshot and screenshot_dir and screenshot_name:
-                screenshot_path = os.path.join(screenshot_dir, screenshot_name)
-                page.screenshot(path=screenshot_path)
-                logger.info(f"📸 Сделан скриншот перед кликом: {screenshot_path}")
-            
-            # Подсвечиваем элемент, если нужно
-            if highlight:
-                try:
-                    element.highlight()
-                except:
-                    pass  # Игнорируем ошибку, если запущено в headless режиме
-            
-            # Кликаем по элементу
-            element.click()
-            logger.info(f"✅ {log_message} - успешно")
-            return True
-        else:
-            logger.error(f"❌ Элемент не найден: {selector}")
-            return False
+        # Ждем появления элемента вместо фиксированной паузы
+        element.wait_for(state="visible", timeout=timeout)
+        
+        # Делаем скриншот перед кликом, если нужно
+        if take_screenshot and screenshot_dir and screenshot_name:
+            screenshot_path = os.path.join(screenshot_dir, screenshot_name)
+            page.screenshot(path=screenshot_path)
+            logger.info(f"📸 Сделан скриншот перед кликом: {screenshot_path}")
+        
+        # Подсвечиваем элемент, если нужно
+        if highlight:
+            try:
+                element.highlight()
+            except:
+                pass  # Игнорируем ошибку, если запущено в headless режиме
+        
+        # Кликаем по элементу, Playwright сам дождется его готовности к клику
+        element.click(timeout=timeout)
+        logger.info(f"✅ {log_message} - успешно")
+        return True
+    except PlaywrightTimeoutError:
+        logger.error(f"❌ Элемент не найден: {selector}")
+        return False
     except Exception as e:
         logger.error(f"❌ Ошибка при клике на элемент: {str(e)}")
         return False
 
+@instrumented('common_actions.fill_input')
 def fill_input(
     page: Page, 
     selector: str, 
     value: str,
     log_message: str = "Заполняем поле", 
     timeout: int = 30000,
-    sleep_before: float = 0.5,
+    sleep_before: Optional[float] = None,
     highlight: bool = True
 ) -> bool:
     """
@@ -94,7 +131,7 @@ def fill_input(
         value: Значение для ввода
         log_message: Сообщение для логирования
         timeout: Таймаут ожидания элемента в миллисекундах
-        sleep_before: Задержка перед вводом в секундах
+        sleep_before: Задержка перед вводом в секундах (None - политика human_delay)
         highlight: Подсвечивать ли элемент перед вводом
         
     Returns:
@@ -102,34 +139,34 @@ def fill_input(
     """
     logger.info(f"✍️ {log_message}...")
     
-    # Добавляем задержку перед действием
-    if sleep_before > 0:
-        time.sleep(sleep_before)
+    _pause_before_action(sleep_before)
     
     try:
         # Создаем локатор
-        input_field = page.locator(selector)
+        input_field = page.locator(selector).first
         
-        # Проверяем видимость поля ввода
-        if input_field.is_visible(timeout=timeout):
-            # Подсвечиваем элемент, если нужно
-            if highlight:
-                try:
-                    input_field.highlight()
-                except:
-                    pass  # Игнорируем ошибку, если запущено в headless режиме
-            
-            # Заполняем поле
-            input_field.fill(value)
-            logger.info(f"✅ {log_message} - успешно")
-            return True
-        else:
-            logger.error(f"❌ Поле ввода не найдено: {selector}")
-            return False
+        # Ждем появления поля ввода вместо фиксированной паузы
+        input_field.wait_for(state="visible", timeout=timeout)
+        
+        # Подсвечиваем элемент, если нужно
+        if highlight:
+            try:
+                input_field.highlight()
+            except:
+                pass  # Игнорируем ошибку, если запущено в headless режиме
+        
+        # Заполняем поле
+        input_field.fill(value, timeout=timeout)
+        logger.info(f"✅ {log_message} - успешно")
+        return True
+    except PlaywrightTimeoutError:
+        logger.error(f"❌ Поле ввода не найдено: {selector}")
+        return False
     except Exception as e:
         logger.error(f"❌ Ошибка при заполнении поля: {str(e)}")
         return False
 
+@instrumented('common_actions.wait_for_element')
 def wait_for_element(
     page: Page, 
     selector: str, 
@@ -154,7 +191,7 @@ def wait_for_element(
     
     try:
         # Создаем локатор
-        element = page.locator(selector)
+        element = page.locator(selector).first
         
         # Ожидаем элемент
         element.wait_for(state=state, timeout=timeout)
@@ -164,6 +201,7 @@ def wait_for_element(
         logger.error(f"❌ Ошибка при ожидании элемента: {str(e)}")
         return False
 
+@instrumented('common_actions.check_element_exists')
 def check_element_exists(
     page: Page, 
     selector: str, 
@@ -186,10 +224,14 @@ def check_element_exists(
     
     try:
         # Создаем локатор
-        element = page.locator(selector)
+        element = page.locator(selector).first
         
-        # Проверяем видимость элемента
-        is_visible = element.is_visible(timeout=timeout)
+        # Ждем появления элемента не дольше timeout (is_visible сам не ждет)
+        try:
+            element.wait_for(state="visible", timeout=timeout)
+            is_visible = True
+        except PlaywrightTimeoutError:
+            is_visible = False
         
         if is_visible:
             logger.info(f"✅ {log_message} - элемент найден")
@@ -15,5 +15,22 @@ CHROME_DRIVER_PATH = PROJECT_PATH / "src" / "chrome" / "scripts" / chrome_driver
 PROFILE_WELCOME_PAGE_TEMPLATE_PATH = PROJECT_PATH / "src" / "client" / "template.html"
 PROFILE_WELCOME_PAGES_OUTPUT_PATH = CHROME_DATA_PATH / "WelcomePages"
 
+# Папки профиля, которые Chrome пересоздает сам (кэши), и файлы блокировок запущенного Chrome.
+# Не переносятся при синхронизации и не попадают в архивы профилей
+PROFILE_CACHE_DIRS = (
+    'Cache',
+    'Code Cache',
+    'GPUCache',
+    'DawnCache',
+    'DawnGraphiteCache',
+    'DawnWebGPUCache',
+    'GrShaderCache',
+    'ShaderCache',
+    'Crashpad',
+    'CacheStorage',
+    'ScriptCache',
+)
+PROFILE_LOCK_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'DevToolsActivePort')
+
 # ID расширений
 METAMASK_ID = "nkbihfbeogaeaoehlefnkodbefgpgknn"
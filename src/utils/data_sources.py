@@ -0,0 +1,151 @@
+"""
+Индекс данных профилей (секреты, прокси и т.п.) по имени профиля.
+
+Файл разбирается один раз в словарь {имя профиля: запись} и кешируется до тех пор,
+пока не изменятся его mtime или размер, поэтому поиск данных для каждого профиля
+не перечитывает файл целиком.
+
+Поддерживаемые форматы:
+    .txt   - строки вида "имя_профиля|данные", запись - исходная строка
+    .csv   - таблица с заголовком, запись - словарь строки
+    .jsonl - JSON-объект на строку, запись - словарь
+В CSV и JSONL имя профиля берется из колонки profile_name, profile или name.
+"""
+
+import os
+import csv
+import json
+import threading
+from pathlib import Path
+
+from loguru import logger
+
+
+PROFILE_KEY_COLUMNS = ('profile_name', 'profile', 'name')
+
+_index_cache: dict[str, tuple[int, int, dict]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def _parse_txt(file_path: str) -> dict[str, str]:
+    index = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or '|' not in line:
+                continue
+
+            name = line.split('|', 1)[0]
+            index.setdefault(name, line)  # при дублях побеждает первая строка, как при линейном поиске
+
+    return index
+
+
+def _get_record_key(record: dict) -> str | None:
+    for column in PROFILE_KEY_COLUMNS:
+        if record.get(column) not in (None, ''):
+            return str(record[column]).strip()
+
+    return None
+
+
+def _parse_csv(file_path: str) -> dict[str, dict]:
+    index = {}
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            name = _get_record_key(row)
+            if name is not None:
+                index.setdefault(name, row)
+
+    return index
+
+
+def _parse_jsonl(file_path: str) -> dict[str, dict]:
+    index = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f'⚠️ {file_path}:{line_number} - строка пропущена, невалидный JSON: {e}')
+                continue
+
+            name = _get_record_key(record) if isinstance(record, dict) else None
+            if name is not None:
+                index.setdefault(name, record)
+
+    return index
+
+
+_PARSERS = {
+    '.csv': _parse_csv,
+    '.jsonl': _parse_jsonl,
+}
+
+
+def load_profile_data_index(file_path: str | Path) -> dict:
+    """
+    Возвращает индекс файла данных {имя профиля: запись}, разбирая файл
+    только при первом обращении или после его изменения
+
+    Args:
+        file_path: Путь к файлу данных (.txt, .csv или .jsonl)
+
+    Returns:
+        dict: Индекс записей по имени профиля (не изменять - общий для всех вызовов)
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)  # FileNotFoundError пробрасываем вызывающему
+
+    with _index_cache_lock:
+        cached = _index_cache.get(file_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        parser = _PARSERS.get(os.path.splitext(file_path)[1].lower(), _parse_txt)
+        index = parser(file_path)
+        _index_cache[file_path] = (stat.st_mtime_ns, stat.st_size, index)
+        logger.debug(f'{file_path} - проиндексировано записей: {len(index)}')
+
+        return index
+
+
+def get_profile_record(profile_name: str | int, file_path: str | Path) -> str | dict | None:
+    """
+    Находит запись профиля в файле данных
+
+    Args:
+        profile_name: Имя профиля
+        file_path: Путь к файлу данных
+
+    Returns:
+        str | dict | None: Строка (.txt) или словарь (.csv, .jsonl), None если запись не найдена
+    """
+    return load_profile_data_index(file_path).get(str(profile_name))
+
+
+def get_txt_line_by_profile_name(profile_name: str | int, file_path: str | Path) -> str | None:
+    """
+    Находит строку "имя_профиля|данные" в текстовом файле данных
+
+    Args:
+        profile_name: Имя профиля
+        file_path: Путь к файлу (secrets.txt, proxies.txt)
+
+    Returns:
+        str | None: Строка с данными профиля или None, если не найдена
+    """
+    record = get_profile_record(profile_name, file_path)
+    return record if isinstance(record, str) else None
+
+
+def clear_profile_data_cache() -> None:
+    """
+    Сбрасывает кеш индексов файлов данных
+    """
+    with _index_cache_lock:
+        _index_cache.clear()
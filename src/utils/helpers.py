@@ -1,14 +1,44 @@
 import os
 import json
+import random
 import shutil
 import sys
 import time
 
 from loguru import logger
 
+from config import general_config
 from src.utils.constants import *
+from src.utils.instrumentation import instrumented
 
 
+# Политика "человеческих" пауз перед действиями в скриптах: случайная задержка [мин, макс] в секундах.
+# Ожидание готовности элементов от нее не зависит и выполняется через явные ожидания.
+_human_delay_range = tuple(general_config.get('human_delay_sec', (0, 0)))
+
+
+def set_human_delay(min_sec: float, max_sec: float) -> None:
+    """
+    Задает диапазон случайной паузы перед действиями в скриптах
+
+    Args:
+        min_sec: Минимальная пауза в секундах
+        max_sec: Максимальная пауза в секундах (0 - паузы отключены)
+    """
+    global _human_delay_range
+    _human_delay_range = (min_sec, max(min_sec, max_sec))
+
+
+def human_delay() -> None:
+    """
+    Делает случайную паузу согласно политике set_human_delay / general_config['human_delay_sec']
+    """
+    min_sec, max_sec = _human_delay_range
+    if max_sec > 0:
+        time.sleep(random.uniform(min_sec, max_sec))
+
+
+@instrumented('helpers.get_profiles_list')
 def get_profiles_list() -> list[str]:
     profiles = []
     for item in os.listdir(CHROME_DATA_PATH):
@@ -64,6 +94,7 @@ def set_comments_for_profiles(profile_names: list[str | int], comment: str | int
     }
 
 
+@instrumented('helpers.copy_extension')
 def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: str, replace: bool = False):
     """
     Копирует расширение из папки default_extensions в папку Extensions профиля Chrome
@@ -79,11 +110,11 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
         bool: True, если расширение успешно скопировано, иначе False
     """
     try:
-        logger.debug(f"copy_extension: src_path={src_path}, type={type(src_path)}")
-        logger.debug(f"copy_extension: dest_path={dest_path}, type={type(dest_path)}")
-        logger.debug(f"copy_extension: profile={profile}, type={type(profile)}")
-        logger.debug(f"copy_extension: ext_id={ext_id}, type={type(ext_id)}")
-        logger.debug(f"copy_extension: replace={replace}, type={type(replace)}")
+        logger.debug("copy_extension: src_path={}, type={}", src_path, type(src_path))
+        logger.debug("copy_extension: dest_path={}, type={}", dest_path, type(dest_path))
+        logger.debug("copy_extension: profile={}, type={}", profile, type(profile))
+        logger.debug("copy_extension: ext_id={}, type={}", ext_id, type(ext_id))
+        logger.debug("copy_extension: replace={}, type={}", replace, type(replace))
         
         # Проверяем, содержит ли имя профиля префикс "Profile "
         if isinstance(profile, str) and profile.startswith("Profile "):
@@ -98,7 +129,7 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
         if os.path.exists(preferences_path):
             backup_path = preferences_path + ".backup"
             shutil.copy2(preferences_path, backup_path)
-            logger.debug(f'Создана резервная копия Preferences для профиля {profile}')
+            logger.debug('Создана резервная копия Preferences для профиля {}', profile)
             
             # Читаем текущие настройки
             with open(preferences_path, 'r', encoding='utf-8') as f:
@@ -126,15 +157,15 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
             if os.path.isdir(item_path) and os.path.isfile(os.path.join(item_path, "manifest.json")):
                 version_folders.append(item)
         
-        logger.debug(f"copy_extension: version_folders={version_folders}")
+        logger.debug("copy_extension: version_folders={}", version_folders)
         
         if replace:
             if os.path.exists(dest_path):
-                logger.debug(f"copy_extension: удаляем существующее расширение: {dest_path}")
+                logger.debug("copy_extension: удаляем существующее расширение: {}", dest_path)
                 shutil.rmtree(dest_path)
             
             # Создаем директорию для ID расширения
-            logger.debug(f"copy_extension: создаем директорию: {dest_path}")
+            logger.debug("copy_extension: создаем директорию: {}", dest_path)
             os.makedirs(dest_path, exist_ok=True)
             
             if version_folders:
@@ -142,7 +173,7 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                 for version in version_folders:
                     version_src_path = os.path.join(src_path, version)
                     version_dest_path = os.path.join(dest_path, version)
-                    logger.debug(f"copy_extension: копируем версию {version} из {version_src_path} в {version_dest_path}")
+                    logger.debug("copy_extension: копируем версию {} из {} в {}", version, version_src_path, version_dest_path)
                     shutil.copytree(version_src_path, version_dest_path)
                 logger.info(f'✅  {profile} - добавлено/заменено расширение {ext_id} (версии: {", ".join(version_folders)})')
             else:
@@ -153,14 +184,14 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                 
                 # Создаем папку с версией и копируем туда файлы
                 version_dest_path = os.path.join(dest_path, version)
-                logger.debug(f"copy_extension: копируем расширение из {src_path} в {version_dest_path}")
+                logger.debug("copy_extension: копируем расширение из {} в {}", src_path, version_dest_path)
                 shutil.copytree(src_path, version_dest_path)
                 logger.info(f'✅  {profile} - добавлено/заменено расширение {ext_id} (версия {version})')
             
             # Добавляем расширение в pinned_extensions если его там нет
             if ext_id not in preferences['extensions']['pinned_extensions']:
                 preferences['extensions']['pinned_extensions'].append(ext_id)
-                logger.debug(f'{profile} - расширение {ext_id} добавлено в pinned_extensions')
+                logger.debug('{} - расширение {} добавлено в pinned_extensions', profile, ext_id)
             
             # Сохраняем обновленные настройки
             with open(preferences_path, 'w', encoding='utf-8') as f:
@@ -180,7 +211,7 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                     # Проверяем, есть ли новые версии для установки
                     new_versions = [v for v in version_folders if v not in existing_versions]
                     if not new_versions:
-                        logger.debug(f'{profile} - расширение {ext_id} уже установлено со всеми версиями, пропущено')
+                        logger.debug('{} - расширение {} уже установлено со всеми версиями, пропущено', profile, ext_id)
                         return False
                     
                     # Устанавливаем только новые версии
@@ -194,7 +225,7 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                     # Добавляем расширение в pinned_extensions если его там нет
                     if ext_id not in preferences['extensions']['pinned_extensions']:
                         preferences['extensions']['pinned_extensions'].append(ext_id)
-                        logger.debug(f'{profile} - расширение {ext_id} добавлено в pinned_extensions')
+                        logger.debug('{} - расширение {} добавлено в pinned_extensions', profile, ext_id)
                     
                     # Сохраняем обновленные настройки
                     with open(preferences_path, 'w', encoding='utf-8') as f:
@@ -202,7 +233,7 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                         
                     return True
                 else:
-                    logger.debug(f'{profile} - расширение {ext_id} уже существует, пропущено')
+                    logger.debug('{} - расширение {} уже существует, пропущено', profile, ext_id)
                     return False
             else:
                 # Создаем директорию для ID расширения
@@ -229,7 +260,7 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                 # Добавляем расширение в pinned_extensions если его там нет
                 if ext_id not in preferences['extensions']['pinned_extensions']:
                     preferences['extensions']['pinned_extensions'].append(ext_id)
-                    logger.debug(f'{profile} - расширение {ext_id} добавлено в pinned_extensions')
+                    logger.debug('{} - расширение {} добавлено в pinned_extensions', profile, ext_id)
                 
                 # Сохраняем обновленные настройки
                 with open(preferences_path, 'w', encoding='utf-8') as f:
@@ -238,10 +269,11 @@ def copy_extension(src_path: str, dest_path: str, profile: str | int, ext_id: st
                 return True
     except Exception as e:
         logger.error(f'⛔  {profile} - не удалось добавить расширение {ext_id}')
-        logger.debug(f'{profile} - не удалось добавить расширение {ext_id}, причина: {e}')
+        logger.debug('{} - не удалось добавить расширение {}, причина: {}', profile, ext_id, e)
         return False
 
 
+@instrumented('helpers.copy_extension_from_profile_to_default')
 def copy_extension_from_profile_to_default(profile: str | int, ext_id: str) -> bool:
     """
     Копирует расширение из профиля Chrome в папку дефолтных расширений
@@ -294,10 +326,11 @@ def copy_extension_from_profile_to_default(profile: str | int, ext_id: str) -> b
         return True
     except Exception as e:
         logger.error(f'⛔ Не удалось скопировать расширение {ext_id} из профиля {profile}')
-        logger.debug(f'Не удалось скопировать расширение {ext_id} из профиля {profile}, причина: {e}')
+        logger.debug('Не удалось скопировать расширение {} из профиля {}, причина: {}', ext_id, profile, e)
         return False
 
 
+@instrumented('helpers.remove_extensions')
 def remove_extensions(profile: str | int, ext_ids: list[str]) -> None:
     # Проверяем, содержит ли имя профиля префикс "Profile "
     if isinstance(profile, str) and profile.startswith("Profile "):
@@ -319,7 +352,7 @@ def remove_extensions(profile: str | int, ext_ids: list[str]) -> None:
                 logger.info(f'{profile} - расширение {ext_id} удалено')
         except Exception as e:
             logger.error(f'⛔  {profile} - не удалоcь удалить расширение {ext_id}')
-            logger.debug(f'{profile} - не удалоcь удалить  расширение {ext_id}, причина: {e}')
+            logger.debug('{} - не удалоcь удалить  расширение {}, причина: {}', profile, ext_id, e)
 
         try:
             if os.path.isdir(ext_settings_path):
@@ -327,7 +360,7 @@ def remove_extensions(profile: str | int, ext_ids: list[str]) -> None:
                 logger.info(f'{profile} - локальные настройки расширения {ext_id} удалены')
         except Exception as e:
             logger.error(f'⛔  {profile} - не удалоcь удалить локальные настройки расширения {ext_id}')
-            logger.debug(f'{profile} - не удалоcь удалить локальные настройки расширения {ext_id}, причина: {e}')
+            logger.debug('{} - не удалоcь удалить локальные настройки расширения {}, причина: {}', profile, ext_id, e)
 
     # Обновляем файл Preferences
     try:
@@ -361,7 +394,7 @@ def remove_extensions(profile: str | int, ext_ids: list[str]) -> None:
             logger.warning(f'{profile} - файл Preferences не найден')
     except Exception as e:
         logger.error(f'⛔  {profile} - не удалось обновить файл Preferences')
-        logger.debug(f'{profile} - не удалось обновить файл Preferences, причина: {e}')
+        logger.debug('{} - не удалось обновить файл Preferences, причина: {}', profile, e)
 
 
 def get_all_default_extensions_info() -> dict:
@@ -376,6 +409,7 @@ def get_all_default_extensions_info() -> dict:
     return extensions_info
 
 
+@instrumented('helpers.get_profiles_extensions_info')
 def get_profiles_extensions_info(profiles_list) -> dict[str, str]:
     """
     Получает информацию о расширениях для списка профилей
@@ -507,14 +541,14 @@ def get_extension_icon_path(extension_path: str) -> str:
                             icon_path = icons[size]
                             full_path = os.path.join(extension_path, icon_path)
                             if os.path.exists(full_path):
-                                logger.debug(f"Найдена иконка размера {size} для расширения: {full_path}")
+                                logger.debug("Найдена иконка размера {} для расширения: {}", size, full_path)
                                 return full_path
                         
                         # Если не нашли по предпочтительным размерам, берем первую доступную
                         icon_path = next(iter(icons.values()))
                         full_path = os.path.join(extension_path, icon_path)
                         if os.path.exists(full_path):
-                            logger.debug(f"Найдена иконка для расширения: {full_path}")
+                            logger.debug("Найдена иконка для расширения: {}", full_path)
                             return full_path
                     
                     # Проверяем поле browser_action или action (для новых версий)
@@ -525,7 +559,7 @@ def get_extension_icon_path(extension_path: str) -> str:
                         if isinstance(default_icon, str) and default_icon:
                             full_path = os.path.join(extension_path, default_icon)
                             if os.path.exists(full_path):
-                                logger.debug(f"Найдена иконка browser_action для расширения: {full_path}")
+                                logger.debug("Найдена иконка browser_action для расширения: {}", full_path)
                                 return full_path
                         elif isinstance(default_icon, dict):
                             # Если default_icon - словарь с размерами
@@ -534,21 +568,21 @@ def get_extension_icon_path(extension_path: str) -> str:
                                     icon_path = default_icon[size]
                                     full_path = os.path.join(extension_path, icon_path)
                                     if os.path.exists(full_path):
-                                        logger.debug(f"Найдена иконка browser_action размера {size} для расширения: {full_path}")
+                                        logger.debug("Найдена иконка browser_action размера {} для расширения: {}", size, full_path)
                                         return full_path
                             # Берем первую доступную
                             if default_icon:
                                 icon_path = next(iter(default_icon.values()))
                                 full_path = os.path.join(extension_path, icon_path)
                                 if os.path.exists(full_path):
-                                    logger.debug(f"Найдена иконка browser_action для расширения: {full_path}")
+                                    logger.debug("Найдена иконка browser_action для расширения: {}", full_path)
                                     return full_path
                     
                     # Проверяем альтернативные пути
                     for icon_name in ["icon.png", "icon.jpg", "icon.svg", "logo.png", "logo.jpg", "logo.svg"]:
                         potential_path = os.path.join(extension_path, icon_name)
                         if os.path.exists(potential_path):
-                            logger.debug(f"Найдена стандартная иконка для расширения: {potential_path}")
+                            logger.debug("Найдена стандартная иконка для расширения: {}", potential_path)
                             return potential_path
             except Exception as manifest_error:
                 logger.warning(f"Ошибка при чтении manifest.json: {manifest_error}")
@@ -572,14 +606,14 @@ def get_extension_icon_path(extension_path: str) -> str:
                                         icon_path = icons[size]
                                         full_path = os.path.join(item_path, icon_path)
                                         if os.path.exists(full_path):
-                                            logger.debug(f"Найдена иконка размера {size} для расширения в подпапке: {full_path}")
+                                            logger.debug("Найдена иконка размера {} для расширения в подпапке: {}", size, full_path)
                                             return full_path
                                 
                                 # Если не нашли по предпочтительным размерам, берем первую доступную
                                 icon_path = next(iter(icons.values()))
                                 full_path = os.path.join(item_path, icon_path)
                                 if os.path.exists(full_path):
-                                    logger.debug(f"Найдена иконка для расширения в подпапке: {full_path}")
+                                    logger.debug("Найдена иконка для расширения в подпапке: {}", full_path)
                                     return full_path
                             
                             # Проверяем поле browser_action или action (для новых версий)
@@ -590,7 +624,7 @@ def get_extension_icon_path(extension_path: str) -> str:
                                 if isinstance(default_icon, str) and default_icon:
                                     full_path = os.path.join(item_path, default_icon)
                                     if os.path.exists(full_path):
-                                        logger.debug(f"Найдена иконка browser_action для расширения в подпапке: {full_path}")
+                                        logger.debug("Найдена иконка browser_action для расширения в подпапке: {}", full_path)
                                         return full_path
                                 elif isinstance(default_icon, dict):
                                     # Если default_icon - словарь с размерами
@@ -599,21 +633,21 @@ def get_extension_icon_path(extension_path: str) -> str:
                                             icon_path = default_icon[size]
                                             full_path = os.path.join(item_path, icon_path)
                                             if os.path.exists(full_path):
-                                                logger.debug(f"Найдена иконка browser_action размера {size} для расширения в подпапке: {full_path}")
+                                                logger.debug("Найдена иконка browser_action размера {} для расширения в подпапке: {}", size, full_path)
                                                 return full_path
                                     # Берем первую доступную
                                     if default_icon:
                                         icon_path = next(iter(default_icon.values()))
                                         full_path = os.path.join(item_path, icon_path)
                                         if os.path.exists(full_path):
-                                            logger.debug(f"Найдена иконка browser_action для расширения в подпапке: {full_path}")
+                                            logger.debug("Найдена иконка browser_action для расширения в подпапке: {}", full_path)
                                             return full_path
                             
                             # Проверяем альтернативные пути
                             for icon_name in ["icon.png", "icon.jpg", "icon.svg", "logo.png", "logo.jpg", "logo.svg"]:
                                 potential_path = os.path.join(item_path, icon_name)
                                 if os.path.exists(potential_path):
-                                    logger.debug(f"Найдена стандартная иконка для расширения в подпапке: {potential_path}")
+                                    logger.debug("Найдена стандартная иконка для расширения в подпапке: {}", potential_path)
                                     return potential_path
                                     
                             # Ищем иконки в подпапках
@@ -623,7 +657,7 @@ def get_extension_icon_path(extension_path: str) -> str:
                                     for icon_name in ["icon.png", "icon.jpg", "icon.svg", "logo.png", "logo.jpg", "logo.svg", "icon_128.png", "icon_48.png", "icon_32.png"]:
                                         potential_path = os.path.join(subdir_path, icon_name)
                                         if os.path.exists(potential_path):
-                                            logger.debug(f"Найдена иконка в подпапке {subdir}: {potential_path}")
+                                            logger.debug("Найдена иконка в подпапке {}: {}", subdir, potential_path)
                                             return potential_path
                     except Exception as manifest_error:
                         logger.warning(f"Ошибка при чтении manifest.json в подпапке: {manifest_error}")
@@ -632,7 +666,7 @@ def get_extension_icon_path(extension_path: str) -> str:
                 for icon_name in ["icon.png", "icon.jpg", "icon.svg", "logo.png", "logo.jpg", "logo.svg"]:
                     potential_path = os.path.join(item_path, icon_name)
                     if os.path.exists(potential_path):
-                        logger.debug(f"Найдена стандартная иконка для расширения в подпапке без manifest: {potential_path}")
+                        logger.debug("Найдена стандартная иконка для расширения в подпапке без manifest: {}", potential_path)
                         return potential_path
                 
                 # Ищем иконки в подпапках
@@ -642,7 +676,7 @@ def get_extension_icon_path(extension_path: str) -> str:
                         for icon_name in ["icon.png", "icon.jpg", "icon.svg", "logo.png", "logo.jpg", "logo.svg", "icon_128.png", "icon_48.png", "icon_32.png"]:
                             potential_path = os.path.join(subdir_path, icon_name)
                             if os.path.exists(potential_path):
-                                logger.debug(f"Найдена иконка в подпапке {subdir} без manifest: {potential_path}")
+                                logger.debug("Найдена иконка в подпапке {} без manifest: {}", subdir, potential_path)
                                 return potential_path
         
         logger.warning(f"Иконка для расширения не найдена: {extension_path}")
@@ -671,6 +705,7 @@ def read_manifest_name(manifest_path: str) -> str:
         return ''
 
 
+@instrumented('helpers.kill_chrome_processes')
 def kill_chrome_processes() -> None:
     """
     Завершает процессы Chrome, связанные с проектом
@@ -704,6 +739,128 @@ def kill_chrome_processes() -> None:
         logger.error(f'⛔  Не удалоcь завершить процессы Chrome, причина: {e}')
 
 
+def get_singleton_lock_owner() -> tuple[str, int] | None:
+    """
+    Читает SingletonLock папки профилей (macOS / Linux): ссылку вида "hostname-pid" на браузер-владельца
+
+    Returns:
+        tuple[str, int] | None: (hostname, pid) или None, если блокировки нет или ее формат неизвестен
+    """
+    try:
+        hostname, _, pid = os.readlink(os.path.join(CHROME_DATA_PATH, 'SingletonLock')).rpartition('-')
+        return hostname, int(pid)
+    except (OSError, ValueError):
+        return None
+
+
+def is_windows_lock_held() -> bool:
+    """
+    Returns:
+        bool: lockfile папки профилей открыт браузером (Windows). Chrome держит его без общего доступа
+              на запись и удаляет при закрытии, поэтому оставшийся от прошлого запуска файл не считается
+    """
+    try:
+        fd = os.open(os.path.join(CHROME_DATA_PATH, 'lockfile'), os.O_RDWR)
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+
+    os.close(fd)
+    return False
+
+
+def is_pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # процесс другого пользователя или проверить не удалось - считаем живым
+
+    return True
+
+
+def is_profiles_dir_locked() -> bool:
+    """
+    Проверяет, работает ли с папкой профилей браузер: живой владелец SingletonLock на этом компьютере,
+    блокировка с другого компьютера (общая папка профилей) или занятый lockfile на Windows
+
+    Returns:
+        bool: True, если с папкой профилей работает Chrome
+    """
+    if sys.platform == 'win32':
+        return is_windows_lock_held()
+
+    owner = get_singleton_lock_owner()
+    if owner is None:
+        return False
+
+    import socket
+
+    hostname, pid = owner
+    return hostname != socket.gethostname() or is_pid_alive(pid)
+
+
+def get_running_profiles() -> set[str]:
+    """
+    Находит профили, которые сейчас могут быть открыты в Chrome проекта.
+
+    Все профили живут в одной папке данных: первый профиль запускает браузер, остальные передаются ему,
+    и в аргументах процессов видно только первый. Поэтому, пока с папкой профилей работает браузер
+    (is_profiles_dir_locked), открытым считается любой профиль, иначе - профили из аргументов процессов
+    (--user-data-dir с путем проекта и --profile-directory)
+
+    Returns:
+        set[str]: Имена профилей без префикса "Profile ", файлы которых нельзя менять
+    """
+    if is_profiles_dir_locked():
+        logger.debug('с папкой профилей работает Chrome, все профили считаются открытыми')
+        try:
+            return {profile.removeprefix('Profile ') for profile in get_profiles_list()}
+        except OSError:
+            return set()
+
+    data_dir_flag = f'--user-data-dir={CHROME_DATA_PATH}'
+    profile_flag = '--profile-directory=Profile '
+    running = set()
+
+    try:
+        if os.path.isdir('/proc'):
+            for pid in os.listdir('/proc'):
+                if not pid.isdigit():
+                    continue
+                try:
+                    with open(os.path.join('/proc', pid, 'cmdline'), 'rb') as f:
+                        args = f.read().decode('utf-8', 'replace').split('\0')
+                except OSError:
+                    continue  # процесс завершился между listdir и чтением
+
+                if data_dir_flag in args:
+                    running.update(arg[len(profile_flag):] for arg in args if arg.startswith(profile_flag))
+        else:
+            import re
+            import subprocess
+
+            if sys.platform == 'win32':
+                command = ['powershell', '-NoProfile', '-Command',
+                           "Get-CimInstance Win32_Process -Filter \"Name='chrome.exe'\" | ForEach-Object CommandLine"]
+            else:
+                command = ['ps', '-axww', '-o', 'command']
+            output = subprocess.run(command, capture_output=True, text=True, timeout=15).stdout
+
+            for line in output.splitlines():
+                if data_dir_flag in line.replace('"', ''):
+                    # аргументы в выводе склеены пробелами, имя профиля - до следующего флага
+                    match = re.search(r'--profile-directory="?Profile (.+?)"?(?= --|$)', line)
+                    if match:
+                        running.add(match.group(1))
+    except Exception as e:
+        logger.debug('не удалось получить список запущенных профилей, причина: {}', e)
+
+    return running
+
+
 def get_profile_comments() -> dict:
     """
     Получает словарь комментариев для профилей
@@ -750,10 +907,11 @@ def delete_profile(profile: str | int) -> bool:
         return True
     except Exception as e:
         logger.error(f"⛔ Не удалось удалить профиль {profile}")
-        logger.debug(f"Не удалось удалить профиль {profile}, причина: {e}")
+        logger.debug("Не удалось удалить профиль {}, причина: {}", profile, e)
         return False
 
 
+@instrumented('helpers.restore_default_extensions')
 def restore_default_extensions(profile: str | int) -> None:
     """
     Восстанавливает все расширения из папки default_extensions в указанный профиль
@@ -782,7 +940,7 @@ def restore_default_extensions(profile: str | int) -> None:
         if os.path.exists(preferences_path):
             backup_path = preferences_path + ".backup"
             shutil.copy2(preferences_path, backup_path)
-            logger.debug(f'Создана резервная копия Preferences для профиля {profile}')
+            logger.debug('Создана резервная копия Preferences для профиля {}', profile)
             
             # Читаем текущие настройки
             with open(preferences_path, 'r', encoding='utf-8') as f:
@@ -810,7 +968,7 @@ def restore_default_extensions(profile: str | int) -> None:
                     # Добавляем расширение в pinned_extensions если его там нет
                     if ext_id not in preferences['extensions']['pinned_extensions']:
                         preferences['extensions']['pinned_extensions'].append(ext_id)
-                        logger.debug(f'{profile} - расширение {ext_id} добавлено в pinned_extensions')
+                        logger.debug('{} - расширение {} добавлено в pinned_extensions', profile, ext_id)
         
         # Сохраняем обновленные настройки
         with open(preferences_path, 'w', encoding='utf-8') as f:
@@ -819,9 +977,10 @@ def restore_default_extensions(profile: str | int) -> None:
         logger.info(f'✅  {profile} - все расширения восстановлены из папки default_extensions')
     except Exception as e:
         logger.error(f'⛔  {profile} - не удалось восстановить расширения')
-        logger.debug(f'{profile} - не удалось восстановить расширения, причина: {e}')
+        logger.debug('{} - не удалось восстановить расширения, причина: {}', profile, e)
 
 
+@instrumented('helpers.safe_remove_extensions')
 def safe_remove_extensions(profile: str | int, ext_ids: list[str]) -> bool:
     """
     Безопасно удаляет расширения только из указанного профиля
@@ -855,7 +1014,7 @@ def safe_remove_extensions(profile: str | int, ext_ids: list[str]) -> bool:
         if os.path.exists(preferences_path):
             backup_path = preferences_path + ".backup"
             shutil.copy2(preferences_path, backup_path)
-            logger.debug(f'Создана резервная копия Preferences для профиля {profile}')
+            logger.debug('Создана резервная копия Preferences для профиля {}', profile)
         
         success = True
         for ext_id in ext_ids:
@@ -912,6 +1071,7 @@ def safe_remove_extensions(profile: str | int, ext_ids: list[str]) -> bool:
         return False
 
 
+@instrumented('helpers.safe_install_extension')
 def safe_install_extension(profile: str | int, ext_id: str, replace: bool = False) -> bool:
     """
     Безопасно устанавливает расширение в указанный профиль
@@ -945,7 +1105,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
             logger.error(f'⛔ Профиль {profile_name} не существует по пути {profile_dir}')
             return False
             
-        logger.debug(f'✓ Профиль {profile_name} найден по пути {profile_dir}')
+        logger.debug('✓ Профиль {} найден по пути {}', profile_name, profile_dir)
             
         # Проверяем наличие расширения в default_extensions
         src_path = os.path.join(DEFAULT_EXTENSIONS_PATH, ext_id)
@@ -953,18 +1113,18 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
             logger.error(f'⛔ Расширение {ext_id} не найдено в папке default_extensions по пути {src_path}')
             return False
             
-        logger.debug(f'✓ Расширение {ext_id} найдено в папке default_extensions')
+        logger.debug('✓ Расширение {} найдено в папке default_extensions', ext_id)
             
         # Создаем папку Extensions, если она не существует
         os.makedirs(extensions_path, exist_ok=True)
-        logger.debug(f'✓ Папка Extensions создана/проверена по пути {extensions_path}')
+        logger.debug('✓ Папка Extensions создана/проверена по пути {}', extensions_path)
         
         # Создаем резервную копию Preferences
         if os.path.exists(preferences_path):
             backup_path = preferences_path + ".backup"
             try:
                 shutil.copy2(preferences_path, backup_path)
-                logger.debug(f'✓ Создана резервная копия Preferences для профиля {profile_name}')
+                logger.debug('✓ Создана резервная копия Preferences для профиля {}', profile_name)
             except Exception as e:
                 logger.warning(f'⚠️ Не удалось создать резервную копию Preferences: {e}')
         
@@ -991,7 +1151,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
                             
                             logger.info(f'✅ {profile_name} - расширение {ext_id} добавлено в pinned_extensions')
                         else:
-                            logger.debug(f'✓ Расширение {ext_id} уже есть в pinned_extensions')
+                            logger.debug('✓ Расширение {} уже есть в pinned_extensions', ext_id)
                 except Exception as e:
                     logger.error(f'⛔ {profile_name} - ошибка при проверке/обновлении Preferences: {e}')
             
@@ -1000,7 +1160,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
         # Если расширение существует и replace=True, удаляем его
         if os.path.exists(dest_path) and replace:
             try:
-                logger.debug(f'🗑️ Удаляем существующее расширение {ext_id} из профиля {profile_name}')
+                logger.debug('🗑️ Удаляем существующее расширение {} из профиля {}', ext_id, profile_name)
                 shutil.rmtree(dest_path)
             except Exception as e:
                 logger.error(f'⛔ Не удалось удалить существующее расширение {ext_id}: {e}')
@@ -1015,7 +1175,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
                 if os.path.isdir(item_path) and os.path.isfile(os.path.join(item_path, "manifest.json")):
                     version_folders.append(item)
             
-            logger.debug(f'Найдены версии расширения: {version_folders}')
+            logger.debug('Найдены версии расширения: {}', version_folders)
             
             # Создаем директорию для ID расширения
             os.makedirs(dest_path, exist_ok=True)
@@ -1025,7 +1185,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
                 for version in version_folders:
                     version_src_path = os.path.join(src_path, version)
                     version_dest_path = os.path.join(dest_path, version)
-                    logger.debug(f'Копируем версию {version} из {version_src_path} в {version_dest_path}')
+                    logger.debug('Копируем версию {} из {} в {}', version, version_src_path, version_dest_path)
                     
                     # Если папка назначения уже существует, удаляем её
                     if os.path.exists(version_dest_path):
@@ -1048,7 +1208,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
                 if os.path.exists(version_dest_path):
                     shutil.rmtree(version_dest_path)
                 
-                logger.debug(f'Копируем расширение из {src_path} в {version_dest_path}')
+                logger.debug('Копируем расширение из {} в {}', src_path, version_dest_path)
                 shutil.copytree(src_path, version_dest_path)
                 
                 logger.info(f'✅ {profile_name} - скопирована версия расширения {ext_id}: {version}')
@@ -1073,9 +1233,9 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
                 
                 if ext_id not in preferences['extensions']['pinned_extensions']:
                     preferences['extensions']['pinned_extensions'].append(ext_id)
-                    logger.debug(f'Расширение {ext_id} добавлено в pinned_extensions')
+                    logger.debug('Расширение {} добавлено в pinned_extensions', ext_id)
                 else:
-                    logger.debug(f'Расширение {ext_id} уже есть в pinned_extensions')
+                    logger.debug('Расширение {} уже есть в pinned_extensions', ext_id)
                 
                 # Проверяем и обновляем settings для расширения
                 if 'settings' not in preferences['extensions']:
@@ -1105,7 +1265,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
                         "path": ext_id,
                         "state": 1
                     }
-                    logger.debug(f'Добавлены настройки для расширения {ext_id} в preferences["extensions"]["settings"]')
+                    logger.debug('Добавлены настройки для расширения {} в preferences["extensions"]["settings"]', ext_id)
                 
                 # Сохраняем обновленные настройки
                 with open(preferences_path, 'w', encoding='utf-8') as f:
@@ -1120,7 +1280,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
         
         # Дополнительно проверяем и исправляем настройки всех расширений в профиле
         try:
-            logger.debug(f'Запускаем проверку и исправление настроек всех расширений в профиле {profile_name}')
+            logger.debug('Запускаем проверку и исправление настроек всех расширений в профиле {}', profile_name)
             fix_profile_extensions_settings(profile)
         except Exception as e:
             logger.warning(f'⚠️ Не удалось проверить и исправить настройки расширений в профиле {profile_name}: {e}')
@@ -1132,6 +1292,7 @@ def safe_install_extension(profile: str | int, ext_id: str, replace: bool = Fals
         return False
 
 
+@instrumented('helpers.safe_restore_profile_extensions')
 def safe_restore_profile_extensions(profile: str | int) -> bool:
     """
     Безопасно восстанавливает все расширения из default_extensions в указанный профиль
@@ -1184,6 +1345,7 @@ def safe_restore_profile_extensions(profile: str | int) -> bool:
         return False
 
 
+@instrumented('helpers.fix_profile_extensions_settings')
 def fix_profile_extensions_settings(profile: str | int) -> bool:
     """
     Проверяет и исправляет настройки всех установленных расширений в профиле
@@ -1215,7 +1377,7 @@ def fix_profile_extensions_settings(profile: str | int) -> bool:
             logger.error(f'⛔ Профиль {profile_name} не существует по пути {profile_dir}')
             return False
             
-        logger.debug(f'✓ Профиль {profile_name} найден по пути {profile_dir}')
+        logger.debug('✓ Профиль {} найден по пути {}', profile_name, profile_dir)
         
         # Проверяем существование папки Extensions
         if not os.path.exists(extensions_path):
@@ -1231,7 +1393,7 @@ def fix_profile_extensions_settings(profile: str | int) -> bool:
         backup_path = preferences_path + ".backup"
         try:
             shutil.copy2(preferences_path, backup_path)
-            logger.debug(f'✓ Создана резервная копия Preferences для профиля {profile_name}')
+            logger.debug('✓ Создана резервная копия Preferences для профиля {}', profile_name)
         except Exception as e:
             logger.warning(f'⚠️ Не удалось создать резервную копию Preferences: {e}')
         
@@ -1255,17 +1417,17 @@ def fix_profile_extensions_settings(profile: str | int) -> bool:
         # Создаем структуру extensions если её нет
         if 'extensions' not in preferences:
             preferences['extensions'] = {}
-            logger.debug(f'Создана структура extensions в Preferences')
+            logger.debug('Создана структура extensions в Preferences')
         
         # Создаем структуру settings если её нет
         if 'settings' not in preferences['extensions']:
             preferences['extensions']['settings'] = {}
-            logger.debug(f'Создана структура settings в extensions')
+            logger.debug('Создана структура settings в extensions')
         
         # Создаем структуру pinned_extensions если её нет
         if 'pinned_extensions' not in preferences['extensions']:
             preferences['extensions']['pinned_extensions'] = []
-            logger.debug(f'Создана структура pinned_extensions в extensions')
+            logger.debug('Создана структура pinned_extensions в extensions')
         
         # Проверяем и обновляем настройки для каждого расширения
         updated = False
@@ -1273,7 +1435,7 @@ def fix_profile_extensions_settings(profile: str | int) -> bool:
             # Добавляем расширение в pinned_extensions, если его там нет
             if ext_id not in preferences['extensions']['pinned_extensions']:
                 preferences['extensions']['pinned_extensions'].append(ext_id)
-                logger.debug(f'Расширение {ext_id} добавлено в pinned_extensions')
+                logger.debug('Расширение {} добавлено в pinned_extensions', ext_id)
                 updated = True
             
             # Добавляем настройки для расширения, если их нет
@@ -1324,7 +1486,7 @@ def fix_profile_extensions_settings(profile: str | int) -> bool:
                 logger.info(f'✅ Проверка: настройки расширений успешно сохранены')
             else:
                 logger.error(f'⛔ Проверка: настройки расширений не были сохранены')
-                logger.debug(f'Структура extensions после сохранения: {list(updated_preferences.get("extensions", {}).keys())}')
+                logger.debug('Структура extensions после сохранения: {}', list(updated_preferences.get('extensions', {}).keys()))
                 
                 # Пробуем альтернативный способ сохранения
                 logger.info(f'🔄 Пробуем альтернативный способ сохранения настроек')
@@ -0,0 +1,368 @@
+"""
+Замеры горячих путей и профилирование прогонов.
+
+Спаны - именованные замеры времени через контекстный менеджер span() или декоратор
+instrumented(). Длительности копятся в гистограммах в памяти (registry), без записи
+в лог и на диск, поэтому спаны можно ставить на горячие пути. Внешние приемники
+подключаются через add_span_listener().
+
+Профилирование прогона включается general_config['profiling_mode']:
+    'cprofile' - cProfile на время прогона профиля, файл .prof (pstats, snakeviz)
+    'sampling' - выборка стека потока прогона раз в profiling_sample_interval_ms,
+                 файл .folded (свернутые стеки для flamegraph.pl / speedscope)
+Файлы пишутся в data/profiling, туда же - сводка спанов spans.json.
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+import cProfile
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import DATA_PATH
+
+
+PROFILING_OUTPUT_PATH = DATA_PATH / "profiling"
+
+# Границы корзин гистограммы в миллисекундах, последняя корзина - все, что дольше
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000, 120000, 300000)
+
+
+class Histogram:
+    """
+    Гистограмма длительностей с логарифмическими корзинами: точные count, total, min, max
+    и приблизительные перцентили (по верхней границе корзины)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def record(self, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = duration_ms if self.min_ms is None else min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, duration_ms)] += 1
+
+    def percentile(self, percent: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = self.count * percent / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                upper = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(upper, self.max_ms)
+
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'min_ms': round(self.min_ms or 0.0, 3),
+            'p50_ms': round(self.percentile(50), 3),
+            'p95_ms': round(self.percentile(95), 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+class HistogramRegistry:
+    """
+    Потокобезопасный реестр гистограмм по именам спанов
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_sec: float, **tags) -> None:
+        """
+        Записывает длительность спана
+
+        Args:
+            name: Имя спана, например chrome.launch или helpers.copy_extension
+            duration_sec: Длительность в секундах
+            **tags: Дополнительные поля для приемников (профиль, скрипт и т.п.)
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(duration_sec * 1000)
+            listeners = self._listeners
+
+        for listener in listeners:
+            try:
+                listener(name, duration_sec, tags)
+            except Exception as e:
+                logger.debug(f'приемник спанов завершился с ошибкой, причина: {e}')
+
+    def add_listener(self, callback: Callable[[str, float, dict], None]) -> Callable[[], None]:
+        """
+        Подключает приемник спанов, вызывается с (имя, длительность в секундах, теги)
+
+        Returns:
+            Callable: Функция отключения приемника
+        """
+        with self._lock:
+            self._listeners = self._listeners + [callback]  # список не меняется на месте, его читают без блокировки
+
+        def remove():
+            with self._lock:
+                self._listeners = [listener for listener in self._listeners if listener is not callback]
+
+        return remove
+
+    def stats(self) -> dict[str, dict]:
+        """
+        Returns:
+            dict[str, dict]: {имя спана: count, total_ms, mean_ms, min_ms, p50_ms, p95_ms, max_ms},
+                             по убыванию суммарного времени
+        """
+        with self._lock:
+            summaries = {name: histogram.summary() for name, histogram in self._histograms.items()}
+
+        return dict(sorted(summaries.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+
+
+registry = HistogramRegistry()
+
+
+def is_instrumentation_enabled() -> bool:
+    return general_config.get('instrumentation', True)
+
+
+@contextmanager
+def span(name: str, **tags):
+    """
+    Замеряет время блока и записывает его в registry
+
+    Args:
+        name: Имя спана
+        **tags: Дополнительные поля для приемников спанов
+    """
+    if not is_instrumentation_enabled():
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.record(name, time.perf_counter() - started, **tags)
+
+
+def instrumented(name: str | None = None):
+    """
+    Декоратор: замеряет каждый вызов функции как спан
+
+    Args:
+        name: Имя спана, по умолчанию <модуль>.<функция>
+    """
+    def decorator(func):
+        span_name = name or f'{func.__module__.rsplit(".", 1)[-1]}.{func.__name__}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_instrumentation_enabled():
+                return func(*args, **kwargs)
+
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.record(span_name, time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def record_span(name: str, duration_sec: float, **tags) -> None:
+    """
+    Записывает длительность, замеренную вне span() (например, фазы прогона в ProfileRun)
+    """
+    if is_instrumentation_enabled():
+        registry.record(name, duration_sec, **tags)
+
+
+def add_span_listener(callback: Callable[[str, float, dict], None]) -> Callable[[], None]:
+    return registry.add_listener(callback)
+
+
+def get_span_stats() -> dict[str, dict]:
+    return registry.stats()
+
+
+def write_span_stats(path=None) -> str:
+    """
+    Записывает сводку спанов в JSON
+
+    Args:
+        path: Путь к файлу, по умолчанию data/profiling/spans.json
+
+    Returns:
+        str: Путь к файлу
+    """
+    path = Path(path or PROFILING_OUTPUT_PATH / "spans.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': time.time(), 'spans': get_span_stats()}, f, ensure_ascii=False, indent=2)
+
+    return str(path)
+
+
+class StackSampler:
+    """
+    Выборочный профилировщик одного потока: раз в interval_sec снимает стек потока
+    через sys._current_frames и считает одинаковые стеки. Накладные расходы не зависят
+    от числа вызовов функций, в отличие от cProfile
+    """
+
+    def __init__(self, interval_sec: float = 0.005, thread_id: int | None = None):
+        """
+        Args:
+            interval_sec: Интервал выборки в секундах
+            thread_id: Поток для выборки, по умолчанию текущий
+        """
+        self.interval_sec = interval_sec
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return  # поток завершился
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+
+            folded = ';'.join(reversed(stack))
+            self.stacks[folded] = self.stacks.get(folded, 0) + 1
+            self.samples += 1
+
+    def write_folded(self, path) -> None:
+        """
+        Записывает свернутые стеки: строка "модуль:функция;...;модуль:функция число_выборок"
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for folded, count in sorted(self.stacks.items(), key=lambda item: item[1], reverse=True):
+                f.write(f'{folded} {count}\n')
+
+
+def _profile_file_name(label: str, extension: str) -> str:
+    safe_label = ''.join(char if char.isalnum() or char in '-_.' else '_' for char in label)
+    return f'{safe_label}_{datetime.now().strftime("%Y%m%d-%H%M%S-%f")}.{extension}'
+
+
+@contextmanager
+def profiling(label: str, mode: str | None = None):
+    """
+    Профилирует блок, если включен режим профилирования
+
+    Args:
+        label: Метка для имени файла, например chrome_Profile 1
+        mode: 'cprofile' или 'sampling', по умолчанию general_config['profiling_mode']
+    """
+    mode = mode or general_config.get('profiling_mode')
+    if mode not in ('cprofile', 'sampling'):
+        yield
+        return
+
+    profiler = None
+    sampler = None
+    try:
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            sampler = StackSampler(general_config.get('profiling_sample_interval_ms', 5) / 1000)
+            sampler.start()
+    except Exception as e:
+        logger.warning(f'⚠️ {label} - не удалось включить профилирование')
+        logger.debug(f'{label} - не удалось включить профилирование ({mode}), причина: {e}')
+        profiler = sampler = None
+
+    try:
+        yield
+    finally:
+        try:
+            PROFILING_OUTPUT_PATH.mkdir(parents=True, exist_ok=True)
+            if profiler:
+                profiler.disable()
+                output_path = PROFILING_OUTPUT_PATH / _profile_file_name(label, 'prof')
+                profiler.dump_stats(output_path)
+            elif sampler:
+                sampler.stop()
+                output_path = PROFILING_OUTPUT_PATH / _profile_file_name(label, 'folded')
+                sampler.write_folded(output_path)
+            else:
+                output_path = None
+
+            if output_path:
+                write_span_stats()
+                logger.info(f'📊 {label} - профиль сохранен в {output_path}')
+        except Exception as e:
+            logger.warning(f'⚠️ {label} - не удалось сохранить профиль')
+            logger.debug(f'{label} - не удалось сохранить профиль, причина: {e}')
+
+
+def profiled_run(runner: str):
+    """
+    Декоратор для run_scripts раннеров: профилирует прогон одного профиля,
+    если включен general_config['profiling_mode']
+
+    Args:
+        runner: Раннер (chrome, playwright, manager), попадает в имя файла профиля
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, profile_name, *args, **kwargs):
+            if not general_config.get('profiling_mode'):
+                return func(self, profile_name, *args, **kwargs)
+
+            with profiling(f'{runner}_{profile_name}'):
+                return func(self, profile_name, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
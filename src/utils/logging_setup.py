@@ -0,0 +1,68 @@
+"""
+Настройка логов для CLI и GUI.
+
+Консоль пишет синхронно, чтобы строки логов не перемешивались с вопросами questionary.
+Файл data/debug_log.log пишется фоновым потоком (enqueue), поэтому параллельные прогоны
+не ждут друг друга на записи в файл. Файл ротируется по размеру, старые части сжимаются.
+
+Уровни задаются отдельно для консоли и файла, а для отдельных модулей - в
+general_config['log_levels'], например {'src.utils.helpers': 'INFO'}. Сообщения ниже
+уровня всех обработчиков не форматируются: в горячих путях debug-логи пишутся
+в виде logger.debug("... {}", value), без f-строк.
+"""
+
+import sys
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import DATA_PATH
+
+
+LOG_FORMAT = "<white>{time:HH:mm:ss}</white> | <level>{level: <8}</level> | <white>{message}</white>"
+LOG_FILE_PATH = DATA_PATH / "debug_log.log"
+
+
+def _build_filter(default_level: str, module_levels: dict[str, str]) -> tuple[int, dict]:
+    """
+    Собирает фильтр loguru по модулям
+
+    Returns:
+        tuple[int, dict]: (минимальный уровень обработчика, фильтр {модуль: уровень})
+    """
+    module_filter = {'': default_level, **module_levels}
+    min_level = min(logger.level(level).no for level in module_filter.values())
+
+    return min_level, module_filter
+
+
+def setup_logger() -> None:
+    """
+    Настраивает вывод логов в консоль и в файл по general_config:
+        show_debug_logs  - DEBUG в консоли
+        log_file_level   - уровень файла data/debug_log.log
+        log_levels       - уровни отдельных модулей (для консоли и файла)
+        log_enqueue      - запись файла в фоновом потоке
+        log_rotation, log_retention, log_compression - ротация файла логов
+    """
+    logger.remove()
+
+    module_levels = general_config.get('log_levels') or {}
+    console_level = "DEBUG" if general_config['show_debug_logs'] else "INFO"
+    file_level = general_config.get('log_file_level', 'DEBUG')
+
+    level, module_filter = _build_filter(console_level, module_levels)
+    logger.add(sys.stderr, level=level, filter=module_filter, format=LOG_FORMAT)
+
+    level, module_filter = _build_filter(file_level, module_levels)
+    logger.add(
+        LOG_FILE_PATH,
+        level=level,
+        filter=module_filter,
+        format=LOG_FORMAT,
+        enqueue=general_config.get('log_enqueue', True),
+        rotation=general_config.get('log_rotation', '10 MB'),
+        retention=general_config.get('log_retention', 5),
+        compression=general_config.get('log_compression', 'zip'),
+        encoding='utf-8',
+    )
@@ -0,0 +1,264 @@
+"""
+Массовое изменение файлов Preferences профилей.
+
+Патч - список правок, каждая правка - словарь:
+    {"op": "set", "path": "profile.cookie_controls_mode", "value": 1}
+    {"op": "merge", "path": "password_manager", "value": {"autofillable_credentials_profile_store_login_database": false}}
+    {"op": "delete", "path": "signin.allowed_on_next_startup"}
+    {"op": "append_unique", "path": "extensions.pinned_extensions", "value": "<id расширения>"}
+
+path - имя настройки Chrome через точку или список ключей (как access в GENERAL_PREFERENCES).
+Профили обрабатываются параллельно, каждый файл читается и пишется один раз за весь патч.
+Профили, в которых все уже применено, не перезаписываются. Запущенные профили
+пропускаются: Chrome перезапишет Preferences при закрытии.
+"""
+
+import os
+import copy
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH
+
+
+PATCH_OPS = ('set', 'merge', 'delete', 'append_unique')
+
+_MISSING = object()
+
+
+def normalize_edits(edits: list[dict]) -> list[dict]:
+    """
+    Проверяет правки и приводит path к списку ключей
+
+    Raises:
+        ValueError: Неизвестная операция, пустой путь или нет значения
+    """
+    normalized = []
+    for index, edit in enumerate(edits, start=1):
+        op = edit.get('op')
+        if op not in PATCH_OPS:
+            raise ValueError(f'правка {index}: неизвестная операция {op!r}, допустимы {", ".join(PATCH_OPS)}')
+
+        path = edit.get('path')
+        if isinstance(path, str):
+            path = path.split('.')
+        if not path or not all(isinstance(key, str) and key for key in path):
+            raise ValueError(f'правка {index}: пустой или неверный путь {edit.get("path")!r}')
+
+        if op != 'delete' and 'value' not in edit:
+            raise ValueError(f'правка {index}: не задано значение')
+        if op == 'merge' and not isinstance(edit['value'], dict):
+            raise ValueError(f'правка {index}: для merge значение должно быть объектом')
+
+        normalized.append({'op': op, 'path': list(path), 'value': edit.get('value')})
+
+    return normalized
+
+
+def edits_from_preferences_spec(spec: dict) -> list[dict]:
+    """
+    Превращает описание настроек в стиле GENERAL_PREFERENCES в правки set с default_safe_value
+    """
+    return [
+        {'op': 'set', 'path': list(data['access']), 'value': data['default_safe_value']}
+        for data in spec.values()
+    ]
+
+
+def _get(node, path: list[str]):
+    for key in path:
+        if not isinstance(node, dict) or key not in node:
+            return _MISSING
+        node = node[key]
+
+    return node
+
+
+def _parent(preferences: dict, path: list[str], create: bool) -> dict | None:
+    node = preferences
+    for key in path[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            if not create:
+                return None
+            child = node[key] = {}
+        node = child
+
+    return node
+
+
+def _deep_merge(target: dict, value: dict) -> None:
+    for key, item in value.items():
+        if isinstance(item, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], item)
+        else:
+            target[key] = copy.deepcopy(item)
+
+
+def apply_edits(preferences: dict, edits: list[dict]) -> list[dict]:
+    """
+    Применяет правки к содержимому Preferences на месте
+
+    Args:
+        preferences: Содержимое Preferences
+        edits: Правки после normalize_edits
+
+    Returns:
+        list[dict]: Изменения {path, op, old, new}; правки, которые ничего не меняют, не попадают
+    """
+    changes = []
+    for edit in edits:
+        path = edit['path']
+        old = _get(preferences, path)
+
+        if edit['op'] == 'delete':
+            if old is _MISSING:
+                continue
+            del _parent(preferences, path, create=False)[path[-1]]
+            new = _MISSING
+        elif edit['op'] == 'set':
+            if old == edit['value']:
+                continue
+            _parent(preferences, path, create=True)[path[-1]] = copy.deepcopy(edit['value'])
+            new = edit['value']
+        elif edit['op'] == 'merge':
+            merged = copy.deepcopy(old) if isinstance(old, dict) else {}
+            _deep_merge(merged, edit['value'])
+            if merged == old:
+                continue
+            _parent(preferences, path, create=True)[path[-1]] = merged
+            new = merged
+        else:  # append_unique
+            items = list(old) if isinstance(old, list) else []
+            if edit['value'] in items:
+                continue
+            items.append(copy.deepcopy(edit['value']))
+            _parent(preferences, path, create=True)[path[-1]] = items
+            new = items
+
+        changes.append({
+            'path': '.'.join(path),
+            'op': edit['op'],
+            'old': None if old is _MISSING else old,
+            'new': None if new is _MISSING else new,
+        })
+
+    return changes
+
+
+def write_json_atomic(path: str | Path, data: dict, indent: int | None = 4) -> None:
+    """
+    Записывает JSON во временный файл рядом и подменяет им исходный,
+    чтобы прерванная запись не оставила битый файл
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def patch_profile(profile: str | int, edits: list[dict], dry_run: bool = False, create_missing: bool = False) -> dict:
+    """
+    Применяет патч к Preferences одного профиля
+
+    Args:
+        profile: Имя профиля (с префиксом "Profile " или без)
+        edits: Правки после normalize_edits
+        dry_run: Только посчитать изменения, файл не менять
+        create_missing: Создать Preferences, если его нет
+
+    Returns:
+        dict: profile, status (changed / compliant / missing / error), changes, error
+    """
+    profile = str(profile).removeprefix('Profile ')
+    report = {'profile': profile, 'status': None, 'changes': [], 'error': None}
+    preferences_path = CHROME_DATA_PATH / f"Profile {profile}" / "Preferences"
+
+    try:
+        if preferences_path.exists():
+            with open(preferences_path, 'r', encoding='utf-8') as f:
+                preferences = json.load(f)
+        elif create_missing:
+            preferences = {}
+        else:
+            report['status'] = 'missing'
+            return report
+
+        report['changes'] = apply_edits(preferences, edits)
+        if not report['changes']:
+            report['status'] = 'compliant'
+            return report
+
+        if not dry_run:
+            write_json_atomic(preferences_path, preferences)
+        report['status'] = 'changed'
+    except Exception as e:
+        report['status'] = 'error'
+        report['error'] = str(e)
+        logger.error(f'⛔  {profile} - не удалось изменить Preferences')
+        logger.debug('{} - не удалось изменить Preferences, причина: {}', profile, e)
+
+    return report
+
+
+def patch_profiles(profiles: list[str | int],
+                   edits: list[dict],
+                   dry_run: bool = False,
+                   create_missing: bool = False,
+                   skip_running: bool = True) -> list[dict]:
+    """
+    Применяет патч к Preferences нескольких профилей параллельно
+
+    Args:
+        profiles: Профили
+        edits: Правки (см. описание модуля)
+        dry_run: Только показать изменения, файлы не менять
+        create_missing: Создавать Preferences, если его нет
+        skip_running: Пропускать профили, открытые в Chrome
+
+    Returns:
+        list[dict]: Отчеты patch_profile в порядке profiles (status running - профиль пропущен, так как открыт)
+    """
+    from src.utils.helpers import get_running_profiles
+
+    edits = normalize_edits(edits)
+    running = get_running_profiles() if skip_running and not dry_run else set()
+
+    def run(profile):
+        name = str(profile).removeprefix('Profile ')
+        if name in running:
+            return {'profile': name, 'status': 'running', 'changes': [], 'error': None}
+        return patch_profile(name, edits, dry_run, create_missing)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(profiles)))) as executor:
+        return list(executor.map(run, profiles))
+
+
+def format_change(change: dict) -> str:
+    old = json.dumps(change['old'], ensure_ascii=False)
+    new = json.dumps(change['new'], ensure_ascii=False)
+    return f"{change['path']}: {old} -> {new}" if change['op'] != 'delete' else f"{change['path']}: {old} -> (удалено)"
+
+
+def summarize_reports(reports: list[dict]) -> dict[str, int]:
+    """
+    Returns:
+        dict[str, int]: Число профилей по статусам
+    """
+    summary = {'changed': 0, 'compliant': 0, 'missing': 0, 'running': 0, 'error': 0}
+    for report in reports:
+        summary[report['status']] += 1
+
+    return summary
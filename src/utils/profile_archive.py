@@ -0,0 +1,460 @@
+"""
+Экспорт и импорт профилей сжатым tar-архивом для переноса на другую машину и резервных копий.
+
+Экспорт идет конвейером из трех стадий:
+    чтение файлов    - пул потоков читает файлы заранее (крупные файлы читаются потоком)
+    упаковка в tar   - основной поток
+    сжатие и запись  - отдельный поток (zlib и zstd отпускают GIL)
+Сжатие - zstd, если доступен (Python 3.14+ или пакет zstandard), иначе gzip.
+Кэши и файлы блокировок Chrome в архив не попадают.
+
+Каждый профиль в архиве завершается служебной записью-маркером. Импорт распаковывает
+профиль во временную папку и переносит на место, только дойдя до маркера, а список
+импортированных профилей хранит рядом с архивом (<архив>.import.json): прерванный импорт
+при повторном запуске пропускает готовые профили.
+"""
+
+import io
+import os
+import json
+import time
+import queue
+import shutil
+import tarfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH, PROFILE_CACHE_DIRS, PROFILE_LOCK_FILES
+
+
+PROFILE_COMPLETE_MARKER = '.profile_export_complete'
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+_PREFETCH_MAX_FILE_BYTES = 8 * 1024 * 1024  # файлы крупнее читаются потоком при упаковке
+_PREFETCH_MAX_BYTES = 128 * 1024 * 1024  # сколько прочитанных заранее данных держать в памяти
+_WRITE_CHUNK_BYTES = 1024 * 1024
+
+
+def _load_zstd():
+    try:
+        from compression import zstd  # Python 3.14+
+        return 'stdlib', zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return 'zstandard', zstandard
+    except ImportError:
+        return None, None
+
+
+def is_zstd_available() -> bool:
+    return _load_zstd()[0] is not None
+
+
+def _make_compressor(compression: str):
+    if compression == 'zstd':
+        kind, module = _load_zstd()
+        if kind == 'stdlib':
+            return module.ZstdCompressor()
+        return module.ZstdCompressor(level=3, threads=-1).compressobj()
+
+    return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 - формат gzip
+
+
+def _make_decompressor(header: bytes):
+    if header.startswith(_ZSTD_MAGIC):
+        kind, module = _load_zstd()
+        if kind is None:
+            raise RuntimeError('архив сжат zstd, установи пакет zstandard')
+        if kind == 'stdlib':
+            return module.ZstdDecompressor()
+        return module.ZstdDecompressor().decompressobj()
+    if header.startswith(_GZIP_MAGIC):
+        return zlib.decompressobj(31)
+
+    raise RuntimeError('неизвестный формат архива')
+
+
+class _CompressingWriter:
+    """
+    Файловый объект для tarfile: копит данные блоками и отдает их потоку сжатия и записи
+    """
+
+    def __init__(self, output, compression: str, queue_size: int = 16):
+        self.output = output
+        self.compressor = _make_compressor(compression)
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._buffer = bytearray()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='archive-compress', daemon=True)
+        self._thread.start()
+
+    def write(self, data) -> int:
+        if self._error:
+            raise self._error
+
+        self._buffer += data
+        if len(self._buffer) >= _WRITE_CHUNK_BYTES:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+        return len(data)
+
+    def close(self) -> None:
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+        self._queue.put(None)
+        self._thread.join()
+        if self._error:
+            raise self._error
+
+    def _run(self) -> None:
+        try:
+            while (chunk := self._queue.get()) is not None:
+                self.bytes_in += len(chunk)
+                compressed = self.compressor.compress(chunk)
+                if compressed:
+                    self.output.write(compressed)
+                    self.bytes_out += len(compressed)
+
+            tail = self.compressor.flush()
+            self.output.write(tail)
+            self.bytes_out += len(tail)
+        except Exception as e:
+            self._error = e
+            while self._queue.get() is not None:  # освобождаем основной поток, ждущий места в очереди
+                pass
+
+
+class _DecompressingReader:
+    """
+    Файловый объект для tarfile: поток распаковки читает архив и отдает распакованные блоки
+    """
+
+    def __init__(self, source, queue_size: int = 16):
+        self.source = source
+        header = source.read(4)
+        self.decompressor = _make_decompressor(header)
+        self._first = header
+        self._pending = b''
+        self._offset = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name='archive-decompress', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            chunk = self._first
+            while chunk:
+                data = self.decompressor.decompress(chunk)
+                if data:
+                    self._queue.put(data)
+                chunk = self.source.read(_WRITE_CHUNK_BYTES)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._queue.put(None)
+
+    def read(self, size: int = -1) -> bytes:
+        # tarfile читает мелкими блоками: отдаем срезы текущего блока, не склеивая весь остаток
+        parts = []
+        while size < 0 or size > 0:
+            if self._offset >= len(self._pending):
+                chunk = self._queue.get()
+                if chunk is None:
+                    self._queue.put(None)  # конец потока для следующих вызовов
+                    if self._error:
+                        raise self._error
+                    break
+                self._pending = chunk
+                self._offset = 0
+
+            end = len(self._pending) if size < 0 else min(len(self._pending), self._offset + size)
+            parts.append(self._pending[self._offset:end])
+            if size > 0:
+                size -= end - self._offset
+            self._offset = end
+
+        return parts[0] if len(parts) == 1 else b''.join(parts)
+
+
+def _profile_dir_name(profile: str | int) -> str:
+    return f"Profile {str(profile).removeprefix('Profile ')}"
+
+
+def _iter_profile_files(profile_dir: str):
+    """
+    Отдает (путь, имя в архиве) для папок и файлов профиля без кэшей, блокировок и ссылок
+    """
+    profile_path = os.path.join(CHROME_DATA_PATH, profile_dir)
+    for root, dirs, files in os.walk(profile_path):
+        dirs[:] = sorted(name for name in dirs
+                         if name not in PROFILE_CACHE_DIRS and not os.path.islink(os.path.join(root, name)))
+        relative_root = os.path.relpath(root, CHROME_DATA_PATH)
+        yield root, relative_root
+
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name in PROFILE_LOCK_FILES or os.path.islink(path):
+                continue
+            yield path, os.path.join(relative_root, name)
+
+
+def _read_file(path: str) -> bytes | None:
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None  # файл удален или недоступен
+
+
+def export_profiles(profiles: list[str | int], output_path: str | Path, compression: str | None = None) -> dict:
+    """
+    Пишет профили в сжатый tar-архив
+
+    Args:
+        profiles: Профили (с префиксом "Profile " или без)
+        output_path: Путь к архиву
+        compression: 'zstd' или 'gzip', по умолчанию zstd, если доступен
+
+    Returns:
+        dict: profiles, files, bytes_in (размер tar), bytes_out (размер архива), compression, seconds
+    """
+    compression = compression or ('zstd' if is_zstd_available() else 'gzip')
+    if compression == 'zstd' and not is_zstd_available():
+        raise RuntimeError('zstd недоступен, установи пакет zstandard или используй gzip')
+
+    started = time.perf_counter()
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(output_path.name + '.part')
+    report = {'profiles': [], 'files': 0, 'compression': compression}
+
+    with open(temp_path, 'wb') as output, ThreadPoolExecutor(max_workers=max(2, general_config['max_workers'])) as readers:
+        writer = _CompressingWriter(output, compression)
+        try:
+            with tarfile.open(fileobj=writer, mode='w|', format=tarfile.PAX_FORMAT) as archive:
+                for profile in profiles:
+                    profile_dir = _profile_dir_name(profile)
+                    if not os.path.isdir(os.path.join(CHROME_DATA_PATH, profile_dir)):
+                        logger.warning(f'⚠️ {profile_dir} не найден, пропускаю')
+                        continue
+
+                    _add_profile(archive, readers, profile_dir, report)
+
+                    marker = tarfile.TarInfo(os.path.join(profile_dir, PROFILE_COMPLETE_MARKER))
+                    marker.mtime = int(time.time())
+                    archive.addfile(marker, io.BytesIO(b''))
+                    report['profiles'].append(profile_dir.removeprefix('Profile '))
+                    logger.debug('{} - добавлен в архив', profile_dir)
+        finally:
+            writer.close()
+
+    os.replace(temp_path, output_path)
+    report.update(bytes_in=writer.bytes_in, bytes_out=writer.bytes_out,
+                  seconds=round(time.perf_counter() - started, 3))
+
+    return report
+
+
+def _add_profile(archive: tarfile.TarFile, readers: ThreadPoolExecutor, profile_dir: str, report: dict) -> None:
+    # файлы читаются заранее в пуле, упаковка идет в порядке обхода; окно ограничено по объему
+    pending = []
+    pending_bytes = 0
+
+    def flush_one():
+        nonlocal pending_bytes
+        tarinfo, future, size = pending.pop(0)
+        pending_bytes -= size
+        data = future.result()
+        if data is None:
+            return
+        tarinfo.size = len(data)
+        archive.addfile(tarinfo, io.BytesIO(data))
+        report['files'] += 1
+
+    for path, arcname in _iter_profile_files(profile_dir):
+        try:
+            tarinfo = archive.gettarinfo(path, arcname)
+        except OSError:
+            continue
+        if tarinfo is None:
+            continue
+
+        if tarinfo.isdir():
+            while pending:
+                flush_one()
+            archive.addfile(tarinfo)
+            continue
+
+        if tarinfo.size > _PREFETCH_MAX_FILE_BYTES:
+            while pending:
+                flush_one()
+            try:
+                with open(path, 'rb') as f:
+                    archive.addfile(tarinfo, f)
+                report['files'] += 1
+            except OSError:
+                continue
+            continue
+
+        pending.append((tarinfo, readers.submit(_read_file, path), tarinfo.size))
+        pending_bytes += tarinfo.size
+        while pending and pending_bytes > _PREFETCH_MAX_BYTES:
+            flush_one()
+
+    while pending:
+        flush_one()
+
+
+def _state_path(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + '.import.json')
+
+
+def _load_state(archive_path: Path) -> set[str]:
+    try:
+        with open(_state_path(archive_path), 'r', encoding='utf-8') as f:
+            return set(json.load(f).get('completed', []))
+    except (OSError, json.JSONDecodeError):
+        return set()
+
+
+def _save_state(archive_path: Path, completed: set[str]) -> None:
+    from src.utils.preferences_patch import write_json_atomic
+    write_json_atomic(_state_path(archive_path), {'completed': sorted(completed)}, indent=None)
+
+
+def _safe_member_path(member: tarfile.TarInfo) -> tuple[str, str] | None:
+    """
+    Returns:
+        tuple[str, str] | None: (папка профиля, путь внутри профиля) или None, если запись небезопасна
+    """
+    from src.distributed.profile_sync import is_valid_profile_name
+
+    if not (member.isfile() or member.isdir()):
+        return None
+
+    parts = Path(member.name).parts
+    if not parts or os.path.isabs(member.name) or '..' in parts:
+        return None
+    if not parts[0].startswith('Profile ') or not is_valid_profile_name(parts[0].removeprefix('Profile ')):
+        return None
+
+    return parts[0], os.path.join(*parts[1:]) if len(parts) > 1 else ''
+
+
+def import_profiles(archive_path: str | Path, overwrite: bool = False) -> dict:
+    """
+    Распаковывает профили из архива export_profiles
+
+    Args:
+        archive_path: Путь к архиву
+        overwrite: Заменять существующие профили (открытые в Chrome пропускаются всегда)
+
+    Returns:
+        dict: imported, skipped (уже были или импортированы ранее), incomplete (архив оборван), seconds
+    """
+    from src.utils.helpers import get_running_profiles
+
+    started = time.perf_counter()
+    archive_path = Path(archive_path)
+    completed = _load_state(archive_path)
+    running = get_running_profiles()
+    report = {'imported': [], 'skipped': [], 'incomplete': []}
+
+    current_dir = None
+    current_temp = None
+    skip_current = False
+
+    def temp_dir_for(profile_dir: str) -> Path:
+        return CHROME_DATA_PATH / f'.import_{profile_dir}'
+
+    CHROME_DATA_PATH.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(archive_path, 'rb') as source:
+            reader = _DecompressingReader(source)
+            with tarfile.open(fileobj=reader, mode='r|') as archive:
+                for member in archive:
+                    member_path = _safe_member_path(member)
+                    if member_path is None:
+                        logger.debug('импорт архива - пропущена запись {}', member.name)
+                        continue
+
+                    profile_dir, relative_path = member_path
+                    if profile_dir != current_dir:
+                        if current_temp is not None and current_temp.exists():
+                            shutil.rmtree(current_temp, ignore_errors=True)
+                            report['incomplete'].append(current_dir.removeprefix('Profile '))
+
+                        current_dir = profile_dir
+                        name = profile_dir.removeprefix('Profile ')
+                        target = CHROME_DATA_PATH / profile_dir
+                        skip_current = (
+                            name in completed
+                            or name in running
+                            or (target.exists() and not overwrite)
+                        )
+                        current_temp = None
+                        if skip_current:
+                            report['skipped'].append(name)
+                        else:
+                            current_temp = temp_dir_for(profile_dir)
+                            if current_temp.exists():
+                                shutil.rmtree(current_temp)  # остаток прерванного импорта
+                            current_temp.mkdir()
+
+                    if skip_current:
+                        continue
+
+                    if relative_path == PROFILE_COMPLETE_MARKER:
+                        _finish_profile(current_temp, CHROME_DATA_PATH / profile_dir)
+                        name = profile_dir.removeprefix('Profile ')
+                        completed.add(name)
+                        _save_state(archive_path, completed)
+                        report['imported'].append(name)
+                        current_temp = None
+                        logger.debug('{} - импортирован', profile_dir)
+                        continue
+
+                    destination = current_temp / relative_path if relative_path else current_temp
+                    if member.isdir():
+                        destination.mkdir(parents=True, exist_ok=True)
+                        continue
+
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    with archive.extractfile(member) as src, open(destination, 'wb') as dst:
+                        shutil.copyfileobj(src, dst, _WRITE_CHUNK_BYTES)
+                    os.utime(destination, (member.mtime, member.mtime))
+    except (tarfile.TarError, EOFError, zlib.error) as e:
+        logger.warning(f'⚠️ Архив {archive_path.name} оборван или поврежден, готовые профили сохранены, импорт можно повторить')
+        logger.debug('архив {} оборван или поврежден, причина: {}', archive_path, e)
+
+    if current_temp is not None and current_temp.exists():
+        shutil.rmtree(current_temp, ignore_errors=True)
+        report['incomplete'].append(current_dir.removeprefix('Profile '))
+
+    report['seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def _finish_profile(temp_path: Path, profile_path: Path) -> None:
+    old_path = None
+    if profile_path.exists():
+        old_path = profile_path.with_name(f'.old_{profile_path.name}_{os.getpid()}')
+        os.replace(profile_path, old_path)
+    os.replace(temp_path, profile_path)
+
+    if old_path:
+        shutil.rmtree(old_path, ignore_errors=True)
@@ -0,0 +1,319 @@
+"""
+Создание профилей копией шаблонного (golden) профиля.
+
+Шаблон - полностью подготовленный профиль (расширения, настройки, скрипты уже прогнаны),
+его имя хранится в data/golden_profile.json. Копия собирается без запуска Chrome:
+    - если файловая система поддерживает copy-on-write (APFS, Btrfs, XFS), все файлы
+      клонируются (clonefile / FICLONE): место не тратится, изменения копии не трогают шаблон
+    - иначе неизменяемые файлы (папка Extensions, таблицы LevelDB *.ldb) становятся
+      жесткими ссылками, а изменяемые (SQLite, журналы LevelDB и прочее) копируются
+Кэши и файлы блокировок не переносятся. В Preferences копии переписываются имя профиля,
+цвет темы и пути к папке профиля и стартовой странице шаблона.
+Копия собирается во временной папке и переименовывается в Profile <имя> целиком.
+"""
+
+import os
+import sys
+import json
+import errno
+import shutil
+import hashlib
+import colorsys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import (
+    CHROME_DATA_PATH, DATA_PATH, PROFILE_CACHE_DIRS, PROFILE_LOCK_FILES,
+    PROFILE_WELCOME_PAGE_TEMPLATE_PATH, PROFILE_WELCOME_PAGES_OUTPUT_PATH
+)
+
+
+GOLDEN_PROFILE_PATH = DATA_PATH / "golden_profile.json"
+
+# Файлы, которые Chrome не меняет на месте, а только создает и удаляет: их можно делить жесткой ссылкой
+IMMUTABLE_DIRS = ('Extensions',)
+IMMUTABLE_SUFFIXES = ('.ldb',)
+
+# Переписываются в каждой копии, поэтому не клонируются и не связываются
+PREFERENCES_FILE = 'Preferences'
+
+_FICLONE = 0x40049409  # ioctl FICLONE из linux/fs.h
+_REFLINK_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTSUP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.ENOSYS, errno.EPERM}
+
+
+def _profile_dir_name(profile: str | int) -> str:
+    return f"Profile {str(profile).removeprefix('Profile ')}"
+
+
+def get_golden_profile() -> str | None:
+    """
+    Returns:
+        str | None: Имя шаблонного профиля без префикса или None, если шаблон не задан или удален
+    """
+    try:
+        with open(GOLDEN_PROFILE_PATH, 'r', encoding='utf-8') as f:
+            profile = json.load(f).get('profile')
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if not profile or not (CHROME_DATA_PATH / _profile_dir_name(profile)).is_dir():
+        return None
+
+    return profile
+
+
+def set_golden_profile(profile: str | int) -> bool:
+    from src.utils.preferences_patch import write_json_atomic
+
+    name = str(profile).removeprefix('Profile ')
+    if not (CHROME_DATA_PATH / _profile_dir_name(name)).is_dir():
+        logger.error(f'⛔  {name} - профиль не найден')
+        return False
+
+    try:
+        write_json_atomic(GOLDEN_PROFILE_PATH, {'profile': name})
+    except Exception as e:
+        logger.error(f'⛔  {name} - не удалось назначить шаблонным профилем')
+        logger.debug('{} - не удалось назначить шаблонным профилем, причина: {}', name, e)
+        return False
+
+    logger.info(f'✅  {name} - назначен шаблонным профилем')
+    return True
+
+
+def profile_theme_color(profile_name: str) -> int:
+    """
+    Цвет темы профиля, вычисляемый из имени: у копий разные, но стабильные цвета
+
+    Returns:
+        int: ARGB как знаковое 32-битное число, в формате browser.theme.user_color
+    """
+    digest = hashlib.sha1(str(profile_name).encode('utf-8')).digest()
+    hue = int.from_bytes(digest[:2], 'big') / 0xFFFF
+    red, green, blue = colorsys.hls_to_rgb(hue, 0.6, 0.65)
+    argb = 0xFF000000 | int(red * 255) << 16 | int(green * 255) << 8 | int(blue * 255)
+
+    return argb - (1 << 32)
+
+
+def _is_immutable(relative_path: str) -> bool:
+    return relative_path.split(os.sep, 1)[0] in IMMUTABLE_DIRS or relative_path.endswith(IMMUTABLE_SUFFIXES)
+
+
+def _build_plan(template_path: str) -> tuple[list[str], list[str]]:
+    """
+    Returns:
+        tuple[list[str], list[str]]: (папки, файлы) шаблона относительно его папки, без кэшей и блокировок
+    """
+    dirs = []
+    files = []
+    for root, dir_names, file_names in os.walk(template_path):
+        dir_names[:] = [name for name in dir_names
+                        if name not in PROFILE_CACHE_DIRS and not os.path.islink(os.path.join(root, name))]
+        relative_root = os.path.relpath(root, template_path)
+        for name in dir_names:
+            dirs.append(os.path.normpath(os.path.join(relative_root, name)))
+        for name in file_names:
+            if name in PROFILE_LOCK_FILES or os.path.islink(os.path.join(root, name)):
+                continue
+            relative_path = os.path.normpath(os.path.join(relative_root, name))
+            if relative_path != PREFERENCES_FILE:
+                files.append(relative_path)
+
+    return dirs, files
+
+
+def _reflink(src: str, dst: str) -> None:
+    if sys.platform == 'darwin':
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        return
+
+    if sys.platform.startswith('linux'):
+        import fcntl
+
+        try:
+            with open(src, 'rb') as source, open(dst, 'wb') as target:
+                fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        except OSError:
+            if os.path.exists(dst):
+                os.unlink(dst)
+            raise
+        shutil.copystat(src, dst)
+        return
+
+    raise OSError(errno.ENOTSUP, 'copy-on-write недоступен на этой платформе')
+
+
+class _FileCloner:
+    """
+    Переносит файл шаблона в копию самым дешевым способом, запоминая, что файловая система не умеет
+    """
+
+    def __init__(self):
+        self.reflink_supported = True
+        self.hardlink_supported = True
+
+    def clone(self, src: str, dst: str, immutable: bool) -> str:
+        """
+        Returns:
+            str: Способ переноса: reflinked / linked / copied
+        """
+        if self.reflink_supported:
+            try:
+                _reflink(src, dst)
+                return 'reflinked'
+            except OSError as e:
+                if e.errno not in _REFLINK_UNSUPPORTED:
+                    raise
+                self.reflink_supported = False
+
+        if immutable and self.hardlink_supported:
+            try:
+                os.link(src, dst)
+                return 'linked'
+            except OSError as e:
+                if e.errno not in _REFLINK_UNSUPPORTED | {errno.EMLINK}:
+                    raise
+                self.hardlink_supported = False
+
+        shutil.copy2(src, dst)
+        return 'copied'
+
+
+def _rewrite_strings(node, exact: dict[str, str], replacements: dict[str, str]):
+    """
+    Заменяет в строках JSON значения целиком (exact) и подстроки (replacements)
+    """
+    if isinstance(node, dict):
+        return {key: _rewrite_strings(value, exact, replacements) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_rewrite_strings(item, exact, replacements) for item in node]
+    if isinstance(node, str):
+        if node in exact:
+            return exact[node]
+        for old, new in replacements.items():
+            if old in node:
+                node = node.replace(old, new)
+    return node
+
+
+def _write_welcome_page(profile_name: str) -> str:
+    os.makedirs(PROFILE_WELCOME_PAGES_OUTPUT_PATH, exist_ok=True)
+    welcome_page_path = os.path.join(PROFILE_WELCOME_PAGES_OUTPUT_PATH, f"{profile_name}.html")
+
+    with open(PROFILE_WELCOME_PAGE_TEMPLATE_PATH, 'r') as template_file:
+        page_content = template_file.read().replace("{{ profile_name }}", profile_name)
+    with open(welcome_page_path, 'w') as page_file:
+        page_file.write(page_content)
+
+    return welcome_page_path
+
+
+def _clone_preferences(template: str, profile_name: str, template_path: str, clone_path: str, temp_path: str) -> None:
+    from src.utils.preferences_patch import apply_edits, write_json_atomic
+
+    try:
+        with open(os.path.join(template_path, PREFERENCES_FILE), 'r', encoding='utf-8') as f:
+            preferences = json.load(f)
+    except FileNotFoundError:
+        preferences = {}
+
+    template_page = os.path.join(PROFILE_WELCOME_PAGES_OUTPUT_PATH, f"{template}.html")
+    clone_page = _write_welcome_page(profile_name)
+    # путь к папке шаблона заменяется только целиком или с разделителем: "Profile 1" не должен задеть "Profile 10"
+    preferences = _rewrite_strings(preferences, {template_path: clone_path}, {
+        template_path + os.sep: clone_path + os.sep,
+        template_page: clone_page,
+        Path(template_page).as_uri(): Path(clone_page).as_uri(),
+    })
+
+    apply_edits(preferences, [
+        {'op': 'set', 'path': ['profile', 'name'], 'value': profile_name},
+        {'op': 'set', 'path': ['browser', 'theme', 'user_color'], 'value': profile_theme_color(profile_name)},
+    ])
+    write_json_atomic(os.path.join(temp_path, PREFERENCES_FILE), preferences)
+
+
+def clone_profiles(profile_names: list[str | int], template: str | int | None = None) -> list[dict]:
+    """
+    Создает профили копиями шаблонного профиля
+
+    Args:
+        profile_names: Имена новых профилей
+        template: Шаблонный профиль, по умолчанию назначенный через set_golden_profile
+
+    Returns:
+        list[dict]: profile, status (created / exists / error), reflinked, linked, copied (число файлов), error
+    """
+    from src.utils.helpers import get_running_profiles, set_comments_for_profiles
+
+    template = str(template).removeprefix('Profile ') if template is not None else get_golden_profile()
+    if not template:
+        logger.error('⛔  Шаблонный профиль не задан')
+        return []
+
+    template_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(template))
+    if not os.path.isdir(template_path):
+        logger.error(f'⛔  {template} - шаблонный профиль не найден')
+        return []
+    if template in get_running_profiles():
+        logger.error(f'⛔  {template} - шаблонный профиль открыт в Chrome, закрой его перед копированием')
+        return []
+
+    dirs, files = _build_plan(template_path)
+    immutable = {relative_path: _is_immutable(relative_path) for relative_path in files}
+    cloner = _FileCloner()
+
+    def clone(profile) -> dict:
+        name = str(profile).removeprefix('Profile ')
+        report = {'profile': name, 'status': 'created', 'reflinked': 0, 'linked': 0, 'copied': 0, 'error': None}
+        clone_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(name))
+        if os.path.exists(clone_path):
+            report['status'] = 'exists'
+            return report
+
+        temp_path = os.path.join(CHROME_DATA_PATH, f'.clone_{_profile_dir_name(name)}')
+        try:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            os.makedirs(temp_path)
+            for relative_dir in dirs:
+                os.makedirs(os.path.join(temp_path, relative_dir), exist_ok=True)
+            for relative_path in files:
+                method = cloner.clone(os.path.join(template_path, relative_path),
+                                      os.path.join(temp_path, relative_path),
+                                      immutable[relative_path])
+                report[method] += 1
+
+            _clone_preferences(template, name, template_path, clone_path, temp_path)
+            os.rename(temp_path, clone_path)
+        except Exception as e:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            report['status'] = 'error'
+            report['error'] = str(e)
+            logger.error(f'⛔  {name} - не удалось создать профиль из шаблона')
+            logger.debug('{} - не удалось создать профиль из шаблона {}, причина: {}', name, template, e)
+
+        return report
+
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(profile_names) or 1))) as executor:
+        reports = list(executor.map(clone, profile_names))
+
+    created = [report['profile'] for report in reports if report['status'] == 'created']
+    if created:
+        set_comments_for_profiles(created, "")  # сброс комментариев, как при обычном создании профиля
+
+    for report in reports:
+        if report['status'] == 'created':
+            logger.info(f"✅  {report['profile']} - профиль создан из шаблона {template}")
+        elif report['status'] == 'exists':
+            logger.warning(f"⚠️ {report['profile']} - профиль уже существует")
+
+    return reports
@@ -0,0 +1,241 @@
+"""
+Размер папок профилей по категориям и очистка кэшей.
+
+Сканирование обходит папки профилей через os.scandir параллельно: задание пула -
+одна папка верхнего уровня профиля, поэтому большой профиль не задерживает остальные.
+Итог пишется в индекс data/disk_usage.json (размеры по профилям и категориям).
+
+Очищаются только кэши, которые Chrome пересоздает сам (REGENERABLE_CATEGORIES).
+IndexedDB в них не входит: там хранят данные расширения, в том числе кошельки.
+Открытые в Chrome профили при очистке пропускаются.
+"""
+
+import os
+import json
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH, DATA_PATH
+
+
+DISK_USAGE_INDEX_PATH = DATA_PATH / "disk_usage.json"
+
+# Категории по путям внутри папки профиля, проверяются по порядку
+CATEGORY_PATHS = {
+    'cache': ('Cache',),
+    'code_cache': ('Code Cache',),
+    'gpu_cache': ('GPUCache', 'DawnCache', 'DawnGraphiteCache', 'DawnWebGPUCache', 'GrShaderCache', 'ShaderCache'),
+    'service_worker_cache': (os.path.join('Service Worker', 'CacheStorage'), os.path.join('Service Worker', 'ScriptCache')),
+    'indexeddb': ('IndexedDB',),
+    'extensions': ('Extensions', 'Local Extension Settings', 'Sync Extension Settings', 'Extension State'),
+}
+
+# Категории, которые можно удалить без потери данных: Chrome пересоздаст их при запуске
+REGENERABLE_CATEGORIES = ('cache', 'code_cache', 'gpu_cache', 'service_worker_cache')
+
+
+def _profile_dir_name(profile: str | int) -> str:
+    return f"Profile {str(profile).removeprefix('Profile ')}"
+
+
+def _tree_size(path: str) -> tuple[int, int]:
+    """
+    Returns:
+        tuple[int, int]: (размер файлов в байтах, число файлов) в папке и подпапках
+    """
+    total = 0
+    files = 0
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                    except OSError:
+                        continue  # файл удален во время обхода
+        except OSError:
+            continue
+
+    return total, files
+
+
+def _category_tasks(profile_path: str) -> list[tuple[str, str]]:
+    """
+    Делит папку профиля на задания (категория, путь): папки категорий целиком,
+    остальное - по папкам верхнего уровня в категорию other
+    """
+    tasks = []
+    category_roots = {}
+    for category, relative_paths in CATEGORY_PATHS.items():
+        for relative_path in relative_paths:
+            category_roots[relative_path] = category
+
+    nested_parents = {relative_path.split(os.sep)[0] for relative_path in category_roots if os.sep in relative_path}
+
+    def walk_level(relative_dir: str):
+        try:
+            entries = list(os.scandir(os.path.join(profile_path, relative_dir)))
+        except OSError:
+            return
+
+        for entry in entries:
+            relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+            if relative_path in category_roots:
+                tasks.append((category_roots[relative_path], entry.path))
+            elif entry.name in nested_parents and not relative_dir and entry.is_dir(follow_symlinks=False):
+                walk_level(relative_path)
+            else:
+                tasks.append(('other', entry.path))
+
+    walk_level('')
+    return tasks
+
+
+def _entry_size(path: str) -> tuple[int, int]:
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            return _tree_size(path)
+        return os.lstat(path).st_size, 1
+    except OSError:
+        return 0, 0
+
+
+def scan_profiles(profiles: list[str | int], write_index: bool = True) -> dict[str, dict]:
+    """
+    Считает размер профилей по категориям
+
+    Args:
+        profiles: Профили (с префиксом "Profile " или без)
+        write_index: Записать итог в data/disk_usage.json
+
+    Returns:
+        dict[str, dict]: {профиль: {total, files, categories: {категория: байты}, regenerable}}
+    """
+    tasks = []
+    for profile in profiles:
+        name = str(profile).removeprefix('Profile ')
+        profile_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(name))
+        for category, path in _category_tasks(profile_path):
+            tasks.append((name, category, path))
+
+    with ThreadPoolExecutor(max_workers=max(1, general_config['max_workers'])) as executor:
+        sizes = list(executor.map(lambda task: _entry_size(task[2]), tasks))
+
+    usage = {
+        str(profile).removeprefix('Profile '): {'total': 0, 'files': 0, 'categories': {}, 'regenerable': 0}
+        for profile in profiles
+    }
+    for (name, category, _), (size, files) in zip(tasks, sizes):
+        profile_usage = usage[name]
+        profile_usage['total'] += size
+        profile_usage['files'] += files
+        profile_usage['categories'][category] = profile_usage['categories'].get(category, 0) + size
+        if category in REGENERABLE_CATEGORIES:
+            profile_usage['regenerable'] += size
+
+    if write_index:
+        update_index(usage)
+
+    return usage
+
+
+def load_index() -> dict:
+    """
+    Returns:
+        dict: {profiles: {профиль: {..., scanned_at}}} из data/disk_usage.json или пустой индекс
+    """
+    try:
+        with open(DISK_USAGE_INDEX_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {'profiles': {}}
+
+
+def update_index(usage: dict[str, dict]) -> None:
+    from src.utils.preferences_patch import write_json_atomic
+
+    index = load_index()
+    scanned_at = time.time()
+    for profile, profile_usage in usage.items():
+        index['profiles'][profile] = {**profile_usage, 'scanned_at': scanned_at}
+
+    try:
+        write_json_atomic(DISK_USAGE_INDEX_PATH, index, indent=2)
+    except Exception as e:
+        logger.warning('⚠️ Не удалось сохранить индекс размеров профилей')
+        logger.debug('не удалось сохранить индекс размеров профилей, причина: {}', e)
+
+
+def compact_profiles(profiles: list[str | int],
+                     categories: tuple[str, ...] = REGENERABLE_CATEGORIES,
+                     dry_run: bool = False) -> list[dict]:
+    """
+    Удаляет пересоздаваемые кэши профилей
+
+    Args:
+        profiles: Профили
+        categories: Категории для очистки, только из REGENERABLE_CATEGORIES
+        dry_run: Только посчитать, сколько места освободится
+
+    Returns:
+        list[dict]: profile, status (compacted / running / error), freed (байты), error
+    """
+    from src.utils.helpers import get_running_profiles
+
+    unknown = [category for category in categories if category not in REGENERABLE_CATEGORIES]
+    if unknown:
+        raise ValueError(f'категории нельзя очищать: {", ".join(unknown)}')
+
+    running = get_running_profiles()
+
+    def compact(profile) -> dict:
+        name = str(profile).removeprefix('Profile ')
+        report = {'profile': name, 'status': 'compacted', 'freed': 0, 'error': None}
+        if name in running:
+            report['status'] = 'running'
+            return report
+
+        profile_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(name))
+        try:
+            for category in categories:
+                for relative_path in CATEGORY_PATHS[category]:
+                    path = os.path.join(profile_path, relative_path)
+                    if not os.path.isdir(path):
+                        continue
+                    report['freed'] += _tree_size(path)[0]
+                    if not dry_run:
+                        shutil.rmtree(path, ignore_errors=True)
+        except Exception as e:
+            report['status'] = 'error'
+            report['error'] = str(e)
+            logger.error(f'⛔  {name} - не удалось очистить кэши')
+            logger.debug('{} - не удалось очистить кэши, причина: {}', name, e)
+
+        return report
+
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(profiles) or 1))) as executor:
+        reports = list(executor.map(compact, profiles))
+
+    if not dry_run:
+        compacted = [report['profile'] for report in reports if report['status'] == 'compacted']
+        if compacted:
+            scan_profiles(compacted)  # индекс должен отражать размеры после очистки
+
+    return reports
+
+
+def format_size(size: int) -> str:
+    for unit in ('Б', 'КБ', 'МБ', 'ГБ'):
+        if size < 1024 or unit == 'ГБ':
+            return f'{size:.0f} {unit}' if unit == 'Б' else f'{size:.1f} {unit}'
+        size /= 1024
@@ -0,0 +1,348 @@
+"""
+Проверка состояния профилей перед прогоном.
+
+Проверяется параллельно по профилю на поток:
+    preferences_missing         нет Preferences (предупреждение: Chrome создаст файл сам)
+    preferences_corrupt         Preferences не читается как JSON
+    extension_without_manifest  папка версии расширения без manifest.json
+    extension_manifest_corrupt  manifest.json не читается
+    extension_empty             папка расширения без версий (предупреждение)
+    pinned_without_dir          в extensions.pinned_extensions есть расширение, папки которого нет в Extensions
+    extension_not_registered    расширение есть в Extensions, но не прописано в Preferences (предупреждение)
+И один раз на папку профилей - SingletonLock: блокировка с другого компьютера не дает запустить
+ни один профиль и никогда не снимается, блокировка завершенного процесса на этом компьютере
+снимается только после проверки, что процесса нет. Файлы блокировок Chrome (Singleton*, lockfile)
+лежат только в общей папке профилей, поэтому отдельные профили на них не проверяются.
+
+Профиль с ошибками (не предупреждениями) считается нездоровым и исключается из прогона.
+Отчет пишется в data/health_report.json.
+
+manifest.json читается так же терпимо, как его читает Chrome: с BOM, комментариями и висячими запятыми.
+Исправление перед прогоном (health_check_repair) не удаляет папки расширений - это делается
+только из меню проверки профилей, после подтверждения.
+"""
+
+import os
+import json
+import time
+import shutil
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH, DATA_PATH
+
+
+HEALTH_REPORT_PATH = DATA_PATH / "health_report.json"
+
+ISSUE_SEVERITY = {
+    'preferences_missing': 'warning',
+    'preferences_corrupt': 'error',
+    'extension_without_manifest': 'error',
+    'extension_manifest_corrupt': 'error',
+    'extension_empty': 'warning',
+    'pinned_without_dir': 'error',
+    'extension_not_registered': 'warning',
+    'singleton_lock_foreign': 'error',
+    'singleton_lock_stale': 'warning',
+}
+
+SINGLETON_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie')
+
+
+def _profile_dir_name(profile: str | int) -> str:
+    return f"Profile {str(profile).removeprefix('Profile ')}"
+
+
+def _issue(code: str, detail: str | None = None) -> dict:
+    return {'code': code, 'severity': ISSUE_SEVERITY[code], 'detail': detail}
+
+
+def _read_json(path: str):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return json.load(f)
+
+
+def _strip_json_extensions(text: str) -> str:
+    """
+    Убирает вне строк комментарии // и /* */ и висячие запятые перед } и ] - их допускает парсер манифестов Chrome
+    """
+    result = []
+    i, length = 0, len(text)
+    in_string = False
+    while i < length:
+        char = text[i]
+        if in_string:
+            if char == '\\':
+                result.append(text[i:i + 2])
+                i += 2
+                continue
+            in_string = char != '"'
+        elif char == '"':
+            in_string = True
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = length if end == -1 else end
+            continue
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = length if end == -1 else end + 2
+            continue
+        elif char in '}]':
+            # висячая запятая: последний значимый символ перед закрывающей скобкой
+            j = len(result) - 1
+            while j >= 0 and result[j].isspace():
+                j -= 1
+            if j >= 0 and result[j] == ',':
+                del result[j]
+        result.append(char)
+        i += 1
+
+    return ''.join(result)
+
+
+def _read_manifest(path: str):
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        text = f.read()
+
+    try:
+        return json.loads(text, strict=False)  # strict=False - управляющие символы в строках, как в Chrome
+    except ValueError:
+        return json.loads(_strip_json_extensions(text), strict=False)
+
+
+def _inspect_profile(profile_path: str) -> list[dict]:
+    issues = []
+
+    preferences = None
+    preferences_path = os.path.join(profile_path, 'Preferences')
+    if not os.path.exists(preferences_path):
+        issues.append(_issue('preferences_missing'))
+    else:
+        try:
+            preferences = _read_json(preferences_path)
+            if not isinstance(preferences, dict):
+                raise ValueError('корень Preferences - не объект')
+        except (OSError, ValueError) as e:
+            preferences = None
+            issues.append(_issue('preferences_corrupt', str(e)))
+
+    extensions_path = os.path.join(profile_path, 'Extensions')
+    installed = set()
+    try:
+        ext_ids = sorted(entry.name for entry in os.scandir(extensions_path) if entry.is_dir())
+    except OSError:
+        ext_ids = []
+
+    for ext_id in ext_ids:
+        ext_path = os.path.join(extensions_path, ext_id)
+        versions = [entry for entry in os.scandir(ext_path) if entry.is_dir()]
+        if not versions:
+            issues.append(_issue('extension_empty', ext_id))
+            continue
+
+        valid_versions = 0
+        for version in versions:
+            manifest_path = os.path.join(version.path, 'manifest.json')
+            if not os.path.isfile(manifest_path):
+                issues.append(_issue('extension_without_manifest', os.path.join(ext_id, version.name)))
+                continue
+            try:
+                _read_manifest(manifest_path)
+                valid_versions += 1
+            except (OSError, ValueError):
+                issues.append(_issue('extension_manifest_corrupt', os.path.join(ext_id, version.name)))
+
+        if valid_versions:
+            installed.add(ext_id)
+
+    if preferences is not None:
+        extensions = preferences.get('extensions') if isinstance(preferences.get('extensions'), dict) else {}
+        pinned = extensions.get('pinned_extensions') if isinstance(extensions.get('pinned_extensions'), list) else []
+        for ext_id in pinned:
+            if ext_id not in ext_ids:
+                issues.append(_issue('pinned_without_dir', ext_id))
+
+        settings = extensions.get('settings') if isinstance(extensions.get('settings'), dict) else {}
+        for ext_id in sorted(installed - settings.keys()):
+            issues.append(_issue('extension_not_registered', ext_id))
+
+    return issues
+
+
+def _repair_profile(name: str, profile_path: str, issues: list[dict], remove_extensions: bool) -> None:
+    from src.utils.helpers import fix_profile_extensions_settings
+    from src.utils.preferences_patch import write_json_atomic
+
+    codes = {issue['code'] for issue in issues}
+    preferences_path = os.path.join(profile_path, 'Preferences')
+    extensions_path = os.path.join(profile_path, 'Extensions')
+
+    if 'preferences_corrupt' in codes:
+        try:
+            write_json_atomic(preferences_path, _read_json(preferences_path + '.backup'))
+            logger.info(f'🔧 {name} - Preferences восстановлен из резервной копии')
+        except (OSError, ValueError):
+            os.replace(preferences_path, preferences_path + '.corrupt')  # Chrome создаст новый файл при запуске
+            logger.info(f'🔧 {name} - битый Preferences переименован в Preferences.corrupt')
+
+    for issue in issues:
+        if issue['code'] in ('extension_without_manifest', 'extension_manifest_corrupt', 'extension_empty'):
+            if remove_extensions:
+                shutil.rmtree(os.path.join(extensions_path, issue['detail']), ignore_errors=True)
+
+    # папки расширений, у которых не осталось версий после удаления битых
+    for issue in issues:
+        if issue['code'] in ('extension_without_manifest', 'extension_manifest_corrupt'):
+            ext_path = os.path.join(extensions_path, issue['detail'].split(os.sep)[0])
+            if os.path.isdir(ext_path) and not os.listdir(ext_path):
+                os.rmdir(ext_path)
+
+    remaining = _inspect_profile(profile_path)
+    orphan_pinned = [issue['detail'] for issue in remaining if issue['code'] == 'pinned_without_dir']
+    if orphan_pinned:
+        preferences = _read_json(preferences_path)
+        extensions = preferences['extensions']
+        extensions['pinned_extensions'] = [ext_id for ext_id in extensions['pinned_extensions'] if ext_id not in orphan_pinned]
+        write_json_atomic(preferences_path, preferences)
+
+    if any(issue['code'] == 'extension_not_registered' for issue in remaining):
+        fix_profile_extensions_settings(name)
+
+
+def check_profile(profile: str | int,
+                  running: set[str] | None = None,
+                  repair: bool = False,
+                  remove_extensions: bool = False) -> dict:
+    """
+    Проверяет один профиль
+
+    Args:
+        profile: Профиль (с префиксом "Profile " или без)
+        running: Запущенные профили (get_running_profiles), они не проверяются
+        repair: Исправить найденные проблемы
+        remove_extensions: При исправлении удалять битые версии расширений (только по явному запросу пользователя)
+
+    Returns:
+        dict: profile, status (healthy / unhealthy / running / missing), issues, repaired (коды исправленных проблем)
+    """
+    name = str(profile).removeprefix('Profile ')
+    report = {'profile': name, 'status': 'healthy', 'issues': [], 'repaired': []}
+    profile_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(name))
+
+    if running and name in running:
+        report['status'] = 'running'
+        return report
+    if not os.path.isdir(profile_path):
+        report['status'] = 'missing'
+        return report
+
+    try:
+        issues = _inspect_profile(profile_path)
+        if repair and any(issue['code'] != 'preferences_missing' for issue in issues):
+            _repair_profile(name, profile_path, issues, remove_extensions)
+            remaining = _inspect_profile(profile_path)
+            remaining_codes = {(issue['code'], issue['detail']) for issue in remaining}
+            report['repaired'] = sorted({issue['code'] for issue in issues if (issue['code'], issue['detail']) not in remaining_codes})
+            issues = remaining
+    except Exception as e:
+        issues = [{'code': 'check_failed', 'severity': 'error', 'detail': str(e)}]
+        logger.error(f'⛔  {name} - не удалось проверить профиль')
+        logger.debug('{} - не удалось проверить профиль, причина: {}', name, e)
+
+    report['issues'] = issues
+    if any(issue['severity'] == 'error' for issue in issues):
+        report['status'] = 'unhealthy'
+
+    return report
+
+
+def _check_singleton_lock(repair: bool) -> list[dict]:
+    """
+    Проверяет SingletonLock папки профилей, общий для всех профилей.
+    Снимается только блокировка с этого компьютера, процесс которой точно завершен: блокировка
+    с другого компьютера означает, что с общей папкой профилей может работать другой Chrome
+    """
+    from src.utils.helpers import get_singleton_lock_owner, is_pid_alive
+
+    owner = get_singleton_lock_owner()
+    if owner is None:
+        return []  # блокировки нет, это Windows или ссылка не вида "hostname-pid" - владельца не определить, не трогаем
+
+    hostname, pid = owner
+    if hostname != socket.gethostname():
+        if repair:
+            logger.warning(f'⚠️ SingletonLock папки профилей принадлежит другому компьютеру ({hostname}), не снимаю')
+        return [_issue('singleton_lock_foreign', hostname)]
+
+    if is_pid_alive(pid):
+        return []  # Chrome этого компьютера работает с папкой профилей
+
+    if repair:
+        for file_name in SINGLETON_FILES:
+            try:
+                os.unlink(os.path.join(CHROME_DATA_PATH, file_name))
+            except FileNotFoundError:
+                continue
+        logger.info('🔧 Снята блокировка SingletonLock папки профилей')
+        return []
+
+    return [_issue('singleton_lock_stale', str(pid))]
+
+
+def check_profiles(profiles: list[str | int],
+                   repair: bool = False,
+                   write_report: bool = True,
+                   remove_extensions: bool = False) -> dict:
+    """
+    Проверяет профили параллельно
+
+    Args:
+        profiles: Профили
+        repair: Исправить найденные проблемы
+        write_report: Записать отчет в data/health_report.json
+        remove_extensions: При исправлении удалять битые версии расширений (только по явному запросу пользователя)
+
+    Returns:
+        dict: checked_at, repair, shared_issues (проблемы общей папки профилей), profiles (отчеты check_profile)
+    """
+    from src.utils.helpers import get_running_profiles
+
+    running = get_running_profiles()
+    report = {
+        'checked_at': time.time(),
+        'repair': repair,
+        'shared_issues': _check_singleton_lock(repair),
+        'profiles': [],
+    }
+
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(profiles) or 1))) as executor:
+        report['profiles'] = list(executor.map(lambda profile: check_profile(profile, running, repair, remove_extensions), profiles))
+
+    if write_report:
+        from src.utils.preferences_patch import write_json_atomic
+
+        try:
+            write_json_atomic(HEALTH_REPORT_PATH, report, indent=2)
+        except Exception as e:
+            logger.warning('⚠️ Не удалось сохранить отчет проверки профилей')
+            logger.debug('не удалось сохранить отчет проверки профилей, причина: {}', e)
+
+    return report
+
+
+def healthy_profiles(report: dict) -> list[str]:
+    """
+    Returns:
+        list[str]: Профили из отчета check_profiles, которые можно запускать
+    """
+    if any(issue['severity'] == 'error' for issue in report['shared_issues']):
+        return []
+
+    return [profile_report['profile'] for profile_report in report['profiles'] if profile_report['status'] == 'healthy']
+
+
+def format_issue(issue: dict) -> str:
+    return f"{issue['code']} ({issue['detail']})" if issue['detail'] else issue['code']
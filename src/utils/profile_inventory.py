@@ -0,0 +1,225 @@
+"""
+Выгрузка списка профилей с данными о них в CSV или JSONL.
+
+Колонки (INVENTORY_COLUMNS):
+    profile                 имя профиля
+    comment                 комментарий
+    lists                   списки профилей (data/profile_lists.json), в которые входит профиль
+    extensions              установленные расширения: id и версии
+    disk_size               размер папки профиля в байтах из индекса data/disk_usage.json
+                            (пусто, если профиль еще не сканировался в "размер и очистка профилей")
+    last_run_runner         раннер последнего прогона
+    last_run_outcome        итог последнего прогона
+    last_run_duration_sec   длительность последнего прогона
+    last_run_at             время начала последнего прогона (ISO 8601)
+
+Общие данные (комментарии, списки, последние прогоны, индекс размеров) читаются один раз.
+Строки собираются пулом потоков окнами фиксированного размера и пишутся в файл сразу,
+поэтому память не растет с числом профилей. Файл пишется во временный и переименовывается в конце.
+"""
+
+import os
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH, DATA_PATH
+
+
+INVENTORY_COLUMNS = (
+    'profile',
+    'comment',
+    'lists',
+    'extensions',
+    'disk_size',
+    'last_run_runner',
+    'last_run_outcome',
+    'last_run_duration_sec',
+    'last_run_at',
+)
+INVENTORY_FORMATS = ('csv', 'jsonl')
+
+PROFILE_LISTS_PATH = DATA_PATH / "profile_lists.json"
+
+_WINDOW_SIZE = 512  # сколько строк собирается параллельно перед записью
+
+
+def _normalize(profile: str | int) -> str:
+    return str(profile).removeprefix('Profile ')
+
+
+def _load_comments() -> dict[str, str]:
+    from src.utils.helpers import get_comments_for_profiles
+
+    result = get_comments_for_profiles()
+    if not result['success']:
+        return {}
+
+    return {_normalize(profile): comment for profile, comment in result['comments'].items()}
+
+
+def _load_list_membership() -> dict[str, list[str]]:
+    try:
+        with open(PROFILE_LISTS_PATH, 'r', encoding='utf-8') as f:
+            lists = json.load(f).get('lists', {})
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+    membership = {}
+    for list_data in sorted(lists.values(), key=lambda list_data: list_data.get('name', '').lower()):
+        for profile in list_data.get('profiles', []):
+            membership.setdefault(_normalize(profile), []).append(list_data.get('name', ''))
+
+    return membership
+
+
+def _load_last_runs() -> dict[str, dict]:
+    from src.utils.run_results import get_last_profile_runs
+
+    try:
+        return {_normalize(profile): run for profile, run in get_last_profile_runs().items()}
+    except Exception as e:
+        logger.debug('не удалось прочитать результаты прогонов, причина: {}', e)
+        return {}
+
+
+def _load_disk_sizes() -> dict[str, int]:
+    from src.utils.profile_disk_usage import load_index
+
+    return {_normalize(profile): usage.get('total') for profile, usage in load_index().get('profiles', {}).items()}
+
+
+def _profile_extensions(profile: str) -> list[dict]:
+    extensions_path = os.path.join(CHROME_DATA_PATH, f'Profile {profile}', 'Extensions')
+    extensions = []
+    try:
+        ext_entries = sorted(os.scandir(extensions_path), key=lambda entry: entry.name)
+    except OSError:
+        return extensions
+
+    for ext_entry in ext_entries:
+        if not ext_entry.is_dir():
+            continue
+        try:
+            versions = sorted(entry.name for entry in os.scandir(ext_entry.path) if entry.is_dir())
+        except OSError:
+            versions = []
+        extensions.append({'id': ext_entry.name, 'versions': versions})
+
+    return extensions
+
+
+def iter_inventory(profiles: list[str | int] | None = None, columns: tuple[str, ...] = INVENTORY_COLUMNS) -> Iterator[dict]:
+    """
+    Отдает строки описи профилей по мере готовности, в порядке profiles
+
+    Args:
+        profiles: Профили, по умолчанию все
+        columns: Колонки из INVENTORY_COLUMNS
+
+    Raises:
+        ValueError: Неизвестная колонка
+    """
+    from src.utils.helpers import get_profiles_list
+
+    unknown = [column for column in columns if column not in INVENTORY_COLUMNS]
+    if unknown:
+        raise ValueError(f'неизвестные колонки: {", ".join(unknown)}, допустимы {", ".join(INVENTORY_COLUMNS)}')
+
+    if profiles is None:
+        profiles = sorted(get_profiles_list())
+
+    comments = _load_comments() if 'comment' in columns else {}
+    membership = _load_list_membership() if 'lists' in columns else {}
+    disk_sizes = _load_disk_sizes() if 'disk_size' in columns else {}
+    last_runs = _load_last_runs() if any(column.startswith('last_run_') for column in columns) else {}
+    with_extensions = 'extensions' in columns
+
+    def build_row(profile) -> dict:
+        name = _normalize(profile)
+        run = last_runs.get(name) or {}
+        duration = run['finished_at'] - run['started_at'] if run.get('finished_at') else None
+        values = {
+            'profile': name,
+            'comment': comments.get(name, ''),
+            'lists': membership.get(name, []),
+            'extensions': _profile_extensions(name) if with_extensions else [],
+            'disk_size': disk_sizes.get(name),
+            'last_run_runner': run.get('runner'),
+            'last_run_outcome': run.get('outcome'),
+            'last_run_duration_sec': round(duration, 3) if duration is not None else None,
+            'last_run_at': datetime.fromtimestamp(run['started_at']).isoformat(timespec='seconds') if run else None,
+        }
+        return {column: values[column] for column in columns}
+
+    profiles_iter = iter(profiles)
+    with ThreadPoolExecutor(max_workers=max(1, general_config['max_workers'])) as executor:
+        while window := list(islice(profiles_iter, _WINDOW_SIZE)):
+            yield from executor.map(build_row, window)
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ' '.join(
+            f"{item['id']}:{','.join(item['versions'])}" if isinstance(item, dict) else str(item)
+            for item in value
+        )
+    return value
+
+
+def export_inventory(output_path: str | Path,
+                     profiles: list[str | int] | None = None,
+                     columns: tuple[str, ...] = INVENTORY_COLUMNS,
+                     output_format: str | None = None) -> dict:
+    """
+    Пишет опись профилей в CSV или JSONL
+
+    Args:
+        output_path: Путь к файлу
+        profiles: Профили, по умолчанию все
+        columns: Колонки из INVENTORY_COLUMNS
+        output_format: 'csv' или 'jsonl', по умолчанию по расширению файла (иначе csv)
+
+    Returns:
+        dict: path, rows, format, seconds
+    """
+    output_path = Path(output_path)
+    output_format = output_format or ('jsonl' if output_path.suffix.lower() in ('.jsonl', '.ndjson') else 'csv')
+    if output_format not in INVENTORY_FORMATS:
+        raise ValueError(f'неизвестный формат {output_format!r}, допустимы {", ".join(INVENTORY_FORMATS)}')
+
+    started = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output_path.with_name(output_path.name + '.part')
+    rows = 0
+
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            if output_format == 'csv':
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for row in iter_inventory(profiles, columns):
+                    writer.writerow([_csv_value(row[column]) for column in columns])
+                    rows += 1
+            else:
+                for row in iter_inventory(profiles, columns):
+                    f.write(json.dumps(row, ensure_ascii=False))
+                    f.write('\n')
+                    rows += 1
+        os.replace(temp_path, output_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return {'path': str(output_path), 'rows': rows, 'format': output_format,
+            'seconds': round(time.perf_counter() - started, 3)}
@@ -0,0 +1,466 @@
+"""
+Инкрементальные снимки профилей и откат к ним.
+
+Снимок - манифест data/snapshots/profiles/Profile <имя>/<id>[.<batch_id>].json со списком
+файлов профиля {путь: [хеш, размер, mtime_ns]}. Содержимое файлов хранится один раз
+в общем хранилище data/snapshots/objects/<хеш[:2]>/<хеш>: одинаковые файлы разных снимков
+и профилей не дублируются. Хешируются только файлы, у которых с прошлого снимка изменились
+размер или время изменения, остальные берут хеш из прошлого манифеста.
+
+Снимок делается автоматически перед каждым прогоном скриптов (general_config['snapshot_before_runs']).
+Откат переписывает только отличающиеся файлы и удаляет появившиеся после снимка,
+перед откатом текущее состояние тоже сохраняется снимком, поэтому откат можно отменить.
+Хранится general_config['snapshot_retention'] последних снимков на профиль, объекты,
+на которые не ссылается ни один снимок, удаляются.
+Кэши и файлы блокировок Chrome в снимки не попадают и при откате не трогаются.
+"""
+
+import os
+import json
+import stat
+import time
+import shutil
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH, DATA_PATH, PROFILE_CACHE_DIRS, PROFILE_LOCK_FILES
+
+
+SNAPSHOTS_PATH = DATA_PATH / "snapshots"
+SNAPSHOT_OBJECTS_PATH = SNAPSHOTS_PATH / "objects"
+SNAPSHOT_MANIFESTS_PATH = SNAPSHOTS_PATH / "profiles"
+
+UNDO_TAG = 'undo'  # снимок состояния перед откатом, им можно отменить откат
+
+_store_lock = threading.Lock()
+_active_snapshots = 0  # снимки в процессе: сборка мусора в это время пропускается
+_garbage_pending = False  # удалялись снимки, объекты которых еще не собраны
+
+
+def _profile_dir_name(profile: str | int) -> str:
+    return f"Profile {str(profile).removeprefix('Profile ')}"
+
+
+def _hash_file(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=20)).hexdigest()
+
+
+def _object_path(file_hash: str) -> str:
+    return os.path.join(SNAPSHOT_OBJECTS_PATH, file_hash[:2], file_hash)
+
+
+def _scan_profile(profile_path: str) -> dict[str, os.stat_result]:
+    """
+    Returns:
+        dict[str, os.stat_result]: Файлы профиля (относительные пути) без кэшей и блокировок
+    """
+    files = {}
+    for root, dir_names, file_names in os.walk(profile_path):
+        dir_names[:] = [name for name in dir_names if name not in PROFILE_CACHE_DIRS]
+        for name in file_names:
+            if name in PROFILE_LOCK_FILES:
+                continue
+            path = os.path.join(root, name)
+            try:
+                file_stat = os.stat(path, follow_symlinks=False)
+            except OSError:
+                continue  # файл удален во время обхода
+            if stat.S_ISREG(file_stat.st_mode):
+                files[os.path.relpath(path, profile_path)] = file_stat
+
+    return files
+
+
+def _parse_manifest_name(file_name: str) -> tuple[str, str | None]:
+    """
+    Returns:
+        tuple[str, str | None]: (id снимка, batch_id прогона или UNDO_TAG)
+    """
+    snapshot_id, _, tag = file_name.removesuffix('.json').partition('.')
+    return snapshot_id, tag or None
+
+
+def _manifest_names(profile: str) -> list[str]:
+    try:
+        return sorted(name for name in os.listdir(SNAPSHOT_MANIFESTS_PATH / _profile_dir_name(profile))
+                      if name.endswith('.json'))
+    except OSError:
+        return []
+
+
+def _load_manifest(profile: str, file_name: str) -> dict:
+    with open(SNAPSHOT_MANIFESTS_PATH / _profile_dir_name(profile) / file_name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _find_manifest_name(profile: str, snapshot_id: str | None) -> str | None:
+    names = _manifest_names(profile)
+    if snapshot_id is None:
+        names = [name for name in names if _parse_manifest_name(name)[1] != UNDO_TAG]
+        return names[-1] if names else None
+
+    for name in names:
+        if _parse_manifest_name(name)[0] == snapshot_id:
+            return name
+
+    return None
+
+
+def take_snapshot(profile: str | int, label: str | None = None, batch_id: str | None = None) -> dict | None:
+    """
+    Сохраняет снимок профиля, копируя в хранилище только новые файлы
+
+    Args:
+        profile: Профиль (с префиксом "Profile " или без)
+        label: Подпись снимка (например, before_run)
+        batch_id: Прогон, перед которым сделан снимок, для отката всего прогона
+
+    Returns:
+        dict | None: id, profile, files, new_objects, new_bytes, seconds или None, если профиль не найден
+    """
+    return _take_snapshot(str(profile).removeprefix('Profile '), label, batch_id)
+
+
+def _take_snapshot(name: str, label: str | None, tag: str | None) -> dict | None:
+    global _active_snapshots
+    from src.utils.preferences_patch import write_json_atomic
+
+    profile_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(name))
+    if not os.path.isdir(profile_path):
+        logger.warning(f'⚠️ {name} - профиль не найден, снимок не сделан')
+        return None
+
+    started = time.perf_counter()
+    with _store_lock:
+        _active_snapshots += 1
+    try:
+        names = _manifest_names(name)
+        previous_name = names[-1] if names else None
+        previous = _load_manifest(name, previous_name)['files'] if previous_name else {}
+
+        files = {}
+        new_objects = 0
+        new_bytes = 0
+        for relative_path, file_stat in _scan_profile(profile_path).items():
+            known = previous.get(relative_path)
+            if known and known[1] == file_stat.st_size and known[2] == file_stat.st_mtime_ns:
+                files[relative_path] = known
+                continue
+
+            path = os.path.join(profile_path, relative_path)
+            try:
+                file_hash = _hash_file(path)
+                object_path = _object_path(file_hash)
+                if not os.path.exists(object_path):
+                    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                    temp_path = f'{object_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+                    shutil.copyfile(path, temp_path)
+                    os.replace(temp_path, object_path)
+                    new_objects += 1
+                    new_bytes += file_stat.st_size
+            except FileNotFoundError:
+                continue  # файл удален во время снимка
+
+            files[relative_path] = [file_hash, file_stat.st_size, file_stat.st_mtime_ns]
+
+        snapshot_id = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        manifest_name = f'{snapshot_id}.{tag}.json' if tag else f'{snapshot_id}.json'
+        write_json_atomic(SNAPSHOT_MANIFESTS_PATH / _profile_dir_name(name) / manifest_name, {
+            'id': snapshot_id,
+            'profile': name,
+            'created_at': time.time(),
+            'label': label,
+            'batch_id': tag if tag != UNDO_TAG else None,
+            'files': files,
+        }, indent=None)
+    finally:
+        with _store_lock:
+            _active_snapshots -= 1
+
+    seconds = round(time.perf_counter() - started, 3)
+    logger.debug('{} - снимок {}: файлов {}, новых объектов {} ({} байт) за {} сек',
+                 name, snapshot_id, len(files), new_objects, new_bytes, seconds)
+
+    return {'id': snapshot_id, 'profile': name, 'files': len(files),
+            'new_objects': new_objects, 'new_bytes': new_bytes, 'seconds': seconds}
+
+
+def take_snapshots(profiles: list[str | int], label: str | None = None) -> list[dict]:
+    """
+    Снимки нескольких профилей параллельно, открытые в Chrome профили пропускаются
+
+    Returns:
+        list[dict]: Отчеты take_snapshot удачных снимков
+    """
+    from src.utils.helpers import get_running_profiles
+
+    running = get_running_profiles()
+
+    def snapshot(profile):
+        name = str(profile).removeprefix('Profile ')
+        if name in running:
+            logger.warning(f'⚠️ {name} - профиль открыт в Chrome, снимок не сделан')
+            return None
+        try:
+            return take_snapshot(name, label)
+        except Exception as e:
+            logger.error(f'⛔  {name} - не удалось сделать снимок')
+            logger.debug('{} - не удалось сделать снимок, причина: {}', name, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(profiles) or 1))) as executor:
+        reports = [report for report in executor.map(snapshot, profiles) if report]
+
+    if reports:
+        prune_snapshots([report['profile'] for report in reports])
+
+    return reports
+
+
+def snapshot_before_run(profile: str | int, batch_id: str | None = None) -> None:
+    """
+    Снимок перед прогоном скриптов, если включен general_config['snapshot_before_runs'].
+    Ошибка снимка не останавливает прогон
+    """
+    if not general_config.get('snapshot_before_runs', True):
+        return
+
+    name = str(profile).removeprefix('Profile ')
+    try:
+        if take_snapshot(name, 'before_run', batch_id):
+            prune_snapshots([name], collect=False)
+    except Exception as e:
+        logger.warning(f'⚠️ {name} - не удалось сделать снимок перед прогоном')
+        logger.debug('{} - не удалось сделать снимок перед прогоном, причина: {}', name, e)
+
+
+def list_snapshots(profile: str | int) -> list[dict]:
+    """
+    Returns:
+        list[dict]: Снимки профиля от новых к старым: id, batch_id, undo (сделан перед откатом)
+    """
+    name = str(profile).removeprefix('Profile ')
+    snapshots = []
+    for manifest_name in reversed(_manifest_names(name)):
+        snapshot_id, tag = _parse_manifest_name(manifest_name)
+        snapshots.append({'id': snapshot_id, 'batch_id': tag if tag != UNDO_TAG else None, 'undo': tag == UNDO_TAG})
+
+    return snapshots
+
+
+def list_snapshot_batches() -> list[dict]:
+    """
+    Returns:
+        list[dict]: Прогоны, перед которыми есть снимки, от новых к старым: batch_id, first_snapshot_id, profiles
+    """
+    batches = {}
+    try:
+        profile_dirs = os.listdir(SNAPSHOT_MANIFESTS_PATH)
+    except OSError:
+        return []
+
+    for profile_dir in profile_dirs:
+        for manifest_name in _manifest_names(profile_dir):
+            snapshot_id, batch_id = _parse_manifest_name(manifest_name)
+            if not batch_id or batch_id == UNDO_TAG:
+                continue
+            batch = batches.setdefault(batch_id, {'batch_id': batch_id, 'first_snapshot_id': snapshot_id, 'profiles': set()})
+            batch['first_snapshot_id'] = min(batch['first_snapshot_id'], snapshot_id)
+            batch['profiles'].add(profile_dir.removeprefix('Profile '))
+
+    return sorted(batches.values(), key=lambda batch: batch['first_snapshot_id'], reverse=True)
+
+
+def restore_snapshot(profile: str | int, snapshot_id: str | None = None, backup: bool = True) -> dict:
+    """
+    Откатывает профиль к снимку
+
+    Args:
+        profile: Профиль
+        snapshot_id: Снимок, по умолчанию последний (кроме снимков, сделанных перед откатом)
+        backup: Сохранить текущее состояние снимком перед откатом
+
+    Returns:
+        dict: profile, status (restored / running / missing / error), snapshot_id, written, removed, error
+    """
+    from src.utils.helpers import get_running_profiles
+
+    name = str(profile).removeprefix('Profile ')
+    report = {'profile': name, 'status': 'restored', 'snapshot_id': snapshot_id, 'written': 0, 'removed': 0, 'error': None}
+    if name in get_running_profiles():
+        report['status'] = 'running'
+        return report
+
+    manifest_name = _find_manifest_name(name, snapshot_id)
+    if not manifest_name:
+        report['status'] = 'missing'
+        return report
+
+    try:
+        manifest = _load_manifest(name, manifest_name)
+        report['snapshot_id'] = manifest['id']
+        profile_path = os.path.join(CHROME_DATA_PATH, _profile_dir_name(name))
+        if backup and os.path.isdir(profile_path):
+            _take_snapshot(name, f"before_restore_{manifest['id']}", UNDO_TAG)
+
+        current = _scan_profile(profile_path) if os.path.isdir(profile_path) else {}
+        for relative_path in current.keys() - manifest['files'].keys():
+            os.unlink(os.path.join(profile_path, relative_path))
+            report['removed'] += 1
+
+        for relative_path, (file_hash, size, mtime_ns) in manifest['files'].items():
+            file_stat = current.get(relative_path)
+            if file_stat and file_stat.st_size == size and file_stat.st_mtime_ns == mtime_ns:
+                continue
+
+            path = os.path.join(profile_path, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.restore.tmp'
+            shutil.copyfile(_object_path(file_hash), temp_path)
+            os.utime(temp_path, ns=(mtime_ns, mtime_ns))  # следующий снимок не будет заново хешировать файл
+            os.replace(temp_path, path)
+            report['written'] += 1
+
+        _remove_empty_dirs(profile_path)
+    except Exception as e:
+        report['status'] = 'error'
+        report['error'] = str(e)
+        logger.error(f'⛔  {name} - не удалось откатить профиль к снимку')
+        logger.debug('{} - не удалось откатить профиль к снимку {}, причина: {}', name, manifest_name, e)
+
+    return report
+
+
+def _remove_empty_dirs(profile_path: str) -> None:
+    for root, dir_names, file_names in os.walk(profile_path, topdown=False):
+        if root != profile_path and not dir_names and not file_names and os.path.basename(root) not in PROFILE_CACHE_DIRS:
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
+
+
+def restore_profiles(profiles: list[str | int]) -> list[dict]:
+    """
+    Откатывает профили к их последним снимкам параллельно
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(profiles) or 1))) as executor:
+        return list(executor.map(restore_snapshot, profiles))
+
+
+def rollback_batch(batch_id: str) -> list[dict]:
+    """
+    Откатывает все профили прогона к состоянию перед ним (первый снимок профиля с этим batch_id)
+
+    Returns:
+        list[dict]: Отчеты restore_snapshot
+    """
+    targets = []
+    for batch in list_snapshot_batches():
+        if batch['batch_id'] != batch_id:
+            continue
+        for profile in sorted(batch['profiles']):
+            snapshot_ids = [snapshot['id'] for snapshot in list_snapshots(profile) if snapshot['batch_id'] == batch_id]
+            targets.append((profile, min(snapshot_ids)))
+
+    if not targets:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(general_config['max_workers'], len(targets)))) as executor:
+        return list(executor.map(lambda target: restore_snapshot(*target), targets))
+
+
+def prune_snapshots(profiles: list[str | int] | None = None, keep: int | None = None, collect: bool = True) -> int:
+    """
+    Удаляет старые снимки сверх general_config['snapshot_retention'] и, если collect, неиспользуемые объекты
+
+    Args:
+        profiles: Профили, по умолчанию все профили со снимками
+        keep: Сколько последних снимков оставить на профиль
+        collect: Удалить объекты, на которые больше не ссылается ни один снимок
+
+    Returns:
+        int: Число удаленных снимков
+    """
+    keep = max(1, keep or general_config.get('snapshot_retention', 10))
+    if profiles is None:
+        try:
+            profiles = os.listdir(SNAPSHOT_MANIFESTS_PATH)
+        except OSError:
+            profiles = []
+
+    removed = 0
+    for profile in profiles:
+        manifest_names = _manifest_names(str(profile).removeprefix('Profile '))
+        for manifest_name in manifest_names[:-keep]:
+            try:
+                os.unlink(SNAPSHOT_MANIFESTS_PATH / _profile_dir_name(profile) / manifest_name)
+                removed += 1
+            except OSError:
+                continue
+
+    if removed:
+        global _garbage_pending
+        _garbage_pending = True
+
+    if collect:
+        collect_garbage()
+
+    return removed
+
+
+def collect_garbage(pending_only: bool = False) -> tuple[int, int]:
+    """
+    Удаляет объекты хранилища, на которые не ссылается ни один снимок.
+    Пропускается, пока другие потоки делают снимки
+
+    Args:
+        pending_only: Только если с прошлой сборки удалялись снимки (для вызова в конце прогона)
+
+    Returns:
+        tuple[int, int]: (удалено объектов, освобождено байт)
+    """
+    global _garbage_pending
+
+    with _store_lock:
+        if _active_snapshots or (pending_only and not _garbage_pending):
+            return 0, 0
+        _garbage_pending = False
+
+        referenced = set()
+        try:
+            profile_dirs = os.listdir(SNAPSHOT_MANIFESTS_PATH)
+        except OSError:
+            profile_dirs = []
+        for profile_dir in profile_dirs:
+            for manifest_name in _manifest_names(profile_dir):
+                try:
+                    manifest = _load_manifest(profile_dir, manifest_name)
+                except (OSError, json.JSONDecodeError):
+                    continue
+                referenced.update(entry[0] for entry in manifest['files'].values())
+
+        removed = 0
+        freed = 0
+        for root, _, file_names in os.walk(SNAPSHOT_OBJECTS_PATH):
+            for file_name in file_names:
+                if file_name in referenced:
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    freed += os.path.getsize(path)
+                    os.unlink(path)
+                    removed += 1
+                except OSError:
+                    continue
+
+    if removed:
+        logger.debug('удалено неиспользуемых объектов снимков: {} ({} байт)', removed, freed)
+
+    return removed, freed
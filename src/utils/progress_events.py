@@ -0,0 +1,401 @@
+"""
+События хода прогона скриптов по профилям.
+
+Раннеры публикуют структурированные события во внутреннюю шину (event_bus):
+    batch_started   - начало пакетного прогона, total - число профилей
+    queued          - профиль поставлен в очередь прогона
+    started         - раннер взял профиль в работу
+    launching / launched   - запуск браузера (launched - с длительностью)
+    attaching / attached   - подключение к браузеру
+    script_started / script_finished - скрипт N из M (script_finished - с длительностью и итогом)
+    teardown / closed      - закрытие профиля
+    finished        - итог профиля: outcome, длительность, повторы
+    batch_finished  - конец пакетного прогона
+
+Подписчики шины: BatchProgress (пропускная способность, ETA, зависшие профили),
+ProgressStreamServer (поток событий в локальный сокет, по одному JSON на строку)
+и адаптер Qt для GUI. Ошибки подписчиков никогда не прерывают прогон.
+"""
+
+import os
+import json
+import time
+import queue
+import socket
+import threading
+from collections import deque
+from typing import Callable
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import DATA_PATH
+
+
+PROGRESS_SOCKET_PATH = DATA_PATH / "progress.sock"
+
+PHASE_EVENTS = {
+    'launch': ('launching', 'launched'),
+    'attach': ('attaching', 'attached'),
+    'teardown': ('teardown', 'closed'),
+}
+
+
+class EventBus:
+    """
+    Потокобезопасная шина событий в пределах процесса.
+    Подписчики вызываются синхронно в потоке, опубликовавшем событие,
+    поэтому должны быстро возвращать управление
+    """
+
+    def __init__(self, history_size: int = 1000):
+        """
+        Args:
+            history_size: Сколько последних событий хранить для новых подписчиков
+        """
+        self._subscribers = []
+        self._history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def subscribe(self, callback: Callable[[dict], None]) -> Callable[[], None]:
+        """
+        Подписывает на события
+
+        Args:
+            callback: Вызывается с каждым событием (dict)
+
+        Returns:
+            Callable: Функция отписки
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        return lambda: self.unsubscribe(callback)
+
+    def unsubscribe(self, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def history(self) -> list[dict]:
+        with self._lock:
+            return list(self._history)
+
+    def publish(self, event_type: str, **fields) -> dict:
+        """
+        Публикует событие
+
+        Args:
+            event_type: Тип события
+            **fields: Поля события (batch_id, runner, profile и т.п.)
+
+        Returns:
+            dict: Опубликованное событие с полями type, seq, timestamp
+        """
+        with self._lock:
+            self._seq += 1
+            event = {'type': event_type, 'seq': self._seq, 'timestamp': time.time(), **fields}
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.debug(f'подписчик событий прогона завершился с ошибкой, причина: {e}')
+
+        return event
+
+
+event_bus = EventBus()
+
+
+def publish_event(event_type: str, **fields) -> dict:
+    return event_bus.publish(event_type, **fields)
+
+
+def publish_batch_started(batch_id: str, runner: str, profiles: list[str | int], runs_per_profile: int = 1) -> None:
+    """
+    Публикует начало пакетного прогона и постановку профилей в очередь
+
+    Args:
+        batch_id: Идентификатор пакетного прогона
+        runner: Раннер (chrome, playwright, manager)
+        profiles: Профили прогона в порядке запуска
+        runs_per_profile: Сколько раннеров запускается на каждом профиле (в GUI - chrome и playwright)
+    """
+    publish_event('batch_started', batch_id=batch_id, runner=runner, total=len(profiles) * runs_per_profile)
+    for position, profile in enumerate(profiles, start=1):
+        publish_event('queued', batch_id=batch_id, runner=runner, profile=str(profile), position=position)
+
+
+def publish_batch_finished(batch_id: str, runner: str, failed_profiles: list[str | int] | None = None) -> None:
+    """
+    Публикует окончание пакетного прогона
+
+    Args:
+        batch_id: Идентификатор пакетного прогона
+        runner: Раннер (chrome, playwright, manager)
+        failed_profiles: Профили, завершенные с ошибками
+    """
+    publish_event('batch_finished', batch_id=batch_id, runner=runner,
+                  failed_profiles=[str(profile) for profile in failed_profiles or []])
+
+
+class BatchProgress:
+    """
+    Сводка хода пакетных прогонов по событиям шины: сколько профилей выполнено,
+    пропускная способность, ETA и профили без событий дольше stall_sec.
+    Идущие прогоны учитываются по паре (раннер, профиль): в GUI на одном профиле в одном
+    пакетном прогоне работают и chrome, и playwright
+    """
+
+    def __init__(self, stall_sec: float | None = None):
+        """
+        Args:
+            stall_sec: Через сколько секунд без событий профиль считается зависшим
+                       (если None, берется general_config['progress_stall_sec'])
+        """
+        self.stall_sec = stall_sec if stall_sec is not None else general_config.get('progress_stall_sec', 300)
+        self._batches = {}
+        self._last_batch_id = None
+        self._lock = threading.Lock()
+
+    def handle(self, event: dict) -> None:
+        """
+        Учитывает событие. Используется как подписчик шины: event_bus.subscribe(progress.handle)
+        """
+        batch_id = event.get('batch_id')
+        if batch_id is None:
+            return
+
+        with self._lock:
+            if event['type'] == 'batch_started' or batch_id not in self._batches:
+                self._batches[batch_id] = {
+                    'batch_id': batch_id,
+                    'runner': event.get('runner'),
+                    'total': event.get('total', 0),
+                    'started_at': event['timestamp'],
+                    'finished_at': None,
+                    'succeeded': 0,
+                    'failed': 0,
+                    'running': {},
+                }
+                self._last_batch_id = batch_id
+
+            batch = self._batches[batch_id]
+            profile = event.get('profile')
+            key = (event.get('runner'), profile)
+
+            if event['type'] == 'batch_finished':
+                batch['finished_at'] = event['timestamp']
+            elif event['type'] == 'finished':
+                batch['running'].pop(key, None)
+                batch['succeeded' if event.get('outcome') == 'success' else 'failed'] += 1
+            elif profile is not None and event['type'] != 'queued':
+                batch['running'][key] = {
+                    'stage': event['type'],
+                    'script': event.get('script'),
+                    'since': event['timestamp'],
+                }
+
+    def snapshot(self, batch_id: str | None = None, now: float | None = None) -> dict:
+        """
+        Возвращает сводку прогона
+
+        Args:
+            batch_id: Идентификатор прогона, None - последний начатый
+
+        Returns:
+            dict: batch_id, runner, total, done, succeeded, failed, running (runner, profile, stage, script, since),
+                  profiles_per_min, eta_sec, stalled (runner, profile), finished. Пустой dict, если прогонов не было
+        """
+        now = now or time.time()
+        with self._lock:
+            batch = self._batches.get(batch_id or self._last_batch_id)
+            if batch is None:
+                return {}
+
+            done = batch['succeeded'] + batch['failed']
+            elapsed = (batch['finished_at'] or now) - batch['started_at']
+            profiles_per_min = done / elapsed * 60 if elapsed > 0 and done else 0.0
+            remaining = max(batch['total'] - done, 0)
+
+            return {
+                'batch_id': batch['batch_id'],
+                'runner': batch['runner'],
+                'total': batch['total'],
+                'done': done,
+                'succeeded': batch['succeeded'],
+                'failed': batch['failed'],
+                'running': [{'runner': runner, 'profile': profile, **state}
+                            for (runner, profile), state in batch['running'].items()],
+                'profiles_per_min': round(profiles_per_min, 2),
+                'eta_sec': round(remaining / profiles_per_min * 60) if profiles_per_min and remaining else None,
+                'stalled': [{'runner': runner, 'profile': profile}
+                            for (runner, profile), state in sorted(batch['running'].items(), key=lambda item: str(item[0]))
+                            if now - state['since'] > self.stall_sec],
+                'finished': batch['finished_at'] is not None,
+            }
+
+
+class ProgressStreamServer:
+    """
+    Отдает события шины в локальный сокет: по одному JSON на строку (JSON Lines).
+    Новый клиент сначала получает историю последних событий, затем живой поток.
+
+    По умолчанию - Unix-сокет data/progress.sock, при заданном порте или без поддержки
+    Unix-сокетов (Windows) - TCP на 127.0.0.1. Подключение для проверки:
+        nc -U data/progress.sock
+    """
+
+    def __init__(self,
+                 socket_path: str | None = None,
+                 port: int | None = None,
+                 bus: EventBus = event_bus,
+                 client_queue_size: int = 1000):
+        """
+        Args:
+            socket_path: Путь к Unix-сокету
+            port: Порт TCP на 127.0.0.1 (если задан, используется вместо Unix-сокета)
+            bus: Шина событий
+            client_queue_size: Сколько событий копится для медленного клиента, после чего он отключается
+        """
+        self.socket_path = str(socket_path or PROGRESS_SOCKET_PATH)
+        self.port = port
+        self.bus = bus
+        self.client_queue_size = client_queue_size
+        self.address = None
+
+        self._server_socket = None
+        self._clients = []
+        self._lock = threading.Lock()
+        self._unsubscribe = None
+
+    def start(self) -> bool:
+        """
+        Открывает сокет и начинает принимать клиентов
+
+        Returns:
+            bool: True, если сервер запущен
+        """
+        try:
+            if self.port is None and hasattr(socket, 'AF_UNIX'):
+                if os.path.exists(self.socket_path):
+                    os.remove(self.socket_path)  # сокет от прошлого запуска
+                server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                server_socket.bind(self.socket_path)
+                self.address = self.socket_path
+            else:
+                server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                server_socket.bind(('127.0.0.1', self.port or 0))
+                self.address = f'127.0.0.1:{server_socket.getsockname()[1]}'
+
+            server_socket.listen()
+        except Exception as e:
+            logger.warning('⚠️ Не удалось открыть сокет событий прогона')
+            logger.debug(f'не удалось открыть сокет событий прогона, причина: {e}')
+            return False
+
+        self._server_socket = server_socket
+        self._unsubscribe = self.bus.subscribe(self._broadcast)
+        threading.Thread(target=self._accept_loop, name='progress-stream', daemon=True).start()
+        logger.debug(f'поток событий прогона: {self.address}')
+
+        return True
+
+    def stop(self) -> None:
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+        if self._server_socket:
+            try:
+                self._server_socket.close()
+            except OSError:
+                pass
+            self._server_socket = None
+
+        with self._lock:
+            for client_queue in self._clients:
+                client_queue.put(None)
+            self._clients = []
+
+        if self.port is None and self.address == self.socket_path and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    def _accept_loop(self) -> None:
+        server_socket = self._server_socket
+        while True:
+            try:
+                connection, _ = server_socket.accept()
+            except OSError:
+                return  # сокет закрыт в stop()
+
+            client_queue = queue.Queue(maxsize=self.client_queue_size)
+            for event in self.bus.history():
+                if client_queue.full():
+                    break
+                client_queue.put_nowait(event)
+            with self._lock:
+                self._clients.append(client_queue)
+
+            threading.Thread(target=self._serve_client, args=(connection, client_queue), daemon=True).start()
+
+    def _broadcast(self, event: dict) -> None:
+        with self._lock:
+            clients = list(self._clients)
+
+        for client_queue in clients:
+            try:
+                client_queue.put_nowait(event)
+            except queue.Full:
+                # клиент не успевает читать: отключаем, чтобы не задерживать прогон и не копить память
+                self._remove_client(client_queue)
+                with client_queue.mutex:
+                    client_queue.queue.clear()
+                client_queue.put_nowait(None)
+
+    def _remove_client(self, client_queue: queue.Queue) -> None:
+        with self._lock:
+            if client_queue in self._clients:
+                self._clients.remove(client_queue)
+
+    def _serve_client(self, connection: socket.socket, client_queue: queue.Queue) -> None:
+        try:
+            with connection:
+                while True:
+                    event = client_queue.get()
+                    if event is None:
+                        return
+                    connection.sendall((json.dumps(event, ensure_ascii=False, default=str) + '\n').encode('utf-8'))
+        except OSError:
+            pass  # клиент отключился
+        finally:
+            self._remove_client(client_queue)
+
+
+_stream_server = None
+
+
+def start_progress_stream() -> ProgressStreamServer | None:
+    """
+    Запускает поток событий в локальный сокет, если включен general_config['progress_stream'].
+    Повторный вызов возвращает уже запущенный сервер
+
+    Returns:
+        ProgressStreamServer | None: Сервер или None, если поток выключен или не запустился
+    """
+    global _stream_server
+
+    if not general_config.get('progress_stream', False):
+        return None
+
+    if _stream_server is None:
+        server = ProgressStreamServer(port=general_config.get('progress_stream_port'))
+        if server.start():
+            _stream_server = server
+
+    return _stream_server
@@ -0,0 +1,327 @@
+"""
+Допуск новых профилей к запуску с учетом ресурсов хоста.
+
+Вместо фиксированного числа одновременных запусков новый профиль запускается только если
+на хосте остается запас памяти и CPU. Используется при одновременном запуске многих
+профилей (src.chrome.profile_launcher). Состояние хоста читается из /proc:
+    /proc/meminfo        - MemTotal, MemAvailable
+    /proc/stat           - загрузка CPU между двумя замерами
+    /proc/<pid>/statm    - RSS процессов Chrome, запущенных с данными проекта
+
+Оценка памяти на один профиль уточняется по фактическому RSS Chrome активных профилей.
+Под нагрузкой интервал опроса растет экспоненциально (backoff). Там, где /proc нет
+(Windows, macOS), ограничивается только число одновременных профилей.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import CHROME_DATA_PATH
+
+
+PROC_PATH = '/proc'
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def is_proc_available(proc_path: str = PROC_PATH) -> bool:
+    return os.path.exists(os.path.join(proc_path, 'meminfo'))
+
+
+def read_meminfo(proc_path: str = PROC_PATH) -> dict[str, int]:
+    """
+    Читает /proc/meminfo
+
+    Returns:
+        dict[str, int]: {поле: значение в байтах}, например MemTotal, MemAvailable
+    """
+    meminfo = {}
+    with open(os.path.join(proc_path, 'meminfo'), 'r') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            parts = value.split()
+            if parts:
+                meminfo[name] = int(parts[0]) * (1024 if len(parts) > 1 and parts[1] == 'kB' else 1)
+
+    return meminfo
+
+
+def read_cpu_times(proc_path: str = PROC_PATH) -> tuple[int, int]:
+    """
+    Читает суммарные счетчики CPU из /proc/stat
+
+    Returns:
+        tuple[int, int]: (время простоя, общее время) в тиках
+    """
+    with open(os.path.join(proc_path, 'stat'), 'r') as f:
+        values = [int(value) for value in f.readline().split()[1:]]
+
+    idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+    return idle, sum(values)
+
+
+def get_chrome_rss_bytes(proc_path: str = PROC_PATH, data_path: str = None) -> tuple[int, int]:
+    """
+    Суммирует RSS процессов Chrome, запущенных с данными проекта
+
+    Args:
+        data_path: Путь к данным профилей, по которому процессы отличаются от чужого Chrome
+
+    Returns:
+        tuple[int, int]: (суммарный RSS в байтах, количество процессов)
+    """
+    marker = f'--user-data-dir={data_path or CHROME_DATA_PATH}'.encode()
+    total_rss = 0
+    process_count = 0
+
+    for pid in os.listdir(proc_path):
+        if not pid.isdigit():
+            continue
+
+        try:
+            with open(os.path.join(proc_path, pid, 'cmdline'), 'rb') as f:
+                if marker not in f.read():
+                    continue
+            with open(os.path.join(proc_path, pid, 'statm'), 'r') as f:
+                total_rss += int(f.read().split()[1]) * _PAGE_SIZE
+            process_count += 1
+        except (OSError, IndexError, ValueError):
+            continue  # процесс завершился между listdir и чтением
+
+    return total_rss, process_count
+
+
+class HostSampler:
+    """
+    Снимает показатели хоста: свободную память, загрузку CPU и RSS Chrome проекта
+    """
+
+    def __init__(self, proc_path: str = PROC_PATH, data_path: str = None):
+        self.proc_path = proc_path
+        self.data_path = data_path
+        self._last_cpu_times = None
+
+    def sample(self) -> dict:
+        """
+        Returns:
+            dict: mem_total, mem_available, cpu_percent, chrome_rss, chrome_processes
+                  (память в байтах; cpu_percent - загрузка с прошлого замера, None при первом замере)
+        """
+        meminfo = read_meminfo(self.proc_path)
+
+        idle, total = read_cpu_times(self.proc_path)
+        cpu_percent = None
+        if self._last_cpu_times:
+            last_idle, last_total = self._last_cpu_times
+            total_delta = total - last_total
+            if total_delta > 0:
+                cpu_percent = 100 * (1 - (idle - last_idle) / total_delta)
+        self._last_cpu_times = (idle, total)
+
+        chrome_rss, chrome_processes = get_chrome_rss_bytes(self.proc_path, self.data_path)
+
+        return {
+            'mem_total': meminfo.get('MemTotal', 0),
+            'mem_available': meminfo.get('MemAvailable', meminfo.get('MemFree', 0)),
+            'cpu_percent': cpu_percent,
+            'chrome_rss': chrome_rss,
+            'chrome_processes': chrome_processes,
+        }
+
+
+class AdmissionController:
+    """
+    Пускает новые профили к запуску только при наличии запаса ресурсов.
+
+    Использование:
+        controller = AdmissionController.from_config()
+        with controller.slot(profile_name):
+            ...  # запуск профиля
+
+    Или без ожидания, из цикла, который сам опрашивает запущенные процессы:
+        admitted, reason = controller.try_acquire(profile_name)
+        ...
+        controller.release()
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 10,
+                 min_free_memory_mb: int = 1024,
+                 max_cpu_percent: float = 85,
+                 profile_memory_mb: int = 600,
+                 poll_interval_sec: tuple[float, float] = (0.5, 10),
+                 startup_grace_sec: float = 15,
+                 sampler: HostSampler | None = None):
+        """
+        Args:
+            max_concurrency: Максимум одновременно работающих профилей
+            min_free_memory_mb: Сколько памяти должно остаться свободным после запуска еще одного профиля
+            max_cpu_percent: Загрузка CPU, выше которой новые профили не запускаются
+            profile_memory_mb: Начальная оценка памяти на профиль, уточняется по RSS Chrome
+            poll_interval_sec: Интервал повторной проверки (начальный, максимальный)
+            startup_grace_sec: Сколько секунд после допуска память профиля считается еще не занятой
+                               (Chrome запускается) и резервируется по оценке
+            sampler: Источник показателей хоста, None - /proc (если доступен)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_free_memory = min_free_memory_mb * 1024 * 1024
+        self.max_cpu_percent = max_cpu_percent
+        self.profile_memory = profile_memory_mb * 1024 * 1024
+        self.poll_interval_sec = poll_interval_sec
+        self.startup_grace_sec = startup_grace_sec
+        self.sampler = sampler if sampler is not None else (HostSampler() if is_proc_available() else None)
+
+        self.active = 0
+        self._admitted_at = []  # время допуска недавно запущенных профилей: их память еще не видна в RSS
+        self._condition = threading.Condition()
+        self._sample_lock = threading.Lock()  # замер CPU считается от прошлого замера, замеры не должны пересекаться
+
+        if self.sampler is None:
+            logger.debug(f'/proc недоступен, параллельность ограничена только max_workers={self.max_concurrency}')
+
+    @classmethod
+    def from_config(cls, max_concurrency: int | None = None) -> 'AdmissionController':
+        """
+        Args:
+            max_concurrency: Максимум одновременно запускаемых профилей, по умолчанию max_workers
+        """
+        return cls(
+            max_concurrency or general_config.get('max_workers', 10),
+            general_config.get('admission_min_free_memory_mb', 1024),
+            general_config.get('admission_max_cpu_percent', 85),
+            general_config.get('admission_profile_memory_mb', 600),
+            general_config.get('admission_poll_sec', (0.5, 10)),
+            general_config.get('admission_startup_grace_sec', 15),
+        )
+
+    def _count_starting(self) -> int:
+        threshold = time.monotonic() - self.startup_grace_sec
+        self._admitted_at = [admitted_at for admitted_at in self._admitted_at if admitted_at > threshold]
+        return len(self._admitted_at)
+
+    def estimate_profile_memory(self, snapshot: dict) -> int:
+        """
+        Оценивает память на один профиль: средний RSS Chrome активных профилей,
+        но не меньше начальной оценки из настроек
+        """
+        started = self.active - len(self._admitted_at)
+        if started > 0 and snapshot['chrome_rss']:
+            return max(self.profile_memory, snapshot['chrome_rss'] // started)
+
+        return self.profile_memory
+
+    def check_headroom(self, snapshot: dict) -> tuple[bool, str]:
+        """
+        Проверяет, хватает ли ресурсов на еще один профиль
+
+        Returns:
+            tuple[bool, str]: (можно запускать, причина отказа)
+        """
+        starting = self._count_starting()
+        profile_memory = self.estimate_profile_memory(snapshot)
+        memory_after_start = snapshot['mem_available'] - profile_memory * (starting + 1)
+        if memory_after_start < self.min_free_memory:
+            return False, (f'мало памяти: доступно {snapshot["mem_available"] // 2 ** 20} МБ, '
+                           f'на профиль ~{profile_memory // 2 ** 20} МБ')
+
+        if snapshot['cpu_percent'] is not None and snapshot['cpu_percent'] > self.max_cpu_percent:
+            return False, f'высокая загрузка CPU: {snapshot["cpu_percent"]:.0f}%'
+
+        return True, ''
+
+    def try_acquire(self, name: str = '') -> tuple[bool, str]:
+        """
+        Занимает слот, если запас ресурсов есть сейчас, не дожидаясь его
+
+        Args:
+            name: Имя профиля для логов
+
+        Returns:
+            tuple[bool, str]: (слот занят, причина отказа)
+        """
+        with self._condition:
+            if self.active >= self.max_concurrency:
+                return False, f'запущено максимум профилей ({self.max_concurrency})'
+
+        # /proc читается вне блокировки: обход процессов занимает время, а release не должен его ждать
+        snapshot = None
+        if self.sampler is not None:
+            try:
+                with self._sample_lock:
+                    snapshot = self.sampler.sample()
+            except Exception as e:
+                logger.debug('{} - не удалось получить показатели хоста, причина: {}', name, e)
+
+        with self._condition:
+            if self.active >= self.max_concurrency:
+                return False, f'запущено максимум профилей ({self.max_concurrency})'
+
+            admitted, reason = self.check_headroom(snapshot) if snapshot is not None else (True, '')
+            # без активных профилей всегда пускаем один, иначе запуск не сдвинется
+            if admitted or self.active == 0:
+                self.active += 1
+                self._admitted_at.append(time.monotonic())
+                return True, ''
+
+        return False, reason
+
+    def acquire(self, name: str = '', timeout: float | None = None) -> bool:
+        """
+        Ждет, пока появится запас ресурсов, и занимает слот
+
+        Args:
+            name: Имя профиля для логов
+            timeout: Максимальное время ожидания в секундах, None - без ограничения
+
+        Returns:
+            bool: True, если слот занят, False при истечении timeout
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        interval, max_interval = self.poll_interval_sec
+        waiting_logged = False
+
+        while True:
+            admitted, reason = self.try_acquire(name)
+            if admitted:
+                return True
+
+            if not waiting_logged:
+                logger.info(f'⏳ {name} - ожидаю ресурсы: {reason}')
+                waiting_logged = True
+
+            wait_for = interval
+            if deadline is not None:
+                wait_for = min(wait_for, deadline - time.monotonic())
+                if wait_for <= 0:
+                    return False
+
+            # release будит ожидающих раньше срока; пропущенное между проверкой и ожиданием
+            # освобождение слота только откладывает проверку до конца интервала
+            with self._condition:
+                self._condition.wait(wait_for)
+            interval = min(interval * 2, max_interval)
+
+    def release(self) -> None:
+        with self._condition:
+            self.active = max(0, self.active - 1)
+            self._admitted_at = self._admitted_at[-self.active:] if self.active else []
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, name: str = ''):
+        """
+        Занимает слот на время работы профиля
+
+        Args:
+            name: Имя профиля для логов
+        """
+        self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release()
+
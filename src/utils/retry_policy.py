@@ -0,0 +1,206 @@
+"""
+Политика повторов для запуска профилей и выполнения скриптов.
+
+Ошибка классифицируется по фазе и типу:
+    launch  - браузер не запустился (профиль занят, порт отладки не поднялся)
+    attach  - браузер запущен, но подключиться к DevTools не удалось
+    timeout - таймаут ожидания элемента или страницы внутри скрипта
+    crash   - браузер или вкладка упали во время скрипта
+    script  - прочие ошибки скрипта, повтор которых обычно бессмысленен
+
+Повторяется только упавшая фаза, с экспоненциальной задержкой. Общее число повторов
+на весь пакетный прогон ограничено бюджетом, общим для всех профилей прогона.
+
+Скрипт повторяется, только если он помечен в словаре scripts раннера как 'idempotent': True:
+импорт кошелька и подобные скрипты меняют состояние расширения по шагам, и таймаут
+на середине не означает, что скрипт можно безопасно запустить заново.
+"""
+
+import time
+import random
+import threading
+from typing import Callable
+
+from loguru import logger
+
+from config import general_config
+
+
+FAILURE_LAUNCH = 'launch'
+FAILURE_ATTACH = 'attach'
+FAILURE_TIMEOUT = 'timeout'
+FAILURE_CRASH = 'crash'
+FAILURE_SCRIPT = 'script'
+
+DEFAULT_RETRY_LIMITS = {
+    FAILURE_LAUNCH: 2,
+    FAILURE_ATTACH: 2,
+    FAILURE_TIMEOUT: 0,
+    FAILURE_CRASH: 0,
+    FAILURE_SCRIPT: 0,
+}
+
+_CRASH_MARKERS = (
+    'target closed',
+    'target page, context or browser has been closed',
+    'browser has been closed',
+    'browser has disconnected',
+    'connection closed',
+    'disconnected',
+    'crash',
+    'no such window',
+    'invalid session id',
+)
+
+
+def classify_failure(error: Exception | str | None, phase: str) -> str:
+    """
+    Определяет класс ошибки
+
+    Args:
+        error: Исключение или описание ошибки
+        phase: Фаза, в которой произошла ошибка (launch, attach, script)
+
+    Returns:
+        str: Класс ошибки (launch, attach, timeout, crash, script)
+    """
+    if phase in (FAILURE_LAUNCH, FAILURE_ATTACH):
+        return phase
+
+    if isinstance(error, BaseException):
+        if 'timeout' in type(error).__name__.lower():  # TimeoutError Playwright, TimeoutException Selenium
+            return FAILURE_TIMEOUT
+        message = str(error).lower()
+    else:
+        message = str(error or '').lower()
+
+    if any(marker in message for marker in _CRASH_MARKERS):
+        return FAILURE_CRASH
+    if 'timeout' in message:
+        return FAILURE_TIMEOUT
+
+    return FAILURE_SCRIPT
+
+
+class RetryPolicy:
+    """
+    Политика повторов одного пакетного прогона. Потокобезопасна: бюджет повторов
+    общий для всех потоков, которые используют один экземпляр
+    """
+
+    def __init__(self,
+                 limits: dict[str, int] | None = None,
+                 backoff_base_sec: float = 1,
+                 backoff_max_sec: float = 30,
+                 batch_budget: int | None = None):
+        """
+        Args:
+            limits: Максимальное число повторов на одну фазу по классам ошибок
+            backoff_base_sec: Задержка перед первым повтором, далее удваивается
+            backoff_max_sec: Максимальная задержка между повторами
+            batch_budget: Максимальное число повторов на весь прогон, None - без ограничения
+        """
+        self.limits = {**DEFAULT_RETRY_LIMITS, **(limits or {})}
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.batch_budget = batch_budget
+        self.retries_used = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> 'RetryPolicy':
+        """
+        Создает политику из general_config (retry_limits, retry_backoff_sec, retry_batch_budget)
+        """
+        backoff_base_sec, backoff_max_sec = general_config.get('retry_backoff_sec', (1, 30))
+        return cls(
+            general_config.get('retry_limits'),
+            backoff_base_sec,
+            backoff_max_sec,
+            general_config.get('retry_batch_budget')
+        )
+
+    def get_delay(self, retry_number: int) -> float:
+        """
+        Возвращает задержку перед повтором: base * 2^(n-1) со случайным разбросом до 20%
+
+        Args:
+            retry_number: Номер повтора, начиная с 1
+        """
+        delay = min(self.backoff_base_sec * 2 ** (retry_number - 1), self.backoff_max_sec)
+        return delay * random.uniform(0.8, 1.0)
+
+    def acquire_retry(self, failure_class: str, retry_number: int) -> bool:
+        """
+        Проверяет, можно ли выполнить повтор, и списывает его из бюджета прогона
+
+        Args:
+            failure_class: Класс ошибки
+            retry_number: Номер повтора для этой фазы, начиная с 1
+
+        Returns:
+            bool: True, если повтор разрешен
+        """
+        if retry_number > self.limits.get(failure_class, 0):
+            return False
+
+        with self._lock:
+            if self.batch_budget is not None and self.retries_used >= self.batch_budget:
+                logger.warning(f'⚠️ Бюджет повторов прогона исчерпан ({self.batch_budget})')
+                return False
+            self.retries_used += 1
+
+        return True
+
+    def call(self,
+             phase: str,
+             func: Callable,
+             *args,
+             description: str = '',
+             is_failed: Callable | None = None,
+             on_retry: Callable[[str], None] | None = None,
+             retryable: bool = True,
+             **kwargs):
+        """
+        Вызывает func, повторяя вызов при ошибке в соответствии с политикой
+
+        Args:
+            phase: Фаза (launch, attach, script), используется для классификации ошибки
+            func: Вызываемая функция
+            description: Описание для логов, например "1 - запуск профиля"
+            is_failed: Проверка результата: True, если результат означает ошибку
+                       (например, launch_profile вернул None или False)
+            on_retry: Вызывается с классом ошибки перед каждым повтором
+            retryable: False - не повторять вызов (например, неидемпотентный скрипт)
+
+        Returns:
+            Результат последнего вызова func. Если все попытки завершились исключением,
+            пробрасывается последнее исключение
+        """
+        retry_number = 0
+        while True:
+            error = None
+            try:
+                result = func(*args, **kwargs)
+                if is_failed is None or not is_failed(result):
+                    return result
+                error_description = 'вызов завершился неудачей'
+            except Exception as e:
+                error = e
+                result = None
+                error_description = str(e)
+
+            failure_class = classify_failure(error or error_description, phase)
+            retry_number += 1
+            if not retryable or not self.acquire_retry(failure_class, retry_number):
+                if error is not None:
+                    raise error
+                return result
+
+            if on_retry:
+                on_retry(failure_class)
+
+            delay = self.get_delay(retry_number)
+            logger.warning(f'🔁 {description} - ошибка ({failure_class}), повтор {retry_number} через {delay:.1f} с')
+            logger.debug(f'{description} - ошибка перед повтором: {error_description}')
+            time.sleep(delay)
@@ -0,0 +1,415 @@
+"""
+Структурированные результаты прогонов скриптов по профилям.
+
+Каждый прогон профиля записывается в локальную базу SQLite (data/run_results.sqlite3):
+    profile_runs - профиль целиком: раннер, время начала и конца,
+                   длительность фаз launch / attach / teardown, итог и класс ошибки
+    script_runs  - каждый скрипт прогона: время, длительность, итог и класс ошибки
+
+Запись результатов никогда не прерывает прогон: ошибки базы только логируются.
+Ход прогона (фазы, скрипты, итог) параллельно публикуется в шину событий progress_events,
+длительности фаз и скриптов - в гистограммы спанов instrumentation.
+"""
+
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from config import general_config
+from src.utils.constants import DATA_PATH
+from src.utils.progress_events import PHASE_EVENTS, publish_event
+from src.utils.instrumentation import record_span
+
+if TYPE_CHECKING:
+    from src.utils.batch_journal import BatchJournal
+
+
+RUN_RESULTS_DB_PATH = DATA_PATH / "run_results.sqlite3"
+
+PHASES = ('launch', 'attach', 'teardown')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profile_runs (
+    run_id TEXT PRIMARY KEY,
+    batch_id TEXT,
+    runner TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    launch_sec REAL,
+    attach_sec REAL,
+    teardown_sec REAL,
+    outcome TEXT,
+    error_class TEXT,
+    error TEXT,
+    retries INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS script_runs (
+    run_id TEXT NOT NULL REFERENCES profile_runs(run_id),
+    script TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    duration_sec REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    error_class TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_profile_runs_profile ON profile_runs(profile);
+CREATE INDEX IF NOT EXISTS idx_profile_runs_batch ON profile_runs(batch_id);
+CREATE INDEX IF NOT EXISTS idx_script_runs_run ON script_runs(run_id);
+CREATE INDEX IF NOT EXISTS idx_script_runs_script ON script_runs(script);
+"""
+
+_db_lock = threading.Lock()
+_initialized_paths = set()
+
+
+def _connect(db_path: str | Path = None) -> sqlite3.Connection:
+    db_path = str(db_path or RUN_RESULTS_DB_PATH)
+    connection = sqlite3.connect(db_path, timeout=30)
+    connection.row_factory = sqlite3.Row
+
+    if db_path not in _initialized_paths:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        _migrate(connection)
+        _initialized_paths.add(db_path)
+
+    return connection
+
+
+def _migrate(connection: sqlite3.Connection) -> None:
+    # колонки, добавленные после создания схемы
+    columns = {row['name'] for row in connection.execute("PRAGMA table_info(profile_runs)")}
+    if 'retries' not in columns:
+        connection.execute("ALTER TABLE profile_runs ADD COLUMN retries INTEGER NOT NULL DEFAULT 0")
+
+
+def _execute(query: str, params: tuple = (), db_path: str | Path = None) -> None:
+    with _db_lock:
+        connection = _connect(db_path)
+        try:
+            with connection:
+                connection.execute(query, params)
+        finally:
+            connection.close()
+
+
+def _fetch_all(query: str, params: tuple = (), db_path: str | Path = None) -> list[dict]:
+    with _db_lock:
+        connection = _connect(db_path)
+        try:
+            return [dict(row) for row in connection.execute(query, params).fetchall()]
+        finally:
+            connection.close()
+
+
+def new_batch_id() -> str:
+    """
+    Генерирует идентификатор пакетного прогона (одного запуска скриптов на набор профилей)
+    """
+    return uuid.uuid4().hex
+
+
+class ProfileRun:
+    """
+    Результат прогона скриптов на одном профиле.
+
+    Фазы замеряются через контекстный менеджер phase(), скрипты - через script().
+    Итог и время окончания сохраняются в finish().
+    """
+
+    def __init__(self,
+                 runner: str,
+                 profile_name: str | int,
+                 batch_id: str | None = None,
+                 db_path: str | Path = None,
+                 journal: 'BatchJournal | None' = None,
+                 scripts_total: int | None = None):
+        self.run_id = uuid.uuid4().hex
+        self.batch_id = batch_id or (journal.batch_id if journal else None)
+        self.journal = journal
+        self.runner = runner
+        self.profile = str(profile_name)
+        self.started_at = time.time()
+        self.finished_at = None
+        self.phases = {}
+        self.scripts = []
+        self.outcome = None
+        self.error_class = None
+        self.error = None
+        self.retries = {}  # {класс ошибки: число повторов}
+        self.db_path = db_path
+        self.enabled = general_config.get('record_run_results', True)
+        self.scripts_total = scripts_total
+
+        self._save("""
+            INSERT INTO profile_runs (run_id, batch_id, runner, profile, started_at)
+            VALUES (?, ?, ?, ?, ?)
+        """, (self.run_id, self.batch_id, self.runner, self.profile, self.started_at))
+        self.publish('started', scripts_total=scripts_total)
+
+    @property
+    def success(self) -> bool:
+        return self.outcome == 'success'
+
+    @property
+    def failed_scripts(self) -> list[str]:
+        return [script['script'] for script in self.scripts if script['outcome'] != 'success']
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Замеряет длительность фазы прогона (launch, attach, teardown)
+
+        Args:
+            name: Название фазы
+        """
+        if name in PHASE_EVENTS:
+            self.publish(PHASE_EVENTS[name][0])
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase_duration(name, time.perf_counter() - started)
+
+    def add_retry(self, failure_class: str) -> None:
+        """
+        Учитывает повтор фазы после ошибки
+
+        Args:
+            failure_class: Класс ошибки (launch, attach, timeout, crash, script)
+        """
+        self.retries[failure_class] = self.retries.get(failure_class, 0) + 1
+
+    def add_phase_duration(self, name: str, duration_sec: float) -> None:
+        """
+        Добавляет длительность фазы, замеренную вне phase() (например, внутри launch_profile)
+        """
+        self.phases[name] = self.phases.get(name, 0) + duration_sec
+        record_span(f'{self.runner}.{name}', duration_sec, profile=self.profile)
+        if name in PHASE_EVENTS:
+            self.publish(PHASE_EVENTS[name][1], duration_sec=round(duration_sec, 3))
+
+    @contextmanager
+    def script(self, script_name: str):
+        """
+        Замеряет выполнение скрипта и записывает его итог.
+        Исключение скрипта записывается и пробрасывается дальше.
+
+        Args:
+            script_name: Ключ скрипта
+        """
+        outcome = {'failed': False}
+        self.publish('script_started', script=script_name, index=len(self.scripts) + 1, scripts_total=self.scripts_total)
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield outcome
+        except Exception as e:
+            self.add_script_result(script_name, started_at, time.perf_counter() - started, e)
+            raise
+        else:
+            error = 'скрипт вернул False' if outcome['failed'] else None
+            self.add_script_result(script_name, started_at, time.perf_counter() - started, error)
+
+    def add_script_result(self,
+                          script_name: str,
+                          started_at: float,
+                          duration_sec: float,
+                          error: Exception | str | None = None) -> None:
+        """
+        Записывает результат одного скрипта
+
+        Args:
+            script_name: Ключ скрипта
+            started_at: Время начала (unix time)
+            duration_sec: Длительность в секундах
+            error: Исключение или описание ошибки, None если скрипт выполнен успешно
+        """
+        result = {
+            'script': script_name,
+            'started_at': started_at,
+            'finished_at': started_at + duration_sec,
+            'duration_sec': duration_sec,
+            'outcome': 'success' if error is None else 'failed',
+            'error_class': _error_class(error),
+            'error': str(error) if error is not None else None
+        }
+        self.scripts.append(result)
+        record_span(f'{self.runner}.script.{script_name}', duration_sec, profile=self.profile, outcome=result['outcome'])
+        self.publish('script_finished', script=script_name, index=len(self.scripts), scripts_total=self.scripts_total,
+                     duration_sec=round(duration_sec, 3), outcome=result['outcome'], error=result['error'])
+
+        if self.journal and error is None:
+            self.journal.mark_done(self.profile, script_name)
+
+        self._save("""
+            INSERT INTO script_runs (run_id, script, started_at, finished_at, duration_sec, outcome, error_class, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (self.run_id, result['script'], result['started_at'], result['finished_at'],
+              result['duration_sec'], result['outcome'], result['error_class'], result['error']))
+
+    def finish(self, error: Exception | str | None = None) -> 'ProfileRun':
+        """
+        Завершает прогон профиля и сохраняет итог
+
+        Args:
+            error: Ошибка, прервавшая прогон профиля (запуск, подключение и т.п.)
+
+        Returns:
+            ProfileRun: self
+        """
+        self.finished_at = time.time()
+
+        if error is not None:
+            self.outcome = 'failed'
+            self.error_class = _error_class(error)
+            self.error = str(error)
+        elif self.failed_scripts:
+            self.outcome = 'partial' if len(self.failed_scripts) < len(self.scripts) else 'failed'
+            self.error_class = next(s['error_class'] for s in self.scripts if s['outcome'] != 'success')
+        else:
+            self.outcome = 'success'
+
+        self._save("""
+            UPDATE profile_runs
+            SET finished_at = ?, launch_sec = ?, attach_sec = ?, teardown_sec = ?, outcome = ?, error_class = ?, error = ?,
+                retries = ?
+            WHERE run_id = ?
+        """, (self.finished_at, self.phases.get('launch'), self.phases.get('attach'), self.phases.get('teardown'),
+              self.outcome, self.error_class, self.error, sum(self.retries.values()), self.run_id))
+        self.publish('finished', outcome=self.outcome, duration_sec=round(self.finished_at - self.started_at, 3),
+                     failed_scripts=self.failed_scripts, retries=sum(self.retries.values()), error=self.error)
+
+        return self
+
+    def publish(self, event_type: str, **fields) -> None:
+        """
+        Публикует событие хода прогона профиля в шину progress_events
+        """
+        publish_event(event_type, batch_id=self.batch_id, run_id=self.run_id, runner=self.runner,
+                      profile=self.profile, **fields)
+
+    def _save(self, query: str, params: tuple) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            _execute(query, params, self.db_path)
+        except Exception as e:
+            logger.debug(f'{self.profile} - не удалось записать результат прогона, причина: {e}')
+
+
+def _error_class(error: Exception | str | None) -> str | None:
+    if error is None:
+        return None
+    if isinstance(error, BaseException):
+        return type(error).__name__
+
+    return 'ScriptFailed'
+
+
+def get_profile_history(profile_name: str | int, limit: int = 50, db_path: str | Path = None) -> list[dict]:
+    """
+    Возвращает последние прогоны профиля
+
+    Args:
+        profile_name: Имя профиля
+        limit: Максимальное количество записей
+
+    Returns:
+        list[dict]: Строки profile_runs от новых к старым
+    """
+    return _fetch_all("""
+        SELECT * FROM profile_runs WHERE profile = ? ORDER BY started_at DESC LIMIT ?
+    """, (str(profile_name), limit), db_path)
+
+
+def get_last_profile_runs(db_path: str | Path = None) -> dict[str, dict]:
+    """
+    Возвращает последний завершенный прогон каждого профиля
+
+    Returns:
+        dict[str, dict]: {имя профиля: строка profile_runs}
+    """
+    rows = _fetch_all("""
+        SELECT p.* FROM profile_runs p
+        JOIN (
+            SELECT profile, MAX(started_at) AS started_at FROM profile_runs
+            WHERE finished_at IS NOT NULL GROUP BY profile
+        ) last ON last.profile = p.profile AND last.started_at = p.started_at
+    """, (), db_path)
+
+    return {row['profile']: row for row in rows}
+
+
+def get_slowest_profiles(limit: int = 20, runner: str | None = None, db_path: str | Path = None) -> list[dict]:
+    """
+    Возвращает профили с наибольшей средней длительностью прогона
+
+    Args:
+        limit: Количество профилей
+        runner: Фильтр по раннеру (chrome, playwright, manager)
+
+    Returns:
+        list[dict]: profile, runs, avg_total_sec, avg_launch_sec, avg_attach_sec, failures
+    """
+    return _fetch_all(f"""
+        SELECT profile,
+               COUNT(*) AS runs,
+               AVG(finished_at - started_at) AS avg_total_sec,
+               AVG(launch_sec) AS avg_launch_sec,
+               AVG(attach_sec) AS avg_attach_sec,
+               SUM(outcome != 'success') AS failures
+        FROM profile_runs
+        WHERE finished_at IS NOT NULL {'AND runner = ?' if runner else ''}
+        GROUP BY profile
+        ORDER BY avg_total_sec DESC
+        LIMIT ?
+    """, ((runner, limit) if runner else (limit,)), db_path)
+
+
+def get_script_stats(since: float | None = None, db_path: str | Path = None) -> list[dict]:
+    """
+    Возвращает статистику по скриптам: количество, среднее и максимальное время, число ошибок
+
+    Args:
+        since: Учитывать только запуски после этого времени (unix time)
+
+    Returns:
+        list[dict]: script, runs, avg_sec, max_sec, failures
+    """
+    return _fetch_all(f"""
+        SELECT script,
+               COUNT(*) AS runs,
+               AVG(duration_sec) AS avg_sec,
+               MAX(duration_sec) AS max_sec,
+               SUM(outcome != 'success') AS failures
+        FROM script_runs
+        {'WHERE started_at >= ?' if since else ''}
+        GROUP BY script
+        ORDER BY avg_sec DESC
+    """, ((since,) if since else ()), db_path)
+
+
+def get_batch_results(batch_id: str, db_path: str | Path = None) -> list[dict]:
+    """
+    Возвращает результаты всех профилей пакетного прогона
+
+    Args:
+        batch_id: Идентификатор пакетного прогона
+
+    Returns:
+        list[dict]: Строки profile_runs прогона
+    """
+    return _fetch_all("""
+        SELECT * FROM profile_runs WHERE batch_id = ? ORDER BY started_at
+    """, (batch_id,), db_path)
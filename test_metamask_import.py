@@ -10,7 +10,7 @@ import sys
 import time
 from loguru import logger
 
-from src.chrome.playwright_chrome import PlaywrightChrome
+from src.chrome.playwright_chrome import PlaywrightChrome, stop_shared_playwright
 from src.utils.constants import METAMASK_ID
 
 # Настройка логирования
@@ -187,6 +187,7 @@ def main():
         # Закрываем браузер
         logger.info("🔒 Закрываем браузер...")
         pw.close()
+        stop_shared_playwright()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file